@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the web-source crawler's bookkeeping overhead.
+
+Runs ``run_crawl`` against a stubbed site served by ``httpx.MockTransport``
+(no network, no politeness delay). DynamoDB and S3 are stubbed too, each
+call sleeping for a fixed simulated latency so their share of the crawl
+shows up in wall time.
+
+For every run it reports:
+
+- pages/sec
+- counter writes (``increment_counters`` calls) and writes per page
+- S3 clients built
+- crawl-loop sleeps (the scheduler itself should never sleep)
+
+``--flush-pages 1`` reproduces the old one-write-per-event accounting for
+comparison with the batched default.
+
+Usage (from backend/):
+    python scripts/benchmark_crawler.py [--pages 2000] [--concurrency 5] [--ddb-ms 5] [--flush-pages 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+
+from apis.app_api.web_sources import crawler  # noqa: E402
+from apis.app_api.web_sources.models import CrawlSettings  # noqa: E402
+
+ROOT = "https://bench.example.com/"
+
+
+def _site(pages: int, fanout: int) -> dict[str, str]:
+    """A tree of `pages` pages where page i links to its `fanout` children."""
+    site = {}
+    for i in range(pages):
+        children = range(i * fanout + 1, min(pages, i * fanout + fanout + 1))
+        links = "".join(f'<a href="/p{c}">p{c}</a>' for c in children)
+        url = ROOT if i == 0 else f"{ROOT}p{i}"
+        site[url] = f"<html><head><title>P{i}</title></head><body><p>page {i}</p>{links}</body></html>"
+    return site
+
+
+def _handler(site: dict[str, str]):
+    def handle(request: httpx.Request) -> httpx.Response:
+        body = site.get(str(request.url))
+        if body is None:
+            return httpx.Response(404, text="")
+        return httpx.Response(200, text=body, headers={"content-type": "text/html"})
+
+    return handle
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    stats = {"counter_writes": 0, "s3_clients": 0, "puts": 0, "sleeps": 0}
+    ddb_latency = args.ddb_ms / 1000
+    real_sleep = asyncio.sleep
+
+    async def increment_counters(**_kwargs):
+        stats["counter_writes"] += 1
+        await real_sleep(ddb_latency)
+
+    async def noop(*_args, **_kwargs):
+        await real_sleep(ddb_latency)
+
+    async def create_document(**_kwargs):
+        await real_sleep(ddb_latency)
+
+    async def put_markdown(*, s3, **_kwargs):
+        await s3.client()
+        stats["puts"] += 1
+        return "key"
+
+    def s3_client(_service):
+        stats["s3_clients"] += 1
+        return object()
+
+    async def counting_sleep(seconds: float = 0):
+        stats["sleeps"] += 1
+        await real_sleep(seconds)
+
+    import boto3
+
+    boto3.client = s3_client
+    crawler.increment_counters = increment_counters
+    crawler.finalize_crawl = noop
+    crawler.update_document_status = noop
+    crawler.update_document_import_metadata = noop
+    crawler.create_document = create_document
+    crawler._put_markdown = put_markdown
+    crawler.asyncio.sleep = counting_sleep
+
+    site = _site(args.pages, args.fanout)
+    # Bypass the API caps (100 pages, depth 3): this is a load test.
+    settings = CrawlSettings.model_construct(
+        max_depth=args.pages,
+        max_pages=args.pages,
+        concurrency=args.concurrency,
+        min_delay_seconds=0.0,
+        max_delay_seconds=0.0,
+        same_domain_only=True,
+        incremental=False,
+    )
+    started = time.perf_counter()
+    await crawler.run_crawl(
+        assistant_id="ast-bench",
+        crawl_id="CRAWL-bench",
+        user_id="user-bench",
+        root_url=ROOT,
+        settings=settings,
+        root_document_id="DOC-root",
+        http_client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(_handler(site))),
+    )
+    stats["seconds"] = time.perf_counter() - started
+    crawler.shutdown_parse_pool()
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--ddb-ms", type=float, default=5.0, help="simulated latency per DynamoDB call")
+    parser.add_argument("--flush-pages", type=int, default=10, help="WEB_CRAWL_PROGRESS_FLUSH_PAGES")
+    args = parser.parse_args()
+    os.environ["WEB_CRAWL_PROGRESS_FLUSH_PAGES"] = str(args.flush_pages)
+
+    stats = asyncio.run(_run(args))
+
+    print(f"pages={args.pages} concurrency={args.concurrency} ddb_ms={args.ddb_ms} flush_pages={args.flush_pages}")
+    print(f"  wall time      : {stats['seconds']:8.2f} s  ({stats['puts'] / stats['seconds']:.0f} pages/s)")
+    print(f"  counter writes : {stats['counter_writes']:8d}    ({stats['counter_writes'] / max(1, stats['puts']):.2f} per page)")
+    print(f"  S3 clients     : {stats['s3_clients']:8d}")
+    print(f"  loop sleeps    : {stats['sleeps']:8d}")
+    if stats["puts"] != args.pages:
+        print(f"MISMATCH: staged {stats['puts']} of {args.pages} pages")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the chat streaming hot paths.
+
+Replays agent event traces through:
+
+- ``process_agent_stream``: raw Strands events in, processed events out.
+- ``StreamCoordinator.stream_response``: processed events out as SSE frames.
+  Post-turn metadata storage is stubbed out and no AWS calls are made.
+- ``TurnBasedSessionManager._truncate_tool_contents``: compaction stage 1,
+  run over the messages the trace produced.
+
+For every case it reports:
+
+- events/sec (messages/sec for truncation)
+- p50/p99 per-event overhead: the time the pipeline holds each raw event
+  before asking for the next one
+- tracemalloc peak
+- peak RSS. Each case runs in its own subprocess, so the peak belongs to
+  that case plus the interpreter and imports.
+
+Each case is also checked for correctness: the text streamed to the client
+must equal the text in the trace.
+
+Built-in traces are generated deterministically in the shape Strands emits:
+a model-chunk ``event`` plus a ``data``/``delta`` callback per token, and
+``current_tool_use`` per tool-input fragment. They are:
+
+- short_chat: a one-paragraph answer
+- long_answer: a 20k-token answer
+- tool_heavy: eight tool calls with 2 KB results
+- large_tool_result: a 4 MB tool result
+
+``--trace FILE.jsonl`` adds a recorded trace: one raw ``agent.stream_async``
+event per line, as written by ``json.dumps(event, default=str)``.
+
+Timings depend on the machine, so compare baselines captured on the same
+runner type. Allocation and RSS figures travel better.
+
+Usage (from backend/):
+    python scripts/benchmark_streaming.py [--repeat 5] [--trace recorded.jsonl ...]
+    python scripts/benchmark_streaming.py --compare [--baseline PATH] [--tolerance 0.25]
+    python scripts/benchmark_streaming.py --save-baseline [--baseline PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from agents.main_agent.session.compaction_models import CompactionConfig  # noqa: E402
+from agents.main_agent.session.turn_based_session_manager import TurnBasedSessionManager  # noqa: E402
+from agents.main_agent.streaming.stream_coordinator import StreamCoordinator  # noqa: E402
+from agents.main_agent.streaming.stream_processor import process_agent_stream  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_streaming_baseline.json"
+PIPELINES = ("process_agent_stream", "stream_response", "truncate_tool_contents")
+
+_WORDS = (
+    "the of and to in is for on that with as by this from at are be or it an "
+    "retrieval latency assistant document stream token policy invoice quarterly "
+    "revenue customer region forecast summary analysis results table figure"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Traces
+# ---------------------------------------------------------------------------
+
+
+class Trace:
+    def __init__(self, name: str, raw_events: List[Dict[str, Any]], messages: List[Dict[str, Any]], text: Optional[str]):
+        self.name = name
+        self.raw_events = raw_events
+        # Conversation as the session manager would hold it after the turn
+        self.messages = messages
+        # Everything the client should see as text deltas (None: unknown for recorded traces)
+        self.text = text
+
+
+def _tokens(rng: random.Random, count: int) -> List[str]:
+    return [(" " if i else "") + rng.choice(_WORDS) for i in range(count)]
+
+
+def _model_call(
+    rng: random.Random,
+    text_tokens: int,
+    tool_input: Optional[str] = None,
+    tool_use_id: str = "",
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], str]:
+    """Raw events of one model call, the assistant message it produces, and its text."""
+    tokens = _tokens(rng, text_tokens)
+    events: List[Dict[str, Any]] = [
+        {"event": {"messageStart": {"role": "assistant"}}},
+        {"event": {"contentBlockStart": {"contentBlockIndex": 0, "start": {}}}},
+    ]
+    for token in tokens:
+        delta = {"text": token}
+        events.append({"event": {"contentBlockDelta": {"contentBlockIndex": 0, "delta": delta}}})
+        events.append({"data": token, "delta": delta})
+    events.append({"event": {"contentBlockStop": {"contentBlockIndex": 0}}})
+    text = "".join(tokens)
+    content: List[Dict[str, Any]] = [{"text": text}]
+
+    if tool_input is not None:
+        start = {"toolUse": {"toolUseId": tool_use_id, "name": "search_documents"}}
+        events.append({"event": {"contentBlockStart": {"contentBlockIndex": 1, "start": start}}})
+        partial = ""
+        for i in range(0, len(tool_input), 12):
+            fragment = tool_input[i : i + 12]
+            partial += fragment
+            delta = {"toolUse": {"input": fragment}}
+            events.append({"event": {"contentBlockDelta": {"contentBlockIndex": 1, "delta": delta}}})
+            events.append({
+                "delta": delta,
+                "current_tool_use": {"toolUseId": tool_use_id, "name": "search_documents", "input": partial},
+            })
+        events.append({"event": {"contentBlockStop": {"contentBlockIndex": 1}}})
+        content.append({"toolUse": {"toolUseId": tool_use_id, "name": "search_documents", "input": json.loads(tool_input)}})
+
+    stop_reason = "tool_use" if tool_input is not None else "end_turn"
+    events.append({"event": {"messageStop": {"stopReason": stop_reason}}})
+    usage = {"inputTokens": 1200, "outputTokens": text_tokens, "totalTokens": 1200 + text_tokens}
+    events.append({"event": {"metadata": {"usage": usage, "metrics": {"latencyMs": 800}}}})
+    message = {"role": "assistant", "content": content}
+    events.append({"message": message})
+    return events, message, text
+
+
+def _tool_result_message(tool_use_id: str, result_text: str) -> Dict[str, Any]:
+    return {
+        "role": "user",
+        "content": [{
+            "toolResult": {"toolUseId": tool_use_id, "status": "success", "content": [{"text": result_text}]},
+        }],
+    }
+
+
+def _build_trace(name: str, seed: int, tool_calls: int, tool_result_chars: int, text_tokens: int, final_tokens: int) -> Trace:
+    rng = random.Random(seed)
+    messages: List[Dict[str, Any]] = [{"role": "user", "content": [{"text": "Summarize the quarterly results."}]}]
+    raw_events: List[Dict[str, Any]] = [{"init_event_loop": True}, {"start_event_loop": True}]
+    texts: List[str] = []
+
+    for call in range(tool_calls):
+        tool_use_id = f"tooluse_{seed}_{call}"
+        tool_input = json.dumps({"query": " ".join(rng.choice(_WORDS) for _ in range(12)), "top_k": 5})
+        events, message, text = _model_call(rng, text_tokens, tool_input, tool_use_id)
+        raw_events += events
+        messages.append(message)
+        texts.append(text)
+
+        result_text = "".join(_tokens(rng, tool_result_chars // 7 + 1))[:tool_result_chars]
+        result_message = _tool_result_message(tool_use_id, result_text)
+        raw_events.append({"message": result_message})
+        messages.append(result_message)
+
+    events, message, text = _model_call(rng, final_tokens)
+    raw_events += events
+    messages.append(message)
+    texts.append(text)
+    return Trace(name, raw_events, messages, "".join(texts))
+
+
+def builtin_traces() -> Dict[str, Callable[[], Trace]]:
+    return {
+        "short_chat": lambda: _build_trace("short_chat", 1, tool_calls=0, tool_result_chars=0, text_tokens=0, final_tokens=60),
+        "long_answer": lambda: _build_trace("long_answer", 2, tool_calls=0, tool_result_chars=0, text_tokens=0, final_tokens=20_000),
+        "tool_heavy": lambda: _build_trace("tool_heavy", 3, tool_calls=8, tool_result_chars=2_048, text_tokens=30, final_tokens=200),
+        "large_tool_result": lambda: _build_trace(
+            "large_tool_result", 4, tool_calls=1, tool_result_chars=4 * 1024 * 1024, text_tokens=20, final_tokens=300
+        ),
+    }
+
+
+def load_recorded_trace(path: Path) -> Trace:
+    raw_events = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    messages = [
+        event["message"] for event in raw_events
+        if isinstance(event.get("message"), dict) and "role" in event["message"]
+    ]
+    return Trace(path.stem, raw_events, messages, text=None)
+
+
+# ---------------------------------------------------------------------------
+# Pipelines
+# ---------------------------------------------------------------------------
+
+
+async def _timed_source(raw_events: List[Dict[str, Any]], samples: List[float]) -> AsyncIterator[Dict[str, Any]]:
+    # Time between handing an event downstream and being asked for the next one
+    clock = time.perf_counter
+    for event in raw_events:
+        started = clock()
+        yield event
+        samples.append(clock() - started)
+
+
+class _ReplayAgent:
+    """Just enough of a Strands agent for ``stream_response``."""
+
+    def __init__(self, raw_events: List[Dict[str, Any]], samples: List[float]):
+        self.messages: List[Dict[str, Any]] = []
+        self._raw_events = raw_events
+        self._samples = samples
+
+    def stream_async(self, prompt: Any) -> AsyncIterator[Dict[str, Any]]:
+        return _timed_source(self._raw_events, self._samples)
+
+
+class _StubSessionManager:
+    message_count = 0
+
+    def flush(self) -> Optional[int]:
+        return None
+
+
+class _BenchCoordinator(StreamCoordinator):
+    """StreamCoordinator with post-turn DynamoDB writes stubbed out."""
+
+    async def _update_session_metadata(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def _store_message_metadata(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+async def _run_process_agent_stream(trace: Trace, samples: List[float]) -> str:
+    parts: List[str] = []
+    async for event in process_agent_stream(_timed_source(trace.raw_events, samples)):
+        if event["type"] == "content_block_delta" and event["data"].get("type") == "text":
+            parts.append(event["data"]["text"])
+    return "".join(parts)
+
+
+async def _run_stream_response(trace: Trace, samples: List[float]) -> str:
+    parts: List[str] = []
+    prefix = "event: content_block_delta\ndata: "
+    async for frame in _BenchCoordinator().stream_response(
+        agent=_ReplayAgent(trace.raw_events, samples),
+        prompt="benchmark",
+        session_manager=_StubSessionManager(),
+        session_id="bench-session",
+        user_id="bench-user",
+    ):
+        if frame.startswith(prefix):
+            data = json.loads(frame[len(prefix):])
+            if data.get("type") == "text":
+                parts.append(data["text"])
+    return "".join(parts)
+
+
+def _truncating_manager() -> TurnBasedSessionManager:
+    # Only compaction_config is read by _truncate_tool_contents; skip the
+    # AgentCore Memory constructor entirely.
+    manager = TurnBasedSessionManager.__new__(TurnBasedSessionManager)
+    manager.compaction_config = CompactionConfig()
+    return manager
+
+
+def _run_truncation(trace: Trace, samples: List[float]) -> None:
+    manager = _truncating_manager()
+    started = time.perf_counter()
+    manager._truncate_tool_contents(trace.messages)
+    samples.append(time.perf_counter() - started)
+
+
+def _units(trace: Trace, pipeline: str) -> int:
+    return len(trace.messages) if pipeline == "truncate_tool_contents" else len(trace.raw_events)
+
+
+def _run_once(trace: Trace, pipeline: str, samples: List[float]) -> Optional[str]:
+    if pipeline == "process_agent_stream":
+        return asyncio.run(_run_process_agent_stream(trace, samples))
+    if pipeline == "stream_response":
+        return asyncio.run(_run_stream_response(trace, samples))
+    _run_truncation(trace, samples)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(trace: Trace, pipeline: str, repeat: int) -> Dict[str, Any]:
+    # Warm-up run doubles as the correctness check
+    streamed = _run_once(trace, pipeline, [])
+    if trace.text is not None and streamed is not None and streamed != trace.text:
+        raise AssertionError(f"{trace.name}/{pipeline}: streamed text differs from the trace")
+
+    best = float("inf")
+    samples: List[float] = []
+    for _ in range(repeat):
+        run_samples: List[float] = []
+        started = time.perf_counter()
+        _run_once(trace, pipeline, run_samples)
+        best = min(best, time.perf_counter() - started)
+        samples += run_samples
+
+    tracemalloc.start()
+    _run_once(trace, pipeline, [])
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    units = _units(trace, pipeline)
+    if pipeline == "truncate_tool_contents":
+        # One sample per call; report it per message
+        samples = [s / max(units, 1) for s in samples]
+    return {
+        "trace": trace.name,
+        "pipeline": pipeline,
+        "events": units,
+        "bestSeconds": round(best, 6),
+        "eventsPerSec": round(units / best, 1) if best > 0 else 0.0,
+        "p50Us": round(_percentile(samples, 50) * 1e6, 2),
+        "p99Us": round(_percentile(samples, 99) * 1e6, 2),
+        "tracemallocPeakMb": round(traced_peak / (1024 * 1024), 3),
+        "peakRssMb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _run_isolated(case: str, repeat: int, traces: List[str]) -> Dict[str, Any]:
+    command = [sys.executable, __file__, "--case", case, "--repeat", str(repeat)]
+    for path in traces:
+        command += ["--trace", path]
+    completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        raise RuntimeError(f"case {case} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+# metric -> (direction, tolerance key); "higher" means larger is better
+_COMPARED = {
+    "eventsPerSec": ("higher", "time"),
+    "p99Us": ("lower", "time"),
+    "tracemallocPeakMb": ("lower", "memory"),
+    "peakRssMb": ("lower", "memory"),
+}
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerances: Dict[str, float]) -> List[str]:
+    regressions = []
+    by_case = {f"{row['trace']}/{row['pipeline']}": row for row in baseline.get("results", [])}
+    for row in results:
+        base = by_case.get(f"{row['trace']}/{row['pipeline']}")
+        if base is None:
+            continue
+        for metric, (direction, kind) in _COMPARED.items():
+            old, new = base.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if direction == "higher" else change
+            if worse > tolerances[kind]:
+                regressions.append(
+                    f"{row['trace']}/{row['pipeline']} {metric}: {old} -> {new} ({change:+.0%})"
+                )
+    return regressions
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'trace':<18} {'pipeline':<24} {'events':>8} {'events/s':>12} {'p50 us':>9} {'p99 us':>9} {'alloc MB':>9} {'RSS MB':>8}")
+    for row in results:
+        print(
+            f"{row['trace']:<18} {row['pipeline']:<24} {row['events']:>8} {row['eventsPerSec']:>12,.0f} "
+            f"{row['p50Us']:>9.1f} {row['p99Us']:>9.1f} {row['tracemallocPeakMb']:>9.2f} {row['peakRssMb']:>8.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--trace", action="append", default=[], help="recorded JSONL trace (repeatable)")
+    parser.add_argument("--only", action="append", default=[], help="trace name to run (repeatable)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--compare", action="store_true", help="exit 1 when a case regresses past tolerance")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for timing metrics")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15, help="allowed growth for memory metrics")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # The coordinator logs every turn at INFO; keep the output readable
+    logging.disable(logging.WARNING)
+
+    factories = builtin_traces()
+    for path in args.trace:
+        factories[Path(path).stem] = lambda p=Path(path): load_recorded_trace(p)
+
+    if args.case:
+        trace_name, pipeline = args.case.split(":", 1)
+        print(json.dumps(measure(factories[trace_name](), pipeline, args.repeat)))
+        return 0
+
+    names = args.only or list(factories)
+    results = [
+        _run_isolated(f"{name}:{pipeline}", args.repeat, args.trace)
+        for name in names
+        for pipeline in PIPELINES
+    ]
+    _print_table(results)
+
+    if args.save_baseline:
+        payload = {"python": sys.version.split()[0], "platform": sys.platform, "results": results}
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = compare(
+            results,
+            json.loads(args.baseline.read_text()),
+            {"time": args.tolerance, "memory": args.memory_tolerance},
+        )
+        if regressions:
+            print("REGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("  no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Backfill session rows in the sessions metadata table to the stable layout.
+
+Moves every legacy ``S#ACTIVE#`` / ``S#DELETED#`` session row to
+``SK = SESSION#{session_id}`` with SessionRecencyIndex keys (see
+``apis.shared.sessions.session_rows``). Safe to re-run and safe to run while
+the API is serving traffic. Once a dry run reports no legacy rows left,
+set ``SESSIONS_LEGACY_READS=false``.
+
+Usage (from backend/):
+    python scripts/migrate_session_rows.py [--table NAME] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from apis.shared.sessions.session_rows import backfill_session_rows  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--table",
+        default=os.environ.get("DYNAMODB_SESSIONS_METADATA_TABLE_NAME"),
+        help="sessions metadata table (default: $DYNAMODB_SESSIONS_METADATA_TABLE_NAME)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="only count legacy rows")
+    args = parser.parse_args()
+
+    if not args.table:
+        parser.error("--table or DYNAMODB_SESSIONS_METADATA_TABLE_NAME is required")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    stats = asyncio.run(backfill_session_rows(args.table, dry_run=args.dry_run))
+    print(json.dumps(stats.to_dict(), indent=2))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,15 +5,35 @@ Frozen cross-PR contract (must stay in sync with the render Lambda
 `backend/src/apis/app_api/artifacts/service.py`):
 
   Version row : PK=USER#{user_id}  SK=ARTIFACT#{aid}#V#{version:05d}
-                attrs storage="s3", content_key, content_type
+                attrs storage, content_key, content_type
+                      [, content_encoding="gzip"]
   HEAD row    : PK=USER#{user_id}  SK=ARTIFACT#{aid}#HEAD
                 + GSI1PK=SESSION#{session_id}
                 + GSI1SK=ARTIFACT#{updated_at}#{aid}   (SessionIndex)
-  S3 layout   : {user_id}/{aid}/v{n}/index.html
+                + version_index={"{version:05d}": {title, content_type,
+                  updated_at[, produced_by_message_index]}} for every
+                  version, so one SessionIndex query lists them all
+  S3 layout   : storage="s3-blob" (written now):
+                  blobs/{sha256[:2]}/{sha256}[.gz]
+                storage="s3" (legacy rows, still served):
+                  {user_id}/{aid}/v{n}/index.html
 
 Versions are immutable (no DeleteObject grant in inference-api) — an
 update writes a new version and re-points HEAD.
 
+Blobs are content-addressed: the key is the sha256 of the rendered
+body, so an unchanged re-save, a revert, or the same document written by
+another user resolves to an object that already exists. The upload is a
+conditional put (If-None-Match: *). A 412 means the bytes are already
+stored, and keys this process has written are remembered so repeats skip
+the request entirely. Bodies of at least _COMPRESS_MIN_BYTES are stored
+gzip-compressed (".gz" key, S3 ContentEncoding=gzip, row
+content_encoding="gzip") unless ARTIFACTS_COMPRESS_CONTENT=false.
+Readers decompress; the key never changes meaning, so a render token
+pinned to a version always resolves to the same bytes. Sharing a blob
+across users leaks nothing: readers only follow the content_key on a
+row under the caller's own PK.
+
 Markdown artifacts: when `content_type` is a Markdown type, the model
 authors raw Markdown but S3 stores a self-contained HTML render wrapper
 (the writer owns rendering — the render Lambda is a pass-through). The
@@ -25,10 +45,14 @@ to a `text/html` HTTP response so the browser renders the wrapper.
 from __future__ import annotations
 
 import base64
+import gzip
+import hashlib
 import html
 import logging
 import os
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -44,6 +68,18 @@ _DEFAULT_CONTENT_TYPE = "text/html; charset=utf-8"
 _RENDERED_CONTENT_TYPE = "text/html; charset=utf-8"
 _MARKDOWN_MIME_TYPES = frozenset({"text/markdown", "text/x-markdown"})
 
+_BLOB_STORAGE = "s3-blob"
+_GZIP_ENCODING = "gzip"
+# Smaller bodies gain little from gzip and cost a decompress per render.
+_COMPRESS_MIN_BYTES = 1024
+# Blob keys this process has already written (or found present).
+_MAX_KNOWN_BLOBS = 4096
+
+# Past this many versions the HEAD row stops carrying `version_index`
+# (keeps it far from the 400 KB item limit); readers then fall back to
+# querying the version rows.
+_MAX_INDEXED_VERSIONS = 400
+
 # Markdown is base64-embedded so no character ever needs HTML/JS escaping
 # and there is no second network fetch (the artifact-origin CSP sets
 # connect-src 'none'). The rendered HTML is intentionally NOT sanitized:
@@ -151,6 +187,8 @@ _cached_table: Optional[str] = None
 _ssm_client = None
 _s3_client = None
 _ddb_resource = None
+_known_blobs: "OrderedDict[str, None]" = OrderedDict()
+_known_blobs_lock = threading.Lock()
 
 
 class ArtifactError(Exception):
@@ -172,6 +210,8 @@ def _reset_caches_for_tests() -> None:
     _ssm_client = None
     _s3_client = None
     _ddb_resource = None
+    with _known_blobs_lock:
+        _known_blobs.clear()
 
 
 def _region() -> str:
@@ -237,22 +277,121 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _put_object(user_id: str, artifact_id: str, version: int,
-                content: str, content_type: str, title: str) -> str:
-    key = f"{user_id}/{artifact_id}/v{version}/index.html"
+def _compress_content() -> bool:
+    return os.environ.get("ARTIFACTS_COMPRESS_CONTENT", "true").lower() == "true"
+
+
+def _blob_known(key: str) -> bool:
+    with _known_blobs_lock:
+        if key in _known_blobs:
+            _known_blobs.move_to_end(key)
+            return True
+        return False
+
+
+def _remember_blob(key: str) -> None:
+    with _known_blobs_lock:
+        _known_blobs[key] = None
+        _known_blobs.move_to_end(key)
+        while len(_known_blobs) > _MAX_KNOWN_BLOBS:
+            _known_blobs.popitem(last=False)
+
+
+def _put_object(content: str, content_type: str, title: str) -> dict:
+    """Store the rendered body as a content-addressed blob.
+
+    Returns the version-row storage attributes (storage, content_key and,
+    when compressed, content_encoding)."""
     if _is_markdown(content_type):
         body = _wrap_markdown(title, content)
         object_content_type = _RENDERED_CONTENT_TYPE
     else:
         body = content
         object_content_type = content_type
-    _s3().put_object(
-        Bucket=_bucket_name(),
-        Key=key,
-        Body=body.encode("utf-8"),
-        ContentType=object_content_type,
-    )
-    return key
+    data = body.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    key = f"blobs/{digest[:2]}/{digest}"
+    attrs = {"storage": _BLOB_STORAGE}
+    put_kwargs: dict = {"ContentType": object_content_type}
+    if len(data) >= _COMPRESS_MIN_BYTES and _compress_content():
+        key += ".gz"
+        attrs["content_encoding"] = _GZIP_ENCODING
+        put_kwargs["ContentEncoding"] = _GZIP_ENCODING
+    attrs["content_key"] = key
+    if _blob_known(key):
+        return attrs
+
+    if "content_encoding" in attrs:
+        # mtime=0 keeps the compressed bytes a pure function of the body.
+        data = gzip.compress(data, compresslevel=6, mtime=0)
+    try:
+        _s3().put_object(
+            Bucket=_bucket_name(),
+            Key=key,
+            Body=data,
+            IfNoneMatch="*",
+            **put_kwargs,
+        )
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code", "")
+        # PreconditionFailed: already stored. ConditionalRequestConflict:
+        # a concurrent put of the same bytes is in flight.
+        if code not in ("PreconditionFailed", "ConditionalRequestConflict"):
+            raise
+    _remember_blob(key)
+    return attrs
+
+
+def _index_entry(title: str, content_type: str, updated_at: str) -> dict:
+    return {"title": title, "content_type": content_type, "updated_at": updated_at}
+
+
+def _next_version_index(
+    table, pk: str, artifact_id: str, head: dict, version: int, entry: dict
+) -> Optional[dict]:
+    """HEAD's `version_index` with `entry` added for `version`.
+
+    A HEAD written before the index existed (or with gaps) is rebuilt
+    from the version rows, so legacy artifacts pick the index up on
+    their next update. Returns None past _MAX_INDEXED_VERSIONS or when
+    the rebuild query fails; readers then fall back to the version rows.
+    """
+    if version > _MAX_INDEXED_VERSIONS:
+        return None
+    index = head.get("version_index")
+    expected = {f"{v:05d}" for v in range(1, version)}
+    if not isinstance(index, dict) or set(index) != expected:
+        index = {}
+        kwargs: dict = {
+            "KeyConditionExpression": Key("PK").eq(pk)
+            & Key("SK").begins_with(f"ARTIFACT#{artifact_id}#V#"),
+        }
+        try:
+            while True:
+                resp = table.query(**kwargs)
+                for item in resp.get("Items", []):
+                    row_entry = _index_entry(
+                        item.get("title", ""),
+                        item.get("content_type", _DEFAULT_CONTENT_TYPE),
+                        item.get("updated_at", ""),
+                    )
+                    if item.get("produced_by_message_index") is not None:
+                        row_entry["produced_by_message_index"] = item[
+                            "produced_by_message_index"
+                        ]
+                    index[f"{int(item.get('version', 0)):05d}"] = row_entry
+                last = resp.get("LastEvaluatedKey")
+                if not last:
+                    break
+                kwargs["ExclusiveStartKey"] = last
+        except ClientError as exc:
+            logger.warning(
+                "version index rebuild failed artifact=%s: %s", artifact_id, exc
+            )
+            return None
+        if set(index) != expected:
+            return None
+    return {**index, f"{version:05d}": entry}
 
 
 def create_artifact_record(
@@ -267,14 +406,11 @@ def create_artifact_record(
     version = 1
     content_type = content_type or _DEFAULT_CONTENT_TYPE
     now = _now_iso()
-    content_key = _put_object(
-        user_id, artifact_id, version, content, content_type, title
-    )
+    storage = _put_object(content, content_type, title)
 
     pk = f"USER#{user_id}"
     common = {
-        "storage": "s3",
-        "content_key": content_key,
+        **storage,
         "content_type": content_type,
         "version": version,
         "artifact_id": artifact_id,
@@ -302,6 +438,9 @@ def create_artifact_record(
                 "updated_at": now,
                 "GSI1PK": f"SESSION#{session_id}",
                 "GSI1SK": f"ARTIFACT#{now}#{artifact_id}",
+                "version_index": {
+                    f"{version:05d}": _index_entry(title, content_type, now)
+                },
             },
             ConditionExpression="attribute_not_exists(SK)",
         )
@@ -339,13 +478,10 @@ def update_artifact_record(
     title = title or head.get("title", "")
     content_type = content_type or head.get("content_type") or _DEFAULT_CONTENT_TYPE
     now = _now_iso()
-    content_key = _put_object(
-        user_id, artifact_id, version, content, content_type, title
-    )
+    storage = _put_object(content, content_type, title)
 
     common = {
-        "storage": "s3",
-        "content_key": content_key,
+        **storage,
         "content_type": content_type,
         "version": version,
         "artifact_id": artifact_id,
@@ -354,6 +490,20 @@ def update_artifact_record(
         "title": title,
         "created_at": head.get("created_at", now),
     }
+    head_item = {
+        **common,
+        "PK": pk,
+        "SK": f"ARTIFACT#{artifact_id}#HEAD",
+        "updated_at": now,
+        "GSI1PK": f"SESSION#{head.get('session_id', '')}",
+        "GSI1SK": f"ARTIFACT#{now}#{artifact_id}",
+    }
+    version_index = _next_version_index(
+        table, pk, artifact_id, head, version,
+        _index_entry(title, content_type, now),
+    )
+    if version_index is not None:
+        head_item["version_index"] = version_index
     try:
         table.put_item(
             Item={
@@ -367,14 +517,7 @@ def update_artifact_record(
         # Optimistic lock: HEAD must still be at the version we read, so
         # two concurrent updates can't silently clobber each other.
         table.put_item(
-            Item={
-                **common,
-                "PK": pk,
-                "SK": f"ARTIFACT#{artifact_id}#HEAD",
-                "updated_at": now,
-                "GSI1PK": f"SESSION#{head.get('session_id', '')}",
-                "GSI1SK": f"ARTIFACT#{now}#{artifact_id}",
-            },
+            Item=head_item,
             ConditionExpression="version = :cur",
             ExpressionAttributeValues={":cur": current},
         )
@@ -409,22 +552,46 @@ def set_produced_by_message_index(
     metadata (`initial_message_count + 2*i + 1`). That index matches the
     `idx` the messages endpoint enumerates on reload.
 
-    Best-effort: a SET on a single attribute that deliberately does not
-    touch `version`, so it can never collide with the update_artifact
-    optimistic lock. Failures are swallowed by the caller (linkage is a
-    UX nicety, never worth breaking a turn over).
+    The HEAD's `version_index` entry for this version is stamped in the
+    same update when it exists; a HEAD without one (legacy, or past
+    _MAX_INDEXED_VERSIONS) gets the plain top-level SET.
+
+    Best-effort: SETs that deliberately do not touch `version`, so they
+    can never collide with the update_artifact optimistic lock. Failures
+    are swallowed by the caller (linkage is a UX nicety, never worth
+    breaking a turn over).
     """
     table = _table()
-    for sk in (
-        f"ARTIFACT#{artifact_id}#V#{version:05d}",
-        f"ARTIFACT#{artifact_id}#HEAD",
-    ):
+    key = {"PK": f"USER#{user_id}"}
+    table.update_item(
+        Key={**key, "SK": f"ARTIFACT#{artifact_id}#V#{version:05d}"},
+        UpdateExpression="SET produced_by_message_index = :idx",
+        ExpressionAttributeValues={":idx": message_index},
+        ConditionExpression="attribute_exists(SK)",
+    )
+    head_key = {**key, "SK": f"ARTIFACT#{artifact_id}#HEAD"}
+    try:
         table.update_item(
-            Key={"PK": f"USER#{user_id}", "SK": sk},
-            UpdateExpression="SET produced_by_message_index = :idx",
+            Key=head_key,
+            UpdateExpression=(
+                "SET produced_by_message_index = :idx, "
+                "version_index.#v.produced_by_message_index = :idx"
+            ),
+            ExpressionAttributeNames={"#v": f"{version:05d}"},
             ExpressionAttributeValues={":idx": message_index},
-            ConditionExpression="attribute_exists(SK)",
+            ConditionExpression="attribute_exists(version_index.#v)",
         )
+        return
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code", "")
+        if code != "ConditionalCheckFailedException":
+            raise
+    table.update_item(
+        Key=head_key,
+        UpdateExpression="SET produced_by_message_index = :idx",
+        ExpressionAttributeValues={":idx": message_index},
+        ConditionExpression="attribute_exists(SK)",
+    )
 
 
 _SESSION_INDEX = "SessionIndex"
@@ -2,16 +2,26 @@
 
 Factory function creates a context-bound tool that downloads tabular files
 from S3, pushes them to Code Interpreter, and executes Python code for analysis.
+
+Sandboxes come from a per-chat-session pool (see ``interpreter_pool``) and
+remember which S3 objects they already hold, so follow-up analyses of an
+unchanged file skip the download, upload and XLSX conversion. Only the
+staged files carry over: a reused sandbox's kernel is cleared before each
+call, staged CSVs are re-staged if earlier code changed them, and a chart
+left by an earlier call is deleted before the new code runs.
 """
 
+import asyncio
+import base64
 import logging
 import os
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import boto3
 from strands import tool
 
+from .interpreter_pool import StagedFile, get_interpreter_pool
 from .list_spreadsheets_tool import _get_kb_files, _get_session_files
 
 logger = logging.getLogger(__name__)
@@ -52,6 +62,7 @@ if ANALYZE_WARN_FILE_SIZE_BYTES >= ANALYZE_MAX_FILE_SIZE_BYTES:
 
 _SCHEMA_MARKER = "[__SCHEMA__]"
 _SHEETS_MARKER = "[__SHEETS__]"
+_STATE_MARKER = "[__STATE__]"
 
 
 def _sanitize_sheet_name(name: str) -> str:
@@ -441,6 +452,286 @@ def _extract_schema_preview(stdout: str) -> tuple[str, str]:
     return "", stdout
 
 
+def _build_state_code(paths: Tuple[str, ...], output_filename: Optional[str] = None) -> str:
+    """Return code that reports the SHA-256 of each staged file.
+
+    Staging runs it once to record what it wrote; a warm sandbox runs it
+    again before every later call so a CSV the previous call's code
+    overwrote, truncated or deleted is re-staged instead of analyzed.
+    With ``output_filename`` it also deletes any chart a previous call left
+    behind, and reports whether that worked, so the chart read back after
+    the user code can only be one this call wrote.
+    """
+    return f"""
+import hashlib as _hashlib, os as _os
+
+def _state():
+    print({_STATE_MARKER!r})
+    for path in {list(paths)!r}:
+        if not _os.path.isfile(path):
+            print(f"digest|{{path}}|-")
+            continue
+        h = _hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        print(f"digest|{{path}}|{{h.hexdigest()}}")
+    output = {output_filename!r}
+    if output:
+        try:
+            if _os.path.lexists(output):
+                _os.remove(output)
+            print('output|cleared')
+        except Exception:
+            print('output|kept')
+    print({_STATE_MARKER!r})
+
+_state()
+del _state, _hashlib, _os
+"""
+
+
+def _parse_state(stdout: str) -> Tuple[Dict[str, str], bool]:
+    """Parse ``_build_state_code`` output into (digests by path, output cleared)."""
+    digests: Dict[str, str] = {}
+    output_cleared = False
+    parts = stdout.split(_STATE_MARKER)
+    if len(parts) < 3:
+        return digests, output_cleared
+    for line in parts[1].splitlines():
+        if line.startswith("digest|"):
+            # Split from the right: the path itself may contain "|".
+            path, _, digest = line[len("digest|"):].rpartition("|")
+            digests[path] = digest
+        elif line == "output|cleared":
+            output_cleared = True
+    return digests, output_cleared
+
+
+def _run_state_code(
+    code_interpreter: Any,
+    paths: Tuple[str, ...],
+    output_filename: Optional[str] = None,
+    clear_context: bool = False,
+) -> Tuple[Dict[str, str], bool]:
+    """Run ``_build_state_code`` in the sandbox and parse what it reported."""
+    resp = code_interpreter.invoke("executeCode", {
+        "code": _build_state_code(paths, output_filename),
+        "language": "python",
+        "clearContext": clear_context,
+    })
+    stdout = ""
+    for event in resp.get("stream", []):
+        result = event.get("result", {})
+        if result.get("isError", False):
+            return {}, False
+        stdout += result.get("structuredContent", {}).get("stdout", "")
+    return _parse_state(stdout)
+
+
+class _StagingError(Exception):
+    """Staging failed inside the sandbox; the message is user-facing."""
+
+
+def _build_bootstrap_code(stem: str, primary_csv_filename: str) -> str:
+    """Return the XLSX bootstrap that converts every sheet to its own CSV.
+
+    Iterates every sheet (capped), writes a CSV per sheet, and emits an
+    inventory the outer tool can parse. Uses read_only + values_only to
+    avoid loading full styles/formulas into memory — important for large
+    workbooks.
+    """
+    return f"""
+import base64, io, csv, re
+from openpyxl import load_workbook
+
+MAX_SHEETS = {MAX_SHEETS_TO_CONVERT}
+MAX_ROWS = {MAX_ROWS_PER_SHEET}
+STEM = {stem!r}
+PRIMARY_CSV = {primary_csv_filename!r}
+
+def _sanitize(name):
+    cleaned = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower()
+    return cleaned or 'sheet'
+
+with open('_encoded.b64', 'r') as f:
+    raw = base64.b64decode(f.read())
+
+wb = load_workbook(io.BytesIO(raw), read_only=True, data_only=True)
+all_sheets = wb.sheetnames
+total_sheets = len(all_sheets)
+sheets_to_convert = all_sheets[:MAX_SHEETS]
+skipped_sheets = all_sheets[MAX_SHEETS:]
+
+# Track which sanitized names we've used — de-duplicate if two sheet
+# names sanitize to the same token (e.g. "Q1 2026" and "q1_2026").
+used_names = set()
+def _unique(base):
+    candidate, n = base, 2
+    while candidate in used_names:
+        candidate = f"{{base}}_{{n}}"
+        n += 1
+    used_names.add(candidate)
+    return candidate
+
+# Single-sheet workbook: keep the legacy <stem>.csv filename for
+# back-compat with existing prompts/docstring examples. Multi-sheet
+# workbooks get <stem>.<sheet>.csv per sheet. The primary alias is
+# always the first sheet.
+sheet_records = []
+for idx, sheet_name in enumerate(sheets_to_convert):
+    if total_sheets == 1:
+        out_path = PRIMARY_CSV
+    else:
+        safe = _unique(_sanitize(sheet_name))
+        out_path = f"{{STEM}}.{{safe}}.csv"
+
+    ws = wb[sheet_name]
+    rows_written = 0
+    truncated = False
+    with open(out_path, 'w', newline='') as out:
+        writer = csv.writer(out)
+        for row in ws.iter_rows(values_only=True):
+            if all(cell is None for cell in row):
+                continue
+            if rows_written >= MAX_ROWS:
+                truncated = True
+                break
+            writer.writerow([str(cell) if cell is not None else '' for cell in row])
+            rows_written += 1
+
+    # Alias the first sheet of a multi-sheet workbook to the legacy
+    # <stem>.csv path too, so the single-sheet fast path and the
+    # XLSX→CSV docstring example keep working for picking "the main
+    # sheet" without needing to know its name.
+    primary_alias = None
+    if total_sheets > 1 and idx == 0:
+        try:
+            with open(out_path, 'r') as src, open(PRIMARY_CSV, 'w') as dst:
+                dst.write(src.read())
+            primary_alias = PRIMARY_CSV
+        except Exception:
+            pass
+
+    sheet_records.append({{
+        'name': sheet_name,
+        'path': out_path,
+        'rows': rows_written,
+        'truncated': truncated,
+        'primary_alias': primary_alias,
+    }})
+
+print({_SHEETS_MARKER!r})
+print(f'total: {{total_sheets}}')
+print(f'converted: {{len(sheet_records)}}')
+print(f'skipped: {{len(skipped_sheets)}}')
+if skipped_sheets:
+    _preview = skipped_sheets[:5]
+    print(f'skipped_names: {{_preview}}')
+for rec in sheet_records:
+    # Emit one record per line, pipe-delimited, so the outer parser
+    # doesn't have to evaluate arbitrary Python literals.
+    trunc = '1' if rec['truncated'] else '0'
+    alias = rec['primary_alias'] or ''
+    print(f"sheet|{{rec['name']}}|{{rec['path']}}|{{rec['rows']}}|{{trunc}}|{{alias}}")
+print({_SHEETS_MARKER!r})
+wb.close()
+"""
+
+
+def _stage_file(code_interpreter: Any, filename: str, file_bytes: bytes, is_xlsx: bool, etag: str) -> StagedFile:
+    """Push a file into the sandbox, convert XLSX, and probe its schema.
+
+    Returns the staging record the pool keeps so a repeat analysis of the
+    same object can skip all of this. Raises ``_StagingError`` when the
+    workbook can't be converted.
+    """
+    if is_xlsx:
+        # Push XLSX as base64, decode in sandbox, then convert every
+        # sheet to its own CSV (subject to defensive caps below).
+        # Model gets a full sheet inventory in the schema footer so
+        # cross-sheet aggregation works in a single analyze call.
+        b64_content = base64.b64encode(file_bytes).decode("ascii")
+        stem = os.path.splitext(filename)[0]
+        # Back-compat alias: single-sheet workbooks still expose
+        # <stem>.csv so the one-file, one-sheet fast path keeps
+        # its existing filename contract. Multi-sheet workbooks
+        # use <stem>.<sanitized_sheet>.csv per sheet.
+        primary_csv_filename = f"{stem}.csv"
+
+        code_interpreter.invoke("writeFiles", {"content": [
+            {"path": "_encoded.b64", "text": b64_content},
+        ]})
+        bootstrap_code = _build_bootstrap_code(stem, primary_csv_filename)
+        resp = code_interpreter.invoke("executeCode", {"code": bootstrap_code, "language": "python", "clearContext": False})
+        bootstrap_stdout = ""
+        for event in resp.get("stream", []):
+            result = event.get("result", {})
+            if result.get("isError", False):
+                error_msg = _clean_stderr(result.get("structuredContent", {}).get("stderr", ""))
+                raise _StagingError(f"❌ Failed to convert XLSX in sandbox:\n```\n{error_msg}\n```")
+            bootstrap_stdout += result.get("structuredContent", {}).get("stdout", "")
+
+        sheet_inventory = _parse_sheet_inventory(bootstrap_stdout)
+        if not sheet_inventory["sheets"]:
+            raise _StagingError("❌ XLSX bootstrap produced no readable sheets.")
+
+        # csv_filename is the canonical name the rest of the code
+        # path uses to probe schema and emit "load:" hints. For
+        # single-sheet or the primary alias on multi-sheet, that's
+        # <stem>.csv. For multi-sheet with no primary alias (write
+        # failure), fall back to the first converted sheet's path.
+        csv_filename = (
+            primary_csv_filename
+            if sheet_inventory["has_primary_alias"] or len(sheet_inventory["sheets"]) == 1
+            else sheet_inventory["sheets"][0]["path"]
+        )
+        multi_sheet_note = _format_sheet_note(sheet_inventory)
+        paths = tuple(dict.fromkeys(
+            [csv_filename] + [sheet["path"] for sheet in sheet_inventory["sheets"]]
+        ))
+    else:
+        # CSV — push directly as text
+        csv_filename = filename if filename.lower().endswith(".csv") else os.path.splitext(filename)[0] + ".csv"
+        multi_sheet_note = ""
+        try:
+            csv_text = file_bytes.decode("utf-8")
+        except UnicodeDecodeError:
+            csv_text = file_bytes.decode("utf-8", errors="replace")
+        code_interpreter.invoke("writeFiles", {"content": [{"path": csv_filename, "text": csv_text}]})
+        paths = (csv_filename,)
+
+    # Probe schema and fingerprint the staged files — separate exec so its
+    # output is isolated from user code.
+    schema_preview = ""
+    digests: Dict[str, str] = {}
+    try:
+        preview_resp = code_interpreter.invoke("executeCode", {
+            "code": _build_state_code(paths) + _build_preview_code(csv_filename),
+            "language": "python",
+            "clearContext": False,
+        })
+        preview_stdout = ""
+        for event in preview_resp.get("stream", []):
+            result = event.get("result", {})
+            if result.get("isError", False):
+                continue
+            preview_stdout += result.get("structuredContent", {}).get("stdout", "")
+        schema_preview, _ = _extract_schema_preview(preview_stdout)
+        digests, _ = _parse_state(preview_stdout)
+    except Exception as e:
+        logger.warning(f"Schema preview failed for {csv_filename}: {e}")
+
+    return StagedFile(
+        etag=etag,
+        csv_filename=csv_filename,
+        multi_sheet_note=multi_sheet_note,
+        schema_preview=schema_preview,
+        paths=paths,
+        digests=digests,
+    )
+
+
 def _format_size_mb(size_bytes: int) -> str:
     """Format a byte count as a human-readable MB string."""
     return f"{size_bytes / (1024 * 1024):.1f} MB"
@@ -608,195 +899,74 @@ def make_analyze_tool(
             else ""
         )
 
-        # 3. Download from S3
-        try:
-            file_bytes = _download_file(file_info)
-        except Exception as e:
-            return {"content": [{"text": f"❌ Failed to download file: {e}"}], "status": "error"}
-
-        # 4. Push file to Code Interpreter
+        # 3. Locate the file and decide whether it needs staging. If this
+        # chat session's warm sandbox already holds this exact object
+        # (same ETag), a HEAD request is all it costs; otherwise download.
         content_type = file_info.get("content_type", "")
         is_xlsx = "spreadsheetml" in content_type or filename.lower().endswith(".xlsx")
+        pool = get_interpreter_pool()
+        pool_key = (user_id, session_id)
 
-        region = os.getenv("AWS_REGION", "us-west-2")
-        code_interpreter = CodeInterpreter(region)
-
+        file_bytes: Optional[bytes] = None
         try:
-            code_interpreter.start(identifier=ci_id)
-
-            if is_xlsx:
-                # Push XLSX as base64, decode in sandbox, then convert every
-                # sheet to its own CSV (subject to defensive caps below).
-                # Model gets a full sheet inventory in the schema footer so
-                # cross-sheet aggregation works in a single analyze call.
-                import base64
-                b64_content = base64.b64encode(file_bytes).decode("ascii")
-                stem = os.path.splitext(filename)[0]
-                # Back-compat alias: single-sheet workbooks still expose
-                # <stem>.csv so the one-file, one-sheet fast path keeps
-                # its existing filename contract. Multi-sheet workbooks
-                # use <stem>.<sanitized_sheet>.csv per sheet.
-                primary_csv_filename = f"{stem}.csv"
-
-                code_interpreter.invoke("writeFiles", {"content": [
-                    {"path": "_encoded.b64", "text": b64_content},
-                ]})
-                # Bootstrap: iterate every sheet (capped), write a CSV per
-                # sheet, emit an inventory the outer tool can parse. Uses
-                # read_only + values_only to avoid loading full styles/
-                # formulas into memory — important for large workbooks.
-                bootstrap_code = f"""
-import base64, io, csv, re
-from openpyxl import load_workbook
-
-MAX_SHEETS = {MAX_SHEETS_TO_CONVERT}
-MAX_ROWS = {MAX_ROWS_PER_SHEET}
-STEM = {stem!r}
-PRIMARY_CSV = {primary_csv_filename!r}
-
-def _sanitize(name):
-    cleaned = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower()
-    return cleaned or 'sheet'
-
-with open('_encoded.b64', 'r') as f:
-    raw = base64.b64decode(f.read())
-
-wb = load_workbook(io.BytesIO(raw), read_only=True, data_only=True)
-all_sheets = wb.sheetnames
-total_sheets = len(all_sheets)
-sheets_to_convert = all_sheets[:MAX_SHEETS]
-skipped_sheets = all_sheets[MAX_SHEETS:]
-
-# Track which sanitized names we've used — de-duplicate if two sheet
-# names sanitize to the same token (e.g. "Q1 2026" and "q1_2026").
-used_names = set()
-def _unique(base):
-    candidate, n = base, 2
-    while candidate in used_names:
-        candidate = f"{{base}}_{{n}}"
-        n += 1
-    used_names.add(candidate)
-    return candidate
-
-# Single-sheet workbook: keep the legacy <stem>.csv filename for
-# back-compat with existing prompts/docstring examples. Multi-sheet
-# workbooks get <stem>.<sheet>.csv per sheet. The primary alias is
-# always the first sheet.
-sheet_records = []
-for idx, sheet_name in enumerate(sheets_to_convert):
-    if total_sheets == 1:
-        out_path = PRIMARY_CSV
-    else:
-        safe = _unique(_sanitize(sheet_name))
-        out_path = f"{{STEM}}.{{safe}}.csv"
+            file_key = _file_location(file_info)
+            if pool.staged_file(pool_key, file_key) is not None:
+                etag = await asyncio.to_thread(_file_etag, file_info)
+            else:
+                file_bytes, etag = await asyncio.to_thread(_download_file, file_info)
+        except Exception as e:
+            return {"content": [{"text": f"❌ Failed to download file: {e}"}], "status": "error"}
 
-    ws = wb[sheet_name]
-    rows_written = 0
-    truncated = False
-    with open(out_path, 'w', newline='') as out:
-        writer = csv.writer(out)
-        for row in ws.iter_rows(values_only=True):
-            if all(cell is None for cell in row):
-                continue
-            if rows_written >= MAX_ROWS:
-                truncated = True
-                break
-            writer.writerow([str(cell) if cell is not None else '' for cell in row])
-            rows_written += 1
+        # 4. Check out a sandbox and stage the file unless it's already there
+        region = os.getenv("AWS_REGION", "us-west-2")
+        lease = pool.acquire(pool_key, lambda: CodeInterpreter(region), ci_id)
+        code_interpreter = lease.client
 
-    # Alias the first sheet of a multi-sheet workbook to the legacy
-    # <stem>.csv path too, so the single-sheet fast path and the
-    # XLSX→CSV docstring example keep working for picking "the main
-    # sheet" without needing to know its name.
-    primary_alias = None
-    if total_sheets > 1 and idx == 0:
+        chart_filename = output_filename if output_filename and output_filename.endswith(".png") else None
         try:
-            with open(out_path, 'r') as src, open(PRIMARY_CSV, 'w') as dst:
-                dst.write(src.read())
-            primary_alias = PRIMARY_CSV
-        except Exception:
-            pass
-
-    sheet_records.append({{
-        'name': sheet_name,
-        'path': out_path,
-        'rows': rows_written,
-        'truncated': truncated,
-        'primary_alias': primary_alias,
-    }})
-
-print({_SHEETS_MARKER!r})
-print(f'total: {{total_sheets}}')
-print(f'converted: {{len(sheet_records)}}')
-print(f'skipped: {{len(skipped_sheets)}}')
-if skipped_sheets:
-    _preview = skipped_sheets[:5]
-    print(f'skipped_names: {{_preview}}')
-for rec in sheet_records:
-    # Emit one record per line, pipe-delimited, so the outer parser
-    # doesn't have to evaluate arbitrary Python literals.
-    trunc = '1' if rec['truncated'] else '0'
-    alias = rec['primary_alias'] or ''
-    print(f"sheet|{{rec['name']}}|{{rec['path']}}|{{rec['rows']}}|{{trunc}}|{{alias}}")
-print({_SHEETS_MARKER!r})
-wb.close()
-"""
-                resp = code_interpreter.invoke("executeCode", {"code": bootstrap_code, "language": "python", "clearContext": False})
-                bootstrap_stdout = ""
-                for event in resp.get("stream", []):
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        error_msg = _clean_stderr(result.get("structuredContent", {}).get("stderr", ""))
-                        return {"content": [{"text": f"❌ Failed to convert XLSX in sandbox:\n```\n{error_msg}\n```"}], "status": "error"}
-                    bootstrap_stdout += result.get("structuredContent", {}).get("stdout", "")
-
-                sheet_inventory = _parse_sheet_inventory(bootstrap_stdout)
-                if not sheet_inventory["sheets"]:
-                    return {
-                        "content": [{"text": "❌ XLSX bootstrap produced no readable sheets."}],
-                        "status": "error",
-                    }
-
-                # csv_filename is the canonical name the rest of the code
-                # path uses to probe schema and emit "load:" hints. For
-                # single-sheet or the primary alias on multi-sheet, that's
-                # <stem>.csv. For multi-sheet with no primary alias (write
-                # failure), fall back to the first converted sheet's path.
-                csv_filename = (
-                    primary_csv_filename
-                    if sheet_inventory["has_primary_alias"] or len(sheet_inventory["sheets"]) == 1
-                    else sheet_inventory["sheets"][0]["path"]
+            staged = lease.staged.get(file_key)
+            if staged is not None and staged.etag != etag:
+                staged = None
+            # A fresh sandbox holds nothing but what this call stages. A warm
+            # one still has the previous call's variables, any chart it wrote
+            # and whatever its code did to the staged CSVs: reset the kernel,
+            # delete the old chart and re-stage a file whose bytes no longer
+            # match what was staged.
+            chart_is_fresh = True
+            if lease.reused:
+                observed, chart_is_fresh = _run_state_code(
+                    code_interpreter,
+                    staged.paths if staged is not None else (),
+                    chart_filename,
+                    clear_context=True,
                 )
-                multi_sheet_note = _format_sheet_note(sheet_inventory)
+                if staged is not None and observed != staged.digests:
+                    logger.warning(f"📎 {filename} was modified inside the warm Code Interpreter, re-staging")
+                    staged = None
+            if staged is not None:
+                pool.record_staged_hit()
+                logger.info(f"📎 {filename} already staged in warm Code Interpreter, skipping upload")
             else:
-                # CSV — push directly as text
-                csv_filename = filename if filename.lower().endswith(".csv") else os.path.splitext(filename)[0] + ".csv"
-                multi_sheet_note = ""
+                if file_bytes is None:
+                    # Only HEAD was fetched: the warm sandbox that had it was
+                    # taken by a concurrent call, or its copy was modified
+                    try:
+                        file_bytes, etag = await asyncio.to_thread(_download_file, file_info)
+                    except Exception as e:
+                        return {"content": [{"text": f"❌ Failed to download file: {e}"}], "status": "error"}
+                lease.staged.pop(file_key, None)
                 try:
-                    csv_text = file_bytes.decode("utf-8")
-                except UnicodeDecodeError:
-                    csv_text = file_bytes.decode("utf-8", errors="replace")
-                code_interpreter.invoke("writeFiles", {"content": [{"path": csv_filename, "text": csv_text}]})
+                    staged = _stage_file(code_interpreter, filename, file_bytes, is_xlsx, etag)
+                except _StagingError as e:
+                    return {"content": [{"text": str(e)}], "status": "error"}
+                if etag:
+                    lease.staged[file_key] = staged
 
-            # 5. Probe schema — separate exec so its output is isolated from user code.
-            schema_preview = ""
-            try:
-                preview_resp = code_interpreter.invoke("executeCode", {
-                    "code": _build_preview_code(csv_filename),
-                    "language": "python",
-                    "clearContext": False,
-                })
-                preview_stdout = ""
-                for event in preview_resp.get("stream", []):
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        continue
-                    preview_stdout += result.get("structuredContent", {}).get("stdout", "")
-                schema_preview, _ = _extract_schema_preview(preview_stdout)
-            except Exception as e:
-                logger.warning(f"Schema preview failed for {csv_filename}: {e}")
-
-            # 6. Execute user code
+            csv_filename = staged.csv_filename
+            multi_sheet_note = staged.multi_sheet_note
+            schema_preview = staged.schema_preview
+
+            # 5. Execute user code
             response = code_interpreter.invoke("executeCode", {
                 "code": python_code,
                 "language": "python",
@@ -846,7 +1016,7 @@ wb.close()
                 if stdout:
                     execution_output += stdout
 
-            # 7. Download chart if requested
+            # 6. Download chart if requested
             success_text = _truncate_output(execution_output) or "✅ Code executed successfully (no output)."
             if schema_preview:
                 success_text = f"{success_text}\n\n---\nDataset: {schema_preview.splitlines()[0] if schema_preview else ''}"
@@ -855,9 +1025,9 @@ wb.close()
             if soft_warning:
                 success_text = f"{success_text}\n\n{soft_warning}"
 
-            if output_filename and output_filename.endswith(".png"):
+            if chart_filename and chart_is_fresh:
                 try:
-                    dl_response = code_interpreter.invoke("readFiles", {"paths": [output_filename]})
+                    dl_response = code_interpreter.invoke("readFiles", {"paths": [chart_filename]})
                     file_content = None
                     for event in dl_response.get("stream", []):
                         result = event.get("result", {})
@@ -881,18 +1051,24 @@ wb.close()
                             "status": "success",
                         }
                 except Exception as e:
-                    logger.warning(f"Failed to download chart {output_filename}: {e}")
+                    logger.warning(f"Failed to download chart {chart_filename}: {e}")
 
             return {
                 "content": [{"text": success_text}],
                 "status": "success",
             }
 
+        except Exception:
+            # A sandbox that raised mid-call may be gone or half-staged, so
+            # it is stopped rather than pooled. User-code errors come back as
+            # results, not exceptions, and keep the sandbox warm.
+            pool.discard(lease)
+            lease = None
+            raise
+
         finally:
-            try:
-                code_interpreter.stop()
-            except Exception:
-                pass
+            if lease is not None:
+                pool.release(lease)
 
     return analyze_spreadsheet
 
@@ -935,11 +1111,8 @@ async def _find_file(filename: str, assistant_id: Optional[str], session_id: str
     return None
 
 
-def _download_file(file_info: Dict[str, Any]) -> bytes:
-    """Download file bytes from S3."""
-    region = os.environ.get("AWS_REGION", "us-west-2")
-    s3 = boto3.client("s3", region_name=region)
-
+def _file_location(file_info: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the (bucket, key) a file record points at."""
     if file_info["source"] == "knowledge_base":
         bucket = os.environ.get("S3_ASSISTANTS_DOCUMENTS_BUCKET_NAME")
         if not bucket:
@@ -948,6 +1121,22 @@ def _download_file(file_info: Dict[str, Any]) -> bytes:
         bucket = file_info.get("s3_bucket")
         if not bucket:
             raise ValueError("S3 bucket not found in file metadata")
+    return bucket, file_info["s3_key"]
+
+
+def _s3_client():
+    region = os.environ.get("AWS_REGION", "us-west-2")
+    return boto3.client("s3", region_name=region)
+
+
+def _download_file(file_info: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Download file bytes from S3. Returns (bytes, etag)."""
+    bucket, key = _file_location(file_info)
+    response = _s3_client().get_object(Bucket=bucket, Key=key)
+    return response["Body"].read(), response.get("ETag", "")
+
 
-    response = s3.get_object(Bucket=bucket, Key=file_info["s3_key"])
-    return response["Body"].read()
+def _file_etag(file_info: Dict[str, Any]) -> str:
+    """Return the current ETag of a file without downloading it."""
+    bucket, key = _file_location(file_info)
+    return _s3_client().head_object(Bucket=bucket, Key=key).get("ETag", "")
@@ -0,0 +1,271 @@
+"""Warm Code Interpreter sessions for analyze_spreadsheet, pooled per chat session.
+
+Every analyze_spreadsheet call used to start a fresh sandbox, download the
+file, push it, run the XLSX → CSV bootstrap and stop the sandbox again, so a
+follow-up question about the same workbook paid the whole setup a second
+time (10+ seconds for a 15 MB ledger). The pool keeps one warm sandbox per
+chat session for an idle window and remembers which files are already
+staged in it, keyed by S3 location and ETag, together with what the
+staging produced (CSV name, sheet note, schema preview) and a digest of
+every staged CSV. A repeat analysis of an unchanged file skips download,
+upload, conversion and schema probe; only the files persist across calls,
+since the tool clears the kernel of a reused sandbox and re-stages any CSV
+whose digest no longer matches.
+
+Sandboxes are leased exclusively: a concurrent call in the same chat
+session gets its own sandbox rather than sharing a kernel, and when two
+come back only the most recent one stays warm. Sandboxes that sit idle past
+the window, or approach the AgentCore session timeout, are stopped by a
+background sweeper thread that runs while anything is pooled, so a chat
+that goes quiet doesn't keep its sandbox billing until the next tool call.
+
+Configuration:
+    ANALYZE_INTERPRETER_IDLE_SECONDS: how long an idle sandbox stays warm
+        (default 300; 0 stops every sandbox after use, the old behaviour)
+    ANALYZE_INTERPRETER_POOL_MAX: warm sandboxes kept per process
+        (default 32)
+    ANALYZE_INTERPRETER_SESSION_TIMEOUT_SECONDS: session timeout requested
+        from AgentCore when a sandbox starts (default 3600)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_IDLE_SECONDS = 300.0
+_DEFAULT_POOL_MAX = 32
+_DEFAULT_SESSION_TIMEOUT_SECONDS = 3600
+# Don't hand out a sandbox this close to its AgentCore session timeout
+_EXPIRY_MARGIN_SECONDS = 120.0
+# Upper bound on how long an expired sandbox waits for the sweeper
+_MAX_SWEEP_INTERVAL_SECONDS = 30.0
+
+PoolKey = Tuple[str, str]
+FileKey = Tuple[str, str]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+@dataclass
+class StagedFile:
+    """A file already written (and for XLSX, converted) inside a sandbox."""
+
+    etag: str
+    csv_filename: str
+    multi_sheet_note: str = ""
+    schema_preview: str = ""
+    # Every CSV the staging wrote, with the SHA-256 of each as written, so a
+    # later call can tell whether user code has since changed one.
+    paths: Tuple[str, ...] = ()
+    digests: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class InterpreterLease:
+    """A started sandbox checked out of the pool by one tool call."""
+
+    key: PoolKey
+    client: Any
+    started_at: float
+    last_used: float
+    staged: Dict[FileKey, StagedFile] = field(default_factory=dict)
+    reused: bool = False
+
+
+@dataclass
+class InterpreterPoolStats:
+    """Counters for pool effectiveness, exposed for logging and debugging."""
+
+    starts: int = 0
+    reuses: int = 0
+    stops: int = 0
+    staged_hits: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "starts": self.starts,
+            "reuses": self.reuses,
+            "stops": self.stops,
+            "stagedHits": self.staged_hits,
+        }
+
+
+class InterpreterPool:
+    """Idle Code Interpreter sessions keyed by (user_id, session_id)."""
+
+    def __init__(
+        self,
+        idle_seconds: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        session_timeout_seconds: Optional[int] = None,
+    ):
+        self.idle_seconds = max(
+            0.0, idle_seconds if idle_seconds is not None
+            else _env_float("ANALYZE_INTERPRETER_IDLE_SECONDS", _DEFAULT_IDLE_SECONDS)
+        )
+        self.max_sessions = max(
+            1, max_sessions if max_sessions is not None
+            else _env_int("ANALYZE_INTERPRETER_POOL_MAX", _DEFAULT_POOL_MAX)
+        )
+        self.session_timeout_seconds = (
+            session_timeout_seconds if session_timeout_seconds is not None
+            else _env_int("ANALYZE_INTERPRETER_SESSION_TIMEOUT_SECONDS", _DEFAULT_SESSION_TIMEOUT_SECONDS)
+        )
+        # Mutated from tool calls on worker threads and from the sweeper;
+        # guarded by ``_lock`` like the pool itself.
+        self.stats = InterpreterPoolStats()
+        self._idle: "OrderedDict[PoolKey, InterpreterLease]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def staged_file(self, key: PoolKey, file_key: FileKey) -> Optional[StagedFile]:
+        """Staging record for a file in the chat session's idle sandbox, if any."""
+        with self._lock:
+            lease = self._idle.get(key)
+            if lease is None or not self._is_fresh(lease, time.monotonic()):
+                return None
+            return lease.staged.get(file_key)
+
+    def acquire(self, key: PoolKey, factory: Callable[[], Any], identifier: str) -> InterpreterLease:
+        """Check out the chat session's warm sandbox, or start a new one.
+
+        ``factory`` builds an unstarted ``CodeInterpreter`` client. Blocking.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = self._sweep_locked(now)
+            lease = self._idle.pop(key, None)
+            if lease is not None:
+                self.stats.reuses += 1
+        self._stop_all(expired)
+
+        if lease is not None:
+            lease.reused = True
+            lease.last_used = now
+            logger.debug(f"Reusing warm Code Interpreter for session {key[1]}")
+            return lease
+
+        client = factory()
+        client.start(identifier=identifier, session_timeout_seconds=self.session_timeout_seconds)
+        with self._lock:
+            self.stats.starts += 1
+        return InterpreterLease(key=key, client=client, started_at=now, last_used=now)
+
+    def record_staged_hit(self) -> None:
+        """Count a call that found its file already staged in the sandbox."""
+        with self._lock:
+            self.stats.staged_hits += 1
+
+    def release(self, lease: InterpreterLease) -> None:
+        """Return a healthy sandbox to the pool (or stop it if pooling is off)."""
+        if self.idle_seconds <= 0:
+            self.discard(lease)
+            return
+
+        now = time.monotonic()
+        lease.last_used = now
+        with self._lock:
+            to_stop = self._sweep_locked(now)
+            if self._is_fresh(lease, now):
+                replaced = self._idle.pop(lease.key, None)
+                if replaced is not None:
+                    to_stop.append(replaced)
+                self._idle[lease.key] = lease
+                while len(self._idle) > self.max_sessions:
+                    to_stop.append(self._idle.popitem(last=False)[1])
+                self._ensure_sweeper_locked()
+            else:
+                to_stop.append(lease)
+        self._stop_all(to_stop)
+
+    def discard(self, lease: InterpreterLease) -> None:
+        """Stop a sandbox instead of pooling it (e.g. after a transport error)."""
+        self._stop_all([lease])
+
+    def clear(self) -> None:
+        """Stop every idle sandbox."""
+        with self._lock:
+            leases = list(self._idle.values())
+            self._idle.clear()
+        self._stop_all(leases)
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _is_fresh(self, lease: InterpreterLease, now: float) -> bool:
+        return (
+            now - lease.last_used <= self.idle_seconds
+            and now - lease.started_at < self.session_timeout_seconds - _EXPIRY_MARGIN_SECONDS
+        )
+
+    def _sweep_locked(self, now: float) -> List[InterpreterLease]:
+        expired = [k for k, lease in self._idle.items() if not self._is_fresh(lease, now)]
+        return [self._idle.pop(k) for k in expired]
+
+    def _ensure_sweeper_locked(self) -> None:
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop, name="interpreter-pool-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        """Stop expired sandboxes until the pool is empty, then exit."""
+        interval = min(self.idle_seconds / 2, _MAX_SWEEP_INTERVAL_SECONDS)
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                expired = self._sweep_locked(time.monotonic())
+                empty = not self._idle
+                if empty:
+                    # ``release`` starts a new sweeper under the same lock.
+                    self._sweeper = None
+            self._stop_all(expired)
+            if empty:
+                return
+
+    def _stop_all(self, leases: List[InterpreterLease]) -> None:
+        for lease in leases:
+            try:
+                lease.client.stop()
+            except Exception as e:
+                # JUSTIFICATION: stop is best-effort cleanup; AgentCore reaps
+                # the session at its timeout anyway.
+                logger.debug(f"Failed to stop Code Interpreter for session {lease.key[1]}: {e}")
+            with self._lock:
+                self.stats.stops += 1
+
+
+_pool: Optional[InterpreterPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_interpreter_pool() -> InterpreterPool:
+    """Process-wide Code Interpreter pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = InterpreterPool()
+    return _pool
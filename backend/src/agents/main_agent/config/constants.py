@@ -60,6 +60,10 @@ class EnvVars:
     # --- Frontend ---
     FRONTEND_URL = "FRONTEND_URL"
 
+    # --- Streaming ---
+    STREAM_COALESCE_WINDOW_MS = "STREAM_COALESCE_WINDOW_MS"
+    STREAM_COALESCE_MAX_BYTES = "STREAM_COALESCE_MAX_BYTES"
+
     # --- Runtime Context (written by StreamCoordinator) ---
     SESSION_ID = "SESSION_ID"
     USER_ID = "USER_ID"
@@ -109,6 +113,12 @@ class Defaults:
     # --- Frontend ---
     FRONTEND_URL = "http://localhost:4200"
 
+    # --- Streaming ---
+    # Token-delta coalescing is opt-in; 20 ms / 2 KB is a sensible setting
+    # when enabling it (see streaming/delta_coalescer.py).
+    STREAM_COALESCE_WINDOW_MS = 0
+    STREAM_COALESCE_MAX_BYTES = 2048
+
     # --- Gateway ---
     GATEWAY_MCP_ENABLED = True
 
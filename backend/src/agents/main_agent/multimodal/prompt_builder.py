@@ -30,7 +30,8 @@ class PromptBuilder:
 
         Args:
             message: User message text
-            files: Optional list of FileContent objects with base64 bytes
+            files: Optional list of FileContent objects with base64 bytes,
+                or ResolvedFileContent objects with raw ``data``
 
         Returns:
             str or list[ContentBlock]: Simple string or multimodal content blocks
@@ -69,6 +70,7 @@ class PromptBuilder:
 
         Args:
             file: FileContent object with content_type, filename, and base64 bytes
+                (or raw ``data`` bytes, which are used as-is)
             used_document_names: Set of already-used document names in this turn.
                 When provided, duplicate document names are made unique by appending
                 a counter suffix to prevent Bedrock ValidationException.
@@ -79,8 +81,7 @@ class PromptBuilder:
         content_type = file.content_type.lower()
         filename = file.filename.lower()
 
-        # Decode base64 to bytes
-        file_bytes = base64.b64decode(file.bytes)
+        file_bytes = self._file_bytes(file)
 
         # Check if image
         if self.image_handler.is_image(content_type, filename):
@@ -114,6 +115,14 @@ class PromptBuilder:
             logger.warning(f"Unsupported file type: {filename} ({content_type})")
             return None
 
+    @staticmethod
+    def _file_bytes(file: Any) -> bytes:
+        """Raw bytes of an attachment: ``data`` when present, else decoded base64 ``bytes``."""
+        data = getattr(file, "data", None)
+        if data is not None:
+            return data if isinstance(data, bytes) else bytes(data)
+        return base64.b64decode(file.bytes)
+
     @staticmethod
     def _unique_document_name(name: str, used_names: Set[str]) -> str:
         """Return a name that is not already in used_names.
@@ -0,0 +1,197 @@
+"""Merge runs of token deltas into fewer stream events.
+
+``process_agent_stream`` emits one ``content_block_delta`` per model token,
+and the coordinator turns each one into its own SSE frame and network write.
+``coalesce_deltas`` sits between the two and merges a run of consecutive
+text deltas for the same content block, or consecutive plain
+``reasoningText`` chunks, into one event:
+
+- The first delta of a run is passed through immediately, so time to first
+  token is unchanged.
+- Later deltas are held for at most ``window_ms`` after the first held one,
+  or until ``max_bytes`` of UTF-8 text has built up.
+- Any other event (tool use, tool input deltas, block start/stop, metadata,
+  ...) flushes held text first. Events are never reordered.
+- The raw ``event`` mirror that ``process_agent_stream`` passes through for
+  every model chunk is dropped for text and reasoning deltas, since the
+  merged event carries the same text. The web client ignores these mirrors,
+  and keeping them would still cost one frame per token.
+
+The upstream stream is drained by a single pump task, so the flush timer can
+fire while the model is between tokens. Strands attaches its tracing span
+in a context variable that has to be detached in the same context, so
+pulling each event in a fresh task would not work.
+
+Configuration:
+    STREAM_COALESCE_WINDOW_MS: how long later deltas of a run may be held
+        (default 0, which disables coalescing)
+    STREAM_COALESCE_MAX_BYTES: held text that forces an early flush
+        (default 2048)
+"""
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agents.main_agent.config.constants import Defaults, EnvVars
+
+_TEXT_DELTA_KEYS = frozenset({"contentBlockIndex", "type", "text"})
+_QUEUE_SIZE = 256
+_END = object()
+
+
+class _UpstreamError:
+    """Carries an exception raised by the upstream stream across the queue."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _HeldRun:
+    """Deltas of one run held back for a single merged event."""
+
+    def __init__(self, event: Dict[str, Any], field: str, deadline: float):
+        self.event_type = event["type"]
+        self.data = dict(event["data"])
+        self.field = field
+        self.parts: List[str] = [self.data[field]]
+        self.size = len(self.parts[0].encode("utf-8"))
+        self.deadline = deadline
+
+    def add(self, event: Dict[str, Any]) -> None:
+        text = event["data"][self.field]
+        self.parts.append(text)
+        self.size += len(text.encode("utf-8"))
+
+    def merged(self) -> Dict[str, Any]:
+        self.data[self.field] = "".join(self.parts)
+        return {"type": self.event_type, "data": self.data}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _run_key(event: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+    """Identify the run a mergeable delta belongs to; None for anything else."""
+    data = event.get("data")
+    if not isinstance(data, dict):
+        return None
+    event_type = event.get("type")
+    if event_type == "content_block_delta":
+        if data.get("type") == "text" and isinstance(data.get("text"), str) and data.keys() <= _TEXT_DELTA_KEYS:
+            return ("text", data.get("contentBlockIndex"))
+    elif event_type == "reasoning":
+        # Signatures and redacted content are separate events and must stay so
+        if data.keys() == {"reasoningText"} and isinstance(data["reasoningText"], str):
+            return ("reasoning", None)
+    return None
+
+
+def _is_delta_mirror(event: Dict[str, Any]) -> bool:
+    """A raw ``event`` pass-through of a text or reasoning model delta."""
+    if event.get("type") != "event":
+        return False
+    raw = (event.get("data") or {}).get("event")
+    if not isinstance(raw, dict):
+        return False
+    delta = (raw.get("contentBlockDelta") or {}).get("delta")
+    return isinstance(delta, dict) and ("text" in delta or "reasoningContent" in delta)
+
+
+async def _pump(events: AsyncIterator[Dict[str, Any]], queue: "asyncio.Queue[Any]") -> None:
+    try:
+        async for event in events:
+            await queue.put(event)
+    except asyncio.CancelledError:
+        raise
+    except BaseException as e:  # noqa: BLE001
+        # JUSTIFICATION: the consumer re-raises it, so callers see the
+        # same exception they would see iterating the stream directly.
+        await queue.put(_UpstreamError(e))
+        return
+    await queue.put(_END)
+
+
+async def coalesce_deltas(
+    events: AsyncIterator[Dict[str, Any]],
+    window_ms: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield ``events`` with runs of text / reasoning deltas merged.
+
+    Args:
+        events: Processed events ({"type": str, "data": dict}), e.g. from
+            ``process_agent_stream``
+        window_ms: Longest time a held delta waits (env default; <= 0 passes
+            events straight through)
+        max_bytes: Held text that triggers an immediate flush (env default)
+    """
+    if window_ms is None:
+        window_ms = _env_float(EnvVars.STREAM_COALESCE_WINDOW_MS, Defaults.STREAM_COALESCE_WINDOW_MS)
+    if max_bytes is None:
+        max_bytes = int(_env_float(EnvVars.STREAM_COALESCE_MAX_BYTES, Defaults.STREAM_COALESCE_MAX_BYTES))
+
+    if window_ms <= 0:
+        async for event in events:
+            yield event
+        return
+
+    window = window_ms / 1000
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    pump = asyncio.ensure_future(_pump(events, queue))
+    next_item: Optional["asyncio.Future[Any]"] = None
+    run_key: Optional[Tuple[str, Any]] = None
+    held: Optional[_HeldRun] = None
+
+    try:
+        while True:
+            if next_item is None:
+                next_item = asyncio.ensure_future(queue.get())
+            if held is not None:
+                done, _ = await asyncio.wait({next_item}, timeout=max(0.0, held.deadline - loop.time()))
+                if not done:
+                    yield held.merged()
+                    held = None
+                    continue
+
+            item = await next_item
+            next_item = None
+            if item is _END:
+                break
+            if isinstance(item, _UpstreamError):
+                if held is not None:
+                    yield held.merged()
+                    held = None
+                raise item.error
+
+            if _is_delta_mirror(item):
+                continue
+            key = _run_key(item)
+            if key is not None and key == run_key:
+                if held is None:
+                    field = "text" if key[0] == "text" else "reasoningText"
+                    held = _HeldRun(item, field, loop.time() + window)
+                else:
+                    held.add(item)
+                if held.size >= max_bytes:
+                    yield held.merged()
+                    held = None
+                continue
+
+            if held is not None:
+                yield held.merged()
+                held = None
+            run_key = key
+            yield item
+
+        if held is not None:
+            yield held.merged()
+    finally:
+        if next_item is not None:
+            next_item.cancel()
+        pump.cancel()
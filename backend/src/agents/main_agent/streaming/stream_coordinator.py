@@ -18,6 +18,8 @@ from apis.shared.errors import (
     build_conversational_error_event,
 )
 
+from .delta_coalescer import coalesce_deltas
+from .sse_frames import sse_frame
 from .stream_processor import process_agent_stream
 
 logger = logging.getLogger(__name__)
@@ -149,8 +151,10 @@ class StreamCoordinator:
             # Get raw agent stream
             agent_stream = agent.stream_async(prompt)
 
-            # Process through new stream processor and format as SSE
-            async for event in process_agent_stream(agent_stream):
+            # Process through new stream processor and format as SSE.
+            # Runs of token deltas are merged into fewer frames when
+            # STREAM_COALESCE_WINDOW_MS is set (pass-through otherwise).
+            async for event in coalesce_deltas(process_agent_stream(agent_stream)):
                 # Track when new assistant messages start (to associate metadata with them)
                 if event.get("type") == "message_start":
                     role = event.get("data", {}).get("role")
@@ -1469,7 +1473,7 @@ class StreamCoordinator:
             event_data = event.get("data", {})
 
             # Format as SSE with explicit event type
-            return f"event: {event_type}\ndata: {json.dumps(event_data)}\n\n"
+            return sse_frame(event_type, event_data)
         except (TypeError, ValueError) as e:
             # Fallback for non-serializable objects (should never happen with new processor)
             logger.error(f"Failed to serialize event: {e}")
@@ -66,6 +66,10 @@ class ProcessedEventDict(TypedDict):
 ProcessedEvent = ProcessedEventDict
 
 
+# Value types _serialize_object returns unchanged (exact types, not subclasses)
+_JSON_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
 def _serialize_object(obj: Any) -> Any:
     """Serialize an object to a JSON-serializable format.
 
@@ -169,6 +173,11 @@ def _create_event(event_type: str, data: Dict[str, Any]) -> ProcessedEvent:
         Standardized event dictionary with "type" and "data" keys
         Example: {"type": "delta", "data": {"content": "Hello"}}
     """
+    # Fast path: most events (token deltas above all) are built here from
+    # plain scalars, so there is nothing for the recursive walk to convert
+    if all(type(value) in _JSON_SCALAR_TYPES for value in data.values()):
+        return {"type": event_type, "data": data}
+
     # Serialize data to ensure JSON compatibility
     # This handles cases where data contains non-serializable objects
     serialized_data = _serialize_object(data)
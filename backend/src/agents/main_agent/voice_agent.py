@@ -12,11 +12,12 @@ https://github.com/aws-samples/sample-strands-agent-with-agentcore
 """
 
 import asyncio
+import base64
 import logging
 import os
 import sys
 import types
-from typing import Any, AsyncGenerator, List, Optional
+from typing import Any, AsyncGenerator, List, Optional, Union
 
 from agents.main_agent.base_agent import BaseAgent
 from agents.main_agent.config.constants import EnvVars, Defaults
@@ -188,20 +189,24 @@ class VoiceAgent(BaseAgent):
             self._create_agent()
         await self._bidi_agent.start()
 
-    async def send_audio(self, audio_base64: str, sample_rate: int = 16000) -> None:
+    async def send_audio(self, audio: Union[str, bytes], sample_rate: int = 16000) -> None:
         """
         Send audio data to the voice agent via BidiAgent.send().
 
         Args:
-            audio_base64: Base64-encoded PCM audio
+            audio: Base64-encoded PCM audio, or raw PCM bytes from a binary
+                WebSocket frame (encoded here, since the model input event
+                carries base64)
             sample_rate: Audio sample rate (default 16kHz)
         """
         if not self._bidi_agent:
             raise RuntimeError("Voice agent not started")
 
+        if isinstance(audio, (bytes, bytearray)):
+            audio = base64.b64encode(audio).decode("ascii")
         await self._bidi_agent.send({
             "type": "bidi_audio_input",
-            "audio": audio_base64,
+            "audio": audio,
             "format": "pcm",
             "sample_rate": sample_rate,
             "channels": 1,
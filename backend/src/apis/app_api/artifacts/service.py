@@ -12,11 +12,15 @@ Never log the token or the assembled URL — log identifiers only.
 from __future__ import annotations
 
 import base64
+import hashlib
 import logging
 import os
 import re
 import threading
 import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import boto3
@@ -90,7 +94,7 @@ class ArtifactTooLargeError(RenderTokenError):
 
 def _reset_caches_for_tests() -> None:
     """Drop process-wide singletons so test order can't leak a stale
-    signing key, secrets client, or DDB table handle."""
+    signing key, secrets client, DDB table handle, or cached listing."""
     global _cached_signing_key, _secrets_client, _ddb_table
     global _s3_client, _cached_bucket
     _s3_client = None
@@ -98,6 +102,8 @@ def _reset_caches_for_tests() -> None:
     _cached_signing_key = None
     _secrets_client = None
     _ddb_table = None
+    with _list_cache_lock:
+        _list_cache.clear()
 
 
 def _region() -> str:
@@ -240,19 +246,104 @@ def get_render_token_service() -> RenderTokenService:
 _SESSION_INDEX = "SessionIndex"
 
 
+# Legacy HEADs (no complete version_index) fall back to one version-row
+# query per artifact, run with at most this many in flight.
+_MAX_VERSION_QUERY_CONCURRENCY = 8
+# (user, session) listings kept; each is revalidated against the HEAD
+# rows on every request, so this only bounds memory.
+_LIST_CACHE_MAX_ENTRIES = 512
+
+_list_cache_lock = threading.Lock()
+_list_cache: "OrderedDict[tuple[str, str], tuple[tuple, list[dict]]]" = (
+    OrderedDict()
+)
+
+
+def _version_index_digest(index: object) -> Optional[str]:
+    """Stable digest of a HEAD's `version_index`. The linkage stamp
+    rewrites one version's entry without touching the HEAD's own
+    version or updated_at, so the entries have to be in the fingerprint."""
+    if not isinstance(index, dict):
+        return None
+    canonical = repr(sorted(
+        (v, sorted(entry.items()) if isinstance(entry, dict) else entry)
+        for v, entry in index.items()
+    ))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _head_fingerprint(heads: list[dict]) -> tuple:
+    """What a cached listing is valid for. create/update re-put HEAD with
+    a new version + updated_at and the linkage stamp rewrites
+    produced_by_message_index and the per-version `version_index` entry,
+    so any write to the session changes it."""
+    return tuple(
+        (
+            head.get("artifact_id"),
+            int(head.get("version", 0)),
+            head.get("updated_at", ""),
+            head.get("produced_by_message_index"),
+            _version_index_digest(head.get("version_index")),
+        )
+        for head in heads
+    )
+
+
+def _cached_listing(key: tuple[str, str], fingerprint: tuple) -> Optional[list[dict]]:
+    with _list_cache_lock:
+        entry = _list_cache.get(key)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        _list_cache.move_to_end(key)
+        return [dict(row) for row in entry[1]]
+
+
+def _store_listing(key: tuple[str, str], fingerprint: tuple, rows: list[dict]) -> None:
+    with _list_cache_lock:
+        _list_cache[key] = (fingerprint, [dict(row) for row in rows])
+        _list_cache.move_to_end(key)
+        while len(_list_cache) > _LIST_CACHE_MAX_ENTRIES:
+            _list_cache.popitem(last=False)
+
+
+def _summary(
+    artifact_id: str, version: int, source: dict, created_at: Optional[str]
+) -> dict:
+    return {
+        "artifact_id": artifact_id,
+        "version": version,
+        "title": source.get("title", ""),
+        "content_type": source.get(
+            "content_type", "text/html; charset=utf-8"
+        ),
+        "updated_at": source.get("updated_at", ""),
+        "created_at": created_at,
+        "produced_by_message_index": source.get(
+            "produced_by_message_index"
+        ),
+    }
+
+
 class ArtifactListService:
     """List every version of every artifact created in a chat session.
 
-    Two-step, because the SessionIndex GSI only projects HEAD rows (the
-    writer attaches GSI1PK/GSI1SK to the HEAD put only):
+    Query SessionIndex by GSI1PK=SESSION#{sid} for the session's HEAD
+    rows. GSI1PK is NOT user-scoped, so each HEAD row is re-checked
+    against the authenticated user's id. The index projects ALL
+    attributes, and the writer keeps a compact `version_index` (one
+    entry per version) on the HEAD row, so this single query normally
+    yields every version card.
 
-      1. Query SessionIndex by GSI1PK=SESSION#{sid} to discover the
-         artifacts in the session. GSI1PK is NOT user-scoped, so each
-         HEAD row is re-checked against the authenticated user's id.
-      2. Per artifact, query the main table by PK=USER#{uid} and
-         SK begins_with ARTIFACT#{aid}#V# for all immutable version
-         rows. PK is the authenticated user's id, so step 2 is
-         ownership-safe by construction.
+    HEADs written before the index existed, or past the writer's
+    version cap, fall back to querying the main table by PK=USER#{uid}
+    and SK begins_with ARTIFACT#{aid}#V#. Those queries run concurrently
+    with a bounded fan-out. PK is the authenticated user's id, so the
+    fallback is ownership-safe by construction.
+
+    The assembled listing is cached per (user, session) and reused only
+    while the HEAD rows are unchanged (see _head_fingerprint). The writer
+    runs in another process, so its create/update calls reach this cache
+    through the HEAD rows they rewrite.
 
     The SPA renders one card per version, anchored to the turn that
     produced it via the per-version produced_by_message_index the writer
@@ -264,6 +355,44 @@ class ArtifactListService:
     def list_for_session(
         self, *, user_id: str, session_id: str
     ) -> list[dict]:
+        heads = self._session_heads(user_id, session_id)
+        key = (user_id, session_id)
+        fingerprint = _head_fingerprint(heads)
+        cached = _cached_listing(key, fingerprint)
+        if cached is not None:
+            return cached
+
+        indexed: dict[str, list[dict]] = {}
+        missing: list[str] = []
+        for head in heads:
+            rows = self._versions_from_index(head)
+            if rows is None:
+                missing.append(head["artifact_id"])
+            else:
+                indexed[head["artifact_id"]] = rows
+        if len(missing) == 1:
+            indexed[missing[0]] = self._versions_for_artifact(
+                user_id, missing[0]
+            )
+        elif missing:
+            workers = min(_MAX_VERSION_QUERY_CONCURRENCY, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fetched = pool.map(
+                    lambda aid: self._versions_for_artifact(user_id, aid),
+                    missing,
+                )
+                indexed.update(zip(missing, fetched))
+
+        summaries: list[dict] = []
+        for head in heads:
+            summaries.extend(indexed[head["artifact_id"]])
+        _store_listing(key, fingerprint, summaries)
+        return summaries
+
+    @staticmethod
+    def _session_heads(user_id: str, session_id: str) -> list[dict]:
+        """Distinct HEAD rows in the session, newest-first, owned by the
+        caller."""
         table = _table()
         head_items: list[dict] = []
         kwargs: dict = {
@@ -286,23 +415,28 @@ class ArtifactListService:
                 "artifact list query failed"
             ) from exc
 
-        # Distinct artifact ids in the session, newest-first, owned by
-        # the caller. dict.fromkeys dedupes while preserving GSI order.
-        artifact_ids = list(
-            dict.fromkeys(
-                item.get("artifact_id", "")
-                for item in head_items
-                if item.get("user_id") == user_id
-                and item.get("artifact_id")
-            )
-        )
+        # dict.setdefault dedupes by artifact id while preserving GSI order.
+        heads: dict[str, dict] = {}
+        for item in head_items:
+            artifact_id = item.get("artifact_id")
+            if item.get("user_id") == user_id and artifact_id:
+                heads.setdefault(artifact_id, item)
+        return list(heads.values())
 
-        summaries: list[dict] = []
-        for artifact_id in artifact_ids:
-            summaries.extend(
-                self._versions_for_artifact(user_id, artifact_id)
-            )
-        return summaries
+    @staticmethod
+    def _versions_from_index(head: dict) -> Optional[list[dict]]:
+        """Version summaries from the HEAD's `version_index`, or None if
+        it is missing or doesn't cover exactly versions 1..HEAD."""
+        index = head.get("version_index")
+        if not isinstance(index, dict):
+            return None
+        head_version = int(head.get("version", 0))
+        if set(index) != {f"{v:05d}" for v in range(1, head_version + 1)}:
+            return None
+        return [
+            _summary(head["artifact_id"], int(v), index[v], head.get("created_at"))
+            for v in sorted(index)
+        ]
 
     @staticmethod
     def _versions_for_artifact(
@@ -331,19 +465,12 @@ class ArtifactListService:
             ) from exc
 
         return [
-            {
-                "artifact_id": item.get("artifact_id", ""),
-                "version": int(item.get("version", 0)),
-                "title": item.get("title", ""),
-                "content_type": item.get(
-                    "content_type", "text/html; charset=utf-8"
-                ),
-                "updated_at": item.get("updated_at", ""),
-                "created_at": item.get("created_at"),
-                "produced_by_message_index": item.get(
-                    "produced_by_message_index"
-                ),
-            }
+            _summary(
+                item.get("artifact_id", ""),
+                int(item.get("version", 0)),
+                item,
+                item.get("created_at"),
+            )
             for item in items
         ]
 
@@ -466,6 +593,20 @@ class ArtifactContentService:
         raw = obj["Body"].read(_MAX_CONTENT_BYTES + 1)
         if len(raw) > _MAX_CONTENT_BYTES:
             raise ArtifactTooLargeError("artifact too large for code view")
+        if item.get("content_encoding") == "gzip":
+            # Content-addressed blobs may be stored compressed; inflate
+            # no further than the cap.
+            inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+            try:
+                raw = inflater.decompress(raw, _MAX_CONTENT_BYTES + 1)
+            except zlib.error as exc:
+                raise ArtifactQueryError(
+                    "artifact content is not valid gzip"
+                ) from exc
+            if len(raw) > _MAX_CONTENT_BYTES:
+                raise ArtifactTooLargeError(
+                    "artifact too large for code view"
+                )
         body = raw.decode("utf-8", errors="replace")
 
         if _is_markdown(stored_type):
@@ -14,7 +14,7 @@ from fastapi.responses import StreamingResponse
 
 from apis.app_api.documents.services.document_service import list_assistant_documents
 from apis.inference_api.chat.routes import stream_conversational_message
-from apis.inference_api.chat.service import get_agent
+from apis.inference_api.chat.service import get_agent, release_agent
 from apis.shared.auth.dependencies import get_current_user_from_session
 from apis.shared.auth.models import User
 from apis.shared.errors import ErrorCode, build_conversational_error_event
@@ -492,58 +492,63 @@ async def test_chat_endpoint(assistant_id: str, request: AssistantTestChatReques
 
         # 7. Stream response using existing infrastructure
         async def stream_response():
-            # Send debug event with RAG context information
-            debug_data = {
-                "type": "rag_debug",
-                "chunk_count": len(context_chunks),
-                "chunks": [
-                    {
-                        "index": i + 1,
-                        "text": chunk.get("text", "")[:500] + ("..." if len(chunk.get("text", "")) > 500 else ""),  # Truncate to 500 chars
-                        "distance": chunk.get("distance"),
-                        "key": chunk.get("key", ""),
-                        "source": chunk.get("metadata", {}).get("source", "unknown"),
-                    }
-                    for i, chunk in enumerate(context_chunks)
-                ],
-            }
-            yield f"event: debug\ndata: {json.dumps(debug_data)}\n\n"
-
+            # Return the agent's cache lease however the stream ends, so
+            # eviction cannot clean up its MCP sessions mid-turn.
             try:
-                stream_iterator = agent.stream_async(augmented_message, session_id=session_id, files=None)
-
-                # Add timeout to prevent hanging streams
-                async with asyncio.timeout(600):  # 10 minutes
-                    async for event in stream_iterator:
+                # Send debug event with RAG context information
+                debug_data = {
+                    "type": "rag_debug",
+                    "chunk_count": len(context_chunks),
+                    "chunks": [
+                        {
+                            "index": i + 1,
+                            "text": chunk.get("text", "")[:500] + ("..." if len(chunk.get("text", "")) > 500 else ""),  # Truncate to 500 chars
+                            "distance": chunk.get("distance"),
+                            "key": chunk.get("key", ""),
+                            "source": chunk.get("metadata", {}).get("source", "unknown"),
+                        }
+                        for i, chunk in enumerate(context_chunks)
+                    ],
+                }
+                yield f"event: debug\ndata: {json.dumps(debug_data)}\n\n"
+
+                try:
+                    stream_iterator = agent.stream_async(augmented_message, session_id=session_id, files=None)
+
+                    # Add timeout to prevent hanging streams
+                    async with asyncio.timeout(600):  # 10 minutes
+                        async for event in stream_iterator:
+                            yield event
+
+                except asyncio.TimeoutError:
+                    logger.error(f"⏱️ Stream timeout for test chat session {session_id}")
+                    error_event = build_conversational_error_event(
+                        code=ErrorCode.TIMEOUT, error=Exception("Stream processing time exceeded 600 seconds"), session_id=session_id, recoverable=True
+                    )
+                    async for event in stream_conversational_message(
+                        message=error_event.message,
+                        stop_reason="error",
+                        metadata_event=error_event,
+                        session_id=session_id,
+                        user_id=user_id,
+                        user_input=request.message,
+                    ):
                         yield event
 
-            except asyncio.TimeoutError:
-                logger.error(f"⏱️ Stream timeout for test chat session {session_id}")
-                error_event = build_conversational_error_event(
-                    code=ErrorCode.TIMEOUT, error=Exception("Stream processing time exceeded 600 seconds"), session_id=session_id, recoverable=True
-                )
-                async for event in stream_conversational_message(
-                    message=error_event.message,
-                    stop_reason="error",
-                    metadata_event=error_event,
-                    session_id=session_id,
-                    user_id=user_id,
-                    user_input=request.message,
-                ):
-                    yield event
-
-            except Exception as e:
-                logger.error(f"Error during test chat streaming: {e}", exc_info=True)
-                error_event = build_conversational_error_event(code=ErrorCode.STREAM_ERROR, error=e, session_id=session_id, recoverable=True)
-                async for event in stream_conversational_message(
-                    message=error_event.message,
-                    stop_reason="error",
-                    metadata_event=error_event,
-                    session_id=session_id,
-                    user_id=user_id,
-                    user_input=request.message,
-                ):
-                    yield event
+                except Exception as e:
+                    logger.error(f"Error during test chat streaming: {e}", exc_info=True)
+                    error_event = build_conversational_error_event(code=ErrorCode.STREAM_ERROR, error=e, session_id=session_id, recoverable=True)
+                    async for event in stream_conversational_message(
+                        message=error_event.message,
+                        stop_reason="error",
+                        metadata_event=error_event,
+                        session_id=session_id,
+                        user_id=user_id,
+                        user_input=request.message,
+                    ):
+                        yield event
+            finally:
+                release_agent(agent)
 
         return StreamingResponse(
             stream_response(),
@@ -1,9 +1,9 @@
 """Proxy for the API-key authenticated Bedrock Converse endpoint.
 
-Forwards /chat/api-converse requests to the Inference API, which handles
-cost accounting, quota enforcement, and the actual Bedrock call. This
-ensures a single code path for all API-key traffic regardless of which
-URL external consumers use.
+Forwards /chat/api-converse and /chat/api-converse/batch requests to the
+Inference API, which handles cost accounting, quota enforcement, and the
+actual Bedrock call. This ensures a single code path for all API-key
+traffic regardless of which URL external consumers use.
 
 In production the Inference API lives on a separate Fargate service
 (AgentCore Runtime) reachable via INFERENCE_API_URL. Locally it defaults
@@ -17,23 +17,29 @@ import httpx
 from fastapi import APIRouter, Header, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from apis.app_api.chat.upstream import get_upstream_client
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["api-converse"])
 
 _INFERENCE_API_URL = os.environ.get("INFERENCE_API_URL", "http://localhost:8001")
 
-_PROXY_TIMEOUT_SECONDS = 300.0
-
 
 def _build_upstream_client() -> httpx.AsyncClient:
-    """Single seam where the proxy's upstream client is constructed.
+    """Single seam where the proxy's upstream client is obtained.
 
-    Tests substitute a MockTransport-backed client here without having to
-    monkey-patch the global `httpx.AsyncClient` symbol — which would also
-    intercept any test-side httpx clients running in the same process.
+    Returns the process-wide pooled client (see `upstream`), so the handler
+    must close only its response, never the client. Tests substitute a
+    MockTransport-backed client here without having to monkey-patch the
+    global `httpx.AsyncClient` symbol — which would also intercept any
+    test-side httpx clients running in the same process.
     """
-    return httpx.AsyncClient(timeout=httpx.Timeout(_PROXY_TIMEOUT_SECONDS))
+    return get_upstream_client()
+
+
+# Upstream content types relayed chunk by chunk instead of read in full
+_STREAMED_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
 
 
 @router.post(
@@ -55,7 +61,28 @@ async def api_converse_proxy(
     and response (including SSE streams) so that external consumers can
     use the App API URL for everything.
     """
-    target_url = f"{_INFERENCE_API_URL}/chat/api-converse"
+    return await _relay(request, x_api_key, "/chat/api-converse")
+
+
+@router.post(
+    "/api-converse/batch",
+    summary="Run many converse prompts via API key (proxied to Inference API)",
+    responses={
+        401: {"description": "Invalid or expired API key"},
+        502: {"description": "Inference API unreachable"},
+    },
+)
+async def api_converse_batch_proxy(
+    request: Request,
+    x_api_key: str = Header(..., alias="X-API-Key"),
+):
+    """Relay a batch request; per-item NDJSON / SSE lines stream through."""
+    return await _relay(request, x_api_key, "/chat/api-converse/batch")
+
+
+async def _relay(request: Request, x_api_key: str, path: str):
+    """Forward one API-key request to the Inference API and relay its response."""
+    target_url = f"{_INFERENCE_API_URL}{path}"
     body = await request.body()
 
     headers = {
@@ -63,15 +90,16 @@ async def api_converse_proxy(
         "X-API-Key": x_api_key,
     }
 
-    logger.info(f"Proxying api-converse to {target_url}")
+    logger.info(f"Proxying {path} to {target_url}")
 
-    # The client lifecycle must outlive this handler — closing it via
+    # The response lifecycle must outlive this handler — closing it via
     # `async with` while a stream is in flight makes httpx drain the upstream
     # response during `__aexit__`, buffering the entire SSE stream before
-    # headers reach the browser. Open the client manually and tie its
+    # headers reach the browser. Open the response manually and tie its
     # cleanup to the streaming generator's `finally` (or to the early-exit
     # paths below) so headers can flush as soon as the upstream's first
-    # response message arrives.
+    # response message arrives. Closing the response hands the connection
+    # back to the shared pool; the client itself stays open.
     client = _build_upstream_client()
     try:
         response = await client.send(
@@ -79,15 +107,12 @@ async def api_converse_proxy(
             stream=True,
         )
     except httpx.ConnectError:
-        await client.aclose()
         logger.error(f"Cannot reach Inference API at {target_url}")
         raise HTTPException(status_code=502, detail="Inference API is unreachable")
     except httpx.TimeoutException:
-        await client.aclose()
         logger.error(f"Inference API request timed out: {target_url}")
         raise HTTPException(status_code=504, detail="Inference API request timed out")
     except Exception as exc:
-        await client.aclose()
         logger.error(f"Proxy error: {exc}", exc_info=True)
         raise HTTPException(
             status_code=502,
@@ -99,25 +124,24 @@ async def api_converse_proxy(
             error_body = await response.aread()
         finally:
             await response.aclose()
-            await client.aclose()
         raise HTTPException(
             status_code=response.status_code,
             detail=error_body.decode("utf-8", errors="replace"),
         )
 
     content_type = response.headers.get("content-type", "")
-    if "text/event-stream" in content_type:
+    streamed_type = next((t for t in _STREAMED_CONTENT_TYPES if t in content_type), None)
+    if streamed_type is not None:
         async def stream_relay():
             try:
                 async for chunk in response.aiter_bytes():
                     yield chunk
             finally:
                 await response.aclose()
-                await client.aclose()
 
         return StreamingResponse(
             stream_relay(),
-            media_type="text/event-stream",
+            media_type=streamed_type,
             headers={
                 "Cache-Control": "no-cache",
                 "X-Accel-Buffering": "no",
@@ -128,7 +152,6 @@ async def api_converse_proxy(
         response_body = await response.aread()
     finally:
         await response.aclose()
-        await client.aclose()
     return StreamingResponse(
         iter([response_body]),
         media_type=content_type or "application/json",
@@ -23,6 +23,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from urllib.parse import quote, urlsplit
 
+from apis.app_api.chat.upstream import get_upstream_client
 from apis.shared.auth.dependencies import get_current_user_from_session
 from apis.shared.auth.models import User
 
@@ -33,9 +34,6 @@ router = APIRouter(prefix="/chat", tags=["bff-chat-proxy"])
 def _inference_api_url() -> str:
     return os.environ.get("INFERENCE_API_URL", "http://localhost:8001")
 
-# Long enough to cover a full agent turn (model + tool calls), bounded so a
-# wedged upstream eventually surfaces.
-_PROXY_TIMEOUT_SECONDS = 300.0
 
 
 def _build_invocations_url(base_url: str) -> str:
@@ -63,13 +61,15 @@ def _build_invocations_url(base_url: str) -> str:
 
 
 def _build_upstream_client() -> httpx.AsyncClient:
-    """Single seam where the proxy's upstream client is constructed.
+    """Single seam where the proxy's upstream client is obtained.
 
-    Tests substitute a MockTransport-backed client here without having to
-    monkey-patch the global `httpx.AsyncClient` symbol — which would also
-    intercept any test-side httpx clients running in the same process.
+    Returns the process-wide pooled client (see `upstream`), so the handler
+    must close only its response, never the client. Tests substitute a
+    MockTransport-backed client here without having to monkey-patch the
+    global `httpx.AsyncClient` symbol — which would also intercept any
+    test-side httpx clients running in the same process.
     """
-    return httpx.AsyncClient(timeout=httpx.Timeout(_PROXY_TIMEOUT_SECONDS))
+    return get_upstream_client()
 
 
 async def chat_stream(
@@ -103,13 +103,14 @@ async def chat_stream(
     if forwarded_callback:
         headers["OAuth2CallbackUrl"] = forwarded_callback
 
-    # The client lifecycle must outlive this handler — closing it via
+    # The response lifecycle must outlive this handler — closing it via
     # `async with` while a stream is in flight makes httpx drain the upstream
     # response during `__aexit__`, buffering the entire SSE stream before
-    # headers reach the browser. Open the client manually and tie its
+    # headers reach the browser. Open the response manually and tie its
     # cleanup to the streaming generator's `finally` (or to the early-exit
     # paths below) so headers can flush as soon as the upstream's first
-    # response message arrives.
+    # response message arrives. Closing the response hands the connection
+    # back to the shared pool; the client itself stays open.
     client = _build_upstream_client()
     try:
         response = await client.send(
@@ -117,15 +118,12 @@ async def chat_stream(
             stream=True,
         )
     except httpx.ConnectError:
-        await client.aclose()
         logger.error(f"Cannot reach Inference API at {target_url}")
         raise HTTPException(status_code=502, detail="Inference API is unreachable")
     except httpx.TimeoutException:
-        await client.aclose()
         logger.error(f"Inference API request timed out: {target_url}")
         raise HTTPException(status_code=504, detail="Inference API request timed out")
     except Exception as exc:
-        await client.aclose()
         logger.error(f"BFF chat proxy error: {exc}", exc_info=True)
         raise HTTPException(
             status_code=502,
@@ -137,7 +135,6 @@ async def chat_stream(
             error_body = await response.aread()
         finally:
             await response.aclose()
-            await client.aclose()
         raise HTTPException(
             status_code=response.status_code,
             detail=error_body.decode("utf-8", errors="replace"),
@@ -151,7 +148,6 @@ async def chat_stream(
                     yield chunk
             finally:
                 await response.aclose()
-                await client.aclose()
 
         return StreamingResponse(
             stream_relay(),
@@ -166,7 +162,6 @@ async def chat_stream(
         response_body = await response.aread()
     finally:
         await response.aclose()
-        await client.aclose()
     return StreamingResponse(
         iter([response_body]),
         media_type=content_type or "application/json",
@@ -0,0 +1,139 @@
+"""Shared upstream HTTP client for the chat proxies.
+
+`/chat/stream` and `/chat/api-converse` both relay to inference-api. A
+client per request meant a fresh TCP + TLS handshake to the runtime on
+every turn, paid before the first token could flow. Instead one
+`httpx.AsyncClient` is opened in the app_api lifespan and shared by every
+proxy route, so connections to the runtime are kept alive and reused.
+
+Routes must never close the shared client. They close only their
+`httpx.Response`, which returns a fully read connection to the pool. A
+connection whose stream was cut short (browser disconnect, cancellation)
+is discarded rather than reused.
+
+An httpx client is bound to the event loop it first runs on. If no
+lifespan ran (scripts, tests) or the loop has changed, `get_upstream_client`
+lazily builds a client for the current loop.
+
+The client is shared by every user, so it must not keep a cookie jar: a
+`Set-Cookie` from the runtime or a load balancer (a sticky-session cookie,
+say) would otherwise be replayed on everyone's relayed requests. Its jar
+refuses every cookie.
+
+Every proxied request goes to the one inference-api host, so the pool
+limits below are effectively per-host limits. A relayed stream holds its
+connection for the whole agent turn, so a connection cap is really a cap
+on concurrent chats. By default the pool is therefore unbounded and a
+request never fails waiting for a connection. Keepalive still bounds how
+many idle connections are kept for reuse.
+
+Configuration:
+    UPSTREAM_HTTP_MAX_CONNECTIONS: open connections to the runtime
+        (default unbounded; unset or <= 0 means no cap)
+    UPSTREAM_HTTP_MAX_KEEPALIVE: idle connections kept for reuse (default 20)
+    UPSTREAM_HTTP_KEEPALIVE_EXPIRY_SECONDS: how long an idle connection is
+        kept (default 30)
+    UPSTREAM_HTTP_POOL_TIMEOUT_SECONDS: wait for a free connection before
+        the request fails with 504, only meaningful with a connection cap
+        (default: wait; unset or <= 0 means no timeout)
+    UPSTREAM_HTTP2: "true" multiplexes requests over HTTP/2 when the runtime
+        speaks it (default false; requires the `h2` package)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Long enough to cover a full agent turn (model + tool calls), bounded so a
+# wedged upstream eventually surfaces.
+PROXY_TIMEOUT_SECONDS = 300.0
+_CONNECT_TIMEOUT_SECONDS = 10.0
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_limit(name: str) -> Optional[float]:
+    """A positive number from the environment, or None (no limit) when the
+    variable is unset, unparseable or <= 0."""
+    value = _env_float(name, 0.0)
+    return value if value > 0 else None
+
+
+def _http2_enabled() -> bool:
+    if os.environ.get("UPSTREAM_HTTP2", "").lower() != "true":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("UPSTREAM_HTTP2=true but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def build_upstream_client() -> httpx.AsyncClient:
+    """Construct a pooled client from the environment configuration."""
+    max_connections = _env_limit("UPSTREAM_HTTP_MAX_CONNECTIONS")
+    limits = httpx.Limits(
+        max_connections=int(max_connections) if max_connections is not None else None,
+        max_keepalive_connections=_env_int("UPSTREAM_HTTP_MAX_KEEPALIVE", 20),
+        keepalive_expiry=_env_float("UPSTREAM_HTTP_KEEPALIVE_EXPIRY_SECONDS", 30.0),
+    )
+    timeout = httpx.Timeout(
+        PROXY_TIMEOUT_SECONDS,
+        connect=_CONNECT_TIMEOUT_SECONDS,
+        pool=_env_limit("UPSTREAM_HTTP_POOL_TIMEOUT_SECONDS"),
+    )
+    http2 = _http2_enabled()
+    logger.info(
+        "Upstream chat client: max_connections=%s keepalive=%s http2=%s",
+        limits.max_connections, limits.max_keepalive_connections, http2,
+    )
+    # An empty allow-list blocks every domain, so nothing is ever stored
+    cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2, cookies=cookies)
+
+
+def get_upstream_client() -> httpx.AsyncClient:
+    """Return the shared client, building one for the running loop if needed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = build_upstream_client()
+        _client_loop = loop
+    return _client
+
+
+async def start_upstream_client() -> None:
+    """Open the shared client at app startup."""
+    get_upstream_client()
+
+
+async def close_upstream_client() -> None:
+    """Close the shared client and its pooled connections at shutdown."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
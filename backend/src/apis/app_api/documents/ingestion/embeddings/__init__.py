@@ -6,6 +6,7 @@ Re-exports are provided for Lambda handler compatibility.
 """
 
 from .bedrock_embeddings import (
+    embed_and_store,
     generate_embeddings,
     store_embeddings_in_s3,
     search_assistant_knowledgebase,
@@ -13,6 +14,7 @@ from .bedrock_embeddings import (
 )
 
 __all__ = [
+    "embed_and_store",
     "generate_embeddings",
     "store_embeddings_in_s3",
     "search_assistant_knowledgebase",
@@ -16,17 +16,21 @@ from typing import List
 # Re-export shared functions for Lambda handler compatibility.
 # The handler imports from embeddings.bedrock_embeddings (Lambda task root path).
 from apis.shared.embeddings.bedrock_embeddings import (  # noqa: F401
+    embed_and_store,
     generate_embeddings,
     store_embeddings_in_s3,
     search_assistant_knowledgebase,
 )
+from apis.shared.embeddings.lexical_index import store_lexical_segment  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "embed_and_store",
     "generate_embeddings",
     "store_embeddings_in_s3",
     "search_assistant_knowledgebase",
+    "store_lexical_segment",
     "validate_and_split_chunks",
     "_validate_and_split_chunks",
 ]
@@ -17,6 +17,7 @@ print("DEBUG: Imported os")
 import asyncio
 
 print("DEBUG: Imported asyncio")
+import time
 from typing import Any, Dict, Optional
 
 # Set environment variables for model caching BEFORE importing other modules
@@ -46,6 +47,9 @@ if len(logging.getLogger().handlers) > 0:
 else:
     logging.basicConfig(level=logging.INFO)
 
+# Minimum gap between "embedding N/M" status writes during vector upload
+EMBEDDING_PROGRESS_INTERVAL_SECONDS = 2.0
+
 
 def _get_mime_type_from_extension(filename: str) -> Optional[str]:
     """
@@ -226,7 +230,7 @@ async def _process_document_pipeline(bucket: str, key: str, assistant_id: str, d
     Execute the full document processing pipeline
     """
     import boto3
-    from embeddings.bedrock_embeddings import generate_embeddings, store_embeddings_in_s3, validate_and_split_chunks
+    from embeddings.bedrock_embeddings import embed_and_store, store_lexical_segment, validate_and_split_chunks
     from processors import is_docling_supported, process_with_docling
 
     # 1. Download document from S3r
@@ -284,22 +288,56 @@ async def _process_document_pipeline(bucket: str, key: str, assistant_id: str, d
 
     logger.info(f"Docling produced {len(chunks)} layout-aware chunks. Skipping recursive splitter.")
 
+    # 4. Validate token counts and split oversized chunks. Done before the
+    # status update so chunkCount matches the number of vectors stored.
+    chunks = validate_and_split_chunks(chunks)
+
     # Update status to 'embedding' with chunk count
     await status_manager.mark_embedding(assistant_id=assistant_id, document_id=document_id, chunk_count=len(chunks))
 
-    # 4. Validate token counts and split oversized chunks, then generate embeddings
-    chunks = validate_and_split_chunks(chunks)
-    embeddings = await generate_embeddings(chunks)
-    logger.info(f"Embeddings generated for {len(embeddings)} chunks")
-
-    # 5. Store in vector store
-    await store_embeddings_in_s3(assistant_id, document_id, chunks, embeddings, {"filename": filename, "s3_key": key})
+    # Report "embedding N/M" at most every few seconds (plus the final count)
+    # rather than once per put_vectors batch.
+    last_progress_at = 0.0
+
+    async def update_embedding_progress(embedded: int, stored: int, total: int) -> None:
+        nonlocal last_progress_at
+        now = time.monotonic()
+        if stored < total and now - last_progress_at < EMBEDDING_PROGRESS_INTERVAL_SECONDS:
+            return
+        last_progress_at = now
+        await status_manager.update_embedding_progress(assistant_id=assistant_id, document_id=document_id, embedded_count=stored)
+
+    # 5. Generate embeddings and store them in the vector store, pipelined so
+    # finished batches upload while later ones are still being embedded
+    await embed_and_store(
+        assistant_id,
+        document_id,
+        chunks,
+        {"filename": filename, "s3_key": key},
+        progress_callback=update_embedding_progress,
+    )
+    logger.info(f"Embeddings generated and stored for {len(chunks)} chunks")
+
+    # 6. Build the lexical (BM25) index segment from the same chunks for
+    # hybrid retrieval
+    lexical_index_key = None
+    try:
+        lexical_index_key = await store_lexical_segment(assistant_id, document_id, chunks)
+    except Exception as e:
+        # JUSTIFICATION: the lexical index only adds recall on top of vector
+        # search; a document without one is still fully searchable by vector.
+        logger.warning(f"Failed to store lexical index for {document_id}: {e}", exc_info=True)
 
     # Get vector store identifier
     vector_store_id = os.environ.get("VECTOR_STORE_INDEX_NAME", "assistants-index")
 
     # Update status to 'complete'
-    await status_manager.mark_complete(assistant_id=assistant_id, document_id=document_id, vector_store_id=vector_store_id)
+    await status_manager.mark_complete(
+        assistant_id=assistant_id,
+        document_id=document_id,
+        vector_store_id=vector_store_id,
+        lexical_index_key=lexical_index_key,
+    )
     logger.info("Embeddings stored, processing complete")
 
     # Test s3vector dump (Optional debugging)
@@ -3,12 +3,23 @@
 Bypasses Docling for CSV files, using row-based chunking that preserves
 the header row in every chunk. This prevents the token-limit overflow
 that occurs when Docling treats the entire CSV as a single table structure.
+
+Chunking is a single streaming pass: each row is serialized and tokenized
+once, and the chunk's token count is kept as a running sum instead of
+re-encoding the whole candidate chunk for every row. The sum is exact, not
+an estimate — cl100k_base pre-tokenization always splits right after a
+row's ``\\r\\n`` terminator when the next row has visible content, and BPE
+never merges across those splits. The one correction needed is for the
+last row of a chunk, whose terminator (and trailing whitespace) is
+stripped from the emitted text, so it is counted separately. Rows that are
+empty or whitespace-only *can* merge with neighbouring terminators; for
+those the candidate chunk is re-tokenized in full, as before.
 """
 
 import csv
 import io
 import logging
-from typing import List
+from typing import Iterator, List
 
 import tiktoken
 
@@ -17,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Module-level encoder (lazy-loaded)
 _encoder: tiktoken.Encoding | None = None
 
+# csv.writer's default line terminator
+_ROW_TERMINATOR = "\r\n"
+
 
 def _get_encoder() -> tiktoken.Encoding:
     global _encoder
@@ -47,18 +61,34 @@ def _rows_to_csv_text(header_row: List[str], data_rows: List[List[str]]) -> str:
     return buf.getvalue().strip()
 
 
-def chunk_csv(file_bytes: bytes, max_tokens: int = 900) -> List[str]:
+class _RowSerializer:
+    """Serializes single rows with one reusable csv.writer/StringIO pair."""
+
+    def __init__(self) -> None:
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def line(self, row: List[str]) -> str:
+        """Return the row as CSV text, including its ``\\r\\n`` terminator."""
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._writer.writerow(row)
+        return self._buf.getvalue()
+
+
+def iter_csv_chunks(file_bytes: bytes, max_tokens: int = 900) -> Iterator[str]:
     """
-    Chunk a CSV file into token-bounded pieces, each starting with the header row.
+    Stream token-bounded CSV chunks, each starting with the header row.
+
+    Produces exactly the chunks ``chunk_csv`` returns, one at a time, in
+    time linear in the size of the file.
 
     Args:
         file_bytes: Raw CSV file content.
-        max_tokens: Maximum token count per chunk (default 900, well under
-                    the Titan v2 8192 limit to leave room for embedding overhead).
+        max_tokens: Maximum token count per chunk.
 
-    Returns:
-        List of CSV text chunks, each containing the header + a subset of rows.
-        Returns empty list for empty or header-only CSVs.
+    Yields:
+        CSV text chunks, each containing the header + a subset of rows.
     """
     try:
         text = file_bytes.decode("utf-8")
@@ -72,52 +102,135 @@ def chunk_csv(file_bytes: bytes, max_tokens: int = 900) -> List[str]:
         header_row = next(reader)
     except StopIteration:
         logger.info("Empty CSV file, returning no chunks")
-        return []
+        return
 
-    header_text = _rows_to_csv_text(header_row, [])
+    serializer = _RowSerializer()
+    header_line = serializer.line(header_row)
+    header_text = header_line.strip()
     header_tokens = _count_tokens(header_text)
 
     if header_tokens >= max_tokens:
         # Header alone exceeds limit — truncate it and return as single chunk
         logger.warning(f"CSV header alone is {header_tokens} tokens (limit {max_tokens}), truncating")
-        return [_truncate_to_tokens(header_text, max_tokens)]
+        yield _truncate_to_tokens(header_text, max_tokens)
+        return
 
-    chunks: List[str] = []
-    current_rows: List[List[str]] = []
+    if not header_text:
+        # A blank header gets stripped together with the start of the first
+        # row, so per-row counts don't line up; fall back to whole-chunk counts.
+        yield from _iter_csv_chunks_exact(header_row, reader, max_tokens)
+        return
+
+    # Chunk prefix = the header line with its leading whitespace stripped.
+    # Everything after it is whole row lines, so its token count is
+    # header_unit_tokens + the sum of each row line's own token count.
+    header_prefix = header_line.lstrip()
+    header_unit_tokens = _count_tokens(header_prefix)
+
+    current_lines: List[str] = []
+    # Tokens of the header prefix + every accumulated row line, terminators
+    # included (i.e. the chunk text before the final strip()).
+    prefix_tokens = header_unit_tokens
+
+    def chunk_text() -> str:
+        return (header_prefix + "".join(current_lines)).strip()
 
     for row in reader:
-        # Try adding this row and check the full assembled chunk token count.
-        # This accounts for CSV delimiters (\r\n) that row-level estimates miss.
-        candidate_rows = current_rows + [row]
-        candidate_text = _rows_to_csv_text(header_row, candidate_rows)
-        candidate_tokens = _count_tokens(candidate_text)
+        line = serializer.line(row)
+        stripped_line = line.rstrip()
+
+        if stripped_line.lstrip():
+            regular = True
+            # The emitted chunk drops this row's terminator and trailing
+            # whitespace when it is the last row, so count that form too.
+            tail_tokens = _count_tokens(stripped_line)
+            candidate_tokens = prefix_tokens + tail_tokens
+        else:
+            # Empty / whitespace-only row: merges with the surrounding
+            # terminators, so count the assembled candidate directly.
+            regular = False
+            candidate_tokens = _count_tokens((header_prefix + "".join(current_lines) + line).strip())
 
         if candidate_tokens <= max_tokens:
             # Fits — accumulate
-            current_rows = candidate_rows
+            current_lines.append(line)
+            prefix_tokens = (
+                prefix_tokens + _count_tokens(line) if regular
+                else _count_tokens(header_prefix + "".join(current_lines))
+            )
             continue
 
         # Doesn't fit. First, flush what we have so far.
-        if current_rows:
-            chunks.append(_rows_to_csv_text(header_row, current_rows))
-            current_rows = []
+        if current_lines:
+            yield chunk_text()
+            current_lines = []
+            prefix_tokens = header_unit_tokens
 
         # Check if this single row + header fits
-        single_text = _rows_to_csv_text(header_row, [row])
-        single_tokens = _count_tokens(single_text)
+        single_tokens = (
+            header_unit_tokens + tail_tokens if regular
+            else _count_tokens((header_prefix + line).strip())
+        )
 
         if single_tokens <= max_tokens:
             # Start a new chunk with this row
-            current_rows = [row]
+            current_lines.append(line)
+            prefix_tokens = (
+                header_unit_tokens + _count_tokens(line) if regular
+                else _count_tokens(header_prefix + line)
+            )
         else:
             # Oversized row — truncate to fit within max_tokens
-            truncated_text = _truncate_to_tokens(single_text, max_tokens)
-            chunks.append(truncated_text)
+            single_text = (header_prefix + line).strip()
+            yield _truncate_to_tokens(single_text, max_tokens)
             logger.warning(f"Truncated oversized CSV row from {single_tokens} to {max_tokens} tokens")
 
     # Emit final chunk
+    if current_lines:
+        yield chunk_text()
+
+
+def _iter_csv_chunks_exact(
+    header_row: List[str], reader: Iterator[List[str]], max_tokens: int
+) -> Iterator[str]:
+    """Row-by-row chunking that re-tokenizes every candidate chunk in full."""
+    current_rows: List[List[str]] = []
+
+    for row in reader:
+        current_rows.append(row)
+        if _count_tokens(_rows_to_csv_text(header_row, current_rows)) <= max_tokens:
+            continue
+        current_rows.pop()
+
+        if current_rows:
+            yield _rows_to_csv_text(header_row, current_rows)
+            current_rows = []
+
+        single_text = _rows_to_csv_text(header_row, [row])
+        single_tokens = _count_tokens(single_text)
+        if single_tokens <= max_tokens:
+            current_rows = [row]
+        else:
+            yield _truncate_to_tokens(single_text, max_tokens)
+            logger.warning(f"Truncated oversized CSV row from {single_tokens} to {max_tokens} tokens")
+
     if current_rows:
-        chunks.append(_rows_to_csv_text(header_row, current_rows))
+        yield _rows_to_csv_text(header_row, current_rows)
+
 
+def chunk_csv(file_bytes: bytes, max_tokens: int = 900) -> List[str]:
+    """
+    Chunk a CSV file into token-bounded pieces, each starting with the header row.
+
+    Args:
+        file_bytes: Raw CSV file content.
+        max_tokens: Maximum token count per chunk (default 900, well under
+                    the Titan v2 8192 limit to leave room for embedding overhead).
+
+    Returns:
+        List of CSV text chunks, each containing the header + a subset of rows.
+        Returns empty list for empty or header-only CSVs.
+    """
+    chunks = list(iter_csv_chunks(file_bytes, max_tokens=max_tokens))
     logger.info(f"CSV chunked into {len(chunks)} pieces (max_tokens={max_tokens})")
     return chunks
@@ -25,8 +25,10 @@ async def update_document_status(
     table_name: str,
     vector_store_id: Optional[str] = None,
     chunk_count: Optional[int] = None,
+    embedded_count: Optional[int] = None,
     error_message: Optional[str] = None,
     error_details: Optional[str] = None,
+    lexical_index_key: Optional[str] = None,
 ) -> bool:
     """
     Standalone version of update_document_status for ingestion pipeline.
@@ -61,10 +63,22 @@ async def update_document_status(
         set_parts.append("chunkCount = :chunk_count")
         expression_attribute_values[":chunk_count"] = chunk_count
     
+    if embedded_count is not None:
+        set_parts.append("embeddedCount = :embedded_count")
+        expression_attribute_values[":embedded_count"] = embedded_count
+    
     if vector_store_id is not None:
         set_parts.append("vectorStoreId = :vector_store_id")
         expression_attribute_values[":vector_store_id"] = vector_store_id
     
+    if lexical_index_key is not None:
+        set_parts.append("lexicalIndexKey = :lexical_index_key")
+        expression_attribute_values[":lexical_index_key"] = lexical_index_key
+    elif status == 'complete':
+        # A re-ingest that stored no segment must not leave the previous
+        # one attached to the document
+        remove_attributes.append("lexicalIndexKey")
+    
     # Handle error fields
     if status == 'failed':
         if error_message is not None:
@@ -198,7 +212,7 @@ class DocumentStatusManager:
             assistant_id: Parent assistant identifier
             document_id: Document identifier
             new_status: New processing status
-            **kwargs: Additional fields to update (chunk_count, vector_store_id, error_message, error_details)
+            **kwargs: Additional fields to update (chunk_count, embedded_count, vector_store_id, lexical_index_key, error_message, error_details)
         
         Returns:
             True if update succeeded, False otherwise
@@ -259,11 +273,36 @@ class DocumentStatusManager:
             chunk_count=chunk_count
         )
     
+    async def update_embedding_progress(
+        self,
+        assistant_id: str,
+        document_id: str,
+        embedded_count: int
+    ) -> bool:
+        """
+        Record how many chunks have been embedded and stored so far
+        
+        Args:
+            assistant_id: Parent assistant identifier
+            document_id: Document identifier
+            embedded_count: Chunks whose vectors are in the vector store
+        
+        Returns:
+            True if update succeeded, False otherwise
+        """
+        return await self.update_status(
+            assistant_id,
+            document_id,
+            'embedding',
+            embedded_count=embedded_count
+        )
+    
     async def mark_complete(
         self,
         assistant_id: str,
         document_id: str,
-        vector_store_id: str
+        vector_store_id: str,
+        lexical_index_key: Optional[str] = None
     ) -> bool:
         """
         Mark document as complete (embedding -> complete) with vector store ID
@@ -272,6 +311,7 @@ class DocumentStatusManager:
             assistant_id: Parent assistant identifier
             document_id: Document identifier
             vector_store_id: S3 vector store identifier
+            lexical_index_key: S3 key of the document's lexical index segment, if stored
         
         Returns:
             True if update succeeded, False otherwise
@@ -281,7 +321,8 @@ class DocumentStatusManager:
             assistant_id,
             document_id,
             'complete',
-            vector_store_id=vector_store_id
+            vector_store_id=vector_store_id,
+            lexical_index_key=lexical_index_key
         )
     
     async def mark_failed(
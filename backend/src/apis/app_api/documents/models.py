@@ -47,6 +47,8 @@ class Document(BaseModel):
     error_message: Optional[str] = Field(None, alias="errorMessage", description="User-friendly error message for UI display")
     error_details: Optional[str] = Field(None, alias="errorDetails", description="Technical error details for debugging")
     chunk_count: Optional[int] = Field(None, alias="chunkCount", description="Number of chunks created")
+    embedded_count: Optional[int] = Field(None, alias="embeddedCount", description="Chunks embedded and stored so far")
+    lexical_index_key: Optional[str] = Field(None, alias="lexicalIndexKey", description="S3 key of the lexical (BM25) index segment")
     created_at: str = Field(..., alias="createdAt", description="ISO 8601 timestamp of creation")
     updated_at: str = Field(..., alias="updatedAt", description="ISO 8601 timestamp of last update")
     ttl: Optional[int] = Field(None, alias="ttl", description="DynamoDB TTL epoch timestamp for auto-expiry")
@@ -60,6 +62,9 @@ class Document(BaseModel):
     source_adapter_key: Optional[str] = Field(None, alias="sourceAdapterKey", description="File-source adapter that fetched the file")
     source_file_id: Optional[str] = Field(None, alias="sourceFileId", description="Provider-side opaque file identifier")
     source_etag: Optional[str] = Field(None, alias="sourceEtag", description="Provider-side version stamp at import time")
+    source_last_modified: Optional[str] = Field(None, alias="sourceLastModified", description="Provider-side Last-Modified header at import time")
+    crawl_depth: Optional[int] = Field(None, alias="crawlDepth", description="BFS depth at which a web crawl reached this page")
+    crawl_root: Optional[str] = Field(None, alias="crawlRoot", description="Normalized root URL of the web crawl that last imported this page")
     imported_by_user_id: Optional[str] = Field(None, alias="importedByUserId", description="User whose credentials imported the file")
 
 
@@ -97,6 +102,7 @@ class DocumentResponse(BaseModel):
     error_message: Optional[str] = Field(None, alias="errorMessage", description="User-friendly error message for UI display")
     error_details: Optional[str] = Field(None, alias="errorDetails", description="Technical error details for debugging")
     chunk_count: Optional[int] = Field(None, alias="chunkCount", description="Number of chunks")
+    embedded_count: Optional[int] = Field(None, alias="embeddedCount", description="Chunks embedded and stored so far")
     created_at: str = Field(..., alias="createdAt", description="ISO 8601 creation timestamp")
     updated_at: str = Field(..., alias="updatedAt", description="ISO 8601 update timestamp")
 
@@ -40,7 +40,7 @@ async def cleanup_document_resources(
     Delete vectors and S3 source file with exponential backoff retries.
 
     Phase 1: Delete vectors (deterministic if chunk_count available, else probe-and-scan).
-    Phase 2: Delete S3 source file.
+    Phase 2: Delete S3 source file (and, best effort, the lexical index segments).
     Phases are independent — failure of one does not prevent the other.
 
     Returns True only if both phases succeed. On True, hard-deletes the
@@ -86,6 +86,15 @@ async def cleanup_document_resources(
         logger.error(f"Unexpected error in S3 deletion for {document_id}: {e}", exc_info=True)
         s3_deleted = False
 
+    try:
+        from apis.shared.embeddings.lexical_index import delete_lexical_segments
+
+        await delete_lexical_segments(assistant_id, document_id)
+    except Exception as e:
+        # JUSTIFICATION: a leftover lexical index segment is never read once
+        # the document row is gone, so it does not hold up the cleanup.
+        logger.warning(f"Failed to delete lexical index for {document_id}: {e}")
+
     all_succeeded = vectors_deleted and s3_deleted
 
     if all_succeeded:
@@ -378,6 +378,9 @@ async def update_document_import_metadata(
     size_bytes: int,
     s3_key: str,
     source_etag: Optional[str] = None,
+    source_last_modified: Optional[str] = None,
+    crawl_depth: Optional[int] = None,
+    crawl_root: Optional[str] = None,
 ) -> Optional[Document]:
     """
     Backfill a document's file metadata after an async import download.
@@ -400,6 +403,9 @@ async def update_document_import_metadata(
         size_bytes: Size of the downloaded bytes
         s3_key: Final S3 object key the bytes are PUT to
         source_etag: Provider-side version stamp at import time, if known
+        source_last_modified: Provider-side Last-Modified value, if known
+        crawl_depth: BFS depth of a crawled web page, if applicable
+        crawl_root: Normalized root URL of the crawl that reached the page
 
     Returns:
         Updated Document object, or None if the record no longer exists
@@ -437,6 +443,15 @@ async def update_document_import_metadata(
     if source_etag is not None:
         set_parts.append("sourceEtag = :source_etag")
         expression_attribute_values[":source_etag"] = source_etag
+    if source_last_modified is not None:
+        set_parts.append("sourceLastModified = :source_last_modified")
+        expression_attribute_values[":source_last_modified"] = source_last_modified
+    if crawl_depth is not None:
+        set_parts.append("crawlDepth = :crawl_depth")
+        expression_attribute_values[":crawl_depth"] = crawl_depth
+    if crawl_root is not None:
+        set_parts.append("crawlRoot = :crawl_root")
+        expression_attribute_values[":crawl_root"] = crawl_root
 
     try:
         response = table.update_item(
@@ -22,6 +22,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
+from apis.app_api.chat.upstream import close_upstream_client, start_upstream_client
+from apis.app_api.web_sources.crawler import shutdown_parse_pool
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -94,10 +97,15 @@ async def lifespan(app: FastAPI):
     os.makedirs(generated_images_dir, exist_ok=True)
     logger.info("Output directories ready")
 
+    # Pooled keep-alive connections to inference-api for the chat proxies
+    await start_upstream_client()
+
     yield  # Application is running
 
     # Shutdown
     logger.info("=== Agent Core Service Shutting Down ===")
+    await close_upstream_client()
+    shutdown_parse_pool()
     # TODO: Cleanup agent pool, MCP clients, etc.
 
 # Create FastAPI app with lifespan
@@ -346,9 +346,9 @@ async def delete_session_endpoint(
     """
     Delete a conversation.
 
-    This soft-deletes the session metadata (moves from S#ACTIVE# to S#DELETED#
-    prefix) and schedules deletion of conversation content from AgentCore Memory
-    as a background task (fire-and-forget).
+    This soft-deletes the session metadata (flags the row deleted, which takes
+    it out of the session list) and schedules deletion of conversation content
+    from AgentCore Memory as a background task (fire-and-forget).
 
     Cost records are preserved for billing and audit purposes - they are stored
     separately with C# SK prefix and are not affected by session deletion.
@@ -432,9 +432,9 @@ async def bulk_delete_sessions_endpoint(
     """
     Bulk delete multiple conversations.
 
-    Deletes up to 20 sessions at once. Each session is soft-deleted (moved from
-    S#ACTIVE# to S#DELETED# prefix) and conversation content is scheduled for
-    deletion from AgentCore Memory as a background task.
+    Deletes up to 20 sessions at once. Each session is soft-deleted (flagged
+    deleted and dropped from the session list) and conversation content is
+    scheduled for deletion from AgentCore Memory as a background task.
 
     Cost records are preserved for billing and audit purposes.
 
@@ -2,7 +2,7 @@
 
 This service provides operations for session management including:
 - Get session by ID (via GSI lookup)
-- Soft-delete session (transactional move from S#ACTIVE# to S#DELETED# prefix)
+- Soft-delete session (in-place update that drops it from the recency index)
 - Cascade delete associated files when session is deleted
 
 The service preserves cost records (C# prefix) for audit trails and billing accuracy.
@@ -15,6 +15,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 
 from apis.shared.sessions.models import SessionMetadata
+from apis.shared.sessions.session_rows import RECENCY_PK, RECENCY_SK, ROW_KEY_ATTRIBUTES, session_row_key
 from apis.app_api.files.service import get_file_upload_service
 
 logger = logging.getLogger(__name__)
@@ -107,12 +108,15 @@ class SessionService:
 
     Provides methods for:
     - get_session: Retrieve session by ID via GSI lookup
-    - delete_session: Soft-delete session (move from S#ACTIVE# to S#DELETED#)
+    - delete_session: Soft-delete session (flag it and drop its recency keys)
 
     DynamoDB Schema:
         PK: USER#{user_id}
-        SK: S#ACTIVE#{last_message_at}#{session_id} (active sessions)
-            S#DELETED#{deleted_at}#{session_id} (deleted sessions)
+        SK: SESSION#{session_id}
+
+        GSI: SessionRecencyIndex (active sessions only)
+            GSI3PK: USER#{user_id}
+            GSI3SK: {last_message_at}#{session_id}
 
         GSI: SessionLookupIndex
             GSI_PK: SESSION#{session_id}
@@ -150,8 +154,8 @@ class SessionService:
         """
         Get session by ID using GSI.
 
-        Uses the SessionLookupIndex GSI to look up sessions by ID without
-        knowing the full SK (which contains the timestamp).
+        Uses the SessionLookupIndex GSI, which finds both stable rows and
+        legacy rows that have not been migrated yet.
 
         Args:
             user_id: User identifier (for ownership verification)
@@ -189,7 +193,7 @@ class SessionService:
                 return None
 
             # Remove DynamoDB keys
-            for key in ['PK', 'SK', 'GSI_PK', 'GSI_SK']:
+            for key in ROW_KEY_ATTRIBUTES:
                 item.pop(key, None)
 
             return SessionMetadata.model_validate(item)
@@ -202,9 +206,11 @@ class SessionService:
         """
         Soft-delete a session.
 
-        Moves the session from S#ACTIVE# to S#DELETED# prefix using a
-        transactional write. Cost records (C# prefix) are preserved for
-        audit trails and billing accuracy.
+        A single conditional ``update_item`` on the stable row marks it
+        deleted and removes its SessionRecencyIndex keys, which takes it
+        out of the session list. A legacy row (not yet migrated) is moved
+        from S#ACTIVE# to S#DELETED# as before. Cost records (C# prefix)
+        are preserved for audit trails and billing accuracy.
 
         Args:
             user_id: User identifier
@@ -221,7 +227,11 @@ class SessionService:
             return False
 
         try:
-            # Get current session via GSI to find its SK
+            if self._soft_delete_stable_row(user_id, session_id):
+                logger.info("Soft-deleted session")
+                return True
+
+            # No active stable row: missing, already deleted, or legacy
             session = await self.get_session(user_id, session_id)
             if not session:
                 logger.info("Session not found for deletion")
@@ -234,7 +244,7 @@ class SessionService:
             now = datetime.now(timezone.utc)
             deleted_at = now.isoformat()
 
-            # Build old and new SKs
+            # Legacy row (rollout only): move it from S#ACTIVE# to S#DELETED#
             old_sk = f'S#ACTIVE#{session.last_message_at}#{session_id}'
             new_sk = f'S#DELETED#{deleted_at}#{session_id}'
             pk = f'USER#{user_id}'
@@ -290,6 +300,32 @@ class SessionService:
             logger.error("Failed to delete session", exc_info=True)
             return False
 
+    def _soft_delete_stable_row(self, user_id: str, session_id: str) -> bool:
+        """Flag an active stable session row deleted. False if there is none."""
+        from botocore.exceptions import ClientError
+
+        try:
+            self.table.update_item(
+                Key=session_row_key(user_id, session_id),
+                UpdateExpression=(
+                    f"SET deleted = :yes, #status = :deleted, deletedAt = :at "
+                    f"REMOVE {RECENCY_PK}, {RECENCY_SK}"
+                ),
+                ConditionExpression="attribute_exists(PK) AND (attribute_not_exists(deleted) OR deleted = :no)",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":yes": True,
+                    ":no": False,
+                    ":deleted": "deleted",
+                    ":at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
     def delete_agentcore_memory(self, session_id: str, user_id: str) -> None:
         """
         Delete conversation content from AgentCore Memory (sync, for background tasks).
@@ -388,6 +424,10 @@ class SessionService:
 
             logger.info("Deleted events from AgentCore Memory")
 
+            from apis.shared.sessions.history_reader import invalidate_session_history
+
+            invalidate_session_history(session_id, user_id)
+
         except ImportError:
             logger.debug("AgentCore Memory SDK not available, skipping content deletion")
         except Exception as e:
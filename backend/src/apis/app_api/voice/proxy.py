@@ -12,8 +12,11 @@ BFF endpoint). The upstream WebSocket talks to either:
 The relay is symmetric and fully duplex: client→upstream and upstream→client
 run as concurrent tasks; the first to complete cancels the other so the
 proxy doesn't leak half-open sockets. Frames are forwarded as text (JSON)
-or binary unchanged. The ticket auth is enforced once, on upgrade — past
-that, the BFF is just a pipe.
+or binary unchanged. Binary frames (raw PCM audio, when the client
+negotiates ``audio_framing: "binary"`` in its config message) are handed
+to the other socket as the same bytes object, never parsed or re-encoded.
+The ticket auth is enforced once, on upgrade — past that, the BFF is just
+a pipe.
 """
 
 from __future__ import annotations
@@ -201,8 +204,7 @@ async def _pump_client_to_upstream(
                 )
                 await upstream_ws.send_str(text_frame)
             elif byte_frame is not None:
-                # Voice payloads are JSON-with-base64, not binary frames, but
-                # forward bytes too for protocol forward-compat.
+                # Binary audio frames carry no identity fields; relay as-is.
                 await upstream_ws.send_bytes(byte_frame)
     except WebSocketDisconnect:
         return
@@ -221,6 +223,11 @@ def _inject_config_auth(text_frame: str, *, access_token: str, user_id: str) ->
     other than a JSON object with ``type == "config"`` is forwarded
     untouched (binary audio frames, control messages, malformed payloads).
     """
+    # JSON audio frames arrive ~10/s per user. A frame that spells "config"
+    # nowhere and has no escapes cannot decode to type == "config", so skip
+    # the parse. Any backslash could be a \u escape, so those still parse.
+    if "config" not in text_frame and "\\" not in text_frame:
+        return text_frame
     try:
         parsed = json.loads(text_frame)
     except (json.JSONDecodeError, TypeError):
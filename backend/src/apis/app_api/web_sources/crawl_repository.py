@@ -5,6 +5,9 @@ Reuses the assistants table via the adjacency-list pattern:
 list-by-assistant query a single `SK begins_with CRAWL#` scan and lets the
 job ride the assistant's blast radius on delete.
 
+`list_crawled_pages` also reads back the assistant's `web` document rows,
+which an incremental re-crawl starts from.
+
 A failed update never raises — the caller is a fire-and-forget background
 task and we'd rather lose a progress tick than abort the crawl.
 """
@@ -13,9 +16,10 @@ import logging
 import os
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from apis.app_api.web_sources.models import CrawlJob, CrawlJobStatus, CrawlSettings
 
@@ -245,6 +249,83 @@ async def list_active_crawls(assistant_id: str) -> List[CrawlJob]:
     return alive
 
 
+@dataclass(frozen=True)
+class CrawledPage:
+    """What an earlier crawl recorded about one page, for conditional re-fetch."""
+
+    document_id: str
+    status: str
+    created_at: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    depth: Optional[int] = None
+    s3_key: Optional[str] = None
+    root: Optional[str] = None  # root URL of the crawl that imported it
+
+
+async def list_crawled_pages(assistant_id: str) -> Dict[str, CrawledPage]:
+    """Map each web document's normalized URL to its prior crawl state.
+
+    Drives incremental re-crawls: the route reuses the root's document and
+    the crawler sends `If-None-Match` / `If-Modified-Since` for every page
+    it already has. Soft-deleted rows are skipped; when a URL was imported
+    more than once the newest document wins. Empty dict on error — the
+    crawl then simply behaves like a fresh one.
+    """
+    try:
+        from boto3.dynamodb.conditions import Attr, Key
+
+        table = _table()
+    except Exception as e:
+        logger.error("Failed to open table for crawled pages of %s: %s", assistant_id, e)
+        return {}
+
+    pages: Dict[str, CrawledPage] = {}
+    exclusive_start_key: Optional[dict] = None
+    while True:
+        kwargs: dict = {
+            "KeyConditionExpression": Key("PK").eq(f"AST#{assistant_id}")
+            & Key("SK").begins_with("DOC#"),
+            "FilterExpression": Attr("sourceConnectorId").eq("web"),
+            "ProjectionExpression": (
+                "documentId, sourceFileId, sourceEtag, sourceLastModified, "
+                "crawlDepth, crawlRoot, createdAt, s3Key, #st"
+            ),
+            "ExpressionAttributeNames": {"#st": "status"},
+        }
+        if exclusive_start_key:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
+        try:
+            response = table.query(**kwargs)
+        except Exception as e:
+            logger.error("Failed to list crawled pages for %s: %s", assistant_id, e)
+            return pages
+
+        for item in response.get("Items", []):
+            url = item.get("sourceFileId")
+            status = item.get("status")
+            if not isinstance(url, str) or not item.get("documentId") or status == "deleting":
+                continue
+            depth = item.get("crawlDepth")
+            page = CrawledPage(
+                document_id=item["documentId"],
+                status=status or "",
+                created_at=item.get("createdAt") or "",
+                etag=item.get("sourceEtag"),
+                last_modified=item.get("sourceLastModified"),
+                depth=int(depth) if depth is not None else None,
+                s3_key=item.get("s3Key"),
+                root=item.get("crawlRoot"),
+            )
+            existing = pages.get(url)
+            if existing is None or page.created_at > existing.created_at:
+                pages[url] = page
+
+        exclusive_start_key = response.get("LastEvaluatedKey")
+        if not exclusive_start_key:
+            return pages
+
+
 async def increment_counters(
     *,
     assistant_id: str,
@@ -252,9 +333,10 @@ async def increment_counters(
     discovered_delta: int = 0,
     fetched_delta: int = 0,
     failed_delta: int = 0,
+    unchanged_delta: int = 0,
 ) -> None:
     """Atomically bump per-page counters on an in-flight job. Never raises."""
-    if discovered_delta == 0 and fetched_delta == 0 and failed_delta == 0:
+    if not (discovered_delta or fetched_delta or failed_delta or unchanged_delta):
         return
     set_parts: list[str] = []
     add_parts: list[str] = []
@@ -269,6 +351,9 @@ async def increment_counters(
     if failed_delta:
         add_parts.append("failedCount :d_fail")
         values[":d_fail"] = failed_delta
+    if unchanged_delta:
+        add_parts.append("unchangedCount :d_same")
+        values[":d_same"] = unchanged_delta
 
     expression_parts: list[str] = []
     if set_parts:
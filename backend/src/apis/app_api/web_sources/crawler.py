@@ -6,7 +6,9 @@ wire — it must never raise out of the top-level `run_crawl` call and must
 always finalize the `CrawlJob` it owns. Failure modes:
 
 - transport errors on a page → that one document goes 'failed', crawl
-  continues
+  continues; on a re-crawl, a transient error (timeout, connection error,
+  5xx, 429) on a previously complete page leaves that document as it was
+  and only counts against the crawl
 - robots.txt disallows a page → silently skipped (it never becomes a doc)
 - timeout on the whole crawl → caught, crawl marked 'failed'
 
@@ -14,16 +16,25 @@ The hot loop is small on purpose: discover links, gate them through
 robots+domain+depth+visited, fetch with per-host jitter, extract markdown,
 write to S3. Everything else (status transitions, chunking, embedding) is
 the existing documents pipeline.
+
+Extraction is CPU-bound and runs in a shared process pool so it never
+stalls the event loop the fetches (and every other request) share.
+WEB_CRAWL_PARSE_WORKERS sizes it (default: min(4, CPUs); 0 parses in a
+thread instead).
 """
 
 import asyncio
 import logging
 import mimetypes
+import multiprocessing
+import os
 import random
-import re
+import threading
 import time
 from collections import defaultdict
-from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 from urllib.robotparser import RobotFileParser
 
 import httpx
@@ -39,18 +50,26 @@ from apis.app_api.documents.services.storage_service import (
     _sanitize_filename,
 )
 from apis.app_api.web_sources.crawl_repository import (
+    CrawledPage,
     finalize_crawl,
     increment_counters,
 )
+from apis.app_api.web_sources.html_extract import (  # noqa: F401 - re-exported
+    _extract_links,
+    _extract_markdown,
+    _extract_title,
+    parse_page,
+)
 from apis.app_api.web_sources.models import CrawlSettings
 from apis.app_api.web_sources.url_utils import (
-    absolute_url,
     assert_url_is_public,
     host_of,
+    is_under_path,
     normalize_url,
     same_registrable_domain,
     url_extension_hint,
 )
+from apis.shared.embeddings.bedrock_embeddings import delete_vectors_for_document
 
 logger = logging.getLogger(__name__)
 
@@ -169,80 +188,83 @@ class _RobotsCache:
             return None
 
 
-# ── HTML extraction ──────────────────────────────────────────────────────────
+# ── Parse pool ──────────────────────────────────────────────────────────────
 
 
-_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
 
 
-def _extract_title(html: str) -> Optional[str]:
-    match = _TITLE_RE.search(html)
-    if not match:
-        return None
-    title = match.group(1).strip()
-    title = re.sub(r"\s+", " ", title)
-    return title or None
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
 
 
-def _extract_links(html: str, base_url: str) -> List[Tuple[str, str]]:
-    """Return (normalized, raw) tuples for every absolute http(s) link in the page."""
-    try:
-        from bs4 import BeautifulSoup
-    except ImportError as e:  # pragma: no cover - dep is in pyproject
-        logger.error("beautifulsoup4 is required for web crawling: %s", e)
-        return []
-
-    soup = BeautifulSoup(html, "html.parser")
-    out: List[Tuple[str, str]] = []
-    seen: Set[str] = set()
-    for anchor in soup.find_all("a", href=True):
-        link = anchor.get("href")
-        if not link:
-            continue
-        resolved = absolute_url(base_url, link)
-        if resolved is None:
-            continue
-        normalized, raw = resolved
-        if normalized in seen:
-            continue
-        seen.add(normalized)
-        out.append((normalized, raw))
-    return out
-
-
-def _extract_markdown(html: str, url: str) -> Tuple[str, Optional[str]]:
-    """Return (markdown, title). Falls back to BS4 text extraction if trafilatura
-    is unavailable or returns nothing.
+# One pool per process, shared by every crawl. Workers are spawned rather
+# than forked: the app process runs threads (boto3, the default executor)
+# and forking a threaded process can deadlock the child.
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared parse pool, or None when WEB_CRAWL_PARSE_WORKERS=0."""
+    global _parse_pool
+    workers = _env_int("WEB_CRAWL_PARSE_WORKERS", min(4, os.cpu_count() or 1))
+    if workers <= 0:
+        return None
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info("Started crawl parse pool with %d workers", workers)
+    return _parse_pool
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse workers at app shutdown."""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _parse_in_pool(
+    html: str, url: str, want_links: bool
+) -> Tuple[str, Optional[str], List[Tuple[str, str]]]:
+    """Run `parse_page` off the event loop so parsing never stalls fetches.
+
+    Falls back to a thread when the pool is disabled. A worker that dies
+    mid-parse (e.g. OOM on a pathological page) breaks the whole pool, so
+    it is discarded and the next page gets a fresh one.
     """
-    title = _extract_title(html)
-    text: Optional[str] = None
+    pool = _get_parse_pool()
+    if pool is None:
+        return await asyncio.to_thread(parse_page, html, url, want_links)
     try:
-        import trafilatura
-
-        text = trafilatura.extract(
-            html,
-            url=url,
-            output_format="markdown",
-            include_links=False,
-            include_images=False,
-            include_tables=True,
-            favor_recall=True,
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, parse_page, html, url, want_links
         )
-    except ImportError:
-        logger.debug("trafilatura unavailable, falling back to BS4 text extraction")
-    if not text:
-        try:
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(html, "html.parser")
-            for tag in soup(["script", "style", "noscript"]):
-                tag.decompose()
-            text = soup.get_text(separator="\n").strip()
-        except ImportError:
-            text = ""
-    if title:
-        return f"# {title}\n\n{text or ''}\n", title
-    return (text or "") + "\n", None
+    except BrokenProcessPool:
+        _discard_parse_pool(pool)
+        raise
 
 
 # ── Per-host delay scheduler ────────────────────────────────────────────────
@@ -252,7 +274,7 @@ class _HostDelay:
     """Per-host jittered delay between fetches.
 
     Tracks the next-allowed-fetch timestamp for each host and sleeps until
-    then before yielding. Combined with the global concurrency semaphore
+    then before yielding. Combined with the fixed pool of crawl workers
     this gives us "up to N in flight overall, but no more than 1 per host
     per (min..max) seconds" — the polite default.
     """
@@ -279,13 +301,49 @@ class _HostDelay:
 # ── Fetch ────────────────────────────────────────────────────────────────────
 
 
+class _FetchedPage(NamedTuple):
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def _conditional_headers(prior: Optional[CrawledPage]) -> Dict[str, str]:
+    """Validators from an earlier import. A failed doc is always re-fetched."""
+    if prior is None or prior.status == "failed":
+        return {}
+    headers: Dict[str, str] = {}
+    if prior.etag:
+        headers["If-None-Match"] = prior.etag
+    if prior.last_modified:
+        headers["If-Modified-Since"] = prior.last_modified
+    return headers
+
+
+def _is_transient(err: Exception) -> bool:
+    """Whether a fetch error says nothing about the page itself."""
+    if isinstance(err, httpx.HTTPStatusError):
+        code = err.response.status_code
+        return code >= 500 or code in (408, 429)
+    return isinstance(err, httpx.TransportError)
+
+
 async def _fetch_page(
-    client: httpx.AsyncClient, url: str
-) -> Tuple[str, Optional[str]]:
-    """Fetch a single page. Returns (html, etag). Raises on non-2xx or non-HTML."""
+    client: httpx.AsyncClient, url: str, prior: Optional[CrawledPage] = None
+) -> Optional[_FetchedPage]:
+    """Fetch a single page. Raises on non-2xx or non-HTML.
+
+    With `prior`, the request is conditional and None means the server
+    answered 304 Not Modified.
+    """
+    headers = _conditional_headers(prior)
     resp = await client.get(
-        url, follow_redirects=True, timeout=PER_PAGE_TIMEOUT_SECONDS
+        url,
+        headers=headers or None,
+        follow_redirects=True,
+        timeout=PER_PAGE_TIMEOUT_SECONDS,
     )
+    if headers and resp.status_code == 304:
+        return None
     resp.raise_for_status()
     content_type = (resp.headers.get("content-type") or "").lower()
     if not any(
@@ -301,14 +359,111 @@ async def _fetch_page(
         )
     # Use httpx's encoding inference; surface bytes as text for parsing.
     html = resp.text
-    return html, resp.headers.get("etag")
+    return _FetchedPage(
+        html, resp.headers.get("etag"), resp.headers.get("last-modified")
+    )
+
+
+# ── Progress accounting ─────────────────────────────────────────────────────
+
+
+class _CrawlProgress:
+    """Batches counter deltas into one `increment_counters` write per flush.
+
+    A per-link, per-page `update_item` made DynamoDB writes the dominant
+    cost of a large crawl. Deltas now accumulate in memory and are flushed
+    every WEB_CRAWL_PROGRESS_FLUSH_SECONDS (default 2) or once
+    WEB_CRAWL_PROGRESS_FLUSH_PAGES events (default 10) are pending,
+    whichever comes first. The SPA polls every few seconds, so progress
+    still moves at the rate it can show. `close()` flushes the remainder
+    and must run before the job is finalized so the final counts are
+    exact.
+    """
+
+    _FIELDS = ("discovered", "fetched", "failed", "unchanged")
+
+    def __init__(self, assistant_id: str, crawl_id: str) -> None:
+        self._assistant_id = assistant_id
+        self._crawl_id = crawl_id
+        self._interval = _env_float("WEB_CRAWL_PROGRESS_FLUSH_SECONDS", 2.0)
+        self._max_pending = max(1, _env_int("WEB_CRAWL_PROGRESS_FLUSH_PAGES", 10))
+        self._pending: Dict[str, int] = dict.fromkeys(self._FIELDS, 0)
+        self._flush_lock = asyncio.Lock()
+        self._closed = asyncio.Event()
+        self._ticker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._ticker = asyncio.create_task(self._tick())
+
+    async def add(
+        self,
+        *,
+        discovered: int = 0,
+        fetched: int = 0,
+        failed: int = 0,
+        unchanged: int = 0,
+    ) -> None:
+        for field, delta in zip(self._FIELDS, (discovered, fetched, failed, unchanged)):
+            self._pending[field] += delta
+        if sum(self._pending.values()) >= self._max_pending:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            pending = self._pending
+            if not any(pending.values()):
+                return
+            self._pending = dict.fromkeys(self._FIELDS, 0)
+            await increment_counters(
+                assistant_id=self._assistant_id,
+                crawl_id=self._crawl_id,
+                discovered_delta=pending["discovered"],
+                fetched_delta=pending["fetched"],
+                failed_delta=pending["failed"],
+                unchanged_delta=pending["unchanged"],
+            )
+
+    async def close(self) -> None:
+        self._closed.set()
+        if self._ticker is not None:
+            await asyncio.gather(self._ticker, return_exceptions=True)
+        await self.flush()
+
+    async def _tick(self) -> None:
+        while not self._closed.is_set():
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                await self.flush()
 
 
 # ── S3 stage ────────────────────────────────────────────────────────────────
 
 
+class _CrawlS3:
+    """One S3 client per crawl, built on first use off the event loop.
+
+    Building a boto3 client loads the service model from disk; doing that
+    per page cost more than the PUT it was for. boto3 clients are
+    thread-safe, so every executor-run PUT of the crawl shares this one.
+    """
+
+    def __init__(self) -> None:
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    async def client(self):
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    import boto3
+
+                    self._client = await asyncio.to_thread(boto3.client, "s3")
+        return self._client
+
+
 async def _put_markdown(
-    *, assistant_id: str, document_id: str, markdown: str, filename: str
+    *, assistant_id: str, document_id: str, markdown: str, filename: str, s3: _CrawlS3
 ) -> str:
     """PUT extracted markdown into the documents bucket. Returns the final S3 key.
 
@@ -317,12 +472,10 @@ async def _put_markdown(
     """
     from apis.app_api.documents.services.storage_service import _get_documents_bucket
 
-    import boto3
-
     sanitized = _sanitize_filename(filename)
     s3_key = _get_s3_key(assistant_id, document_id, sanitized)
-    loop = asyncio.get_event_loop()
-    s3_client = boto3.client("s3")
+    loop = asyncio.get_running_loop()
+    s3_client = await s3.client()
     bucket = _get_documents_bucket()
     body = markdown.encode("utf-8")
     await loop.run_in_executor(
@@ -337,6 +490,15 @@ async def _put_markdown(
     return s3_key
 
 
+async def _delete_markdown(*, s3_key: str, s3: _CrawlS3) -> None:
+    """Delete a page's previously staged markdown from the documents bucket."""
+    from apis.app_api.documents.services.storage_service import _get_documents_bucket
+
+    s3_client = await s3.client()
+    bucket = _get_documents_bucket()
+    await asyncio.to_thread(s3_client.delete_object, Bucket=bucket, Key=s3_key)
+
+
 # ── Public entry point ──────────────────────────────────────────────────────
 
 
@@ -348,6 +510,7 @@ async def run_crawl(
     root_url: str,
     settings: CrawlSettings,
     root_document_id: str,
+    prior_pages: Optional[Dict[str, CrawledPage]] = None,
     http_client_factory: Optional[
         Callable[[], httpx.AsyncClient]
     ] = None,
@@ -359,199 +522,264 @@ async def run_crawl(
     the crawler reuses it for the root URL and only creates new records for
     pages it discovers later. Never raises.
 
+    With `settings.incremental`, `prior_pages` (see `list_crawled_pages`)
+    maps URLs this assistant already imported to their documents. Those
+    documents are reused, every page a previous crawl of this root imported
+    is re-queued at its recorded depth, and each is fetched conditionally; a
+    304 skips extraction, the S3 write and therefore re-embedding. A page
+    that did change has its old vectors deleted before it is re-staged (the
+    new content may chunk into fewer pieces, and ingestion only overwrites
+    the chunk indices it writes), and its old markdown object is removed
+    when a new title moves it to a different key. Links are
+    only re-read from pages that changed; a new link can only appear on a
+    page whose content changed. Pages linked from an unchanged page are
+    still re-checked because each page records the crawl root that imported
+    it (`crawlRoot`), and seeding goes by that root rather than by URL, so
+    it also covers pages outside the root's path. Pages imported before the
+    root was recorded fall back to a path-segment match under the root.
+    A transient fetch error (see `_is_transient`) on a reused document that
+    was complete keeps that document as it is and is only counted as a
+    failure on the crawl; any other fetch error fails the document.
+
     The two injection points (`http_client_factory`, `on_progress`) exist
     purely to make unit testing tractable — production passes neither.
     """
 
     logger.info(
-        "Crawl %s starting (assistant=%s root=%s depth=%d max_pages=%d concurrency=%d)",
+        "Crawl %s starting (assistant=%s root=%s depth=%d max_pages=%d concurrency=%d incremental=%s)",
         crawl_id,
         assistant_id,
         root_url,
         settings.max_depth,
         settings.max_pages,
         settings.concurrency,
+        settings.incremental,
     )
+    prior_pages = prior_pages if settings.incremental and prior_pages else {}
+
+    def _admissible(normalized: str) -> bool:
+        if settings.same_domain_only and not same_registrable_domain(
+            normalized, root_url
+        ):
+            return False
+        try:
+            assert_url_is_public(normalized, resolve=False)
+        except Exception:
+            return False
+        return True
 
     async def _run() -> None:
+        root = normalize_url(root_url)
         creator = _DocumentCreator(
             assistant_id=assistant_id,
             user_id=user_id,
-            already_recorded={normalize_url(root_url): root_document_id},
-        )
-        await increment_counters(
-            assistant_id=assistant_id,
-            crawl_id=crawl_id,
-            discovered_delta=1,
+            already_recorded={
+                **{url: page.document_id for url, page in prior_pages.items()},
+                root: root_document_id,
+            },
         )
 
         visited: Set[str] = set()
         frontier: asyncio.Queue[Tuple[str, int]] = asyncio.Queue()
-        await frontier.put((normalize_url(root_url), 0))
-        visited.add(normalize_url(root_url))
+        await frontier.put((root, 0))
+        visited.add(root)
+        # Pages a previous crawl of this root imported, shallowest first.
+        # One imported before depths were recorded is only re-checked, never
+        # expanded.
+        seeds = sorted(
+            (
+                (page.depth if page.depth is not None else settings.max_depth, url)
+                for url, page in prior_pages.items()
+                if url != root
+                and (page.root == root if page.root is not None else is_under_path(url, root))
+            ),
+        )
+        for depth, url in seeds:
+            if len(visited) >= settings.max_pages:
+                break
+            if depth > settings.max_depth or not _admissible(url):
+                continue
+            visited.add(url)
+            await frontier.put((url, depth))
+        await progress.add(discovered=len(visited))
 
-        semaphore = asyncio.Semaphore(settings.concurrency)
         delay = _HostDelay(settings)
-        # Hold a strong reference to every worker task so the event loop's
-        # weak-task tracking can't GC them mid-execution (Python docs
-        # explicitly warn about this for asyncio.create_task without a
-        # held reference).
-        worker_tasks: Set[asyncio.Task] = set()
+        s3 = _CrawlS3()
         async with (http_client_factory or _default_client)() as client:
             robots = _RobotsCache(client)
-            in_flight = 0
-            done_event = asyncio.Event()
-            done_event.set()  # starts "done" until we launch the first task
 
-            async def worker(url: str, depth: int) -> None:
-                nonlocal in_flight
-                try:
-                    if not await robots.allows(url):
-                        logger.info("robots.txt disallows %s; skipping", url)
-                        # No document was created for non-root URLs yet, so
-                        # nothing to mark failed. The root URL is the
-                        # exception — if the user pointed at a disallowed
-                        # root, the route already created a doc; mark it
-                        # failed below.
-                        if url == normalize_url(root_url):
-                            await update_document_status(
-                                assistant_id=assistant_id,
-                                document_id=root_document_id,
-                                status="failed",
-                                error_message="The site's robots.txt disallows crawling this URL.",
-                            )
-                            await increment_counters(
-                                assistant_id=assistant_id,
-                                crawl_id=crawl_id,
-                                failed_delta=1,
-                            )
-                        return
-                    await delay.wait_for(url)
-                    document_id = await creator.get_or_create(url)
-                    logger.info("Crawl %s fetching %s (depth=%d)", crawl_id, url, depth)
-                    try:
-                        html, etag = await _fetch_page(client, url)
-                    except Exception as fetch_err:
-                        logger.warning("Fetch failed for %s: %s", url, fetch_err)
-                        await update_document_status(
-                            assistant_id=assistant_id,
-                            document_id=document_id,
-                            status="failed",
-                            error_message="The page could not be fetched.",
-                            error_details=str(fetch_err)[:500],
+            async def _fail(document_id: str, message: str, details: Optional[str] = None) -> None:
+                await update_document_status(
+                    assistant_id=assistant_id,
+                    document_id=document_id,
+                    status="failed",
+                    error_message=message,
+                    error_details=details,
+                )
+                await progress.add(failed=1)
+
+            async def crawl_page(url: str, depth: int) -> None:
+                if not await robots.allows(url):
+                    logger.info("robots.txt disallows %s; skipping", url)
+                    # No document was created for non-root URLs yet, so
+                    # nothing to mark failed. The root URL is the
+                    # exception — if the user pointed at a disallowed
+                    # root, the route already created a doc; mark it
+                    # failed below.
+                    if url == root:
+                        await _fail(
+                            root_document_id,
+                            "The site's robots.txt disallows crawling this URL.",
                         )
-                        await increment_counters(
-                            assistant_id=assistant_id,
-                            crawl_id=crawl_id,
-                            failed_delta=1,
-                        )
-                        return
-
-                    markdown, title = _extract_markdown(html, url)
-                    if not markdown.strip():
-                        await update_document_status(
-                            assistant_id=assistant_id,
-                            document_id=document_id,
-                            status="failed",
-                            error_message="The page had no extractable content.",
-                        )
-                        await increment_counters(
-                            assistant_id=assistant_id,
-                            crawl_id=crawl_id,
-                            failed_delta=1,
+                    return
+                await delay.wait_for(url)
+                document_id = await creator.get_or_create(url)
+                logger.info("Crawl %s fetching %s (depth=%d)", crawl_id, url, depth)
+                prior = prior_pages.get(url)
+                if prior is not None and prior.document_id != document_id:
+                    prior = None
+                try:
+                    page = await _fetch_page(client, url, prior)
+                except Exception as fetch_err:
+                    if prior is not None and prior.status == "complete" and _is_transient(fetch_err):
+                        # The previous import is still the best copy we have;
+                        # failing it would pull it out of retrieval over a
+                        # blip. The error is counted on the crawl instead.
+                        logger.warning(
+                            "Crawl %s: fetch of %s failed transiently, keeping document %s: %s",
+                            crawl_id,
+                            url,
+                            document_id,
+                            fetch_err,
                         )
+                        await progress.add(failed=1)
                         return
-                    display_name = (
-                        title or url_extension_hint(url)
-                    ).strip() or "page"
-                    filename = f"{display_name}.md"
-                    logger.info(
-                        "Crawl %s staging %s -> s3 (%d bytes markdown)",
-                        crawl_id,
-                        url,
-                        len(markdown.encode("utf-8")),
+                    logger.warning("Fetch failed for %s: %s", url, fetch_err)
+                    await _fail(
+                        document_id,
+                        "The page could not be fetched.",
+                        str(fetch_err)[:500],
                     )
-                    s3_key = await _put_markdown(
-                        assistant_id=assistant_id,
-                        document_id=document_id,
-                        markdown=markdown,
-                        filename=filename,
-                    )
-                    await update_document_import_metadata(
-                        assistant_id=assistant_id,
-                        document_id=document_id,
-                        filename=filename,
-                        content_type="text/markdown",
-                        size_bytes=len(markdown.encode("utf-8")),
-                        s3_key=s3_key,
-                        source_etag=etag,
-                    )
-                    logger.info(
-                        "Crawl %s wrote %s to s3 (key=%s); ingestion Lambda will take over",
-                        crawl_id,
-                        url,
-                        s3_key,
+                    return
+
+                if page is None:
+                    logger.info("Crawl %s: %s not modified; skipping", crawl_id, url)
+                    await progress.add(unchanged=1)
+                    return
+
+                try:
+                    markdown, title, links = await _parse_in_pool(
+                        page.html, url, depth < settings.max_depth
                     )
-                    await increment_counters(
-                        assistant_id=assistant_id,
-                        crawl_id=crawl_id,
-                        fetched_delta=1,
+                except Exception as parse_err:
+                    logger.warning("Parse failed for %s: %s", url, parse_err)
+                    await _fail(
+                        document_id,
+                        "The page could not be parsed.",
+                        str(parse_err)[:500],
                     )
-                    if on_progress is not None:
-                        await on_progress(url)
-
-                    if depth < settings.max_depth:
-                        for normalized, _raw in _extract_links(html, url):
-                            if normalized in visited:
-                                continue
-                            if len(visited) >= settings.max_pages:
-                                break
-                            if settings.same_domain_only and not same_registrable_domain(
-                                normalized, root_url
-                            ):
-                                continue
-                            try:
-                                assert_url_is_public(normalized, resolve=False)
-                            except Exception:
-                                continue
-                            visited.add(normalized)
-                            await increment_counters(
-                                assistant_id=assistant_id,
-                                crawl_id=crawl_id,
-                                discovered_delta=1,
-                            )
-                            await frontier.put((normalized, depth + 1))
-                finally:
-                    in_flight -= 1
-                    if in_flight == 0 and frontier.empty():
-                        done_event.set()
-
-            async def scheduler() -> None:
-                nonlocal in_flight
-                while True:
-                    if frontier.empty():
-                        if in_flight == 0:
-                            return
-                        await asyncio.sleep(0.05)
+                    return
+                if not markdown.strip():
+                    await _fail(document_id, "The page had no extractable content.")
+                    return
+                display_name = (
+                    title or url_extension_hint(url)
+                ).strip() or "page"
+                filename = f"{display_name}.md"
+                logger.info(
+                    "Crawl %s staging %s -> s3 (%d bytes markdown)",
+                    crawl_id,
+                    url,
+                    len(markdown.encode("utf-8")),
+                )
+                if prior is not None:
+                    try:
+                        await delete_vectors_for_document(document_id)
+                    except Exception as e:
+                        # JUSTIFICATION: re-ingestion overwrites every chunk
+                        # index it writes, so a failed delete only strands
+                        # the tail of a longer previous version; that must
+                        # not stop the changed page from being re-imported.
+                        logger.warning(
+                            "Crawl %s: could not clear old vectors of %s: %s", crawl_id, url, e
+                        )
+                s3_key = await _put_markdown(
+                    assistant_id=assistant_id,
+                    document_id=document_id,
+                    markdown=markdown,
+                    filename=filename,
+                    s3=s3,
+                )
+                if prior is not None and prior.s3_key and prior.s3_key != s3_key:
+                    try:
+                        await _delete_markdown(s3_key=prior.s3_key, s3=s3)
+                    except Exception as e:
+                        # JUSTIFICATION: the document already points at the
+                        # new key; an orphaned object costs storage only.
+                        logger.warning(
+                            "Crawl %s: could not delete old markdown %s: %s",
+                            crawl_id,
+                            prior.s3_key,
+                            e,
+                        )
+                await update_document_import_metadata(
+                    assistant_id=assistant_id,
+                    document_id=document_id,
+                    filename=filename,
+                    content_type="text/markdown",
+                    size_bytes=len(markdown.encode("utf-8")),
+                    s3_key=s3_key,
+                    source_etag=page.etag,
+                    source_last_modified=page.last_modified,
+                    crawl_depth=depth,
+                    crawl_root=root,
+                )
+                logger.info(
+                    "Crawl %s wrote %s to s3 (key=%s); ingestion Lambda will take over",
+                    crawl_id,
+                    url,
+                    s3_key,
+                )
+                await progress.add(fetched=1)
+                if on_progress is not None:
+                    await on_progress(url)
+
+                for normalized, _raw in links:
+                    if normalized in visited:
                         continue
-                    url, depth = await frontier.get()
-                    await semaphore.acquire()
-                    in_flight += 1
-                    done_event.clear()
-
-                    async def _wrapped(u: str = url, d: int = depth) -> None:
-                        try:
-                            await worker(u, d)
-                        finally:
-                            semaphore.release()
-
-                    task = asyncio.create_task(_wrapped())
-                    worker_tasks.add(task)
-                    task.add_done_callback(worker_tasks.discard)
-
-            await scheduler()
-            await done_event.wait()
+                    if len(visited) >= settings.max_pages:
+                        break
+                    if not _admissible(normalized):
+                        continue
+                    visited.add(normalized)
+                    await progress.add(discovered=1)
+                    frontier.put_nowait((normalized, depth + 1))
 
+            async def worker() -> None:
+                # Sleeps in `get()` until a page is queued; the crawl is
+                # over once every queued page has been marked done.
+                while True:
+                    url, depth = await frontier.get()
+                    try:
+                        await crawl_page(url, depth)
+                    except Exception as e:
+                        logger.exception("Crawl %s: unexpected error on %s: %s", crawl_id, url, e)
+                    finally:
+                        frontier.task_done()
+
+            # `concurrency` long-lived workers bound in-flight fetches. Hold
+            # strong references so the loop's weak task tracking can't GC
+            # them mid-crawl.
+            workers = [asyncio.create_task(worker()) for _ in range(settings.concurrency)]
+            try:
+                await frontier.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    progress = _CrawlProgress(assistant_id, crawl_id)
+    progress.start()
     error: Optional[str] = None
     status: str = "complete"
     try:
@@ -565,6 +793,7 @@ async def run_crawl(
         error = str(e)[:500]
         status = "failed"
     finally:
+        await progress.close()
         logger.info("Crawl %s finalizing with status=%s", crawl_id, status)
         await finalize_crawl(
             assistant_id=assistant_id,
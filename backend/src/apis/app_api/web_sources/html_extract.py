@@ -0,0 +1,101 @@
+"""HTML → markdown and link extraction for the crawler.
+
+Parsing with trafilatura and BeautifulSoup is pure CPU — tens to hundreds
+of milliseconds per page — so the crawler runs it in a worker process
+rather than on the event loop (see `crawler._parse_in_pool`). This module
+is kept free of app imports so a spawned worker only pays for the parsers
+themselves, and `parse_page` is a plain top-level function so it pickles.
+"""
+
+import logging
+import re
+from typing import List, Optional, Set, Tuple
+
+from apis.app_api.web_sources.url_utils import absolute_url
+
+logger = logging.getLogger(__name__)
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def _extract_title(html: str) -> Optional[str]:
+    match = _TITLE_RE.search(html)
+    if not match:
+        return None
+    title = match.group(1).strip()
+    title = re.sub(r"\s+", " ", title)
+    return title or None
+
+
+def _extract_links(html: str, base_url: str) -> List[Tuple[str, str]]:
+    """Return (normalized, raw) tuples for every absolute http(s) link in the page."""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError as e:  # pragma: no cover - dep is in pyproject
+        logger.error("beautifulsoup4 is required for web crawling: %s", e)
+        return []
+
+    soup = BeautifulSoup(html, "html.parser")
+    out: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for anchor in soup.find_all("a", href=True):
+        link = anchor.get("href")
+        if not link:
+            continue
+        resolved = absolute_url(base_url, link)
+        if resolved is None:
+            continue
+        normalized, raw = resolved
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        out.append((normalized, raw))
+    return out
+
+
+def _extract_markdown(html: str, url: str) -> Tuple[str, Optional[str]]:
+    """Return (markdown, title). Falls back to BS4 text extraction if trafilatura
+    is unavailable or returns nothing.
+    """
+    title = _extract_title(html)
+    text: Optional[str] = None
+    try:
+        import trafilatura
+
+        text = trafilatura.extract(
+            html,
+            url=url,
+            output_format="markdown",
+            include_links=False,
+            include_images=False,
+            include_tables=True,
+            favor_recall=True,
+        )
+    except ImportError:
+        logger.debug("trafilatura unavailable, falling back to BS4 text extraction")
+    if not text:
+        try:
+            from bs4 import BeautifulSoup
+
+            soup = BeautifulSoup(html, "html.parser")
+            for tag in soup(["script", "style", "noscript"]):
+                tag.decompose()
+            text = soup.get_text(separator="\n").strip()
+        except ImportError:
+            text = ""
+    if title:
+        return f"# {title}\n\n{text or ''}\n", title
+    return (text or "") + "\n", None
+
+
+def parse_page(
+    html: str, url: str, want_links: bool
+) -> Tuple[str, Optional[str], List[Tuple[str, str]]]:
+    """Extract (markdown, title, links) from one page in a single round trip.
+
+    `want_links` is False at the depth limit so the worker skips the second
+    BeautifulSoup pass entirely.
+    """
+    markdown, title = _extract_markdown(html, url)
+    links = _extract_links(html, url) if want_links else []
+    return markdown, title, links
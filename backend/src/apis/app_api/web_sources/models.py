@@ -36,6 +36,9 @@ class CrawlSettings(BaseModel):
     min_delay_seconds: float = Field(1.0, alias="minDelay", ge=0.0, le=5.0)
     max_delay_seconds: float = Field(3.0, alias="maxDelay", ge=0.0, le=10.0)
     same_domain_only: bool = Field(True, alias="sameDomainOnly")
+    # Re-crawl pages this assistant already imported with conditional
+    # requests, skipping extraction and re-embedding for unchanged ones.
+    incremental: bool = False
 
     @model_validator(mode="after")
     def _delay_ordering(self) -> "CrawlSettings":
@@ -74,6 +77,7 @@ class CrawlJob(BaseModel):
     discovered_count: int = Field(0, alias="discoveredCount", ge=0)
     fetched_count: int = Field(0, alias="fetchedCount", ge=0)
     failed_count: int = Field(0, alias="failedCount", ge=0)
+    unchanged_count: int = Field(0, alias="unchangedCount", ge=0)
     started_at: str = Field(..., alias="startedAt")
     completed_at: Optional[str] = Field(None, alias="completedAt")
     started_by_user_id: str = Field(..., alias="startedByUserId")
@@ -1,7 +1,8 @@
 """User-facing web-source endpoints.
 
 `POST /assistants/{id}/web-sources/crawl` validates the URL, pre-creates the
-root `Document` so the SPA has a row to render and poll, persists a
+root `Document` (or, for an incremental re-crawl, reuses the one an earlier
+crawl created) so the SPA has a row to render and poll, persists a
 `CrawlJob` row, and fires the BFS crawler as a background task. The endpoint
 returns 202 with the root document and the job — exactly mirroring the
 shape the SPA already handles for connector imports.
@@ -24,6 +25,7 @@ from apis.app_api.documents.models import (
 from apis.app_api.documents.services.document_service import (
     _generate_document_id,
     create_document,
+    get_document,
 )
 from apis.app_api.documents.services.storage_service import (
     _get_s3_key,
@@ -33,6 +35,7 @@ from apis.app_api.web_sources.crawl_repository import (
     create_crawl_job,
     get_crawl_job,
     list_active_crawls,
+    list_crawled_pages,
 )
 from apis.app_api.web_sources.crawler import run_crawl
 from apis.app_api.web_sources.models import (
@@ -99,23 +102,34 @@ async def start_crawl(
 
     settings = request.settings or CrawlSettings()
 
-    document_id = _generate_document_id()
-    provisional_filename = f"{_sanitize_filename(url_extension_hint(normalized))}.html"
-    s3_key = _get_s3_key(assistant_id, document_id, provisional_filename)
-    root_document = await create_document(
-        assistant_id=assistant_id,
-        filename=provisional_filename,
-        content_type="text/html",
-        size_bytes=0,
-        s3_key=s3_key,
-        document_id=document_id,
-        provenance=DocumentProvenance(
-            source_connector_id="web",
-            source_adapter_key="http",
-            source_file_id=normalized,
-            imported_by_user_id=current_user.user_id,
-        ),
-    )
+    # An incremental re-crawl keeps the documents an earlier crawl created,
+    # root included, so unchanged pages cost only a conditional request.
+    prior_pages = await list_crawled_pages(assistant_id) if settings.incremental else {}
+    root_document = None
+    prior_root = prior_pages.get(normalized)
+    if prior_root is not None:
+        root_document = await get_document(
+            assistant_id, prior_root.document_id, current_user.user_id
+        )
+    if root_document is None:
+        document_id = _generate_document_id()
+        provisional_filename = f"{_sanitize_filename(url_extension_hint(normalized))}.html"
+        s3_key = _get_s3_key(assistant_id, document_id, provisional_filename)
+        root_document = await create_document(
+            assistant_id=assistant_id,
+            filename=provisional_filename,
+            content_type="text/html",
+            size_bytes=0,
+            s3_key=s3_key,
+            document_id=document_id,
+            provenance=DocumentProvenance(
+                source_connector_id="web",
+                source_adapter_key="http",
+                source_file_id=normalized,
+                imported_by_user_id=current_user.user_id,
+            ),
+        )
+    document_id = root_document.document_id
 
     job = await create_crawl_job(
         assistant_id=assistant_id,
@@ -132,6 +146,7 @@ async def start_crawl(
             root_url=normalized,
             settings=settings,
             root_document_id=document_id,
+            prior_pages=prior_pages,
         )
     )
     _BACKGROUND_CRAWLS.add(task)
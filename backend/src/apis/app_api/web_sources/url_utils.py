@@ -72,6 +72,19 @@ def same_registrable_domain(a: str, b: str) -> bool:
     return parts_a[-2:] == parts_b[-2:]
 
 
+def is_under_path(url: str, root: str) -> bool:
+    """True when normalized `url` is `root` itself or sits below its path.
+
+    Compares whole path segments, so root `/docs` covers `/docs/intro`
+    but not `/docs-old`. Scheme and host must match exactly.
+    """
+    parsed, base = urlparse(url), urlparse(root)
+    if (parsed.scheme, parsed.netloc) != (base.scheme, base.netloc):
+        return False
+    prefix = base.path if base.path.endswith("/") else base.path + "/"
+    return parsed.path == base.path or parsed.path.startswith(prefix)
+
+
 def _resolve_addresses(host: str) -> Iterable[ipaddress._BaseAddress]:
     try:
         infos = socket.getaddrinfo(host, None)
@@ -0,0 +1,460 @@
+"""LRU/TTL cache of built agents for the inference API.
+
+Building a Strands agent on a cache miss costs hundreds of milliseconds
+(tool registry, gateway/external MCP client start-up, freshness lookups),
+so the cache directly sets time to first token. The previous cache was a
+plain dict capped at 100 entries with FIFO eviction, which evicted hot
+sessions ahead of idle ones and ignored how much each agent actually
+holds.
+
+``AgentCache`` is a true LRU (``OrderedDict`` + ``move_to_end`` on hit)
+with three bounds:
+
+- an entry cap (``AGENT_CACHE_MAX_ENTRIES``)
+- an approximate byte budget (``AGENT_CACHE_MAX_BYTES``), estimated from
+  each agent's message history and tool count and refreshed when a turn
+  releases its lease, because the history grows turn by turn
+- an idle TTL (``AGENT_CACHE_IDLE_TTL_SECONDS``) enforced by a background
+  sweeper task, so a worker that goes quiet releases its agents
+
+Evicted agents are released via Strands' ``Agent.cleanup()``, which drops
+the agent's consumer registration on its MCP tool providers. Providers
+are reference counted, so a client shared by another cached agent stays
+open and an unshared one closes its session. Cleanup runs in a worker
+thread because closing an MCP session joins its background thread.
+
+``get()`` and ``put()`` hand out a lease that the caller returns with
+``release()`` once the turn's stream ends. Evicting a leased entry only
+drops it from the map; its cleanup waits for the last lease, so a stream
+never loses its MCP sessions mid-turn. A lease that is never returned
+(a response the client abandoned before its body started) is reclaimed
+by the sweeper after ``AGENT_CACHE_LEASE_TIMEOUT_SECONDS``.
+
+Hit/miss/eviction counters are exposed through ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_ENTRIES = 100
+_DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_DEFAULT_IDLE_TTL_SECONDS = 30 * 60.0
+_DEFAULT_LEASE_TIMEOUT_SECONDS = 60 * 60.0
+
+# Rough fixed cost of one built agent (model client, hooks, prompt,
+# session manager) and of one registered tool spec. Only used to rank
+# entries against the byte budget, so order of magnitude is what matters.
+_AGENT_BASE_BYTES = 256 * 1024
+_TOOL_SPEC_BYTES = 4 * 1024
+_SCALAR_BYTES = 16
+_MAX_WALK_DEPTH = 12
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _payload_bytes(value: Any, depth: int = 0) -> int:
+    """Approximate in-memory size of a Strands message payload."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    if depth >= _MAX_WALK_DEPTH:
+        return _SCALAR_BYTES
+    if isinstance(value, dict):
+        return sum(len(str(k)) + _payload_bytes(v, depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_bytes(v, depth + 1) for v in value)
+    return _SCALAR_BYTES
+
+
+def estimate_agent_bytes(agent: Any) -> int:
+    """Approximate bytes held by a cached ``BaseAgent``.
+
+    Counts the wrapped Strands agent's message history (text, tool I/O,
+    inline document/image bytes) plus a fixed cost per registered tool.
+    Never raises — an agent we cannot introspect is charged the base cost.
+    """
+    size = _AGENT_BASE_BYTES
+    inner = getattr(agent, "agent", None)
+    if inner is None:
+        return size
+    try:
+        messages = getattr(inner, "messages", None)
+        if isinstance(messages, list):
+            size += _payload_bytes(messages)
+        tool_names = getattr(inner, "tool_names", None)
+        if isinstance(tool_names, (list, tuple)):
+            size += len(tool_names) * _TOOL_SPEC_BYTES
+    except Exception as e:
+        # JUSTIFICATION: Sizing is a heuristic for eviction order; a
+        # misbehaving property on a third-party agent must not fail the
+        # request that is merely caching it.
+        logger.debug(f"Could not size cached agent: {e}")
+    return size
+
+
+@dataclass
+class _Entry:
+    key: Hashable
+    agent: Any
+    session_id: str
+    size: int
+    last_used: float
+    # Turns currently streaming on this agent, and whether it has already
+    # left the map (cleanup then runs when ``leases`` drops to zero).
+    leases: int = 0
+    evicted: bool = False
+
+
+@dataclass
+class AgentCacheStats:
+    """Running counters for the agent cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: Dict[str, int] = field(default_factory=dict)
+
+    def evicted(self, reason: str) -> None:
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+
+
+class AgentCache:
+    """Bounded LRU of built agents keyed by the ``get_agent`` cache key.
+
+    Keys must be tuples whose first element is the session id (as built by
+    ``service._create_cache_key``) so entries can be evicted per session.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        lease_timeout_seconds: Optional[float] = None,
+    ):
+        self.max_entries = max(1, int(
+            max_entries if max_entries is not None
+            else _env_number("AGENT_CACHE_MAX_ENTRIES", _DEFAULT_MAX_ENTRIES)
+        ))
+        self.max_bytes = int(
+            max_bytes if max_bytes is not None
+            else _env_number("AGENT_CACHE_MAX_BYTES", _DEFAULT_MAX_BYTES)
+        )
+        self.idle_ttl = (
+            idle_ttl_seconds if idle_ttl_seconds is not None
+            else _env_number("AGENT_CACHE_IDLE_TTL_SECONDS", _DEFAULT_IDLE_TTL_SECONDS)
+        )
+        self.lease_timeout = (
+            lease_timeout_seconds if lease_timeout_seconds is not None
+            else _env_number("AGENT_CACHE_LEASE_TIMEOUT_SECONDS", _DEFAULT_LEASE_TIMEOUT_SECONDS)
+        )
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._sessions: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._stats = AgentCacheStats()
+        # Entries with outstanding leases, keyed by ``id(agent)`` so a caller
+        # can return the lease holding only the agent. Evicted entries stay
+        # here until their last lease is released.
+        self._leased: Dict[int, _Entry] = {}
+
+        self._sweeper: Optional[asyncio.Task] = None
+        self._sweeper_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._releases: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # Lookup / insert
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached agent for ``key`` and mark it most recently used.
+
+        A hit takes a lease; pass the agent to ``release()`` when the turn ends.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        self._entries.move_to_end(key)
+        entry.last_used = time.monotonic()
+        self._lease(entry)
+        return entry.agent
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached agent without touching recency or counters."""
+        entry = self._entries.get(key)
+        return entry.agent if entry is not None else None
+
+    def put(self, key: Hashable, agent: Any) -> None:
+        """Insert ``agent`` as most recently used, evicting to stay in bounds.
+
+        Takes a lease like ``get()``; pass the agent to ``release()`` when the
+        turn ends.
+        """
+        leases = 0
+        existing = self._entries.get(key)
+        if existing is not None:
+            same_agent = existing.agent is agent
+            if same_agent:
+                # Re-inserting the same agent carries its in-flight turns over.
+                leases, existing.leases = existing.leases, 0
+            self._remove(key, "replaced", release=not same_agent)
+
+        session_id = str(key[0]) if isinstance(key, tuple) and key else str(key)
+        entry = _Entry(
+            key=key,
+            agent=agent,
+            session_id=session_id,
+            size=estimate_agent_bytes(agent),
+            last_used=time.monotonic(),
+            leases=leases,
+        )
+        self._entries[key] = entry
+        self._sessions.setdefault(session_id, set()).add(key)
+        self._bytes += entry.size
+        self._lease(entry)
+        self._enforce_bounds(keep=key)
+        self._ensure_sweeper()
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    def _lease(self, entry: _Entry) -> None:
+        entry.leases += 1
+        self._leased[id(entry.agent)] = entry
+
+    def release(self, agent: Any) -> None:
+        """Return a lease taken by ``get()``/``put()`` once the turn has ended.
+
+        The turn has grown the agent's history, so a still-cached entry is
+        re-sized here rather than on every lookup. An entry evicted while
+        leased is cleaned up when its last lease comes back. Agents the cache
+        never handed out (e.g. uncached ``extra_tools`` agents) are ignored.
+        """
+        entry = self._leased.get(id(agent))
+        if entry is None or entry.agent is not agent:
+            return
+        entry.leases -= 1
+        if entry.leases > 0:
+            return
+        del self._leased[id(agent)]
+        if entry.evicted:
+            self._release(agent)
+            return
+        entry.last_used = time.monotonic()
+        self._resize(entry, estimate_agent_bytes(agent))
+        self._enforce_bounds(keep=entry.key)
+
+    def _reclaim_stale_leases(self) -> int:
+        """Drop leases held past the timeout, e.g. by a response never streamed."""
+        if self.lease_timeout <= 0:
+            return 0
+        cutoff = time.monotonic() - self.lease_timeout
+        stale = [e for e in self._leased.values() if e.last_used < cutoff]
+        for entry in stale:
+            logger.warning(
+                f"Reclaiming {entry.leases} stale agent cache lease(s) "
+                f"held for over {self.lease_timeout:.0f}s"
+            )
+            entry.leases = 1
+            self.release(entry.agent)
+        return len(stale)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def discard(self, key: Hashable, reason: str = "explicit") -> bool:
+        """Evict one entry. Returns True if it was cached."""
+        if key not in self._entries:
+            return False
+        self._remove(key, reason)
+        return True
+
+    def evict_session(
+        self,
+        session_id: str,
+        *,
+        keep: Optional[Hashable] = None,
+        reason: str = "session",
+    ) -> int:
+        """Evict every cached agent for ``session_id`` except ``keep``."""
+        keys = [k for k in self._sessions.get(session_id, ()) if k != keep]
+        for key in keys:
+            self._remove(key, reason)
+        return len(keys)
+
+    def session_keys(self, session_id: str) -> Set[Hashable]:
+        return set(self._sessions.get(session_id, ()))
+
+    def sweep(self) -> int:
+        """Evict entries idle for longer than the TTL. Returns the count."""
+        if self.idle_ttl <= 0:
+            return 0
+        cutoff = time.monotonic() - self.idle_ttl
+        # A leased entry is mid-turn, not idle.
+        expired = [
+            k for k, e in self._entries.items()
+            if e.last_used < cutoff and e.leases == 0
+        ]
+        for key in expired:
+            self._remove(key, "idle")
+        if expired:
+            logger.info(f"🧹 Swept {len(expired)} idle agent(s) from cache")
+        return len(expired)
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key, "cleared")
+
+    def _resize(self, entry: _Entry, size: int) -> None:
+        self._bytes += size - entry.size
+        entry.size = size
+
+    def _enforce_bounds(self, keep: Optional[Hashable] = None) -> None:
+        while len(self._entries) > self.max_entries:
+            if not self._evict_lru("lru", keep):
+                break
+        while self.max_bytes > 0 and self._bytes > self.max_bytes:
+            if not self._evict_lru("bytes", keep):
+                break
+
+    def _evict_lru(self, reason: str, keep: Optional[Hashable]) -> bool:
+        for key in self._entries:
+            if key != keep:
+                self._remove(key, reason)
+                return True
+        return False
+
+    def _remove(self, key: Hashable, reason: str, release: bool = True) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._sessions.get(entry.session_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._sessions[entry.session_id]
+        self._stats.evicted(reason)
+        logger.debug(f"🗑️ Evicted cached agent ({reason}, size≈{entry.size // 1024}KB)")
+        if not release:
+            return
+        if entry.leases > 0:
+            # Still streaming: cleanup waits for the last ``release()``.
+            entry.evicted = True
+        else:
+            self._release(entry.agent)
+
+    # ------------------------------------------------------------------
+    # Resource release
+    # ------------------------------------------------------------------
+
+    def _release(self, agent: Any) -> None:
+        inner = getattr(agent, "agent", None)
+        cleanup = getattr(inner, "cleanup", None)
+        if not callable(cleanup):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _run_cleanup(cleanup)
+            return
+        task = loop.create_task(asyncio.to_thread(_run_cleanup, cleanup))
+        self._releases.add(task)
+        task.add_done_callback(self._releases.discard)
+
+    # ------------------------------------------------------------------
+    # Idle sweeper
+    # ------------------------------------------------------------------
+
+    def _ensure_sweeper(self) -> None:
+        if self.idle_ttl <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._sweeper is not None and not self._sweeper.done() and self._sweeper_loop is loop:
+            return
+        self._sweeper_loop = loop
+        self._sweeper = loop.create_task(self._sweep_loop(), name="agent-cache-sweeper")
+
+    async def _sweep_loop(self) -> None:
+        interval = max(1.0, min(self.idle_ttl / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            self._reclaim_stale_leases()
+            self.sweep()
+
+    async def close(self) -> None:
+        """Stop the sweeper, evict everything and wait for MCP cleanup."""
+        sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None and not sweeper.done():
+            sweeper.cancel()
+            try:
+                await sweeper
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.clear()
+        # Shutting down: nothing will return the outstanding leases.
+        for entry in list(self._leased.values()):
+            entry.leases = 1
+            self.release(entry.agent)
+        if self._releases:
+            await asyncio.gather(*list(self._releases), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats.hits + self._stats.misses
+        return {
+            "entries": len(self._entries),
+            "sessions": len(self._sessions),
+            "bytes": self._bytes,
+            "leased": len(self._leased),
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "idleTtlSeconds": self.idle_ttl,
+            "hits": self._stats.hits,
+            "misses": self._stats.misses,
+            "hitRate": round(self._stats.hits / lookups, 4) if lookups else 0.0,
+            "evictions": dict(self._stats.evictions),
+        }
+
+
+def _run_cleanup(cleanup) -> None:
+    try:
+        cleanup()
+    except Exception as e:
+        # JUSTIFICATION: The agent is already out of the cache; a provider
+        # that fails to close must not take down the sweeper or the request
+        # that triggered eviction. Strands' finalizers are the backstop.
+        logger.warning(f"Failed to release cached agent resources: {e}")
@@ -6,21 +6,45 @@ Provides a direct Bedrock Converse API wrapper authenticated via API keys
 - Streaming (SSE) and non-streaming responses
 - Reasoning models (extended thinking / reasoning content blocks)
 - Multiple Bedrock model IDs
+- Batches of independent prompts (``/chat/api-converse/batch``), streamed
+  back as NDJSON or SSE as each one completes
 
 RBAC model access is enforced via ``AppRoleService.can_access_model()``
 before any Bedrock invocation occurs. Requests for models the caller's
 role does not permit are rejected with HTTP 403.
+
+boto3 is blocking, so Bedrock calls never run on the event loop. One
+shared client is used from a dedicated worker pool. A streaming response
+is read by a worker thread and handed to the loop through a bounded
+queue: a slow model stream ties up one worker, not the whole process, and
+a slow reader stalls its own worker rather than buffering without limit.
+Cost recording runs as a background task once the response has been sent.
+
+Configuration:
+    CONVERSE_MAX_CONCURRENCY: Bedrock calls and streams in flight at once;
+        sizes both the worker pool and the client's connection pool
+        (default 64)
+    CONVERSE_BATCH_MAX_ITEMS: items accepted in one batch (default 1000)
+    CONVERSE_BATCH_CONCURRENCY: items of one batch run at once (default 8)
+    CONVERSE_BATCH_KEY_CONCURRENCY: items in flight per API key across all
+        of its batches (default 16)
 """
 
+import asyncio
+import functools
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError as BotoClientError
-from fastapi import APIRouter, Header, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, status
 from fastapi.responses import StreamingResponse
 
 from apis.shared.auth.models import User
@@ -36,12 +60,27 @@ from apis.shared.sessions.models import (
     Attribution,
 )
 
-from .models import ConverseRequest, ConverseResponse
+from .models import ConverseBatchRequest, ConverseRequest, ConverseResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["api-converse"])
 
+# Stream events buffered between the reader thread and the response
+_STREAM_QUEUE_SIZE = 64
+_STREAM_END = object()
+
+_bedrock_client = None
+_executor: Optional[ThreadPoolExecutor] = None
+_client_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
 
 # ---------------------------------------------------------------------------
 # API key validation dependency
@@ -130,10 +169,102 @@ async def _record_cost(user_id: str, model_id: str, usage: dict, key_id: str) ->
         )
 
 
+def _max_concurrency() -> int:
+    return max(1, _env_int("CONVERSE_MAX_CONCURRENCY", 64))
+
+
 def _get_bedrock_client():
-    """Return a boto3 bedrock-runtime client."""
-    region = os.environ.get("AWS_REGION", "us-east-1")
-    return boto3.client("bedrock-runtime", region_name=region)
+    """Return the shared boto3 bedrock-runtime client."""
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _client_lock:
+            if _bedrock_client is None:
+                region = os.environ.get("AWS_REGION", "us-east-1")
+                _bedrock_client = boto3.client(
+                    "bedrock-runtime",
+                    region_name=region,
+                    config=Config(max_pool_connections=_max_concurrency()),
+                )
+    return _bedrock_client
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _client_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_concurrency(),
+                    thread_name_prefix="api-converse",
+                )
+    return _executor
+
+
+async def _run_blocking(fn, *args, **kwargs) -> Any:
+    """Run a blocking boto3 call on the converse worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+class _StreamError:
+    """Carries an exception raised by the reader thread across the queue."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def _iterate_in_thread(stream: Iterable[dict]) -> AsyncIterator[dict]:
+    """Iterate a blocking Bedrock event stream from a worker thread.
+
+    The reader blocks while the queue is full, so a slow client applies
+    backpressure to its own stream only. If the consumer stops early
+    (client disconnect), the reader is told to stop and the underlying
+    stream is closed so its thread is released.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+    stopped = threading.Event()
+
+    def _put(item: Any) -> None:
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def _read() -> None:
+        try:
+            for event in stream:
+                if stopped.is_set():
+                    return
+                _put(event)
+            _put(_STREAM_END)
+        except BaseException as exc:  # noqa: BLE001
+            # JUSTIFICATION: the consumer re-raises it on the loop. Once it
+            # has stopped listening (or the loop is gone) there is nobody
+            # left to report to, and closing the stream is expected to
+            # interrupt the read.
+            if stopped.is_set():
+                return
+            try:
+                _put(_StreamError(exc))
+            except RuntimeError:
+                return
+
+    reader = loop.run_in_executor(_get_executor(), _read)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+            yield item
+    finally:
+        if not reader.done():
+            stopped.set()
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            # Free a reader blocked on a full queue so it sees the stop flag
+            while not queue.empty():
+                queue.get_nowait()
 
 
 def _build_converse_params(request: ConverseRequest) -> dict:
@@ -192,17 +323,38 @@ def _extract_reasoning_and_text(content_blocks: list) -> tuple[str, str | None]:
     return text, reasoning
 
 
+def _converse_response(model_id: str, response: dict) -> ConverseResponse:
+    """Build the API response from a Bedrock ``converse`` result."""
+    output = response.get("output", {})
+    message = output.get("message", {})
+    content_blocks = message.get("content", [])
+
+    text, reasoning = _extract_reasoning_and_text(content_blocks)
+
+    return ConverseResponse(
+        content=text,
+        model_id=model_id,
+        usage=response.get("usage"),
+        stop_reason=response.get("stopReason"),
+        reasoning=reasoning,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Streaming helpers
 # ---------------------------------------------------------------------------
 
-async def _stream_converse(request: ConverseRequest, user_id: str, key_id: str) -> AsyncGenerator[str, None]:
-    """Call Bedrock converse_stream and yield SSE events."""
+async def _stream_converse(request: ConverseRequest, usage_out: dict) -> AsyncGenerator[str, None]:
+    """Call Bedrock converse_stream and yield SSE events.
+
+    The final ``metadata`` usage is copied into ``usage_out`` so cost can be
+    recorded after the response has been sent.
+    """
     client = _get_bedrock_client()
     params = _build_converse_params(request)
 
     try:
-        response = client.converse_stream(**params)
+        response = await _run_blocking(client.converse_stream, **params)
     except BotoClientError as exc:
         error_code = exc.response["Error"]["Code"]
         logger.error(f"Bedrock converse_stream ClientError ({error_code})", exc_info=True)
@@ -223,9 +375,8 @@ async def _stream_converse(request: ConverseRequest, user_id: str, key_id: str)
 
     # Track state for SSE lifecycle events
     in_reasoning = False
-    accumulated_usage: dict = {}
 
-    for event in stream:
+    async for event in _iterate_in_thread(stream):
         # --- message start ---
         if "messageStart" in event:
             role = event["messageStart"].get("role", "assistant")
@@ -289,21 +440,17 @@ async def _stream_converse(request: ConverseRequest, user_id: str, key_id: str)
         elif "metadata" in event:
             meta = event["metadata"]
             usage = meta.get("usage", {})
-            accumulated_usage = usage
+            usage_out.update(usage)
             metrics = meta.get("metrics", {})
             yield _sse("metadata", {"usage": usage, "metrics": metrics})
 
     yield _sse("done", {})
 
-    # Record cost after stream completes
-    if accumulated_usage:
-        await _record_cost(
-            user_id=user_id,
-            model_id=request.model_id,
-            usage=accumulated_usage,
-            key_id=key_id,
-        )
 
+async def _record_stream_cost(user_id: str, model_id: str, usage: dict, key_id: str) -> None:
+    """Record cost for a finished stream or batch, if it reported usage."""
+    if usage:
+        await _record_cost(user_id=user_id, model_id=model_id, usage=usage, key_id=key_id)
 
 
 def _sse(event_type: str, data: dict) -> str:
@@ -315,29 +462,18 @@ def _sse(event_type: str, data: dict) -> str:
 # Endpoint
 # ---------------------------------------------------------------------------
 
-@router.post(
-    "/api-converse",
-    response_model=ConverseResponse,
-    responses={
-        200: {"description": "Non-streaming response (or SSE stream when stream=true)"},
-        401: {"description": "Invalid or expired API key"},
-        400: {"description": "Bad request (invalid model, empty messages, etc.)"},
-    },
-    summary="Converse with a Bedrock model via API key",
-)
-async def api_converse(
-    request: ConverseRequest,
-    x_api_key: str = Header(..., alias="X-API-Key"),
-):
-    """Direct Bedrock Converse API wrapper authenticated via API key.
-
-    Supports streaming (SSE) and non-streaming responses, multi-turn
-    conversations, and reasoning models that return extended thinking blocks.
-    """
+async def _admit_api_key(x_api_key: str):
+    """Validate the API key and apply its per-key rate limit."""
     # 1. Validate API key
     validated_key = await _validate_api_key(x_api_key)
     logger.info("api-converse request received")
 
+    await _check_rate_limit(validated_key)
+    return validated_key
+
+
+async def _check_rate_limit(validated_key) -> None:
+    """Charge one request to the key's rate limit, raising 429 when it is spent."""
     # 1.5 Per-key rate limit (fail-open)
     from apis.shared.rate_limit import get_rate_limiter
 
@@ -358,13 +494,17 @@ async def api_converse(
     except Exception as exc:
         logger.error(f"Rate limit check error: {exc}", exc_info=True)
 
-    # 2. Basic validation
-    if not request.messages:
-        raise HTTPException(status_code=400, detail="messages array must not be empty")
 
+async def _authorize_model(validated_key, model_id: str) -> Optional[float]:
+    """Enforce the caller's quota and RBAC model access.
+
+    Returns the spend left before a blocking quota stops the caller, or
+    None when no such limit applies (or the check failed open).
+    """
     # 2.5 Build User and synthetic session_id for quota / cost accounting
     user = _build_user_from_api_key(validated_key)
     session_id = f"api-converse-{validated_key.key_id}"
+    remaining: Optional[float] = None
 
     # 2.6 Quota check (fail-open: errors are logged but don't block the request)
     if shared_quota.is_quota_enforcement_enabled():
@@ -384,6 +524,12 @@ async def api_converse(
                         f"Quota exceeded for user {validated_key.user_id}: {quota_result.message}"
                     )
                     raise HTTPException(status_code=429, detail=quota_result.message)
+            elif (
+                quota_result.remaining is not None
+                and quota_result.tier is not None
+                and quota_result.tier.action_on_limit == "block"
+            ):
+                remaining = float(quota_result.remaining)
         except HTTPException:
             raise
         except Exception as exc:
@@ -394,16 +540,82 @@ async def api_converse(
 
     # 2.7 Model access check (RBAC)
     app_role_service = get_app_role_service()
-    if not await app_role_service.can_access_model(user, request.model_id):
+    if not await app_role_service.can_access_model(user, model_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Access denied to model: {request.model_id}",
+            detail=f"Access denied to model: {model_id}",
+        )
+    return remaining
+
+
+def _converse_error(exc: Exception) -> HTTPException:
+    """Map a failed Bedrock converse call to the HTTP error returned to the caller."""
+    if not isinstance(exc, BotoClientError):
+        logger.error("Unexpected error during Bedrock converse call", exc_info=exc)
+        return HTTPException(status_code=502, detail="Model invocation failed due to an internal error.")
+
+    error_code = exc.response["Error"]["Code"]
+    if error_code == "ThrottlingException":
+        logger.warning("Bedrock throttling on converse call", exc_info=exc)
+        return HTTPException(
+            status_code=429,
+            detail="Model is temporarily overloaded. Please retry shortly.",
+            headers={"Retry-After": "5"},
         )
+    logger.error(f"Bedrock ClientError ({error_code}) on converse call", exc_info=exc)
+    if error_code in ("ValidationException", "ModelErrorException"):
+        return HTTPException(
+            status_code=400,
+            detail="Invalid request — check model ID, message format, and content policy.",
+        )
+    if error_code == "AccessDeniedException":
+        return HTTPException(status_code=403, detail="Model access is not available.")
+    return HTTPException(status_code=502, detail="Model invocation failed due to a service error.")
+
+
+
+@router.post(
+    "/api-converse",
+    response_model=ConverseResponse,
+    responses={
+        200: {"description": "Non-streaming response (or SSE stream when stream=true)"},
+        401: {"description": "Invalid or expired API key"},
+        400: {"description": "Bad request (invalid model, empty messages, etc.)"},
+    },
+    summary="Converse with a Bedrock model via API key",
+)
+async def api_converse(
+    request: ConverseRequest,
+    background_tasks: BackgroundTasks,
+    x_api_key: str = Header(..., alias="X-API-Key"),
+):
+    """Direct Bedrock Converse API wrapper authenticated via API key.
+
+    Supports streaming (SSE) and non-streaming responses, multi-turn
+    conversations, and reasoning models that return extended thinking blocks.
+    """
+    validated_key = await _admit_api_key(x_api_key)
+
+    # 2. Basic validation
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="messages array must not be empty")
+
+    await _authorize_model(validated_key, request.model_id)
 
     # 3. Streaming path
     if request.stream:
+        # Cost is recorded after the last byte is sent, so the client sees
+        # the end of the stream without waiting on pricing and DynamoDB.
+        usage: dict = {}
+        background_tasks.add_task(
+            _record_stream_cost,
+            user_id=validated_key.user_id,
+            model_id=request.model_id,
+            usage=usage,
+            key_id=validated_key.key_id,
+        )
         return StreamingResponse(
-            _stream_converse(request, user_id=validated_key.user_id, key_id=validated_key.key_id),
+            _stream_converse(request, usage_out=usage),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -416,52 +628,241 @@ async def api_converse(
     params = _build_converse_params(request)
 
     try:
-        response = client.converse(**params)
-    except BotoClientError as exc:
-        error_code = exc.response["Error"]["Code"]
-        if error_code == "ThrottlingException":
-            logger.warning("Bedrock throttling on converse call", exc_info=True)
-            raise HTTPException(
-                status_code=429,
-                detail="Model is temporarily overloaded. Please retry shortly.",
-                headers={"Retry-After": "5"},
-            )
-        logger.error(f"Bedrock ClientError ({error_code}) on converse call", exc_info=True)
-        if error_code in ("ValidationException", "ModelErrorException"):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid request — check model ID, message format, and content policy.",
-            )
-        if error_code == "AccessDeniedException":
-            raise HTTPException(status_code=403, detail="Model access is not available.")
-        raise HTTPException(status_code=502, detail="Model invocation failed due to a service error.")
-    except Exception:
-        logger.error("Unexpected error during Bedrock converse call", exc_info=True)
-        raise HTTPException(status_code=502, detail="Model invocation failed due to an internal error.")
-
-    # Parse response
-    output = response.get("output", {})
-    message = output.get("message", {})
-    content_blocks = message.get("content", [])
-
-    text, reasoning = _extract_reasoning_and_text(content_blocks)
+        response = await _run_blocking(client.converse, **params)
+    except Exception as exc:
+        raise _converse_error(exc)
 
-    usage = response.get("usage")
-    stop_reason = response.get("stopReason")
+    result = _converse_response(request.model_id, response)
 
-    # Record cost for non-streaming response
-    if usage is not None:
-        await _record_cost(
+    # Record cost for non-streaming response once it has been sent
+    if result.usage is not None:
+        background_tasks.add_task(
+            _record_cost,
             user_id=validated_key.user_id,
             model_id=request.model_id,
-            usage=usage,
+            usage=result.usage,
             key_id=validated_key.key_id,
         )
 
-    return ConverseResponse(
-        content=text,
-        model_id=request.model_id,
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Batch endpoint
+# ---------------------------------------------------------------------------
+
+class _KeySlot:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+# Batch items in flight per API key, across all of that key's batches
+_batch_key_slots: Dict[str, _KeySlot] = {}
+
+
+@asynccontextmanager
+async def _key_slot(key_id: str, limit: int):
+    """Hold one of ``key_id``'s batch slots for the duration of an item.
+
+    The cap is shared by every batch a key has running, so one caller's
+    batches can occupy only part of the converse worker pool and other
+    keys keep getting through.
+    """
+    slot = _batch_key_slots.get(key_id)
+    if slot is None:
+        slot = _batch_key_slots[key_id] = _KeySlot(limit)
+    slot.users += 1
+    try:
+        async with slot.semaphore:
+            yield
+    finally:
+        slot.users -= 1
+        if slot.users == 0:
+            _batch_key_slots.pop(key_id, None)
+
+
+def _add_usage(total: dict, usage: Optional[dict]) -> None:
+    """Sum the token counters of one item's usage into the batch total."""
+    for name, value in (usage or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[name] = total.get(name, 0) + value
+
+
+def _ndjson(event_type: str, data: dict) -> str:
+    """Format a single NDJSON line."""
+    return json.dumps({"type": event_type, **data}) + "\n"
+
+
+async def _stream_batch(
+    batch: ConverseBatchRequest,
+    validated_key,
+    usage_out: dict,
+    in_flight: set,
+    remaining_quota: Optional[float] = None,
+) -> AsyncGenerator[str, None]:
+    """Run every batch item and yield one line per item as it completes.
+
+    Lines are ``result`` (the ``ConverseResponse`` fields) or ``error``
+    (the status and message a single call would have returned), each
+    tagged with the item's ``index`` and ``id``, followed by a final
+    ``done`` line with the counts and aggregate usage.
+
+    Every item is a request against the key's rate limit: the first was
+    charged when the batch was admitted, each later one just before it
+    runs. Once the limiter refuses an item, or the batch has spent
+    ``remaining_quota`` (the quota left at admission), the items not yet
+    started are answered with the 429 a single call would get; items
+    already running finish.
+
+    Usage is summed into ``usage_out`` as each Bedrock call returns. A call
+    still running when the client goes away is left to finish, and its
+    future stays in ``in_flight`` until then, so cost recording can wait
+    for it instead of dropping its usage.
+    """
+    client = _get_bedrock_client()
+    loop = asyncio.get_running_loop()
+    encode = _sse if batch.format == "sse" else _ndjson
+    workers = min(len(batch.items), max(1, _env_int("CONVERSE_BATCH_CONCURRENCY", 8)))
+    per_key = max(1, _env_int("CONVERSE_BATCH_KEY_CONCURRENCY", 16))
+    pending = iter(enumerate(batch.items))
+    # Bounded so a slow reader pauses the workers instead of piling up results
+    results: "asyncio.Queue[tuple]" = asyncio.Queue(maxsize=workers)
+
+    pricing = None
+    if remaining_quota is not None:
+        try:
+            pricing = await create_pricing_snapshot(batch.model_id)
+        except Exception:
+            # JUSTIFICATION: quota is fail-open everywhere else on this
+            # route; without pricing the batch runs unmetered.
+            logger.error("Failed to load pricing for batch quota", exc_info=True)
+    spent = 0.0
+    refused: Optional[HTTPException] = None
+
+    def _account(future: "asyncio.Future") -> None:
+        in_flight.discard(future)
+        if not future.cancelled() and future.exception() is None:
+            _add_usage(usage_out, future.result().get("usage"))
+
+    async def _converse(params: dict) -> dict:
+        future = loop.run_in_executor(_get_executor(), functools.partial(client.converse, **params))
+        in_flight.add(future)
+        future.add_done_callback(_account)
+        # Shielded: cancelling the worker must not orphan a call that is
+        # already billing; it finishes and _account still sees its usage.
+        return await asyncio.shield(future)
+
+    async def _admit_item(index: int) -> None:
+        nonlocal refused
+        if refused is None and index > 0:
+            try:
+                await _check_rate_limit(validated_key)
+            except HTTPException as exc:
+                refused = exc
+        if refused is None and remaining_quota is not None and spent >= remaining_quota:
+            logger.warning(f"Batch quota exhausted for user {validated_key.user_id}")
+            refused = HTTPException(status_code=429, detail="Quota exceeded: this batch used the remaining quota.")
+        if refused is not None:
+            raise refused
+
+    async def _work() -> None:
+        nonlocal spent
+        for index, item in pending:
+            tag = {"index": index, "id": item.id}
+            request = batch.item_request(item)
+            try:
+                async with _key_slot(validated_key.key_id, per_key):
+                    await _admit_item(index)
+                    response = await _converse(_build_converse_params(request))
+                result = _converse_response(request.model_id, response)
+            except Exception as exc:
+                # JUSTIFICATION: one failed item must not end the batch; it is
+                # reported on its own line with the status a single call gets.
+                error = exc if isinstance(exc, HTTPException) else _converse_error(exc)
+                await results.put(("error", {**tag, "status": error.status_code, "error": error.detail}))
+                continue
+            if pricing is not None and result.usage:
+                spent += CostCalculator.calculate_message_cost(result.usage, pricing)[0]
+            await results.put(("result", {**tag, **result.model_dump()}))
+
+    tasks = [asyncio.create_task(_work()) for _ in range(workers)]
+    succeeded = 0
+    try:
+        for _ in batch.items:
+            event_type, data = await results.get()
+            if event_type == "result":
+                succeeded += 1
+            yield encode(event_type, data)
+        yield encode("done", {
+            "succeeded": succeeded,
+            "failed": len(batch.items) - succeeded,
+            "usage": usage_out,
+        })
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _record_batch_cost(user_id: str, model_id: str, usage: dict, key_id: str, in_flight: set) -> None:
+    """Record a batch's cost once every Bedrock call it started has returned."""
+    if in_flight:
+        await asyncio.wait(list(in_flight))
+    await _record_stream_cost(user_id=user_id, model_id=model_id, usage=usage, key_id=key_id)
+
+
+@router.post(
+    "/api-converse/batch",
+    responses={
+        200: {"description": "One NDJSON line (or SSE event) per item as it completes, then a done summary"},
+        401: {"description": "Invalid or expired API key"},
+        400: {"description": "Bad request (empty or oversized batch, empty messages)"},
+    },
+    summary="Run many independent converse prompts via API key",
+)
+async def api_converse_batch(
+    batch: ConverseBatchRequest,
+    background_tasks: BackgroundTasks,
+    x_api_key: str = Header(..., alias="X-API-Key"),
+):
+    """Run a batch of single-shot prompts against one Bedrock model.
+
+    Key validation and model access are checked once for the whole batch.
+    Each item counts against the key's rate limit, and the batch stops
+    starting items once it has spent the caller's remaining quota. Cost is
+    recorded once from the summed usage. Items run concurrently under a
+    per-batch and a per-key limit, and a failing item is reported on its
+    own line without failing the batch.
+    """
+    validated_key = await _admit_api_key(x_api_key)
+
+    max_items = max(1, _env_int("CONVERSE_BATCH_MAX_ITEMS", 1000))
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="items array must not be empty")
+    if len(batch.items) > max_items:
+        raise HTTPException(status_code=400, detail=f"A batch may hold at most {max_items} items")
+    if any(not item.messages for item in batch.items):
+        raise HTTPException(status_code=400, detail="messages array must not be empty")
+
+    remaining_quota = await _authorize_model(validated_key, batch.model_id)
+
+    usage: dict = {}
+    in_flight: set = set()
+    background_tasks.add_task(
+        _record_batch_cost,
+        user_id=validated_key.user_id,
+        model_id=batch.model_id,
         usage=usage,
-        stop_reason=stop_reason,
-        reasoning=reasoning,
+        key_id=validated_key.key_id,
+        in_flight=in_flight,
+    )
+    return StreamingResponse(
+        _stream_batch(batch, validated_key, usage, in_flight, remaining_quota),
+        media_type="text/event-stream" if batch.format == "sse" else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
     )
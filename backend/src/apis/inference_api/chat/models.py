@@ -4,7 +4,7 @@ Contains Pydantic models for chat API requests and responses.
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, field_validator
 
@@ -246,3 +246,44 @@ class ConverseResponse(BaseModel):
     usage: Optional[Dict[str, Any]] = None
     stop_reason: Optional[str] = None
     reasoning: Optional[str] = None  # Populated for reasoning models
+
+
+class ConverseBatchItem(BaseModel):
+    """One independent prompt in a /chat/api-converse/batch request.
+
+    Unset generation settings fall back to the batch-level values.
+    """
+
+    id: Optional[str] = None  # Caller's correlation id, echoed on the result line
+    messages: List[ConverseMessage]
+    system_prompt: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    top_p: Optional[float] = None
+
+
+class ConverseBatchRequest(BaseModel):
+    """Request model for /chat/api-converse/batch.
+
+    Every item runs against ``model_id`` as its own single-shot converse
+    call. Results stream back one line per item, in completion order.
+    """
+
+    model_id: str
+    items: List[ConverseBatchItem]
+    system_prompt: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = 4096
+    top_p: Optional[float] = None
+    format: Literal["ndjson", "sse"] = "ndjson"
+
+    def item_request(self, item: ConverseBatchItem) -> ConverseRequest:
+        """The single-shot converse request for one item."""
+        return ConverseRequest(
+            model_id=self.model_id,
+            messages=item.messages,
+            system_prompt=item.system_prompt if item.system_prompt is not None else self.system_prompt,
+            temperature=item.temperature if item.temperature is not None else self.temperature,
+            max_tokens=item.max_tokens if item.max_tokens is not None else self.max_tokens,
+            top_p=item.top_p if item.top_p is not None else self.top_p,
+        )
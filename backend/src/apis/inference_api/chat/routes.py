@@ -12,7 +12,7 @@ import json
 import logging
 import os
 import time
-from typing import AsyncGenerator, Optional, Union
+from typing import Any, AsyncGenerator, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -28,7 +28,7 @@ from apis.shared.errors import (
 )
 from apis.shared.feature_flags import skills_enabled
 from apis.shared.files.file_resolver import get_file_resolver
-from apis.shared.models.managed_models import list_managed_models
+from apis.shared.models.registry import find_managed_model
 from apis.shared.platform_settings.models import DEFAULT_CHAT_MODE, ChatModeSettings
 from apis.shared.platform_settings.service import get_chat_mode_settings_service
 from apis.shared.quota import (
@@ -50,8 +50,8 @@ from .app_context_dispatch import (
     merge_and_clear_pending_context,
 )
 from .app_tool_dispatch import AppToolCallError, dispatch_app_tool_call
-from .models import FileContent, InvocationRequest
-from .service import generate_conversation_title, get_agent
+from .models import InvocationRequest
+from .service import generate_conversation_title, get_agent, release_agent
 from .system_prompt_resolver import (
     append_active_prompt,
     resolve_active_prompt_text,
@@ -139,10 +139,7 @@ async def _find_managed_model(model_id: str | None):
     if not model_id:
         return None
     try:
-        managed_models = await list_managed_models()
-        for model in managed_models:
-            if model.model_id == model_id:
-                return model
+        return await find_managed_model(model_id)
     except Exception:
         # model_id is request-controlled; sanitize before logging to keep
         # CRLF / control chars from forging extra log lines.
@@ -404,12 +401,16 @@ def _build_artifact_tools(
 # Attachment Partitioning (#206)
 # ============================================================
 
-def _estimate_decoded_size(file: "FileContent") -> int:
-    """Estimate decoded byte size of a base64-encoded FileContent payload.
+def _estimate_decoded_size(file: Any) -> int:
+    """Estimate decoded byte size of an attachment.
 
-    Base64 inflates bytes by ~4/3, so decoded size ≈ len(b64) * 3 / 4.
+    Resolved uploads carry raw ``data``; for a base64 FileContent payload,
+    base64 inflates bytes by ~4/3, so decoded size ≈ len(b64) * 3 / 4.
     This avoids allocating the full bytes just to check a threshold.
     """
+    data = getattr(file, "data", None)
+    if data is not None:
+        return len(data)
     try:
         # Account for base64 padding: strip "=" padding before estimating.
         stripped = (file.bytes or "").rstrip("=")
@@ -814,6 +815,7 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
     # app-visible).
     if input_data.app_tool_call is not None:
         atc = input_data.app_tool_call
+        agent = None
         try:
             request_inference_params = dict(input_data.inference_params or {})
             caching_enabled, inference_params, mantle_endpoint_path = await _resolve_model_settings(
@@ -852,6 +854,9 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
         except Exception:
             logger.error("app tools/call invocation failed", exc_info=True)
             return JSONResponse({"error": "Internal error"}, status_code=500)
+        finally:
+            if agent is not None:
+                release_agent(agent)
 
     # App-pushed model context (MCP Apps PR #6, `ui/update-model-context`).
     # Like app_tool_call it bypasses quota / RAG / file resolution / title
@@ -861,6 +866,7 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
     # clears it. Inert behind the host flag (no live App ever calls this).
     if input_data.app_context_update is not None:
         acu = input_data.app_context_update
+        agent = None
         try:
             request_inference_params = dict(input_data.inference_params or {})
             caching_enabled, inference_params, mantle_endpoint_path = await _resolve_model_settings(
@@ -897,6 +903,9 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
         except Exception:
             logger.error("app context update invocation failed", exc_info=True)
             return JSONResponse({"error": "Internal error"}, status_code=500)
+        finally:
+            if agent is not None:
+                release_agent(agent)
 
     if input_data.enabled_tools:
         logger.info(f"Enabled tools ({len(input_data.enabled_tools)})")
@@ -909,7 +918,7 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
     if input_data.file_upload_ids:
         logger.info(f"File upload IDs: {len(input_data.file_upload_ids)} IDs to resolve")
 
-    # Resolve file upload IDs to FileContent objects, then partition:
+    # Resolve file upload IDs to raw-byte file content, then partition:
     #   - inline_files: images + non-tabular documents that Bedrock can
     #     ingest directly as document content blocks
     #   - tabular_files: csv/xlsx, which we intentionally NEVER send inline
@@ -930,10 +939,9 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
                 upload_ids=input_data.file_upload_ids,
                 max_files=5,  # Bedrock document limit
             )
-            for rf in resolved_files:
-                all_files.append(
-                    FileContent(filename=rf.filename, content_type=rf.content_type, bytes=rf.bytes)
-                )
+            # Resolved files carry raw bytes; the prompt builder reads them
+            # directly, so there is no base64 round trip for S3 uploads.
+            all_files.extend(resolved_files)
             logger.info(f"Resolved {len(resolved_files)} files from upload IDs")
         except Exception:
             logger.warning("Failed to resolve file upload IDs", exc_info=True)
@@ -1328,6 +1336,7 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
             system_prompt = append_active_prompt(system_prompt, prompt_name, prompt_text)
             logger.info(f"Appended custom system prompt: {prompt_name!r}")
 
+    agent = None
     try:
         # Resume requests rebuild the agent from the persisted PausedTurnSnapshot
         # so a refresh / cache eviction / pod restart between pause and resume
@@ -1525,128 +1534,134 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
         # Create stream with optional quota warning injection
         async def stream_with_quota_warning() -> AsyncGenerator[str, None]:
             """Wrap agent stream to inject quota warning at start if needed"""
-            # Yield quota warning event first if applicable
-            if quota_warning_event:
-                yield quota_warning_event.to_sse_format()
-
-            # Yield citation events BEFORE the agent stream starts
-            # This allows the UI to display sources immediately
-            if citations_for_storage:
-                for citation in citations_for_storage:
-                    yield f"event: citation\ndata: {json.dumps(citation)}\n\n"
-
-            # Then yield all agent stream events
-            # Use augmented message if assistant RAG was applied
-            # Use resolved files (from S3) merged with any direct file content
-            #
-            # Always store the original user message as displayText when the prompt
-            # will be modified before reaching the model. This happens when:
-            #   1. RAG augmentation prepends context chunks to the message
-            #   2. File attachments cause PromptBuilder to rewrite into ContentBlocks
-            #   3. Attachment guidance is appended (tabular routed to tools, etc.)
-            # The original text becomes the single source of truth for UI display,
-            # while the full augmented prompt stays in AgentCore Memory for the LLM.
-            attachment_guidance = _build_attachment_guidance(
-                diverted_tabular, oversized_inline, input_data.enabled_tools
-            )
-            # When multiple spreadsheets are visible, ship the full inventory
-            # up front so the agent can disambiguate intentionally instead of
-            # silently picking whichever file the vector search ranked first.
-            tabular_inventory = await _build_tabular_inventory(
-                session_id=input_data.session_id,
-                assistant_id=input_data.rag_assistant_id,
-                enabled_tools=input_data.enabled_tools,
-            )
-            # Bind to a new local so we don't trip Python's local-scope rules
-            # inside this generator closure (augmented_message is defined in
-            # the outer function; reassigning it here would make the whole
-            # name local and UnboundLocalError before the assignment runs).
-            final_message = augmented_message
-            if attachment_guidance:
-                final_message = f"{final_message}\n\n{attachment_guidance}"
-            if tabular_inventory:
-                final_message = f"{final_message}\n\n{tabular_inventory}"
-
-            # MCP Apps PR #6: drain any context an embedded App pushed via
-            # `ui/update-model-context` since the last turn and prepend it
-            # to this turn only. Skipped on resume/continuation (Strands
-            # ignores `final_message` there) so a pending update survives
-            # until the next real user turn instead of being silently
-            # cleared. Kept out of persisted history via the
-            # `original_message` path below (cache-prefix-safe).
-            if not is_resume and not is_continuation:
-                pending_ctx_block = merge_and_clear_pending_context(agent)
-                if pending_ctx_block:
-                    final_message = f"{pending_ctx_block}\n\n{final_message}"
-
-            message_will_be_modified = (
-                final_message != input_data.message  # RAG augmentation / attachment guidance / inventory
-                or bool(files_to_send)               # File attachments
-            )
-            # Strands' resume protocol wants each entry wrapped as
-            # {"interruptResponse": {...}}. The InvocationRequest schema
-            # accepts the inner shape so callers don't have to think about
-            # the SDK's content-block convention.
-            interrupt_responses_payload = (
-                [{"interruptResponse": entry.model_dump()} for entry in input_data.interrupt_responses]
-                if input_data.interrupt_responses
-                else None
-            )
+            # The agent's cache lease is returned when the stream ends, however
+            # it ends (including a client disconnect), so eviction cannot
+            # clean up its MCP sessions mid-turn.
+            try:
+                # Yield quota warning event first if applicable
+                if quota_warning_event:
+                    yield quota_warning_event.to_sse_format()
+
+                # Yield citation events BEFORE the agent stream starts
+                # This allows the UI to display sources immediately
+                if citations_for_storage:
+                    for citation in citations_for_storage:
+                        yield f"event: citation\ndata: {json.dumps(citation)}\n\n"
+
+                # Then yield all agent stream events
+                # Use augmented message if assistant RAG was applied
+                # Use resolved files (from S3) merged with any direct file content
+                #
+                # Always store the original user message as displayText when the prompt
+                # will be modified before reaching the model. This happens when:
+                #   1. RAG augmentation prepends context chunks to the message
+                #   2. File attachments cause PromptBuilder to rewrite into ContentBlocks
+                #   3. Attachment guidance is appended (tabular routed to tools, etc.)
+                # The original text becomes the single source of truth for UI display,
+                # while the full augmented prompt stays in AgentCore Memory for the LLM.
+                attachment_guidance = _build_attachment_guidance(
+                    diverted_tabular, oversized_inline, input_data.enabled_tools
+                )
+                # When multiple spreadsheets are visible, ship the full inventory
+                # up front so the agent can disambiguate intentionally instead of
+                # silently picking whichever file the vector search ranked first.
+                tabular_inventory = await _build_tabular_inventory(
+                    session_id=input_data.session_id,
+                    assistant_id=input_data.rag_assistant_id,
+                    enabled_tools=input_data.enabled_tools,
+                )
+                # Bind to a new local so we don't trip Python's local-scope rules
+                # inside this generator closure (augmented_message is defined in
+                # the outer function; reassigning it here would make the whole
+                # name local and UnboundLocalError before the assignment runs).
+                final_message = augmented_message
+                if attachment_guidance:
+                    final_message = f"{final_message}\n\n{attachment_guidance}"
+                if tabular_inventory:
+                    final_message = f"{final_message}\n\n{tabular_inventory}"
+
+                # MCP Apps PR #6: drain any context an embedded App pushed via
+                # `ui/update-model-context` since the last turn and prepend it
+                # to this turn only. Skipped on resume/continuation (Strands
+                # ignores `final_message` there) so a pending update survives
+                # until the next real user turn instead of being silently
+                # cleared. Kept out of persisted history via the
+                # `original_message` path below (cache-prefix-safe).
+                if not is_resume and not is_continuation:
+                    pending_ctx_block = merge_and_clear_pending_context(agent)
+                    if pending_ctx_block:
+                        final_message = f"{pending_ctx_block}\n\n{final_message}"
+
+                message_will_be_modified = (
+                    final_message != input_data.message  # RAG augmentation / attachment guidance / inventory
+                    or bool(files_to_send)               # File attachments
+                )
+                # Strands' resume protocol wants each entry wrapped as
+                # {"interruptResponse": {...}}. The InvocationRequest schema
+                # accepts the inner shape so callers don't have to think about
+                # the SDK's content-block convention.
+                interrupt_responses_payload = (
+                    [{"interruptResponse": entry.model_dump()} for entry in input_data.interrupt_responses]
+                    if input_data.interrupt_responses
+                    else None
+                )
 
-            async for event in agent.stream_async(
-                final_message,
-                session_id=input_data.session_id,
-                files=files_to_send if files_to_send else None,
-                citations=citations_for_storage if citations_for_storage else None,
-                original_message=input_data.message if message_will_be_modified else None,
-                interrupt_responses=interrupt_responses_payload,
-                continue_truncated=is_continuation,
-            ):
-                yield event
-
-            # Resume bookkeeping: any interrupt that was submitted in this
-            # request and is no longer present in the agent's interrupt state
-            # has been resolved — drop the persisted breadcrumb so a refresh
-            # doesn't redisplay a stale prompt. Interrupts that re-paused
-            # (same provider, new url) are left in place; the next event
-            # extractor will refresh them.
-            #
-            # When the agent's interrupt state is no longer activated after
-            # streaming, the turn fully completed — clear ``paused_turn`` too
-            # so a stale snapshot doesn't authorize a phantom resume against
-            # an already-finished turn. If interrupts re-paused, the snapshot
-            # was overwritten by ``_extract_oauth_required_events`` for the
-            # next pause, so leave it alone.
-            if is_resume and input_data.interrupt_responses:
-                try:
-                    strands_agent = getattr(agent, "agent", None)
-                    interrupt_state = getattr(strands_agent, "_interrupt_state", None) if strands_agent else None
-                    still_paused: set[str] = set()
-                    state_activated = bool(
-                        interrupt_state and getattr(interrupt_state, "activated", False)
-                    )
-                    if state_activated:
-                        still_paused = set((getattr(interrupt_state, "interrupts", None) or {}).keys())
-                    resolved_ids = [
-                        entry.interruptId
-                        for entry in input_data.interrupt_responses
-                        if entry.interruptId not in still_paused
-                    ]
-                    if resolved_ids:
-                        from apis.shared.sessions.metadata import remove_pending_interrupts
-                        await remove_pending_interrupts(
-                            session_id=input_data.session_id,
-                            user_id=user_id,
-                            interrupt_ids=resolved_ids,
-                        )
-                    if not state_activated:
-                        from apis.shared.sessions.metadata import clear_paused_turn
-                        await clear_paused_turn(
-                            session_id=input_data.session_id,
-                            user_id=user_id,
+                async for event in agent.stream_async(
+                    final_message,
+                    session_id=input_data.session_id,
+                    files=files_to_send if files_to_send else None,
+                    citations=citations_for_storage if citations_for_storage else None,
+                    original_message=input_data.message if message_will_be_modified else None,
+                    interrupt_responses=interrupt_responses_payload,
+                    continue_truncated=is_continuation,
+                ):
+                    yield event
+
+                # Resume bookkeeping: any interrupt that was submitted in this
+                # request and is no longer present in the agent's interrupt state
+                # has been resolved — drop the persisted breadcrumb so a refresh
+                # doesn't redisplay a stale prompt. Interrupts that re-paused
+                # (same provider, new url) are left in place; the next event
+                # extractor will refresh them.
+                #
+                # When the agent's interrupt state is no longer activated after
+                # streaming, the turn fully completed — clear ``paused_turn`` too
+                # so a stale snapshot doesn't authorize a phantom resume against
+                # an already-finished turn. If interrupts re-paused, the snapshot
+                # was overwritten by ``_extract_oauth_required_events`` for the
+                # next pause, so leave it alone.
+                if is_resume and input_data.interrupt_responses:
+                    try:
+                        strands_agent = getattr(agent, "agent", None)
+                        interrupt_state = getattr(strands_agent, "_interrupt_state", None) if strands_agent else None
+                        still_paused: set[str] = set()
+                        state_activated = bool(
+                            interrupt_state and getattr(interrupt_state, "activated", False)
                         )
-                except Exception as cleanup_err:
-                    logger.error("Failed to clear resolved pending_interrupts: %s", cleanup_err, exc_info=True)
+                        if state_activated:
+                            still_paused = set((getattr(interrupt_state, "interrupts", None) or {}).keys())
+                        resolved_ids = [
+                            entry.interruptId
+                            for entry in input_data.interrupt_responses
+                            if entry.interruptId not in still_paused
+                        ]
+                        if resolved_ids:
+                            from apis.shared.sessions.metadata import remove_pending_interrupts
+                            await remove_pending_interrupts(
+                                session_id=input_data.session_id,
+                                user_id=user_id,
+                                interrupt_ids=resolved_ids,
+                            )
+                        if not state_activated:
+                            from apis.shared.sessions.metadata import clear_paused_turn
+                            await clear_paused_turn(
+                                session_id=input_data.session_id,
+                                user_id=user_id,
+                            )
+                    except Exception as cleanup_err:
+                        logger.error("Failed to clear resolved pending_interrupts: %s", cleanup_err, exc_info=True)
+            finally:
+                release_agent(agent)
 
         # Stream response from agent as SSE (with optional files)
         # Note: Compression is handled by GZipMiddleware if configured in main.py
@@ -1657,11 +1672,16 @@ async def invocations(request: InvocationRequest, current_user: User = Depends(g
         )
 
     except HTTPException:
-        # Re-raise HTTP exceptions as-is (e.g., from auth)
+        # Re-raise HTTP exceptions as-is (e.g., from auth). The stream never
+        # started, so hand back the agent's cache lease here.
+        if agent is not None:
+            release_agent(agent)
         raise
     except Exception as e:
         # Stream error as a conversational assistant message for better UX
         logger.error("Error in invocations", exc_info=True)
+        if agent is not None:
+            release_agent(agent)
 
         error_event = build_conversational_error_event(code=ErrorCode.AGENT_ERROR, error=e, session_id=input_data.session_id, recoverable=True)
 
@@ -14,6 +14,7 @@ import boto3
 # from agentcore.agent.agent import ChatbotAgent
 from agents.main_agent.agent_types import create_agent
 from agents.main_agent.base_agent import BaseAgent
+from apis.inference_api.chat.agent_cache import AgentCache
 from apis.shared.sessions.metadata import update_session_title
 
 from apis.shared.security.log_sanitize import scrub_log
@@ -98,11 +99,11 @@ def _create_cache_key(
     )
 
 
-# LRU cache for agent instances
-# maxsize=100 allows caching up to 100 different agent configurations
-# This reduces initialization overhead for repeated requests
-_agent_cache: dict = {}
-_CACHE_MAX_SIZE = 100
+# LRU/TTL cache for agent instances, bounded by entry count and an
+# approximate byte budget (see agent_cache.py for the knobs). Rebuilding an
+# agent on a miss costs hundreds of milliseconds, so this sits directly on
+# the time-to-first-token path.
+_agent_cache = AgentCache()
 
 
 def _is_paused_on_interrupt(agent: BaseAgent) -> bool:
@@ -159,7 +160,8 @@ async def get_agent(
             kwargs (the explicit dict wins on key conflicts).
 
     Returns:
-        BaseAgent subclass instance (cached or newly created)
+        BaseAgent subclass instance (cached or newly created). Pass it to
+        ``release_agent`` once the turn has finished streaming.
     """
     from apis.shared.tools.freshness import get_freshness_hash
 
@@ -199,8 +201,8 @@ async def get_agent(
         skills_hash=skills_hash,
     )
 
-    if not extra_tools and cache_key in _agent_cache:
-        cached = _agent_cache[cache_key]
+    cached = None if extra_tools else _agent_cache.get(cache_key)
+    if cached is not None:
         # Defense in depth: a non-resume request should never be served a
         # paused agent. If we ever desync the cache key between the original
         # turn and a resume (e.g. snapshot stores a normalized form of one
@@ -214,7 +216,8 @@ async def get_agent(
                 "evicting and rebuilding (session=%s user=%s)",
                 scrub_log(session_id), scrub_log(user_id),
             )
-            del _agent_cache[cache_key]
+            _agent_cache.release(cached)
+            _agent_cache.discard(cache_key, reason="interrupt")
         else:
             logger.debug("✅ Agent cache hit")
             return cached
@@ -261,30 +264,58 @@ async def get_agent(
         logger.debug("⏭️ Skipping cache for agent with extra_tools")
         return agent
 
-    # Add to cache with LRU eviction
-    if len(_agent_cache) >= _CACHE_MAX_SIZE:
-        # Remove oldest entry (first inserted)
-        oldest_key = next(iter(_agent_cache))
-        del _agent_cache[oldest_key]
-        logger.debug(f"🗑️ Evicted oldest agent from cache (size={_CACHE_MAX_SIZE})")
-
-    _agent_cache[cache_key] = agent
+    # A session only ever continues on its latest configuration, so agents
+    # cached under the session's previous keys (model/tool/prompt changes)
+    # are dead weight holding stale history and MCP sessions. Keep paused
+    # ones: a resume may still target them.
+    stale = [
+        key for key in _agent_cache.session_keys(session_id)
+        if key != cache_key and not _is_paused_on_interrupt(_agent_cache.peek(key))
+    ]
+    for key in stale:
+        _agent_cache.discard(key, reason="session")
+
+    _agent_cache.put(cache_key, agent)
     logger.debug("💾 Cached agent")
 
     return agent
 
 
+def release_agent(agent: BaseAgent) -> None:
+    """Return the cache lease ``get_agent`` took once the turn has ended.
+
+    Until then the agent is never cleaned up, even if evicted, so its MCP
+    sessions outlive the stream using them. Safe to call on uncached agents.
+    """
+    _agent_cache.release(agent)
+
+
 def clear_agent_cache():
     """
     Clear the agent cache
 
     Useful for testing or when configuration changes require cache invalidation.
+    Evicted agents release their MCP client sessions.
     """
-    global _agent_cache
-    _agent_cache = {}
+    _agent_cache.clear()
     logger.info("🗑️ Agent cache cleared")
 
 
+def evict_session_agents(session_id: str) -> int:
+    """Drop every cached agent for ``session_id``. Returns the count evicted."""
+    return _agent_cache.evict_session(session_id)
+
+
+def get_agent_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters and current size of the agent cache."""
+    return _agent_cache.stats()
+
+
+async def close_agent_cache() -> None:
+    """Stop the idle sweeper and release every cached agent (shutdown hook)."""
+    await _agent_cache.close()
+
+
 # ============================================================
 # Title Generation
 # ============================================================
@@ -0,0 +1,53 @@
+"""Binary audio frames for the voice WebSocket.
+
+By default audio travels as base64 inside JSON (``bidi_audio_input`` /
+``bidi_audio_stream``). A client that sends ``"audio_framing": "binary"``
+in its config message may instead carry audio as binary WebSocket frames,
+and receives the assistant's audio the same way. Control, transcript and
+usage events stay JSON text frames.
+
+Frame layout (network byte order):
+
+    offset  size  field
+    0       1     kind         0x01 = PCM audio
+    1       4     sample_rate  uint32, Hz
+    5       1     channels     uint8
+    6       ...   payload      16-bit little-endian PCM samples
+
+The same layout is used in both directions. The BFF relay forwards binary
+frames untouched, so only the two endpoints parse them.
+"""
+
+import struct
+from typing import NamedTuple
+
+AUDIO_FRAMING_BINARY = "binary"
+AUDIO_FRAMING_JSON = "json"
+
+FRAME_KIND_AUDIO = 0x01
+
+_HEADER = struct.Struct(">BIB")
+
+
+class AudioFrame(NamedTuple):
+    pcm: bytes
+    sample_rate: int
+    channels: int
+
+
+def encode_audio_frame(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Prefix raw PCM with the binary frame header."""
+    return _HEADER.pack(FRAME_KIND_AUDIO, sample_rate, channels) + pcm
+
+
+def decode_audio_frame(frame: bytes) -> AudioFrame:
+    """Split a binary frame into header fields and PCM payload.
+
+    Raises ``ValueError`` for a short frame or an unknown frame kind.
+    """
+    if len(frame) < _HEADER.size:
+        raise ValueError("binary voice frame shorter than its header")
+    kind, sample_rate, channels = _HEADER.unpack_from(frame)
+    if kind != FRAME_KIND_AUDIO:
+        raise ValueError(f"unknown binary voice frame kind {kind:#04x}")
+    return AudioFrame(frame[_HEADER.size:], sample_rate, channels)
@@ -7,19 +7,25 @@ voice router pattern.
 
 Protocol:
     Client → Server:
-        {"type": "config", "session_id": "...", "auth_token": "...", ...}  (first message)
+        {"type": "config", "session_id": "...", "auth_token": "...",
+         "audio_framing": "json" | "binary", ...}  (first message)
         {"type": "bidi_audio_input", "audio": "<base64>", "sample_rate": 16000}
+        <binary audio frame>  (see voice_frames; accepted in either mode)
         {"type": "bidi_text_input", "text": "..."}
         {"type": "ping"}
         {"type": "stop"}
 
     Server → Client:
-        {"type": "bidi_connection_start", "connection_id": "...", "status": "connected"}
+        {"type": "bidi_connection_start", "connection_id": "...", "status": "connected",
+         "audio_framing": "json" | "binary"}
         {"type": "bidi_error", "message": "..."}
-        Agent stream events (audio, transcripts, tool use, etc.)
+        Agent stream events (audio, transcripts, tool use, etc.). With binary
+        framing, bidi_audio_stream events are sent as binary audio frames.
 """
 
 import asyncio
+import base64
+import binascii
 import json
 import jwt
 import logging
@@ -32,6 +38,13 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from apis.shared.sessions.metadata import get_session_metadata, store_session_metadata
 from apis.shared.sessions.models import SessionMetadata
 
+from .voice_frames import (
+    AUDIO_FRAMING_BINARY,
+    AUDIO_FRAMING_JSON,
+    decode_audio_frame,
+    encode_audio_frame,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -321,6 +334,7 @@ async def voice_stream(
     user_id = _get_param_from_request(websocket, "user-id", user_id)
     enabled_tools_list = _get_enabled_tools_from_request(websocket, enabled_tools)
     auth_token = _get_param_from_request(websocket, "auth-token", token) or ""
+    audio_framing = AUDIO_FRAMING_JSON
 
     # Always read config message from client (sent on WebSocket open).
     # Required for auth_token in AgentCore mode and supplements any
@@ -334,6 +348,8 @@ async def voice_stream(
             user_id = first_msg.get("user_id") or user_id
             enabled_tools_list = first_msg.get("enabled_tools") or enabled_tools_list
             auth_token = first_msg.get("auth_token") or auth_token
+            if first_msg.get("audio_framing") == AUDIO_FRAMING_BINARY:
+                audio_framing = AUDIO_FRAMING_BINARY
             logger.info(f"Voice config received from client message")
     except asyncio.TimeoutError:
         logger.warning("No config message received within 10s, using query params")
@@ -381,6 +397,7 @@ async def voice_stream(
             "type": "bidi_connection_start",
             "connection_id": session_id,
             "status": "connected",
+            "audio_framing": audio_framing,
         })
 
         # Start the voice agent
@@ -394,7 +411,12 @@ async def voice_stream(
             _receive_from_client(websocket, voice_agent, session_id)
         )
         send_task = asyncio.create_task(
-            _send_to_client(websocket, voice_agent, session_id)
+            _send_to_client(
+                websocket,
+                voice_agent,
+                session_id,
+                binary_audio=audio_framing == AUDIO_FRAMING_BINARY,
+            )
         )
 
         done, pending = await asyncio.wait(
@@ -456,10 +478,33 @@ async def voice_stream(
 async def _receive_from_client(
     websocket: WebSocket, voice_agent: Any, session_id: str
 ) -> None:
-    """Receive messages from client and dispatch to voice agent."""
+    """Receive messages from client and dispatch to voice agent.
+
+    Binary frames carry raw PCM (see voice_frames) and skip JSON and
+    base64 decoding entirely; text frames are JSON messages.
+    """
     try:
         while True:
-            msg = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            frame = message.get("bytes")
+            if frame is not None:
+                try:
+                    audio = decode_audio_frame(frame)
+                except ValueError as e:
+                    logger.debug(f"Dropping binary frame: {e}")
+                    continue
+                await voice_agent.send_audio(audio.pcm, audio.sample_rate)
+                continue
+
+            try:
+                msg = json.loads(message.get("text") or "")
+            except json.JSONDecodeError:
+                logger.debug("Dropping non-JSON text frame")
+                continue
+            if not isinstance(msg, dict):
+                continue
             msg_type = msg.get("type", "")
 
             if msg_type == "bidi_audio_input":
@@ -489,19 +534,37 @@ async def _receive_from_client(
         raise
 
 
+def _binary_audio_frame(event: Dict[str, Any]) -> Optional[bytes]:
+    """Binary frame for a PCM bidi_audio_stream event, or None to send it as JSON."""
+    if event.get("type") != "bidi_audio_stream" or event.get("format", "pcm") != "pcm":
+        return None
+    audio = event.get("audio")
+    if not isinstance(audio, str):
+        return None
+    try:
+        pcm = base64.b64decode(audio, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return encode_audio_frame(pcm, int(event.get("sample_rate") or 16000), int(event.get("channels") or 1))
+
+
 async def _send_to_client(
-    websocket: WebSocket, voice_agent: Any, session_id: str
+    websocket: WebSocket, voice_agent: Any, session_id: str, binary_audio: bool = False
 ) -> None:
     """Stream events from voice agent to client.
 
     VoiceAgent.receive_events() yields dicts from BidiAgent.receive() — each dict
     has a 'type' field (e.g. 'bidi_audio_stream', 'bidi_transcript_stream',
-    'bidi_response_complete', etc.).
+    'bidi_response_complete', etc.). With ``binary_audio`` set, PCM audio
+    events go out as binary frames instead of base64 JSON.
     """
     try:
         async for event in voice_agent.receive_events():
             try:
-                if isinstance(event, dict):
+                frame = _binary_audio_frame(event) if binary_audio and isinstance(event, dict) else None
+                if frame is not None:
+                    await websocket.send_bytes(frame)
+                elif isinstance(event, dict):
                     await websocket.send_json(event)
                 else:
                     await websocket.send_json({
@@ -100,7 +100,14 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("=== Inference API Shutting Down ===")
-    # TODO: Cleanup agent pool, MCP clients, etc.
+
+    # Flush buffered system cost rollups so in-flight deltas aren't lost
+    from apis.shared.costs.rollup_buffer import close_rollup_buffer
+    await close_rollup_buffer()
+
+    # Release cached agents so their MCP client sessions close cleanly
+    from apis.inference_api.chat.service import close_agent_cache
+    await close_agent_cache()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
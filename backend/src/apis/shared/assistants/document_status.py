@@ -0,0 +1,241 @@
+"""Which of an assistant's documents are searchable, with a short-TTL cache.
+
+RAG search only returns chunks from documents whose status is ``complete``:
+chunks of documents that are still ingesting, or are being deleted, stay in
+the vector index for a while. That check used to be one ``get_item`` per
+distinct document, in sequence, on a freshly built boto3 resource, on the
+time-to-first-token path of every RAG turn.
+
+``DocumentStatusCache`` keeps, per assistant, the document IDs last seen
+``complete``, each with its ``lexicalIndexKey`` (see
+``apis.shared.embeddings.lexical_index``):
+
+- ``prefetch`` loads the assistant's complete documents with one keys-only
+  query. The RAG service starts it alongside query embedding, so it has
+  usually finished by the time vector results arrive. The query stops
+  after a bounded number of rows, so an assistant with a very large
+  knowledge base does not pay for a full partition read on every TTL
+  expiry; documents past the bound are confirmed by ``complete_documents``
+  instead, and are left out of lexical search until then.
+- ``complete_documents`` answers from that set and confirms any other
+  document IDs with a single ``BatchGetItem``. Documents found complete
+  are added to the set.
+
+Only positive answers are cached, so a document that finishes ingesting is
+searchable on the next turn. A document that starts deleting can keep being
+served for up to the TTL, until the deletion flow removes its vectors.
+
+Configuration:
+    RAG_DOC_STATUS_CACHE_TTL_SECONDS: how long an assistant's set of
+        complete documents is trusted (default 15; 0 disables the cache)
+    RAG_DOC_STATUS_PREFETCH_MAX_ITEMS: most document rows one prefetch
+        reads (default 1000; 0 disables the prefetch)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL_SECONDS = 15.0
+_DEFAULT_PREFETCH_MAX_ITEMS = 1000
+_MAX_ASSISTANTS = 1024
+_BATCH_GET_MAX_KEYS = 100
+_BATCH_GET_MAX_ATTEMPTS = 3
+_COMPLETE = "complete"
+_PROJECTION = "SK, #status, lexicalIndexKey"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class DocumentStatusCache:
+    """Per-assistant complete documents over the assistants table."""
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl_seconds: Optional[float] = None,
+        region_name: Optional[str] = None,
+        prefetch_max_items: Optional[int] = None,
+    ):
+        self.table_name = table_name
+        self.ttl_seconds = max(
+            0.0, ttl_seconds if ttl_seconds is not None
+            else _env_float("RAG_DOC_STATUS_CACHE_TTL_SECONDS", _DEFAULT_TTL_SECONDS)
+        )
+        self.region_name = region_name or os.environ.get("AWS_REGION", "us-west-2")
+        self.prefetch_max_items = max(
+            0, prefetch_max_items if prefetch_max_items is not None
+            else _env_int("RAG_DOC_STATUS_PREFETCH_MAX_ITEMS", _DEFAULT_PREFETCH_MAX_ITEMS)
+        )
+        # assistant_id -> (loaded_at, {complete document ID: lexicalIndexKey})
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Optional[str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dynamodb: Any = None
+
+    def prefetch(self, assistant_id: str) -> None:
+        """Load the assistant's complete documents unless a fresh set is cached. Blocking.
+
+        Reads at most ``prefetch_max_items`` rows.
+        """
+        if (
+            self.ttl_seconds <= 0
+            or self.prefetch_max_items <= 0
+            or self._fresh_entry(assistant_id) is not None
+        ):
+            return
+        from boto3.dynamodb.conditions import Key
+
+        table = self._get_dynamodb().Table(self.table_name)
+        query_kwargs = {
+            "KeyConditionExpression": Key("PK").eq(f"AST#{assistant_id}") & Key("SK").begins_with("DOC#"),
+            "ProjectionExpression": _PROJECTION,
+            "ExpressionAttributeNames": {"#status": "status"},
+        }
+        complete: Dict[str, Optional[str]] = {}
+        remaining = self.prefetch_max_items
+        while True:
+            query_kwargs["Limit"] = remaining
+            response = table.query(**query_kwargs)
+            items = response.get("Items", [])
+            _collect_complete(items, complete)
+            remaining -= len(items)
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            if remaining <= 0:
+                logger.info(
+                    f"Prefetch for assistant {assistant_id} stopped after {self.prefetch_max_items} documents"
+                )
+                break
+            query_kwargs["ExclusiveStartKey"] = last_key
+        self._store(assistant_id, complete, replace=True)
+        logger.debug(f"Prefetched {len(complete)} complete documents for assistant {assistant_id}")
+
+    def complete_documents(self, assistant_id: str, doc_ids: Iterable[str]) -> Set[str]:
+        """The subset of ``doc_ids`` whose status is ``complete``. Blocking.
+
+        Raises on DynamoDB errors; callers decide how to degrade.
+        """
+        wanted = set(doc_ids)
+        cached = self._fresh_entry(assistant_id) or {}
+        complete = wanted & cached.keys()
+        unknown = wanted - complete
+        if unknown:
+            confirmed = self._batch_get_complete(assistant_id, unknown)
+            self._store(assistant_id, confirmed, replace=False)
+            complete |= confirmed.keys()
+        return complete
+
+    def lexical_segments(self, assistant_id: str) -> Dict[str, str]:
+        """``{document_id: lexicalIndexKey}`` for the cached complete documents that have one.
+
+        Empty unless a fresh set is cached (normally after ``prefetch``).
+        """
+        entry = self._fresh_entry(assistant_id) or {}
+        return {doc_id: key for doc_id, key in entry.items() if key}
+
+    def invalidate(self, assistant_id: Optional[str] = None) -> None:
+        """Forget one assistant's cached set, or all of them."""
+        with self._lock:
+            if assistant_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(assistant_id, None)
+
+    def _fresh_entry(self, assistant_id: str) -> Optional[Dict[str, Optional[str]]]:
+        with self._lock:
+            entry = self._entries.get(assistant_id)
+            if entry is None:
+                return None
+            loaded_at, documents = entry
+            if time.monotonic() - loaded_at > self.ttl_seconds:
+                del self._entries[assistant_id]
+                return None
+            self._entries.move_to_end(assistant_id)
+            return dict(documents)
+
+    def _store(self, assistant_id: str, documents: Dict[str, Optional[str]], replace: bool) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            entry = self._entries.get(assistant_id)
+            if replace or entry is None:
+                self._entries[assistant_id] = (time.monotonic(), dict(documents))
+            else:
+                # Confirmed documents extend the set without refreshing its age
+                entry[1].update(documents)
+            self._entries.move_to_end(assistant_id)
+            while len(self._entries) > _MAX_ASSISTANTS:
+                self._entries.popitem(last=False)
+
+    def _batch_get_complete(self, assistant_id: str, doc_ids: Set[str]) -> Dict[str, Optional[str]]:
+        client = self._get_dynamodb().meta.client
+        ordered = sorted(doc_ids)
+        complete: Dict[str, Optional[str]] = {}
+        # DynamoDB batch_get_item limit is 100
+        for i in range(0, len(ordered), _BATCH_GET_MAX_KEYS):
+            request = {
+                self.table_name: {
+                    "Keys": [
+                        {"PK": f"AST#{assistant_id}", "SK": f"DOC#{doc_id}"}
+                        for doc_id in ordered[i : i + _BATCH_GET_MAX_KEYS]
+                    ],
+                    "ProjectionExpression": _PROJECTION,
+                    "ExpressionAttributeNames": {"#status": "status"},
+                }
+            }
+            for _ in range(_BATCH_GET_MAX_ATTEMPTS):
+                response = client.batch_get_item(RequestItems=request)
+                _collect_complete(response.get("Responses", {}).get(self.table_name, []), complete)
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+        return complete
+
+    def _get_dynamodb(self) -> Any:
+        if self._dynamodb is None:
+            with self._lock:
+                if self._dynamodb is None:
+                    import boto3
+
+                    self._dynamodb = boto3.resource("dynamodb", region_name=self.region_name)
+        return self._dynamodb
+
+
+def _collect_complete(items: Iterable[Dict[str, Any]], into: Dict[str, Optional[str]]) -> None:
+    for item in items:
+        if item.get("status") == _COMPLETE:
+            into[item["SK"][len("DOC#"):]] = item.get("lexicalIndexKey")
+
+
+_cache: Optional[DocumentStatusCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_document_status_cache(table_name: str) -> DocumentStatusCache:
+    """Process-wide document status cache for the assistants table."""
+    global _cache
+    if _cache is None or _cache.table_name != table_name:
+        with _cache_lock:
+            if _cache is None or _cache.table_name != table_name:
+                _cache = DocumentStatusCache(table_name)
+    return _cache
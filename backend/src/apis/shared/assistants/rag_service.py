@@ -2,18 +2,52 @@
 
 This service handles searching the vector store for assistant-specific
 knowledge and augmenting user prompts with retrieved context.
+
+The assistant's complete-document set is prefetched concurrently with
+query embedding and vector search, so the document-status filter usually
+answers from memory (see ``document_status``).
+
+In hybrid mode (the default) the same background step also runs a BM25
+query over the lexical index segments of those documents (see
+``apis.shared.embeddings.lexical_index``). Vector search over-fetches. The
+two ranked lists are fused with reciprocal-rank fusion and cut back to
+``top_k``. Lexical-only hits are read back from the vector store by key,
+so hybrid search costs no extra Bedrock calls.
+
+Configuration:
+    RAG_RETRIEVAL_MODE: "hybrid" (default) or "vector"
+    RAG_OVERFETCH_FACTOR: candidates per result fetched from each retriever
+        before fusion (default 4)
+    RAG_RRF_K: reciprocal-rank fusion constant (default 60)
 """
 
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Set
-
-import boto3
+from typing import Any, Dict, List, Optional, Sequence, Set
 
-from apis.shared.embeddings.bedrock_embeddings import search_assistant_knowledgebase
+from apis.shared.assistants.document_status import get_document_status_cache
+from apis.shared.embeddings.bedrock_embeddings import get_vectors_by_key, search_assistant_knowledgebase
+from apis.shared.embeddings.lexical_index import LexicalHit, get_lexical_index
 
 logger = logging.getLogger(__name__)
 
+# QueryVectors accepts at most this many results per call
+_MAX_QUERY_TOP_K = 30
+_DEFAULT_OVERFETCH_FACTOR = 4
+_DEFAULT_RRF_K = 60
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _hybrid_enabled() -> bool:
+    return os.environ.get("RAG_RETRIEVAL_MODE", "hybrid").strip().lower() != "vector"
+
 
 async def search_assistant_knowledgebase_with_formatting(assistant_id: str, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     """
@@ -27,23 +61,32 @@ async def search_assistant_knowledgebase_with_formatting(assistant_id: str, quer
     Returns:
         List of dictionaries containing:
         - text: Chunk text content
-        - distance: Similarity distance (lower = more similar)
+        - distance: Similarity distance (lower = more similar; None for
+          chunks found only by the lexical index)
         - metadata: Original metadata from vector store
         - key: Vector key/ID
     """
+    hybrid = _hybrid_enabled()
+    fetch_k = min(_MAX_QUERY_TOP_K, max(top_k, top_k * _env_int("RAG_OVERFETCH_FACTOR", _DEFAULT_OVERFETCH_FACTOR))) if hybrid else top_k
+    background = _start_background_retrieval(assistant_id, query if hybrid else None, fetch_k)
     try:
         # Call the bedrock_embeddings search function
-        response = await search_assistant_knowledgebase(assistant_id, query)
+        response = await search_assistant_knowledgebase(assistant_id, query, top_k=fetch_k)
 
         # Extract vectors from response
         vectors = response.get("vectors", [])
 
-        if not vectors:
+        lexical_hits: List[LexicalHit] = await background if background is not None else []
+
+        if not vectors and not lexical_hits:
             logger.info(f"No vectors found for assistant {assistant_id} with query: {query[:50]}...")
             return []
 
         # Filter out chunks from documents that are not in "complete" status
-        vectors = _filter_vectors_by_document_status(vectors, assistant_id)
+        vectors = await asyncio.to_thread(_filter_vectors_by_document_status, vectors, assistant_id)
+
+        if lexical_hits:
+            vectors = await _fuse_with_lexical_hits(vectors, lexical_hits, top_k)
 
         # Format results - return document_id for on-demand download URL generation
         formatted_results = []
@@ -66,14 +109,89 @@ async def search_assistant_knowledgebase_with_formatting(assistant_id: str, quer
         logger.error(f"Error searching knowledge base for assistant {assistant_id}: {e}", exc_info=True)
         # Return empty list on error (graceful degradation)
         return []
+    finally:
+        if background is not None and not background.done():
+            background.cancel()
+
+
+def _start_background_retrieval(
+    assistant_id: str, lexical_query: Optional[str], limit: int
+) -> Optional["asyncio.Task[List[LexicalHit]]"]:
+    """Warm the complete-document set (and run the lexical query) while the query is embedded."""
+    table_name = os.environ.get("DYNAMODB_ASSISTANTS_TABLE_NAME")
+    if not table_name:
+        return None
+    return asyncio.create_task(asyncio.to_thread(_prefetch_and_search_lexical, table_name, assistant_id, lexical_query, limit))
+
+
+def _prefetch_and_search_lexical(
+    table_name: str, assistant_id: str, lexical_query: Optional[str], limit: int
+) -> List[LexicalHit]:
+    cache = get_document_status_cache(table_name)
+    try:
+        cache.prefetch(assistant_id)
+    except Exception as e:
+        # JUSTIFICATION: the prefetch is only a warm-up; the filter confirms
+        # any uncached document with a BatchGetItem and degrades on its own.
+        logger.warning(f"Document status prefetch failed for assistant {assistant_id}: {e}")
+        return []
+
+    if lexical_query is None:
+        return []
+    index = get_lexical_index()
+    segments = cache.lexical_segments(assistant_id) if index is not None else {}
+    if not segments:
+        return []
+    try:
+        return index.search(segments, lexical_query, limit)
+    except Exception as e:
+        # JUSTIFICATION: lexical hits only add recall on top of vector
+        # search; without them the turn still gets vector results.
+        logger.warning(f"Lexical search failed for assistant {assistant_id}: {e}")
+        return []
+
+
+def _reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int) -> List[str]:
+    """Merge ranked key lists by sum of ``1 / (k + rank)``; ties keep first-seen order."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda key: -scores[key])
+
+
+async def _fuse_with_lexical_hits(
+    vectors: List[Dict[str, Any]], lexical_hits: List[LexicalHit], top_k: int
+) -> List[Dict[str, Any]]:
+    """Rerank vector results together with lexical hits; fetch lexical-only chunks by key."""
+    by_key = {v.get("key", ""): v for v in vectors}
+    fused = _reciprocal_rank_fusion(
+        [list(by_key), [hit.key for hit in lexical_hits]], _env_int("RAG_RRF_K", _DEFAULT_RRF_K)
+    )
+    missing = [key for key in fused[:top_k] if key not in by_key]
+    if missing:
+        try:
+            for vector in await get_vectors_by_key(missing):
+                by_key[vector["key"]] = vector
+        except Exception as e:
+            # JUSTIFICATION: without their text the lexical-only hits are
+            # dropped and the remaining fused order is used.
+            logger.warning(f"Failed to read {len(missing)} lexical-only chunks: {e}")
+    results = [by_key[key] for key in fused if key in by_key][:top_k]
+    logger.info(
+        f"Hybrid retrieval: {len(vectors)} vector + {len(lexical_hits)} lexical candidates → {len(results)} "
+        f"({sum(1 for r in results if r.get('distance') is None)} lexical-only)"
+    )
+    return results
 
 
 def _filter_vectors_by_document_status(vectors: List[Dict[str, Any]], assistant_id: str) -> List[Dict[str, Any]]:
     """
     Filter vector results to only include chunks from documents with status='complete'.
 
-    Extracts unique document_ids from vector metadata, looks up each document's status
-    in DynamoDB, and removes chunks from documents that are not 'complete' or don't exist.
+    Extracts unique document_ids from vector metadata, resolves which are complete
+    through the document status cache (one BatchGetItem for any not cached), and
+    removes chunks from documents that are not 'complete' or don't exist. Blocking.
 
     On any DynamoDB failure, falls back to returning unfiltered results (graceful degradation).
 
@@ -99,25 +217,9 @@ def _filter_vectors_by_document_status(vectors: List[Dict[str, Any]], assistant_
     try:
         table_name = os.environ.get("DYNAMODB_ASSISTANTS_TABLE_NAME")
         if table_name:
-            region = os.environ.get("AWS_REGION", "us-west-2")
-            dynamodb = boto3.resource("dynamodb", region_name=region)
-            table = dynamodb.Table(table_name)
-            for doc_id in doc_ids:
-                try:
-                    response = table.get_item(
-                        Key={"PK": f"AST#{assistant_id}", "SK": f"DOC#{doc_id}"}
-                    )
-                    item = response.get("Item")
-                    if item and item.get("status") == "complete":
-                        valid_doc_ids.add(doc_id)
-                    else:
-                        logger.info(
-                            f"Filtering out doc {doc_id}: "
-                            f"status={item.get('status') if item else 'NOT_FOUND'}"
-                        )
-                except Exception as e:
-                    logger.warning(f"Failed to look up document {doc_id}: {e}")
-                    # Skip individual lookup failures
+            valid_doc_ids = get_document_status_cache(table_name).complete_documents(assistant_id, doc_ids)
+            for doc_id in doc_ids - valid_doc_ids:
+                logger.info(f"Filtering out doc {doc_id}: not complete")
         else:
             # No table configured — fall back to unfiltered
             logger.warning("DYNAMODB_ASSISTANTS_TABLE_NAME not configured, returning unfiltered results")
@@ -4,20 +4,42 @@ This service handles storing and retrieving assistant data using DynamoDB.
 
 Architecture:
 - Cloud: Stores assistants in DynamoDB table specified by DYNAMODB_ASSISTANTS_TABLE_NAME
+
+Configuration:
+    ASSISTANT_SHARED_LIST_CACHE_TTL_SECONDS: how long a user's list of
+        assistants shared with them is reused (default 30; 0 disables).
+        Sharing changes made through this process invalidate it at once.
 """
 
+import asyncio
 import base64
 import json
 import logging
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .models import Assistant
 
 logger = logging.getLogger(__name__)
 
+_BATCH_GET_MAX_KEYS = 100
+_BATCH_GET_MAX_ATTEMPTS = 5
+_BATCH_GET_BACKOFF_SECONDS = 0.05
+_BATCH_GET_MAX_CONCURRENCY = 8
+_SHARED_LIST_CACHE_MAX_USERS = 1024
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
 
 def _generate_assistant_id() -> str:
     """Generate a unique assistant ID with AST prefix"""
@@ -405,6 +427,93 @@ async def _get_assistant_cloud_without_ownership_check(assistant_id: str, table_
         raise
 
 
+# Low-level client: unlike resources, clients are safe to share across
+# threads, so one serves every batch read instead of one per call
+_dynamodb_client: Any = None
+_dynamodb_client_lock = threading.Lock()
+
+
+def _get_dynamodb_client() -> Any:
+    global _dynamodb_client
+    if _dynamodb_client is None:
+        with _dynamodb_client_lock:
+            if _dynamodb_client is None:
+                import boto3
+
+                _dynamodb_client = boto3.client("dynamodb")
+    return _dynamodb_client
+
+
+async def _batch_get_assistants(assistant_ids: Iterable[str], table_name: str) -> Dict[str, Assistant]:
+    """
+    Retrieve many assistants from DynamoDB without ownership verification
+
+    Keys are sent in BatchGetItem chunks of 100 (the API limit), up to
+    eight chunks at a time. Unprocessed keys are retried with exponential
+    backoff.
+
+    Args:
+        assistant_ids: Assistant identifiers (duplicates are ignored)
+        table_name: DynamoDB table name
+
+    Returns:
+        Dict of assistant_id -> Assistant for the assistants that exist
+
+    Raises:
+        Exception: On DynamoDB errors, or when keys are still unprocessed
+            after the last retry
+    """
+    ordered_ids = list(dict.fromkeys(assistant_id for assistant_id in assistant_ids if assistant_id))
+    if not ordered_ids:
+        return {}
+
+    from boto3.dynamodb.types import TypeDeserializer
+
+    client = _get_dynamodb_client()
+    deserializer = TypeDeserializer()
+    semaphore = asyncio.Semaphore(_BATCH_GET_MAX_CONCURRENCY)
+
+    def _fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+        request = {
+            table_name: {
+                "Keys": [{"PK": {"S": f"AST#{assistant_id}"}, "SK": {"S": "METADATA"}} for assistant_id in chunk]
+            }
+        }
+        items: List[Dict[str, Any]] = []
+        for attempt in range(_BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(_BATCH_GET_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            response = client.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return items
+        raise Exception(
+            f"DynamoDB BatchGetItem left {len(request[table_name]['Keys'])} assistant keys unprocessed"
+        )
+
+    async def _load_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.to_thread(_fetch_chunk, chunk)
+
+    chunks = [ordered_ids[i : i + _BATCH_GET_MAX_KEYS] for i in range(0, len(ordered_ids), _BATCH_GET_MAX_KEYS)]
+    results = await asyncio.gather(*(_load_chunk(chunk) for chunk in chunks))
+
+    assistants: Dict[str, Assistant] = {}
+    for items in results:
+        for raw_item in items:
+            item = {key: deserializer.deserialize(value) for key, value in raw_item.items()}
+            try:
+                assistant = Assistant.model_validate(item)
+            except Exception as e:
+                logger.warning(f"Failed to parse assistant item: {e}")
+                continue
+            assistants[assistant.assistant_id] = assistant
+
+    logger.debug(f"Batch-loaded {len(assistants)} of {len(ordered_ids)} assistants in {len(chunks)} request(s)")
+    return assistants
+
+
 async def update_assistant(
     assistant_id: str,
     owner_id: str,
@@ -481,6 +590,8 @@ async def update_assistant(
         raise RuntimeError("DYNAMODB_ASSISTANTS_TABLE_NAME environment variable is required")
 
     await _update_assistant_cloud(updated_assistant, assistants_table)
+    # Shared users' cached lists hold a copy of this assistant
+    _invalidate_shared_with()
 
     return updated_assistant
 
@@ -807,7 +918,10 @@ async def delete_assistant(assistant_id: str, owner_id: str) -> bool:
     if not assistants_table:
         raise RuntimeError("DYNAMODB_ASSISTANTS_TABLE_NAME environment variable is required")
 
-    return await _delete_assistant_cloud(assistant_id, assistants_table)
+    deleted = await _delete_assistant_cloud(assistant_id, assistants_table)
+    if deleted:
+        _invalidate_shared_with()
+    return deleted
 
 
 async def _delete_assistant_cloud(assistant_id: str, table_name: str) -> bool:
@@ -916,6 +1030,7 @@ async def share_assistant(
                 logger.error(f"Failed to create share record for {email}: {e}")
                 # Continue with other emails even if one fails
 
+        _invalidate_shared_with(normalized_emails)
         return True
 
     except Exception as e:
@@ -978,6 +1093,7 @@ async def update_share_permission(
         logger.info(
             f"Updated share permission for assistant {assistant_id}, email {normalized_email} -> {permission}"
         )
+        _invalidate_shared_with([normalized_email])
         return True
 
     except ClientError as e:
@@ -1041,6 +1157,7 @@ async def unshare_assistant(assistant_id: str, owner_id: str, emails: List[str])
                 logger.error(f"Failed to delete share record for {email}: {e}")
                 # Continue with other emails even if one fails
 
+        _invalidate_shared_with(normalized_emails)
         return True
 
     except Exception as e:
@@ -1083,16 +1200,21 @@ async def list_assistant_shares(assistant_id: str, owner_id: str) -> List[dict]:
         table = dynamodb.Table(assistants_table)
 
         # Query all share records for this assistant
-        response = table.query(
-            KeyConditionExpression=Key("PK").eq(f"AST#{assistant_id}") & Key("SK").begins_with("SHARE#")
-        )
-
+        query_params = {
+            "KeyConditionExpression": Key("PK").eq(f"AST#{assistant_id}") & Key("SK").begins_with("SHARE#")
+        }
         shares: List[dict] = []
-        for item in response.get("Items", []):
-            email = item.get("email")
-            if not email:
-                continue
-            shares.append({"email": email, "permission": item.get("permission", "viewer")})
+        while True:
+            response = table.query(**query_params)
+            for item in response.get("Items", []):
+                email = item.get("email")
+                if not email:
+                    continue
+                shares.append({"email": email, "permission": item.get("permission", "viewer")})
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_params["ExclusiveStartKey"] = last_key
 
         logger.info(f"Found {len(shares)} shares for assistant {assistant_id}")
         return shares
@@ -1201,6 +1323,7 @@ async def mark_share_as_interacted(assistant_id: str, user_email: str) -> bool:
         )
 
         logger.info(f"Marked share as interacted: assistant={assistant_id}, email={normalized_email}")
+        _invalidate_shared_with([normalized_email])
         return True
 
     except ClientError as e:
@@ -1215,10 +1338,66 @@ async def mark_share_as_interacted(assistant_id: str, user_email: str) -> bool:
         return False
 
 
+# ========== Shared-With Listing Cache ==========
+
+# normalized email -> (loaded_at, assistants shared with that user)
+_shared_with_cache: "OrderedDict[str, Tuple[float, List[Assistant]]]" = OrderedDict()
+_shared_with_cache_lock = threading.Lock()
+# Bumped on every invalidation so a listing that raced a share change is not cached
+_shared_with_generation = 0
+
+
+def _copy_assistants(assistants: List[Assistant]) -> List[Assistant]:
+    # Callers annotate the returned models (is_shared_with_me, ...)
+    return [assistant.model_copy(deep=True) for assistant in assistants]
+
+
+def _get_cached_shared_with(email: str) -> Optional[List[Assistant]]:
+    ttl = _env_float("ASSISTANT_SHARED_LIST_CACHE_TTL_SECONDS", 30.0)
+    with _shared_with_cache_lock:
+        entry = _shared_with_cache.get(email)
+        if entry is None:
+            return None
+        loaded_at, assistants = entry
+        if ttl <= 0 or time.monotonic() - loaded_at > ttl:
+            del _shared_with_cache[email]
+            return None
+        _shared_with_cache.move_to_end(email)
+    return _copy_assistants(assistants)
+
+
+def _store_shared_with(email: str, assistants: List[Assistant], generation: int) -> None:
+    if _env_float("ASSISTANT_SHARED_LIST_CACHE_TTL_SECONDS", 30.0) <= 0:
+        return
+    with _shared_with_cache_lock:
+        if generation != _shared_with_generation:
+            return
+        _shared_with_cache[email] = (time.monotonic(), _copy_assistants(assistants))
+        _shared_with_cache.move_to_end(email)
+        while len(_shared_with_cache) > _SHARED_LIST_CACHE_MAX_USERS:
+            _shared_with_cache.popitem(last=False)
+
+
+def _invalidate_shared_with(emails: Optional[Iterable[str]] = None) -> None:
+    """Drop cached shared-assistant lists for the given emails (all users if None)."""
+    global _shared_with_generation
+    with _shared_with_cache_lock:
+        _shared_with_generation += 1
+        if emails is None:
+            _shared_with_cache.clear()
+            return
+        for email in emails:
+            _shared_with_cache.pop(email.lower().strip(), None)
+
+
 async def list_shared_with_user(user_email: str) -> List[Assistant]:
     """
     List all assistants shared with a specific user email.
 
+    Pages through every share record on SharedWithIndex, then loads the
+    assistants with batched BatchGetItem calls. The result is cached per
+    email for ASSISTANT_SHARED_LIST_CACHE_TTL_SECONDS.
+
     Args:
         user_email: User's email address (will be normalized to lowercase)
 
@@ -1229,6 +1408,14 @@ async def list_shared_with_user(user_email: str) -> List[Assistant]:
     if not assistants_table:
         raise RuntimeError("DYNAMODB_ASSISTANTS_TABLE_NAME environment variable is required")
 
+    # Normalize email
+    normalized_email = user_email.lower().strip()
+
+    cached = _get_cached_shared_with(normalized_email)
+    if cached is not None:
+        return cached
+    generation = _shared_with_generation
+
     try:
         import boto3
         from boto3.dynamodb.conditions import Key
@@ -1237,27 +1424,35 @@ async def list_shared_with_user(user_email: str) -> List[Assistant]:
         dynamodb = boto3.resource("dynamodb")
         table = dynamodb.Table(assistants_table)
 
-        # Normalize email
-        normalized_email = user_email.lower().strip()
-
         # Query GSI3 for all assistants shared with this email
-        response = table.query(IndexName="SharedWithIndex", KeyConditionExpression=Key("GSI3_PK").eq(f"SHARE#{normalized_email}"))
+        query_params = {
+            "IndexName": "SharedWithIndex",
+            "KeyConditionExpression": Key("GSI3_PK").eq(f"SHARE#{normalized_email}"),
+        }
+        share_items = []
+        while True:
+            response = table.query(**query_params)
+            share_items.extend(item for item in response.get("Items", []) if item.get("assistantId"))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_params["ExclusiveStartKey"] = last_key
+
+        # Get the full assistant metadata in batches
+        loaded = await _batch_get_assistants(
+            (item["assistantId"] for item in share_items), assistants_table
+        )
 
         assistants = []
-        for item in response.get("Items", []):
-            assistant_id = item.get("assistantId")
-            first_interacted = item.get("firstInteracted", False)  # Default to False if not present
-            share_permission = item.get("permission", "viewer")  # Legacy records default to viewer
-
-            if assistant_id:
-                # Get the full assistant metadata
-                assistant = await _get_assistant_cloud_without_ownership_check(assistant_id, assistants_table)
-                if assistant:
-                    # Attach share metadata as dynamic attributes
-                    assistant.first_interacted = first_interacted
-                    assistant.user_permission = share_permission
-                    assistants.append(assistant)
-
+        for item in share_items:
+            assistant = loaded.get(item["assistantId"])
+            if assistant:
+                # Attach share metadata as dynamic attributes
+                assistant.first_interacted = item.get("firstInteracted", False)  # Default to False if not present
+                assistant.user_permission = item.get("permission", "viewer")  # Legacy records default to viewer
+                assistants.append(assistant)
+
+        _store_shared_with(normalized_email, assistants, generation)
         logger.info(f"Found {len(assistants)} assistants shared with {normalized_email}")
         return assistants
 
@@ -4,7 +4,7 @@ This module provides pricing information for cost calculation by reading from
 the managed models database instead of hardcoded values.
 
 Architecture:
-- Reads pricing from managed models (local files or DynamoDB)
+- Reads pricing from the in-process managed model registry (DynamoDB-backed)
 - Creates pricing snapshots for historical accuracy
 - Supports multi-provider pricing (Bedrock, OpenAI, Gemini)
 """
@@ -13,7 +13,7 @@ import logging
 from typing import Dict, Optional
 from datetime import datetime, timezone
 
-from apis.shared.models.managed_models import list_managed_models
+from apis.shared.models.registry import find_managed_model
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +28,10 @@ async def get_model_by_model_id(model_id: str) -> Optional[Dict[str, any]]:
     Returns:
         ManagedModel if found, None otherwise
     """
-    # Get all managed models (no role filtering, we want admin view)
-    models = await list_managed_models(user_roles=None)
-
-    # Find model with matching model_id
-    for model in models:
-        if model.model_id == model_id:
-            return model
+    # O(1) lookup against the in-process registry (no role filtering)
+    model = await find_managed_model(model_id)
+    if model is not None:
+        return model
 
     logger.warning(f"No managed model found for model_id: {model_id}")
     return None
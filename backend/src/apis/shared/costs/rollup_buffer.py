@@ -0,0 +1,388 @@
+"""Write-behind buffer for system-wide cost rollups.
+
+Every completed message used to spawn an unbounded
+``asyncio.create_task(_update_system_rollups_async(...))`` that issued up
+to six DynamoDB writes against ``SystemCostRollup`` (daily/monthly
+active-user puts, daily + monthly rollup ADDs, per-model active-user put
+and per-model rollup ADD). Under burst traffic those tasks piled up and
+every message paid the full write fan-out, even though the rollup rows
+are only read by the admin dashboard.
+
+``SystemRollupBuffer`` instead accumulates deltas in-process, keyed by
+``(date)``, ``(period)`` and ``(period, model_id)``, and a single
+background task flushes them every few seconds as one atomic ``ADD`` per
+key. Active-user tracking is coalesced too: each distinct user is tracked
+once per flush, and users this process has already tracked for a
+date/period/model are remembered so repeat requests skip the conditional
+put entirely.
+
+A flush issues its writes concurrently, at most
+``COST_ROLLUP_FLUSH_CONCURRENCY`` at a time. Each write is a blocking boto3
+call, and ``DynamoDBStorage`` runs it on a worker thread, so a large flush
+is bounded by the slowest few writes rather than their sum, and it never
+stalls the event loop.
+
+Rollups stay best-effort, exactly as before: a failed flush is logged
+and its deltas are dropped rather than retried, because a lost response
+on an ``ADD`` that actually applied would otherwise double-count.
+
+Configuration:
+    COST_ROLLUP_FLUSH_INTERVAL_SECONDS: flush cadence (default 5)
+    COST_ROLLUP_MAX_PENDING_KEYS: flush early once this many distinct
+        rollup keys are buffered (default 200)
+    COST_ROLLUP_FLUSH_CONCURRENCY: DynamoDB writes in flight during a
+        flush (default 8)
+
+Callers must ``await close_rollup_buffer()`` on shutdown so buffered
+deltas are not lost; the inference API lifespan does this.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Dict, List, Optional, Set, Tuple
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+_DEFAULT_MAX_PENDING_KEYS = 200
+_DEFAULT_FLUSH_CONCURRENCY = 8
+
+# Users already tracked as active by this process. Bounded so a long-lived
+# worker doesn't grow without limit; entries outlive a day so the daily key
+# is never re-put within its own date.
+_TRACKED_CACHE_MAXSIZE = 50_000
+_TRACKED_CACHE_TTL_SECONDS = 26 * 3600
+
+
+@dataclass
+class RollupDelta:
+    """Accumulated counters for one rollup row."""
+
+    cost: float = 0.0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cache_savings: float = 0.0
+    users: Set[str] = field(default_factory=set)
+
+    def add(self, user_id: str, cost: float, usage_delta: dict, cache_savings: float) -> None:
+        self.cost += cost
+        self.requests += 1
+        self.input_tokens += usage_delta.get("inputTokens", 0)
+        self.output_tokens += usage_delta.get("outputTokens", 0)
+        self.cache_read_tokens += usage_delta.get("cacheReadInputTokens", 0)
+        self.cache_write_tokens += usage_delta.get("cacheWriteInputTokens", 0)
+        self.cache_savings += cache_savings
+        self.users.add(user_id)
+
+    def usage_delta(self) -> Dict[str, int]:
+        return {
+            "inputTokens": self.input_tokens,
+            "outputTokens": self.output_tokens,
+            "cacheReadInputTokens": self.cache_read_tokens,
+            "cacheWriteInputTokens": self.cache_write_tokens,
+        }
+
+
+@dataclass
+class _ModelRollupDelta(RollupDelta):
+    model_name: str = ""
+    provider: str = ""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class SystemRollupBuffer:
+    """In-process coalescing stage in front of the ``SystemCostRollup`` writes."""
+
+    def __init__(
+        self,
+        flush_interval_seconds: Optional[float] = None,
+        max_pending_keys: Optional[int] = None,
+        storage=None,
+        flush_concurrency: Optional[int] = None,
+    ):
+        self.flush_interval = (
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else _env_float("COST_ROLLUP_FLUSH_INTERVAL_SECONDS", _DEFAULT_FLUSH_INTERVAL_SECONDS)
+        )
+        self.max_pending_keys = (
+            max_pending_keys
+            if max_pending_keys is not None
+            else int(_env_float("COST_ROLLUP_MAX_PENDING_KEYS", _DEFAULT_MAX_PENDING_KEYS))
+        )
+        self.flush_concurrency = max(1, (
+            flush_concurrency
+            if flush_concurrency is not None
+            else int(_env_float("COST_ROLLUP_FLUSH_CONCURRENCY", _DEFAULT_FLUSH_CONCURRENCY))
+        ))
+        self._storage = storage
+
+        self._daily: Dict[str, RollupDelta] = {}
+        self._monthly: Dict[str, RollupDelta] = {}
+        self._models: Dict[Tuple[str, str], _ModelRollupDelta] = {}
+        # (user, date, period) triples seen since the last flush, so the
+        # flush can track daily + monthly activity with one call per user.
+        self._user_periods: Set[Tuple[str, str, str]] = set()
+
+        self._tracked: TTLCache = TTLCache(maxsize=_TRACKED_CACHE_MAXSIZE, ttl=_TRACKED_CACHE_TTL_SECONDS)
+
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @property
+    def pending_keys(self) -> int:
+        return len(self._daily) + len(self._monthly) + len(self._models)
+
+    def record(
+        self,
+        *,
+        user_id: str,
+        period: str,
+        date: str,
+        cost: float,
+        usage_delta: dict,
+        cache_savings: float,
+        model_id: Optional[str],
+        model_name: Optional[str],
+        provider: Optional[str],
+    ) -> None:
+        """Buffer one message's rollup contribution. Never blocks or raises on I/O."""
+        self._daily.setdefault(date, RollupDelta()).add(user_id, cost, usage_delta, 0.0)
+        self._monthly.setdefault(period, RollupDelta()).add(user_id, cost, usage_delta, cache_savings)
+        self._user_periods.add((user_id, date, period))
+
+        if model_id and model_name and provider:
+            delta = self._models.get((period, model_id))
+            if delta is None:
+                delta = self._models[(period, model_id)] = _ModelRollupDelta(model_name=model_name, provider=provider)
+            delta.add(user_id, cost, usage_delta, 0.0)
+
+        self._ensure_running()
+        if self.pending_keys >= self.max_pending_keys and self._wakeup is not None:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _get_storage(self):
+        if self._storage is None:
+            from apis.shared.storage.dynamodb_storage import DynamoDBStorage
+
+            self._storage = DynamoDBStorage()
+        return self._storage
+
+    def discard_pending(self) -> None:
+        """Forget buffered deltas without writing them."""
+        self._daily = {}
+        self._monthly = {}
+        self._models = {}
+        self._user_periods = set()
+
+    async def flush(self) -> None:
+        """Write all buffered deltas, one ``ADD`` per rollup key."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self.pending_keys:
+                return
+
+            daily, self._daily = self._daily, {}
+            monthly, self._monthly = self._monthly, {}
+            models, self._models = self._models, {}
+            user_periods, self._user_periods = self._user_periods, set()
+
+            try:
+                storage = self._get_storage()
+                new_daily, new_monthly = await self._track_users(storage, user_periods)
+                new_model_users = await self._track_model_users(storage, models)
+
+                writes: List[Awaitable] = [
+                    storage.update_daily_rollup(
+                        date=date,
+                        cost_delta=delta.cost,
+                        usage_delta=delta.usage_delta(),
+                        request_count=delta.requests,
+                        new_user_count=new_daily.get(date, 0),
+                    )
+                    for date, delta in daily.items()
+                ]
+                writes += [
+                    storage.update_monthly_rollup(
+                        period=period,
+                        cost_delta=delta.cost,
+                        usage_delta=delta.usage_delta(),
+                        cache_savings_delta=delta.cache_savings,
+                        request_count=delta.requests,
+                        new_user_count=new_monthly.get(period, 0),
+                    )
+                    for period, delta in monthly.items()
+                ]
+                writes += [
+                    storage.update_model_rollup(
+                        period=period,
+                        model_id=model_id,
+                        model_name=delta.model_name,
+                        provider=delta.provider,
+                        cost_delta=delta.cost,
+                        usage_delta=delta.usage_delta(),
+                        request_count=delta.requests,
+                        new_user_count=new_model_users.get((period, model_id), 0),
+                    )
+                    for (period, model_id), delta in models.items()
+                ]
+                await self._run_bounded(writes)
+
+                logger.debug(
+                    "📈 Flushed system rollups: %d daily, %d monthly, %d model key(s)",
+                    len(daily), len(monthly), len(models),
+                )
+            except Exception as e:
+                # JUSTIFICATION: System rollups are supplementary admin-dashboard
+                # aggregates; the primary cost data lives in the C# records.
+                # Dropping a failed window is preferable to double-counting on retry.
+                logger.error(f"Failed to flush system rollups (non-critical): {e}", exc_info=True)
+
+    async def _run_bounded(self, calls: List[Awaitable]) -> list:
+        """Await ``calls`` with at most ``flush_concurrency`` in flight.
+
+        Every call runs to completion before the first failure, if any, is
+        re-raised, so a failed write never leaves others running unobserved.
+        """
+        semaphore = asyncio.Semaphore(self.flush_concurrency)
+
+        async def _one(call: Awaitable):
+            async with semaphore:
+                return await call
+
+        results = await asyncio.gather(*(_one(call) for call in calls), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _track_users(self, storage, user_periods: Set[Tuple[str, str, str]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Track each distinct user once; return new-user counts per date and period."""
+        pending = [
+            (user_id, date, period)
+            for user_id, date, period in user_periods
+            if ("daily", date, user_id) not in self._tracked or ("monthly", period, user_id) not in self._tracked
+        ]
+        results = await self._run_bounded([
+            storage.track_active_user(user_id=user_id, period=period, date=date)
+            for user_id, date, period in pending
+        ])
+
+        new_daily: Dict[str, int] = {}
+        new_monthly: Dict[str, int] = {}
+        for (user_id, date, period), (is_new_today, is_new_this_month) in zip(pending, results):
+            if is_new_today:
+                new_daily[date] = new_daily.get(date, 0) + 1
+            if is_new_this_month:
+                new_monthly[period] = new_monthly.get(period, 0) + 1
+            self._tracked[("daily", date, user_id)] = True
+            self._tracked[("monthly", period, user_id)] = True
+        return new_daily, new_monthly
+
+    async def _track_model_users(
+        self, storage, models: Dict[Tuple[str, str], _ModelRollupDelta]
+    ) -> Dict[Tuple[str, str], int]:
+        """Track each user once per model; return new-user counts per (period, model)."""
+        pending = [
+            (period, model_id, user_id)
+            for (period, model_id), delta in models.items()
+            for user_id in delta.users
+            if ("model", period, model_id, user_id) not in self._tracked
+        ]
+        results = await self._run_bounded([
+            storage.track_active_user_for_model(user_id=user_id, period=period, model_id=model_id)
+            for period, model_id, user_id in pending
+        ])
+
+        new_users: Dict[Tuple[str, str], int] = {}
+        for (period, model_id, user_id), is_new in zip(pending, results):
+            if is_new:
+                new_users[(period, model_id)] = new_users.get((period, model_id), 0) + 1
+            self._tracked[("model", period, model_id, user_id)] = True
+        return new_users
+
+    # ------------------------------------------------------------------
+    # Background task lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_running(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._closed:
+            return
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run(), name="cost-rollup-flush")
+
+    async def _run(self) -> None:
+        wakeup = self._wakeup
+        while not self._closed:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+
+    async def close(self) -> None:
+        """Stop the background task and flush whatever is still buffered."""
+        self._closed = True
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self.flush()
+
+
+_buffer: Optional[SystemRollupBuffer] = None
+
+
+def get_rollup_buffer() -> SystemRollupBuffer:
+    """Return the process-wide rollup buffer, creating it on first use."""
+    global _buffer
+    if _buffer is None:
+        _buffer = SystemRollupBuffer()
+    return _buffer
+
+
+async def close_rollup_buffer() -> None:
+    """Flush and discard the process-wide buffer. Safe to call when unused."""
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        await buffer.close()
@@ -7,7 +7,9 @@ operations used by both the app API and inference API.
 from .bedrock_embeddings import (
     BEDROCK_EMBEDDING_CONFIG,
     delete_vectors_for_document,
+    embed_and_store,
     generate_embeddings,
+    get_embedding_stats,
     search_assistant_knowledgebase,
     store_embeddings_in_s3,
 )
@@ -15,7 +17,9 @@ from .bedrock_embeddings import (
 __all__ = [
     "BEDROCK_EMBEDDING_CONFIG",
     "delete_vectors_for_document",
+    "embed_and_store",
     "generate_embeddings",
+    "get_embedding_stats",
     "search_assistant_knowledgebase",
     "store_embeddings_in_s3",
 ]
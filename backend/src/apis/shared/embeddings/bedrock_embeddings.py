@@ -6,16 +6,22 @@ S3 vector store operations (store, search, delete).
 NOTE: This module intentionally has NO tiktoken dependency.
 Token validation/chunk splitting lives in the ingestion pipeline
 (apis.app_api.documents.ingestion) where tiktoken is available.
+
+Configuration:
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES: search-query embeddings kept apart
+        from the engine's shared cache (default 1024; 0 disables)
 """
 
 import asyncio
-import json
 import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import boto3
 
+from .embedding_engine import EmbeddingCache, EmbeddingEngine, embedding_cache_key, normalize_text
+from .vector_writer import ProgressCallback, VectorWriter, get_s3vectors_client
+
 # Module-level constants (read once at import time, but not validated until use)
 _VECTOR_STORE_BUCKET_NAME = os.environ.get("S3_ASSISTANTS_VECTOR_STORE_BUCKET_NAME")
 _VECTOR_STORE_INDEX_NAME = os.environ.get("S3_ASSISTANTS_VECTOR_STORE_INDEX_NAME")
@@ -48,9 +54,29 @@ def _get_vector_store_index() -> str:
     return _VECTOR_STORE_INDEX_NAME
 
 
+_engine: Optional[EmbeddingEngine] = None
+
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """Return the process-wide embedding engine (created on first use)."""
+    global _engine
+    if _engine is None:
+        _engine = EmbeddingEngine(model_id=BEDROCK_EMBEDDING_CONFIG["model_id"], region_name=AWS_REGION)
+    return _engine
+
+
+def get_embedding_stats() -> Dict[str, float]:
+    """Cache hit rate, per-batch latency and throttle counters."""
+    return get_embedding_engine().stats.to_dict()
+
+
 async def generate_embeddings(chunks: List[str]) -> List[List[float]]:
     """
-    Generate embeddings for text chunks using Bedrock (parallelized)
+    Generate embeddings for text chunks using Bedrock
+
+    Calls run with bounded, throttle-adaptive concurrency and are served
+    from the content-hash cache when the same text was embedded before
+    (see ``embedding_engine``).
 
     Supported models:
     - amazon.titan-embed-text-v2:0 (1024 dimensions)
@@ -66,41 +92,9 @@ async def generate_embeddings(chunks: List[str]) -> List[List[float]]:
         List of embedding vectors (one per chunk)
 
     Raises:
-        Exception: If Bedrock API call fails
+        Exception: If a Bedrock API call fails after retries
     """
-    bedrock_runtime = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-
-    logger.info(f"Generating embeddings for {len(chunks)} chunks in parallel...")
-
-    async def get_single_embedding(chunk: str, index: int) -> List[float]:
-        """Generate embedding for a single chunk"""
-        loop = asyncio.get_event_loop()
-
-        # Run synchronous boto3 call in thread pool to avoid blocking
-        response = await loop.run_in_executor(
-            None,
-            lambda: bedrock_runtime.invoke_model(
-                modelId=BEDROCK_EMBEDDING_CONFIG["model_id"],
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps({"inputText": chunk}),
-            ),
-        )
-
-        response_body = json.loads(response["body"].read())
-        embedding = response_body.get("embedding")
-
-        # Log progress for large batches
-        if (index + 1) % 20 == 0:
-            logger.info(f"Generated embeddings for {index + 1}/{len(chunks)} chunks...")
-
-        return embedding
-
-    # Generate all embeddings in parallel
-    embeddings = await asyncio.gather(*[get_single_embedding(chunk, i) for i, chunk in enumerate(chunks)])
-
-    logger.info(f"All {len(embeddings)} embeddings generated successfully")
-    return embeddings
+    return await get_embedding_engine().embed(chunks)
 
 
 async def store_embeddings_in_s3(
@@ -108,58 +102,138 @@ async def store_embeddings_in_s3(
 ) -> str:
     """
     Store embeddings directly into the S3 Vector Index in batches.
-    """
-    s3vectors = boto3.client("s3vectors", region_name=AWS_REGION)
 
+    Batches are uploaded concurrently by a ``VectorWriter``; use
+    ``embed_and_store`` to also overlap upload with embedding generation.
+    """
     vector_bucket = _get_vector_store_bucket()
     vector_index = _get_vector_store_index()
     logger.info(f"Storing {len(chunks)} chunks for {document_id} in {vector_bucket} (index: {vector_index})")
 
-    BATCH_SIZE = 50  # Safe batch size to stay under S3 Vectors request body limit
+    async with _vector_writer(assistant_id, document_id, metadata, len(chunks)) as writer:
+        await writer.put(0, chunks, embeddings)
+
+    return f"Indexed {len(chunks)} chunks for {document_id}"
 
-    for batch_start in range(0, len(chunks), BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, len(chunks))
-        batch_payload = []
 
-        for i in range(batch_start, batch_end):
-            batch_payload.append({
-                "key": f"{document_id}#{i}",
-                "data": {"float32": embeddings[i]},
-                "metadata": {
-                    "text": chunks[i],
-                    "document_id": document_id,
-                    "assistant_id": assistant_id,
-                    "source": metadata.get("filename", "unknown"),
-                },
-            })
+async def embed_and_store(
+    assistant_id: str,
+    document_id: str,
+    chunks: List[str],
+    metadata: Dict[str, Any],
+    progress_callback: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Embed chunks and store them in the S3 Vector Index as one pipeline.
 
-        s3vectors.put_vectors(vectorBucketName=vector_bucket, indexName=vector_index, vectors=batch_payload)
+    Chunks are embedded in slices of ``EMBED_STORE_SLICE_SIZE`` (default
+    200); each finished slice is handed to the vector writer, whose workers
+    upload it while the next slice is being embedded.
 
-        if batch_end % 500 == 0 or batch_end == len(chunks):
-            logger.info(f"Stored {batch_end}/{len(chunks)} vectors")
+    Args:
+        assistant_id: Owning assistant
+        document_id: Document the chunks belong to (vector keys are
+            ``{document_id}#{chunk_index}``)
+        chunks: Validated text chunks
+        metadata: Document metadata (``filename`` is stored as ``source``)
+        progress_callback: Optional ``(embedded, stored, total)`` callback,
+            sync or async
+
+    Returns:
+        Summary message
+    """
+    vector_bucket = _get_vector_store_bucket()
+    vector_index = _get_vector_store_index()
+    logger.info(f"Embedding and storing {len(chunks)} chunks for {document_id} in {vector_bucket} (index: {vector_index})")
+
+    try:
+        slice_size = max(1, int(os.environ.get("EMBED_STORE_SLICE_SIZE", 200)))
+    except ValueError:
+        slice_size = 200
+
+    async with _vector_writer(assistant_id, document_id, metadata, len(chunks), progress_callback) as writer:
+        for start in range(0, len(chunks), slice_size):
+            chunk_slice = chunks[start : start + slice_size]
+            embeddings = await generate_embeddings(chunk_slice)
+            await writer.put(start, chunk_slice, embeddings)
 
     return f"Indexed {len(chunks)} chunks for {document_id}"
 
 
-async def search_assistant_knowledgebase(assistant_id: str, query: str):
-    """Search the S3 vector store for chunks relevant to the query."""
-    client = boto3.client("s3vectors", region_name=AWS_REGION)
+def _vector_writer(
+    assistant_id: str,
+    document_id: str,
+    metadata: Dict[str, Any],
+    total: int,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> VectorWriter:
+    return VectorWriter(
+        client=get_s3vectors_client(AWS_REGION),
+        vector_bucket=_get_vector_store_bucket(),
+        vector_index=_get_vector_store_index(),
+        assistant_id=assistant_id,
+        document_id=document_id,
+        metadata=metadata,
+        total=total,
+        progress_callback=progress_callback,
+    )
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
 
-    # Generate vector for the query (short string, no token validation needed)
-    query_embedding = await generate_embeddings([query])
+
+# Search queries get their own small LRU so that a large document upload
+# in the same process cannot push every recent question out of the engine's
+# shared cache.
+_query_cache = EmbeddingCache(_env_int("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", 1024))
+
+
+async def embed_query(query: str) -> List[float]:
+    """Embedding for a search query, cached per normalized query text."""
+    key = embedding_cache_key(BEDROCK_EMBEDDING_CONFIG["model_id"], normalize_text(query))
+    cached = _query_cache.get(key)
+    if cached is not None:
+        return cached
+    # Short string, no token validation needed
+    embedding = (await generate_embeddings([query]))[0]
+    _query_cache.put(key, embedding)
+    return embedding
+
+
+async def search_assistant_knowledgebase(assistant_id: str, query: str, top_k: int = 5):
+    """Search the S3 vector store for chunks relevant to the query."""
+    query_embedding = await embed_query(query)
 
     # Query the Global Index with a STRICT Filter
-    response = client.query_vectors(
+    return await asyncio.to_thread(
+        get_s3vectors_client(AWS_REGION).query_vectors,
         vectorBucketName=_get_vector_store_bucket(),
         indexName=_get_vector_store_index(),
-        queryVector={"float32": query_embedding[0]},
+        queryVector={"float32": query_embedding},
         filter={"assistant_id": assistant_id},
-        topK=5,
+        topK=top_k,
         returnMetadata=True,
         returnDistance=True,
     )
 
-    return response
+
+async def get_vectors_by_key(keys: List[str]) -> List[Dict[str, Any]]:
+    """Stored chunks (key and metadata, without vector data) for ``keys``; unknown keys are left out."""
+    if not keys:
+        return []
+    response = await asyncio.to_thread(
+        get_s3vectors_client(AWS_REGION).get_vectors,
+        vectorBucketName=_get_vector_store_bucket(),
+        indexName=_get_vector_store_index(),
+        keys=keys,
+        returnData=False,
+        returnMetadata=True,
+    )
+    return response.get("vectors", [])
 
 
 async def delete_vectors_for_document(document_id: str) -> int:
@@ -0,0 +1,382 @@
+"""Bounded-concurrency Bedrock embedding engine with a content-hash cache.
+
+``generate_embeddings`` used to start one ``invoke_model`` per chunk under
+an unbounded ``asyncio.gather`` on the default executor. A 3,000-chunk
+document queued 3,000 blocking calls behind the loop's shared thread pool
+and reliably tripped Bedrock throttling, with nothing to retry or back off.
+
+``EmbeddingEngine`` replaces that with:
+
+- a dedicated thread pool and one shared ``bedrock-runtime`` client, sized
+  to ``EMBEDDING_MAX_CONCURRENCY`` (default 8)
+- an adaptive limiter that halves the number of in-flight calls when
+  Bedrock throttles and grows it back one call at a time as requests
+  succeed (AIMD), plus exponential backoff with full jitter on retryable
+  errors, up to ``EMBEDDING_MAX_RETRIES`` (default 6) retries per text
+- an in-process LRU cache keyed by sha256(model id + normalized text),
+  bounded by ``EMBEDDING_CACHE_MAX_ENTRIES`` (default 4096, about 8 KiB per
+  1024-dim vector). Re-uploads, re-crawls of unchanged pages and repeated
+  search queries are served without calling Bedrock, and duplicate texts
+  inside one batch are embedded once.
+
+Hit rate, per-batch latency and throttle/retry counters are exposed via
+``get_embedding_stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_CONCURRENCY = 8
+_DEFAULT_MAX_RETRIES = 6
+_DEFAULT_CACHE_MAX_ENTRIES = 4096
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_MAX_SECONDS = 20.0
+# Throttles that land within this window of the last decrease are treated as
+# the same congestion event, so a burst of N concurrent 429s halves the limit
+# once instead of N times.
+_DECREASE_COOLDOWN_SECONDS = 1.0
+
+_RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException",
+}
+_THROTTLE_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for embedding and cache keys (NFC, trimmed)."""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def embedding_cache_key(model_id: str, normalized_text: str) -> str:
+    """sha256 over model id and normalized text."""
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalized_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _error_code(exc: BaseException) -> Optional[str]:
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embedding vectors keyed by content hash."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                return None
+            self._entries.move_to_end(key)
+        return vector.tolist()
+
+    def put(self, key: str, vector: List[float]) -> None:
+        if self.max_entries == 0:
+            return
+        # array('d') keeps the exact values at 8 bytes per dimension instead
+        # of a list of boxed floats (~32 bytes per dimension).
+        packed = array("d", vector)
+        with self._lock:
+            self._entries[key] = packed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class EmbeddingStats:
+    """Running counters for the embedding engine."""
+
+    batches: int = 0
+    texts: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    bedrock_calls: int = 0
+    throttles: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_batch_ms: float = 0.0
+    max_batch_ms: float = 0.0
+    last_batch_ms: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "cacheHits": self.cache_hits,
+            "cacheMisses": self.cache_misses,
+            "hitRate": round(self.hit_rate, 4),
+            "bedrockCalls": self.bedrock_calls,
+            "throttles": self.throttles,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avgBatchMs": round(self.total_batch_ms / self.batches, 3) if self.batches else 0.0,
+            "maxBatchMs": round(self.max_batch_ms, 3),
+            "lastBatchMs": round(self.last_batch_ms, 3),
+        }
+
+
+class _AdaptiveLimiter:
+    """AIMD concurrency limit: halve on throttle, +1 per window of successes."""
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, throttled: bool = False) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease >= _DECREASE_COOLDOWN_SECONDS:
+                    self.limit = max(1, self.limit // 2)
+                    self._last_decrease = now
+                    logger.info(f"Bedrock embedding throttled; concurrency limit → {self.limit}")
+                self._successes = 0
+            elif self.limit < self.max_limit:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+class EmbeddingEngine:
+    """Generates Bedrock embeddings with bounded concurrency and caching."""
+
+    def __init__(
+        self,
+        model_id: str,
+        region_name: str,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        cache_max_entries: Optional[int] = None,
+    ):
+        self.model_id = model_id
+        self.region_name = region_name
+        self.max_concurrency = max(
+            1,
+            max_concurrency if max_concurrency is not None
+            else _env_int("EMBEDDING_MAX_CONCURRENCY", _DEFAULT_MAX_CONCURRENCY),
+        )
+        self.max_retries = max(
+            0,
+            max_retries if max_retries is not None
+            else _env_int("EMBEDDING_MAX_RETRIES", _DEFAULT_MAX_RETRIES),
+        )
+        self.cache = EmbeddingCache(
+            cache_max_entries if cache_max_entries is not None
+            else _env_int("EMBEDDING_CACHE_MAX_ENTRIES", _DEFAULT_CACHE_MAX_ENTRIES)
+        )
+        self.stats = EmbeddingStats()
+
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # asyncio primitives are bound to the loop they were created on; the
+        # ingestion Lambda runs a fresh loop per invocation.
+        self._limiter: Optional[_AdaptiveLimiter] = None
+        self._limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return one embedding per input text, in input order."""
+        started = time.perf_counter()
+        normalized = [normalize_text(text) for text in texts]
+        keys = [embedding_cache_key(self.model_id, text) for text in normalized]
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        # cache key -> (normalized text, indexes that need it)
+        pending: Dict[str, tuple[str, List[int]]] = {}
+        hits = 0
+        for index, key in enumerate(keys):
+            if key in pending:
+                pending[key][1].append(index)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = cached
+                hits += 1
+            else:
+                pending[key] = (normalized[index], [index])
+
+        self.stats.cache_hits += hits
+        self.stats.cache_misses += len(texts) - hits
+
+        if pending:
+            logger.info(
+                f"Generating embeddings for {len(texts)} chunks "
+                f"({hits} cached, {len(pending)} Bedrock calls, concurrency ≤ {self.max_concurrency})..."
+            )
+            completed = 0
+
+            async def embed_one(key: str, text: str, indexes: List[int]) -> None:
+                nonlocal completed
+                vector = await self._invoke_with_backoff(text)
+                self.cache.put(key, vector)
+                for index in indexes:
+                    results[index] = vector
+                completed += 1
+                if completed % 100 == 0:
+                    logger.info(f"Generated embeddings for {completed}/{len(pending)} unique chunks...")
+
+            tasks = [asyncio.ensure_future(embed_one(key, text, indexes)) for key, (text, indexes) in pending.items()]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats.batches += 1
+        self.stats.texts += len(texts)
+        self.stats.total_batch_ms += elapsed_ms
+        self.stats.last_batch_ms = elapsed_ms
+        self.stats.max_batch_ms = max(self.stats.max_batch_ms, elapsed_ms)
+        logger.info(
+            f"Embedded {len(texts)} chunks in {elapsed_ms:.0f}ms "
+            f"(cache hits {hits}/{len(texts)}, lifetime hit rate {self.stats.hit_rate:.1%})"
+        )
+        return results  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Shut down the worker pool; in-flight calls are allowed to finish."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import boto3
+                    from botocore.config import Config
+
+                    # Retries are handled here so throttling can also shrink
+                    # the concurrency limit; botocore's own retries would hide it.
+                    self._client = boto3.client(
+                        "bedrock-runtime",
+                        region_name=self.region_name,
+                        config=Config(
+                            max_pool_connections=self.max_concurrency,
+                            retries={"total_max_attempts": 1},
+                        ),
+                    )
+        return self._client
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="bedrock-embed",
+            )
+        return self._executor
+
+    def _get_limiter(self) -> _AdaptiveLimiter:
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter_loop is not loop:
+            self._limiter = _AdaptiveLimiter(self.max_concurrency)
+            self._limiter_loop = loop
+        return self._limiter
+
+    def _invoke(self, text: str) -> List[float]:
+        response = self._get_client().invoke_model(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps({"inputText": text}),
+        )
+        return json.loads(response["body"].read()).get("embedding")
+
+    async def _invoke_with_backoff(self, text: str) -> List[float]:
+        limiter = self._get_limiter()
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            throttled = False
+            try:
+                self.stats.bedrock_calls += 1
+                return await loop.run_in_executor(self._get_executor(), self._invoke, text)
+            except Exception as e:
+                code = _error_code(e)
+                if code not in _RETRYABLE_ERROR_CODES or attempt >= self.max_retries:
+                    self.stats.failures += 1
+                    raise
+                throttled = code in _THROTTLE_ERROR_CODES
+                if throttled:
+                    self.stats.throttles += 1
+            finally:
+                await limiter.release(throttled=throttled)
+
+            # Full jitter: sleep a random slice of the exponential window.
+            delay = random.uniform(0, min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2**attempt)))
+            attempt += 1
+            self.stats.retries += 1
+            logger.debug(f"Retrying Bedrock embedding after {code} (attempt {attempt}, sleeping {delay:.2f}s)")
+            await asyncio.sleep(delay)
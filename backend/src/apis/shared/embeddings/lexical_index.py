@@ -0,0 +1,415 @@
+"""Per-document inverted index segments for lexical (BM25) retrieval.
+
+Vector search alone misses exact-match queries: course codes, policy
+numbers, SKUs. They embed close to any text that looks like them. The
+ingestion pipeline therefore also builds a small inverted index over the
+same chunks it embeds. ``build_segment`` produces one segment per document.
+``store_lexical_segment`` gzips it into the documents bucket under
+
+    lexical-index/{assistant_id}/{document_id}/{version}.lxi.gz
+
+The bucket's ingestion trigger only watches ``assistants/``, so this prefix
+never fires it. ``version`` is a hash of the chunk texts, and the key is
+recorded on the document row as ``lexicalIndexKey``. Re-ingesting changed
+content produces a new key, so readers never serve a stale segment.
+
+Segment layout (little-endian, terms sorted by their UTF-8 bytes so that a
+lookup is a binary search over the mapped file):
+
+    header       magic "LXI1", chunk count, term count, total term count,
+                 term blob length
+    lengths      u32 per chunk (terms in the chunk)
+    term table   per term: blob offset u32, length u16, postings offset u32,
+                 postings count u32
+    term blob    UTF-8 terms, concatenated
+    postings     per posting: chunk index u32, term frequency u16
+
+On the inference side ``LexicalIndex`` downloads each segment once, writes
+it decompressed to local disk and memory-maps it. Queries then read only
+the term-table entries and posting lists they touch. Open segments are
+kept in an LRU; an evicted segment's file is removed and its mapping is
+released once no search is still reading it.
+
+Configuration:
+    LEXICAL_INDEX_CACHE_DIR: where decompressed segments are kept
+        (default /tmp/lexical-index)
+    LEXICAL_INDEX_MAX_OPEN_SEGMENTS: memory-mapped segments kept open
+        (default 256)
+    LEXICAL_INDEX_LOAD_CONCURRENCY: parallel segment downloads (default 8)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_INDEX_PREFIX = "lexical-index/"
+
+_MAGIC = b"LXI1"
+_HEADER = struct.Struct("<4sIIQI")
+_TERM_ENTRY = struct.Struct("<IHII")
+_POSTING = struct.Struct("<IH")
+_CHUNK_LENGTH = struct.Struct("<I")
+_MAX_TERM_FREQUENCY = 0xFFFF
+
+_TOKEN_RE = re.compile(r"\w+(?:[-./:]\w+)*")
+_PART_SPLIT_RE = re.compile(r"[-./:_]")
+_MAX_TERM_LENGTH = 64
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were will with".split()
+)
+
+# BM25 parameters (the usual defaults)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "lexical-index")
+_DEFAULT_MAX_OPEN_SEGMENTS = 256
+_DEFAULT_LOAD_CONCURRENCY = 8
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased index terms of ``text``, in order.
+
+    Identifiers joined by ``-``, ``.``, ``/``, ``:`` or ``_`` (``CS-101``,
+    ``POL.2024.03``) are kept whole and also split into their parts, so that
+    ``CS-101`` matches both ``cs-101`` and ``cs 101``.
+    """
+    terms: List[str] = []
+    for match in _TOKEN_RE.finditer(unicodedata.normalize("NFKC", text).lower()):
+        token = match.group()
+        if len(token) > _MAX_TERM_LENGTH:
+            continue
+        parts = _PART_SPLIT_RE.split(token)
+        if len(parts) > 1:
+            terms.append(token)
+            terms.extend(part for part in parts if part and part not in _STOPWORDS)
+        elif token not in _STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def segment_version(chunks: Sequence[str]) -> str:
+    """Content hash of a document's chunks; changes whenever the text does."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def segment_key(assistant_id: str, document_id: str, version: str) -> str:
+    return f"{LEXICAL_INDEX_PREFIX}{assistant_id}/{document_id}/{version}.lxi.gz"
+
+
+def build_segment(chunks: Sequence[str]) -> bytes:
+    """Serialize an inverted index over ``chunks`` (chunk ``i`` is vector ``{document_id}#{i}``)."""
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    lengths: List[int] = []
+    for chunk_index, chunk in enumerate(chunks):
+        terms = tokenize(chunk)
+        lengths.append(len(terms))
+        for term, frequency in Counter(terms).items():
+            postings.setdefault(term, []).append((chunk_index, min(frequency, _MAX_TERM_FREQUENCY)))
+
+    terms_sorted = sorted((term.encode("utf-8"), plist) for term, plist in postings.items())
+    blob = bytearray()
+    table = bytearray()
+    posting_bytes = bytearray()
+    posting_offset = 0
+    for term_bytes, plist in terms_sorted:
+        table += _TERM_ENTRY.pack(len(blob), len(term_bytes), posting_offset, len(plist))
+        blob += term_bytes
+        for chunk_index, frequency in plist:
+            posting_bytes += _POSTING.pack(chunk_index, frequency)
+        posting_offset += len(plist)
+
+    header = _HEADER.pack(_MAGIC, len(chunks), len(terms_sorted), sum(lengths), len(blob))
+    chunk_lengths = struct.pack(f"<{len(lengths)}I", *lengths)
+    return b"".join((header, chunk_lengths, bytes(table), bytes(blob), bytes(posting_bytes)))
+
+
+class LexicalSegment:
+    """Read-only view over one serialized segment (bytes or a memory map)."""
+
+    def __init__(self, buffer: Any):
+        magic, chunk_count, term_count, total_length, blob_length = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a lexical index segment")
+        self._buffer = buffer
+        self.chunk_count = chunk_count
+        self.term_count = term_count
+        self.total_length = total_length
+        self._lengths_offset = _HEADER.size
+        self._table_offset = self._lengths_offset + chunk_count * _CHUNK_LENGTH.size
+        self._blob_offset = self._table_offset + term_count * _TERM_ENTRY.size
+        self._postings_offset = self._blob_offset + blob_length
+
+    def chunk_length(self, chunk_index: int) -> int:
+        return _CHUNK_LENGTH.unpack_from(self._buffer, self._lengths_offset + chunk_index * _CHUNK_LENGTH.size)[0]
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        """``(chunk_index, term_frequency)`` pairs for ``term``; empty if absent."""
+        target = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, postings_at, count = _TERM_ENTRY.unpack_from(
+                self._buffer, self._table_offset + mid * _TERM_ENTRY.size
+            )
+            start = self._blob_offset + offset
+            candidate = self._buffer[start : start + length]
+            if candidate == target:
+                base = self._postings_offset + postings_at * _POSTING.size
+                return [_POSTING.unpack_from(self._buffer, base + i * _POSTING.size) for i in range(count)]
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return []
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+@dataclass(frozen=True)
+class LexicalHit:
+    """One chunk matched by a lexical query."""
+
+    document_id: str
+    chunk_index: int
+    score: float
+
+    @property
+    def key(self) -> str:
+        """Vector key of the chunk (``{document_id}#{chunk_index}``)."""
+        return f"{self.document_id}#{self.chunk_index}"
+
+
+_s3_client: Any = None
+_s3_client_lock = threading.Lock()
+
+
+def _get_s3_client() -> Any:
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+
+                _s3_client = boto3.client("s3", region_name=os.environ.get("AWS_REGION", "us-west-2"))
+    return _s3_client
+
+
+def _get_documents_bucket() -> Optional[str]:
+    return os.environ.get("S3_ASSISTANTS_DOCUMENTS_BUCKET_NAME")
+
+
+async def store_lexical_segment(assistant_id: str, document_id: str, chunks: Sequence[str]) -> str:
+    """Build and upload the document's segment; returns its S3 key (``lexicalIndexKey``)."""
+    bucket = _get_documents_bucket()
+    if not bucket:
+        raise ValueError("S3_ASSISTANTS_DOCUMENTS_BUCKET_NAME environment variable is required")
+    key = segment_key(assistant_id, document_id, segment_version(chunks))
+    body = gzip.compress(build_segment(chunks))
+    await asyncio.to_thread(
+        _get_s3_client().put_object,
+        Bucket=bucket,
+        Key=key,
+        Body=body,
+        ContentType="application/octet-stream",
+        ContentEncoding="gzip",
+    )
+    logger.info(f"📇 Stored lexical index for {document_id} ({len(chunks)} chunks, {len(body)} bytes) at {key}")
+    return key
+
+
+async def delete_lexical_segments(assistant_id: str, document_id: str) -> int:
+    """Delete every stored segment version of a document. Returns the number deleted."""
+    bucket = _get_documents_bucket()
+    if not bucket:
+        return 0
+    client = _get_s3_client()
+    prefix = f"{LEXICAL_INDEX_PREFIX}{assistant_id}/{document_id}/"
+    response = await asyncio.to_thread(client.list_objects_v2, Bucket=bucket, Prefix=prefix)
+    keys = [{"Key": obj["Key"]} for obj in response.get("Contents", [])]
+    if keys:
+        await asyncio.to_thread(client.delete_objects, Bucket=bucket, Delete={"Objects": keys, "Quiet": True})
+    return len(keys)
+
+
+class LexicalIndex:
+    """BM25 search over the memory-mapped segments of an assistant's documents."""
+
+    def __init__(
+        self,
+        bucket: str,
+        cache_dir: Optional[str] = None,
+        max_open_segments: Optional[int] = None,
+        load_concurrency: Optional[int] = None,
+    ):
+        self.bucket = bucket
+        self.cache_dir = cache_dir or os.environ.get("LEXICAL_INDEX_CACHE_DIR", _DEFAULT_CACHE_DIR)
+        self.max_open_segments = max(
+            1, max_open_segments or _env_int("LEXICAL_INDEX_MAX_OPEN_SEGMENTS", _DEFAULT_MAX_OPEN_SEGMENTS)
+        )
+        workers = max(1, load_concurrency or _env_int("LEXICAL_INDEX_LOAD_CONCURRENCY", _DEFAULT_LOAD_CONCURRENCY))
+        # segment key -> open segment, or None when the object does not exist
+        self._segments: "OrderedDict[str, Optional[LexicalSegment]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loader = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lexical-index")
+
+    def search(self, segment_keys: Mapping[str, str], query: str, limit: int) -> List[LexicalHit]:
+        """Top ``limit`` chunks for ``query`` across documents. Blocking.
+
+        ``segment_keys`` maps document ID to ``lexicalIndexKey``; statistics
+        (document frequency, average chunk length) are computed over exactly
+        those documents.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not segment_keys or limit <= 0:
+            return []
+
+        segments = self._load_all(segment_keys)
+        chunk_total = sum(segment.chunk_count for _, segment in segments)
+        if chunk_total == 0:
+            return []
+        average_length = max(1.0, sum(segment.total_length for _, segment in segments) / chunk_total)
+
+        scores: Dict[Tuple[str, int], float] = {}
+        for term in terms:
+            matches = [(document_id, segment, segment.postings(term)) for document_id, segment in segments]
+            frequency = sum(len(postings) for _, _, postings in matches)
+            if frequency == 0:
+                continue
+            idf = math.log(1.0 + (chunk_total - frequency + 0.5) / (frequency + 0.5))
+            for document_id, segment, postings in matches:
+                for chunk_index, tf in postings:
+                    norm = 1.0 - _BM25_B + _BM25_B * segment.chunk_length(chunk_index) / average_length
+                    score = idf * tf * (_BM25_K1 + 1.0) / (tf + _BM25_K1 * norm)
+                    scores[(document_id, chunk_index)] = scores.get((document_id, chunk_index), 0.0) + score
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [LexicalHit(document_id, chunk_index, score) for (document_id, chunk_index), score in best]
+
+    def close(self) -> None:
+        """Unmap every open segment and stop the loader threads."""
+        with self._lock:
+            for segment in self._segments.values():
+                if segment is not None:
+                    segment.close()
+            self._segments.clear()
+        self._loader.shutdown(wait=False)
+
+    def _load_all(self, segment_keys: Mapping[str, str]) -> List[Tuple[str, LexicalSegment]]:
+        loaded: Dict[str, Optional[LexicalSegment]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in set(segment_keys.values()):
+                if key in self._segments:
+                    self._segments.move_to_end(key)
+                    loaded[key] = self._segments[key]
+                else:
+                    missing.append(key)
+        for key, segment in zip(missing, self._loader.map(self._fetch, missing)):
+            loaded[key] = segment
+        return [
+            (document_id, loaded[key])
+            for document_id, key in segment_keys.items()
+            if loaded.get(key) is not None
+        ]
+
+    def _fetch(self, key: str) -> Optional[LexicalSegment]:
+        """Download, decompress and map one segment; cache the outcome."""
+        from botocore.exceptions import ClientError
+
+        path = os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".lxi")
+        segment: Optional[LexicalSegment] = None
+        try:
+            if not os.path.exists(path):
+                response = _get_s3_client().get_object(Bucket=self.bucket, Key=key)
+                data = gzip.decompress(response["Body"].read())
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            with open(path, "rb") as f:
+                segment = LexicalSegment(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                logger.warning(f"Failed to load lexical index segment {key}: {e}")
+                return None
+            logger.info(f"Lexical index segment {key} does not exist")
+        except Exception as e:
+            # JUSTIFICATION: a corrupt or unreadable segment only costs that
+            # document its lexical matches; vector search still covers it.
+            # Failures are not cached, so the next query retries.
+            logger.warning(f"Failed to load lexical index segment {key}: {e}")
+            return None
+
+        with self._lock:
+            existing = self._segments.get(key)
+            if existing is not None:
+                if segment is not None:
+                    segment.close()
+                return existing
+            self._segments[key] = segment
+            self._segments.move_to_end(key)
+            while len(self._segments) > self.max_open_segments:
+                # Not closed explicitly: a search running in another thread
+                # may still hold it. The map goes away with its last
+                # reference, and unlinking a mapped file is safe.
+                evicted_key, evicted = self._segments.popitem(last=False)
+                if evicted is not None:
+                    self._remove_file(evicted_key)
+        return segment
+
+    def _remove_file(self, key: str) -> None:
+        path = os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".lxi")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_index: Optional[LexicalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lexical_index() -> Optional[LexicalIndex]:
+    """Process-wide lexical index, or None when no documents bucket is configured."""
+    global _index
+    bucket = _get_documents_bucket()
+    if not bucket:
+        return None
+    if _index is None or _index.bucket != bucket:
+        with _index_lock:
+            if _index is None or _index.bucket != bucket:
+                _index = LexicalIndex(bucket)
+    return _index
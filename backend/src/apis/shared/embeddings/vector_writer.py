@@ -0,0 +1,216 @@
+"""Pipelined S3 Vectors writer for document ingestion.
+
+``store_embeddings_in_s3`` used to build a fresh ``s3vectors`` client and
+call the blocking ``put_vectors`` on the event loop, one 50-vector batch at
+a time, and only after every chunk had been embedded. Embedding and upload
+never overlapped, and nothing else could run on the loop during the upload.
+
+``VectorWriter`` decouples the two stages:
+
+- producers ``await writer.put(start_index, chunks, embeddings)``; vectors
+  are cut into ``put_vectors`` batches and pushed onto a bounded queue
+  (``put`` waits when the queue is full, so a fast embedder cannot buffer
+  a whole document in memory)
+- a small pool of worker tasks drains the queue and runs each
+  ``put_vectors`` call in a thread, with exponential backoff on failures
+- ``progress_callback(embedded, stored, total)`` fires as batches are
+  queued and stored, so the ingestion status can report "embedding N/M"
+
+``embed_and_store`` in ``bedrock_embeddings`` wires this to the embedding
+engine so batch k uploads while batch k+1 is being embedded.
+
+Configuration:
+    VECTOR_WRITER_WORKERS: concurrent put_vectors calls (default 4)
+    VECTOR_WRITER_QUEUE_SIZE: batches buffered ahead of the workers (default 8)
+    VECTOR_WRITER_MAX_RETRIES: retries per batch (default 4)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import random
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Safe batch size to stay under the S3 Vectors request body limit
+PUT_VECTORS_BATCH_SIZE = 50
+
+_DEFAULT_WORKERS = 4
+_DEFAULT_QUEUE_SIZE = 8
+_DEFAULT_MAX_RETRIES = 4
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_MAX_SECONDS = 10.0
+
+ProgressCallback = Callable[[int, int, int], Union[None, Awaitable[None]]]
+
+_client: Any = None
+_client_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def get_s3vectors_client(region_name: str) -> Any:
+    """Process-wide ``s3vectors`` client (botocore clients are thread-safe)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import boto3
+
+                _client = boto3.client("s3vectors", region_name=region_name)
+    return _client
+
+
+class VectorWriter:
+    """Bounded-queue, multi-worker uploader for one document's vectors."""
+
+    def __init__(
+        self,
+        client: Any,
+        vector_bucket: str,
+        vector_index: str,
+        assistant_id: str,
+        document_id: str,
+        metadata: Dict[str, Any],
+        total: int,
+        progress_callback: Optional[ProgressCallback] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.client = client
+        self.vector_bucket = vector_bucket
+        self.vector_index = vector_index
+        self.assistant_id = assistant_id
+        self.document_id = document_id
+        self.source = metadata.get("filename", "unknown")
+        self.total = total
+        self.progress_callback = progress_callback
+        self.workers = max(1, workers if workers is not None else _env_int("VECTOR_WRITER_WORKERS", _DEFAULT_WORKERS))
+        self.max_retries = max(
+            0, max_retries if max_retries is not None else _env_int("VECTOR_WRITER_MAX_RETRIES", _DEFAULT_MAX_RETRIES)
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max(1, queue_size if queue_size is not None else _env_int("VECTOR_WRITER_QUEUE_SIZE", _DEFAULT_QUEUE_SIZE))
+        )
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[BaseException] = None
+
+        self.embedded = 0
+        self.stored = 0
+
+    async def __aenter__(self) -> "VectorWriter":
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.close()
+        else:
+            await self._cancel()
+
+    async def put(self, start_index: int, chunks: List[str], embeddings: List[List[float]]) -> None:
+        """Queue vectors for ``chunks[i]`` under keys ``{document_id}#{start_index + i}``."""
+        self._raise_if_failed()
+        for offset in range(0, len(chunks), PUT_VECTORS_BATCH_SIZE):
+            batch = [
+                {
+                    "key": f"{self.document_id}#{start_index + i}",
+                    "data": {"float32": embeddings[i]},
+                    "metadata": {
+                        "text": chunks[i],
+                        "document_id": self.document_id,
+                        "assistant_id": self.assistant_id,
+                        "source": self.source,
+                    },
+                }
+                for i in range(offset, min(offset + PUT_VECTORS_BATCH_SIZE, len(chunks)))
+            ]
+            await self._queue.put(batch)
+            self._raise_if_failed()
+        self.embedded += len(chunks)
+        await self._report_progress()
+
+    async def close(self) -> None:
+        """Wait for every queued batch to be stored; re-raise a worker failure."""
+        for _ in self._tasks:
+            await self._queue.put(None)
+        results = await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._raise_if_failed()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            batch = await self._queue.get()
+            if batch is None:
+                return
+            if self._error is not None:
+                # A batch already failed for good: drain without uploading so
+                # producers blocked on a full queue wake up and see the error.
+                continue
+            try:
+                await self._put_with_retry(batch)
+            except Exception as e:
+                self._error = e
+                logger.error(f"Vector writer {worker_id} failed for {self.document_id}: {e}")
+                continue
+            self.stored += len(batch)
+            if self.stored % 500 < len(batch) or self.stored == self.total:
+                logger.info(f"Stored {self.stored}/{self.total} vectors")
+            await self._report_progress()
+
+    async def _put_with_retry(self, batch: List[Dict[str, Any]]) -> None:
+        attempt = 0
+        while True:
+            try:
+                await asyncio.to_thread(
+                    self.client.put_vectors,
+                    vectorBucketName=self.vector_bucket,
+                    indexName=self.vector_index,
+                    vectors=batch,
+                )
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2**attempt)))
+                attempt += 1
+                logger.warning(
+                    f"put_vectors failed for {self.document_id} ({e}); retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _report_progress(self) -> None:
+        if self.progress_callback is None:
+            return
+        try:
+            result = self.progress_callback(self.embedded, self.stored, self.total)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # JUSTIFICATION: Progress is informational; a failed status write
+            # must not abort an upload that is otherwise succeeding.
+            logger.warning(f"Vector writer progress callback failed: {e}")
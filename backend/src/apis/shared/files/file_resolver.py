@@ -1,35 +1,76 @@
 """
 File Resolver Service
 
-Resolves file upload IDs to FileContent objects with base64-encoded bytes.
+Resolves file upload IDs to raw file content for the agent.
 Used by chat endpoints to fetch files from S3 before passing to agent.
+
+All upload IDs in a request are looked up with one BatchGetItem and their
+S3 objects are fetched concurrently off the event loop. Content is carried
+as raw bytes all the way to the prompt builder: the previous base64 round
+trip (encode here, decode again in ``PromptBuilder``) cost ~3x the payload
+in transient memory per turn for nothing.
+
+Recently fetched objects are kept in a small LRU, because resume and
+continuation turns re-send the same attachments. Only the S3 bytes are
+cached: ownership and READY status are re-checked against DynamoDB on every
+call, so a deleted upload is never served from the cache.
+
+Configuration:
+    FILE_RESOLVER_CACHE_MAX_BYTES: byte budget for cached content
+        (default 64 MiB; 0 disables the cache)
+    FILE_RESOLVER_CACHE_TTL_SECONDS: how long cached content stays fresh
+        (default 900)
 """
 
 from __future__ import annotations
 
-import base64
+import asyncio
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
 from .repository import get_file_upload_repository
-from .models import FileStatus
+from .models import FileMetadata, FileStatus
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_DEFAULT_CACHE_TTL_SECONDS = 900.0
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
 
 @dataclass
 class ResolvedFileContent:
     """
-    Resolved file content with base64-encoded bytes.
-    Compatible with FileContent from inference_api.chat.models.
+    Resolved file content with raw bytes.
+
+    Accepted by ``PromptBuilder`` alongside the inference API's base64
+    ``FileContent``; it reads ``data`` directly instead of decoding.
     """
     filename: str
     content_type: str
-    bytes: str  # base64-encoded
+    data: bytes
+    upload_id: Optional[str] = None
 
 
 class FileResolverError(Exception):
@@ -37,17 +78,74 @@ class FileResolverError(Exception):
     pass
 
 
+class _ContentCache:
+    """Thread-safe LRU of S3 object bytes under a byte budget and TTL."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, data = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: Tuple[str, str], data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic(), data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class FileResolver:
     """
-    Resolves file upload IDs to FileContent objects.
+    Resolves file upload IDs to ResolvedFileContent objects.
 
-    Fetches file metadata from DynamoDB and content from S3,
-    then encodes as base64 for the agent.
+    Fetches file metadata from DynamoDB and content from S3
+    (or the recent-content cache).
     """
 
-    def __init__(self, s3_client=None):
+    def __init__(
+        self,
+        s3_client=None,
+        cache_max_bytes: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+    ):
         self._s3_client = s3_client or boto3.client("s3")
         self._file_repository = get_file_upload_repository()
+        self._cache = _ContentCache(
+            max_bytes=max(0, cache_max_bytes if cache_max_bytes is not None
+                          else _env_int("FILE_RESOLVER_CACHE_MAX_BYTES", _DEFAULT_CACHE_MAX_BYTES)),
+            ttl_seconds=cache_ttl_seconds if cache_ttl_seconds is not None
+            else _env_float("FILE_RESOLVER_CACHE_TTL_SECONDS", _DEFAULT_CACHE_TTL_SECONDS),
+        )
 
     async def resolve_files(
         self,
@@ -64,62 +162,77 @@ class FileResolver:
             max_files: Maximum files to process (Bedrock limit is 5)
 
         Returns:
-            List of ResolvedFileContent objects with base64-encoded bytes
-
-        Raises:
-            FileResolverError: If file not found or access denied
+            List of ResolvedFileContent objects with raw bytes, in request
+            order; missing, not-ready or unreadable files are skipped
         """
-        resolved_files = []
+        requested = list(dict.fromkeys(upload_ids[:max_files]))
+        if not requested:
+            return []
 
-        for upload_id in upload_ids[:max_files]:
-            try:
-                file_content = await self._resolve_single_file(user_id, upload_id)
-                if file_content:
-                    resolved_files.append(file_content)
-            except Exception as e:
-                logger.warning(f"Failed to resolve file {upload_id}: {e}")
+        try:
+            files = await self._file_repository.batch_get_files(user_id, requested)
+        except Exception as e:
+            logger.warning(f"Failed to look up {len(requested)} file(s): {e}")
+            return []
+
+        ready: List[FileMetadata] = []
+        for upload_id in requested:
+            file_meta = files.get(upload_id)
+            if not file_meta:
+                logger.warning(f"File {upload_id} not found for user {user_id}")
+            elif file_meta.status != FileStatus.READY:
+                logger.warning(f"File {upload_id} not ready: {file_meta.status}")
+            else:
+                ready.append(file_meta)
+
+        results = await asyncio.gather(
+            *(self._load_content(file_meta) for file_meta in ready),
+            return_exceptions=True,
+        )
+
+        resolved_files = []
+        for file_meta, result in zip(ready, results):
+            if isinstance(result, BaseException):
                 # Continue with other files rather than failing entirely
+                logger.warning(f"Failed to resolve file {file_meta.upload_id}: {result}")
                 continue
+            if result is None:
+                continue
+            resolved_files.append(
+                ResolvedFileContent(
+                    filename=file_meta.filename,
+                    content_type=file_meta.mime_type,
+                    data=result,
+                    upload_id=file_meta.upload_id,
+                )
+            )
 
         return resolved_files
 
-    async def _resolve_single_file(
-        self,
-        user_id: str,
-        upload_id: str
-    ) -> Optional[ResolvedFileContent]:
-        """Resolve a single file upload ID."""
-
-        # Get file metadata
-        file_meta = await self._file_repository.get_file(user_id, upload_id)
+    async def _load_content(self, file_meta: FileMetadata) -> Optional[bytes]:
+        """Return an upload's bytes from the cache or S3 (in a worker thread)."""
+        key = (file_meta.s3_bucket, file_meta.s3_key)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug(f"File {file_meta.upload_id} served from resolver cache")
+            return cached
 
-        if not file_meta:
-            logger.warning(f"File {upload_id} not found for user {user_id}")
-            return None
-
-        if file_meta.status != FileStatus.READY:
-            logger.warning(f"File {upload_id} not ready: {file_meta.status}")
-            return None
-
-        # Fetch content from S3
         try:
-            response = self._s3_client.get_object(
-                Bucket=file_meta.s3_bucket,
-                Key=file_meta.s3_key
-            )
-            file_bytes = response["Body"].read()
+            file_bytes = await asyncio.to_thread(self._get_object, file_meta.s3_bucket, file_meta.s3_key)
         except ClientError as e:
-            logger.error(f"Failed to fetch file {upload_id} from S3: {e}")
+            logger.error(f"Failed to fetch file {file_meta.upload_id} from S3: {e}")
             return None
 
-        # Encode as base64
-        base64_content = base64.b64encode(file_bytes).decode("utf-8")
+        self._cache.put(key, file_bytes)
+        return file_bytes
 
-        return ResolvedFileContent(
-            filename=file_meta.filename,
-            content_type=file_meta.mime_type,
-            bytes=base64_content
-        )
+    def _get_object(self, bucket: str, key: str) -> bytes:
+        response = self._s3_client.get_object(Bucket=bucket, Key=key)
+        return response["Body"].read()
+
+    def clear_cache(self) -> None:
+        """Drop all cached file content."""
+        self._cache.clear()
 
 
 # Global instance
@@ -4,11 +4,13 @@ File Upload Repository
 DynamoDB operations for file metadata and user quota tracking.
 """
 
+import asyncio
 import os
 import logging
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -17,6 +19,11 @@ from .models import FileMetadata, UserFileQuota, FileStatus
 
 logger = logging.getLogger(__name__)
 
+# Rounds of UnprocessedKeys retries before a batch get gives up on the rest
+_BATCH_GET_MAX_ATTEMPTS = 5
+# Base delay before re-requesting UnprocessedKeys; doubles each round
+_BATCH_GET_BACKOFF_SECONDS = 0.05
+
 
 class InvalidCursorError(ValueError):
     """Raised when a pagination cursor cannot be safely used.
@@ -106,6 +113,56 @@ class FileUploadRepository:
             logger.error(f"Error getting file {upload_id}: {e}")
             raise
 
+    async def batch_get_files(
+        self, user_id: str, upload_ids: List[str]
+    ) -> Dict[str, FileMetadata]:
+        """
+        Get several of a user's files in one BatchGetItem round-trip.
+
+        Args:
+            user_id: The owner's user ID
+            upload_ids: Upload identifiers (duplicates are fetched once)
+
+        Returns:
+            Dict of upload_id -> FileMetadata; IDs that don't exist for this
+            user are absent
+        """
+        unique_ids = list(dict.fromkeys(upload_ids))
+        if not unique_ids:
+            return {}
+
+        try:
+            # The round-trips and retry backoff block; keep them off the event loop
+            return await asyncio.to_thread(self._batch_get_files_sync, user_id, unique_ids)
+        except ClientError as e:
+            logger.error(f"Error batch getting files: {e}")
+            raise
+
+    def _batch_get_files_sync(
+        self, user_id: str, upload_ids: List[str]
+    ) -> Dict[str, FileMetadata]:
+        files: Dict[str, FileMetadata] = {}
+        # DynamoDB batch_get_item limit is 100
+        for i in range(0, len(upload_ids), 100):
+            keys = [
+                {"PK": f"USER#{user_id}", "SK": f"FILE#{upload_id}"}
+                for upload_id in upload_ids[i : i + 100]
+            ]
+            request = {self.table_name: {"Keys": keys}}
+            for attempt in range(_BATCH_GET_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(_BATCH_GET_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                response = self._dynamodb.meta.client.batch_get_item(
+                    RequestItems=request
+                )
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    file_meta = FileMetadata.from_dynamo_item(item)
+                    files[file_meta.upload_id] = file_meta
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+        return files
+
     async def update_file_status(
         self, user_id: str, upload_id: str, status: FileStatus
     ) -> Optional[FileMetadata]:
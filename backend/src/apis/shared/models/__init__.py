@@ -17,6 +17,12 @@ from .managed_models import (
     update_managed_model,
     delete_managed_model,
 )
+from .registry import (
+    ManagedModelRegistry,
+    find_managed_model,
+    get_model_registry,
+    invalidate_model_registry,
+)
 
 __all__ = [
     # Models
@@ -30,4 +36,9 @@ __all__ = [
     "list_all_managed_models",
     "update_managed_model",
     "delete_managed_model",
+    # Registry
+    "ManagedModelRegistry",
+    "find_managed_model",
+    "get_model_registry",
+    "invalidate_model_registry",
 ]
@@ -55,6 +55,40 @@ def _resolve_mantle_endpoint_path(endpoint_path: Optional[str], provider: str) -
 # Initialize DynamoDB client
 dynamodb = boto3.resource('dynamodb')
 
+# Version watermark for the in-process model registry (see registry.py).
+# Every successful model write bumps this counter so registries in other
+# processes notice the change with one GetItem instead of a full scan.
+# The PK deliberately does not start with 'MODEL#' so listing scans skip it.
+_REGISTRY_VERSION_KEY = {'PK': 'REGISTRY#VERSION', 'SK': 'REGISTRY#VERSION'}
+
+
+def get_registry_version(table_name: str) -> int:
+    """Read the model-registry version watermark (0 if never written).
+
+    Synchronous boto3 call; async callers should run it in a thread.
+    """
+    table = dynamodb.Table(table_name)
+    item = table.get_item(Key=_REGISTRY_VERSION_KEY).get('Item') or {}
+    return int(item.get('version', 0))
+
+
+def _mark_models_changed(table_name: str) -> None:
+    """Invalidate this process's registry and bump the shared watermark."""
+    from .registry import invalidate_model_registry
+
+    invalidate_model_registry()
+    try:
+        dynamodb.Table(table_name).update_item(
+            Key=_REGISTRY_VERSION_KEY,
+            UpdateExpression='ADD #version :one SET #updatedAt = :now',
+            ExpressionAttributeNames={'#version': 'version', '#updatedAt': 'updatedAt'},
+            ExpressionAttributeValues={':one': 1, ':now': datetime.now(timezone.utc).isoformat()},
+        )
+    except ClientError as e:
+        # JUSTIFICATION: The model write itself succeeded. A missed bump only
+        # delays other processes until their registry TTL expires.
+        logger.warning(f"Failed to bump managed model registry version: {e}")
+
 
 async def _clear_existing_default_cloud(table_name: str, exclude_id: Optional[str] = None) -> None:
     """
@@ -166,7 +200,9 @@ async def create_managed_model(model_data: ManagedModelCreate) -> ManagedModel:
     managed_models_table = os.environ.get('DYNAMODB_MANAGED_MODELS_TABLE_NAME')
     if not managed_models_table:
         raise RuntimeError("DYNAMODB_MANAGED_MODELS_TABLE_NAME environment variable is required")
-    return await _create_managed_model_cloud(model_data, managed_models_table)
+    model = await _create_managed_model_cloud(model_data, managed_models_table)
+    _mark_models_changed(managed_models_table)
+    return model
 
 
 async def _create_managed_model_cloud(model_data: ManagedModelCreate, table_name: str) -> ManagedModel:
@@ -493,7 +529,10 @@ async def update_managed_model(model_id: str, updates: ManagedModelUpdate) -> Op
     managed_models_table = os.environ.get('DYNAMODB_MANAGED_MODELS_TABLE_NAME')
     if not managed_models_table:
         raise RuntimeError("DYNAMODB_MANAGED_MODELS_TABLE_NAME environment variable is required")
-    return await _update_managed_model_cloud(model_id, updates, managed_models_table)
+    model = await _update_managed_model_cloud(model_id, updates, managed_models_table)
+    if model is not None:
+        _mark_models_changed(managed_models_table)
+    return model
 
 
 async def _update_managed_model_cloud(model_id: str, updates: ManagedModelUpdate, table_name: str) -> Optional[ManagedModel]:
@@ -632,7 +671,10 @@ async def delete_managed_model(model_id: str) -> bool:
     managed_models_table = os.environ.get('DYNAMODB_MANAGED_MODELS_TABLE_NAME')
     if not managed_models_table:
         raise RuntimeError("DYNAMODB_MANAGED_MODELS_TABLE_NAME environment variable is required")
-    return await _delete_managed_model_cloud(model_id, managed_models_table)
+    deleted = await _delete_managed_model_cloud(model_id, managed_models_table)
+    if deleted:
+        _mark_models_changed(managed_models_table)
+    return deleted
 
 
 async def _delete_managed_model_cloud(model_id: str, table_name: str) -> bool:
@@ -0,0 +1,197 @@
+"""In-process managed-model registry indexed by external model ID.
+
+The chat path resolves the selected model's settings, caching flags and
+pricing by external ``model_id`` (e.g.
+``us.anthropic.claude-sonnet-4-5-20250929-v1:0``). Each of those lookups
+used to call ``list_managed_models()`` — a full paginated table scan —
+and search the result linearly, and pricing snapshots repeated it at the
+end of the turn, so every chat turn paid two or more scans.
+
+``ManagedModelRegistry`` loads the table once into a dict keyed by
+``model_id`` and serves lookups from memory. It reloads when:
+
+- this process writes a model (``create/update/delete_managed_model``
+  call ``invalidate_model_registry``), which covers the admin routes
+- another process wrote one: writes bump a version watermark item in the
+  managed models table, which the registry polls with a single GetItem
+  at most every ``MANAGED_MODEL_REGISTRY_VERSION_CHECK_SECONDS`` (default 5)
+- the snapshot is older than ``MANAGED_MODEL_REGISTRY_TTL_SECONDS``
+  (default 300), as a backstop for missed watermark bumps
+
+If a reload fails while a snapshot is held, the stale snapshot keeps
+serving (and the failure is logged) rather than failing the chat turn.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from .models import ManagedModel
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL_SECONDS = 300.0
+_DEFAULT_VERSION_CHECK_SECONDS = 5.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class ManagedModelRegistry:
+    """TTL/watermark-refreshed snapshot of the managed models table."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        version_check_seconds: Optional[float] = None,
+    ):
+        self.ttl = (
+            ttl_seconds if ttl_seconds is not None
+            else _env_float("MANAGED_MODEL_REGISTRY_TTL_SECONDS", _DEFAULT_TTL_SECONDS)
+        )
+        self.version_check_interval = (
+            version_check_seconds if version_check_seconds is not None
+            else _env_float("MANAGED_MODEL_REGISTRY_VERSION_CHECK_SECONDS", _DEFAULT_VERSION_CHECK_SECONDS)
+        )
+
+        self._models: Optional[List[ManagedModel]] = None
+        self._by_model_id: Dict[str, ManagedModel] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        # Bumped by invalidate() so a reload that raced a local write
+        # doesn't mark its (possibly pre-write) snapshot as fresh.
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    async def get(self, model_id: str) -> Optional[ManagedModel]:
+        """Return the managed model whose external ``model_id`` matches."""
+        await self._ensure_fresh()
+        return self._by_model_id.get(model_id)
+
+    async def list(self) -> List[ManagedModel]:
+        """All managed models, newest first (same order as the table listing)."""
+        await self._ensure_fresh()
+        return list(self._models or [])
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next lookup reloads from the table."""
+        self._generation += 1
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def _ensure_fresh(self) -> None:
+        if self._models is not None and not self._needs_version_check() and not self._expired():
+            return
+
+        # Single-flight: concurrent turns after an invalidation share one scan.
+        async with self._get_lock():
+            if self._models is not None and not self._expired():
+                if not self._needs_version_check():
+                    return
+                version = await self._read_version()
+                self._checked_at = time.monotonic()
+                if version is None or version == self._version:
+                    return
+                logger.info(f"🔄 Managed model registry version changed ({self._version} → {version}); reloading")
+            await self._reload()
+
+    def _expired(self) -> bool:
+        return self._loaded_at == 0.0 or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _needs_version_check(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.version_check_interval
+
+    async def _read_version(self) -> Optional[int]:
+        from . import managed_models
+
+        table_name = os.environ.get("DYNAMODB_MANAGED_MODELS_TABLE_NAME")
+        if not table_name:
+            return None
+        try:
+            return await asyncio.to_thread(managed_models.get_registry_version, table_name)
+        except Exception as e:
+            # JUSTIFICATION: The watermark is an optimisation over the TTL;
+            # if it can't be read, keep serving the snapshot until it expires.
+            logger.warning(f"Failed to read managed model registry version: {e}")
+            return None
+
+    async def _reload(self) -> None:
+        from .managed_models import list_all_managed_models
+
+        generation = self._generation
+        version = await self._read_version()
+        try:
+            models = await list_all_managed_models()
+        except Exception:
+            if self._models is None:
+                raise
+            # JUSTIFICATION: A transient scan failure shouldn't fail chat turns
+            # that a slightly stale snapshot can still serve. Retry after the
+            # next version-check interval rather than on every lookup.
+            logger.warning("Failed to reload managed model registry; serving stale snapshot", exc_info=True)
+            now = time.monotonic()
+            self._loaded_at = now - self.ttl + self.version_check_interval
+            self._checked_at = now
+            return
+
+        index: Dict[str, ManagedModel] = {}
+        for model in models:
+            # The listing is newest-first; keep the first match, as the old
+            # linear search did.
+            index.setdefault(model.model_id, model)
+
+        self._models = models
+        self._by_model_id = index
+        self._version = version
+        if generation == self._generation:
+            now = time.monotonic()
+            self._loaded_at = now
+            self._checked_at = now
+        logger.debug(f"Loaded {len(models)} managed model(s) into registry (version={version})")
+
+
+_registry: Optional[ManagedModelRegistry] = None
+
+
+def get_model_registry() -> ManagedModelRegistry:
+    """Return the process-wide managed model registry."""
+    global _registry
+    if _registry is None:
+        _registry = ManagedModelRegistry()
+    return _registry
+
+
+async def find_managed_model(model_id: str) -> Optional[ManagedModel]:
+    """Resolve a managed model by external ``model_id`` from the registry."""
+    return await get_model_registry().get(model_id)
+
+
+def invalidate_model_registry() -> None:
+    """Force the process-wide registry to reload on its next lookup."""
+    if _registry is not None:
+        _registry.invalidate()
@@ -5,8 +5,12 @@ rate limits.  TTL auto-cleans expired window items.
 
 Fail-open: any DynamoDB error returns *allowed* so a rate-limit outage
 never blocks legitimate traffic.
+
+The counter update runs on a worker thread via ``asyncio.to_thread`` so a
+slow DynamoDB call does not stall the event loop.
 """
 
+import asyncio
 import logging
 import os
 import time
@@ -45,7 +49,8 @@ class RateLimiter:
         window_key = now // window_seconds
 
         try:
-            resp = self.table.update_item(
+            resp = await asyncio.to_thread(
+                self.table.update_item,
                 Key={"PK": f"RATE#{key_id}", "SK": f"WIN#{window_key}"},
                 UpdateExpression=(
                     "SET #cnt = if_not_exists(#cnt, :zero) + :one, #ttl = :ttl"
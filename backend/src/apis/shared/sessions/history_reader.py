@@ -0,0 +1,227 @@
+"""Incremental, cached reads of session history from AgentCore Memory.
+
+``get_messages_from_cloud`` used to build an ``AgentCoreMemorySessionManager``
+per request (three boto3 clients plus a session lookup) and call
+``list_messages``, which pages through *every* event in the session and
+JSON-decodes all of them — only for the caller to slice out one page.
+Scrolling back through a long conversation, or exporting it page by page,
+re-fetched and re-decoded the whole history on every request.
+
+``SessionHistoryReader`` keeps the decoded history of recently read
+sessions in a small LRU, keyed by (memory, actor, session) and stamped with
+the id of the newest event it covers. A read then costs:
+
+- cache hit: one ``ListEvents(maxResults=1, includePayloads=False)`` to
+  confirm the newest event id is unchanged
+- new turns since the last read: page newest-first only until the cached
+  event id is reached, decode just those events and append them
+- cold or unrecognised history (e.g. events were deleted): one full load,
+  same as before
+
+AgentCore Memory events are append-only in normal operation; the event id
+check is what makes a stale entry impossible to serve.
+
+Configuration:
+    SESSION_HISTORY_CACHE_MAX_SESSIONS: decoded histories kept (default 64)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Same ceiling AgentCoreMemorySessionManager.list_messages applies
+MAX_HISTORY_EVENTS = 10000
+# ListEvents page size (API maximum)
+_PAGE_SIZE = 100
+
+_DEFAULT_MAX_SESSIONS = 64
+
+_CacheKey = Tuple[str, str, str]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+@dataclass
+class _CachedHistory:
+    """Decoded chronological history up to and including ``last_event_id``."""
+
+    last_event_id: str
+    event_count: int
+    messages: List[Any]
+
+
+@dataclass
+class HistoryReaderStats:
+    """Counters for cache effectiveness, exposed for logging and debugging."""
+
+    hits: int = 0
+    incremental: int = 0
+    full_loads: int = 0
+    events_fetched: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "incremental": self.incremental,
+            "fullLoads": self.full_loads,
+            "eventsFetched": self.events_fetched,
+        }
+
+
+class SessionHistoryReader:
+    """LRU of decoded session histories refreshed by event-id watermark."""
+
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = max(
+            1, max_sessions if max_sessions is not None else _env_int("SESSION_HISTORY_CACHE_MAX_SESSIONS", _DEFAULT_MAX_SESSIONS)
+        )
+        self.stats = HistoryReaderStats()
+        self._entries: "OrderedDict[_CacheKey, _CachedHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, client: Any, converter: Any, memory_id: str, actor_id: str, session_id: str) -> List[Any]:
+        """Return the full chronological ``SessionMessage`` list for a session.
+
+        Blocking (boto3); call it from a worker thread. ``client`` is a
+        ``bedrock-agentcore`` data-plane client and ``converter`` a strands
+        ``MemoryConverter`` (``events_to_messages``). The returned list is
+        shared with the cache and must not be mutated.
+        """
+        key = (memory_id, actor_id, session_id)
+        params = {"memoryId": memory_id, "actorId": actor_id, "sessionId": session_id}
+
+        cached = self._get(key)
+        if cached is None:
+            return self._full_load(key, client, converter, params)
+
+        head = client.list_events(**params, maxResults=1, includePayloads=False).get("events", [])
+        if not head:
+            self.invalidate(session_id, actor_id)
+            return []
+        if head[0].get("eventId") == cached.last_event_id:
+            self.stats.hits += 1
+            return cached.messages
+
+        new_events: List[Dict[str, Any]] = []
+        found = False
+        next_token = None
+        while not found and cached.event_count + len(new_events) < MAX_HISTORY_EVENTS:
+            page_params = dict(params, maxResults=_PAGE_SIZE, includePayloads=True)
+            if next_token:
+                page_params["nextToken"] = next_token
+            response = client.list_events(**page_params)
+            for event in response.get("events", []):
+                if event.get("eventId") == cached.last_event_id:
+                    found = True
+                    break
+                new_events.append(event)
+            next_token = response.get("nextToken")
+            if not next_token:
+                break
+        self.stats.events_fetched += len(new_events)
+
+        if not found:
+            logger.info(f"History for session {session_id} no longer extends the cached prefix, reloading")
+            return self._full_load(key, client, converter, params)
+
+        # events_to_messages expects newest-first (the ListEvents order) and
+        # decodes each event independently, so the new suffix converts alone.
+        messages = cached.messages + converter.events_to_messages(new_events)
+        self._put(key, _CachedHistory(new_events[0]["eventId"], cached.event_count + len(new_events), messages))
+        self.stats.incremental += 1
+        logger.debug(f"Appended {len(new_events)} events to cached history for session {session_id}")
+        return messages
+
+    def invalidate(self, session_id: str, actor_id: Optional[str] = None) -> None:
+        """Drop cached history for a session (all actors unless one is given)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[2] == session_id and (actor_id is None or k[1] == actor_id)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _full_load(self, key: _CacheKey, client: Any, converter: Any, params: Dict[str, Any]) -> List[Any]:
+        events: List[Dict[str, Any]] = []
+        next_token = None
+        while len(events) < MAX_HISTORY_EVENTS:
+            page_params = dict(params, maxResults=_PAGE_SIZE, includePayloads=True)
+            if next_token:
+                page_params["nextToken"] = next_token
+            response = client.list_events(**page_params)
+            events.extend(response.get("events", []))
+            next_token = response.get("nextToken")
+            if not next_token:
+                break
+        events = events[:MAX_HISTORY_EVENTS]
+        self.stats.full_loads += 1
+        self.stats.events_fetched += len(events)
+
+        messages = converter.events_to_messages(events)
+        if events and events[0].get("eventId"):
+            self._put(key, _CachedHistory(events[0]["eventId"], len(events), messages))
+        return messages
+
+    def _get(self, key: _CacheKey) -> Optional[_CachedHistory]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: _CacheKey, entry: _CachedHistory) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+
+
+_reader: Optional[SessionHistoryReader] = None
+_reader_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+
+
+def get_history_reader() -> SessionHistoryReader:
+    """Process-wide history reader."""
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                _reader = SessionHistoryReader()
+    return _reader
+
+
+def get_memory_data_client(region_name: str) -> Any:
+    """Process-wide ``bedrock-agentcore`` client per region (thread-safe)."""
+    client = _clients.get(region_name)
+    if client is None:
+        with _reader_lock:
+            client = _clients.get(region_name)
+            if client is None:
+                import boto3
+
+                client = _clients[region_name] = boto3.client("bedrock-agentcore", region_name=region_name)
+    return client
+
+
+def invalidate_session_history(session_id: str, actor_id: Optional[str] = None) -> None:
+    """Forget cached history for a session, e.g. after its events are deleted."""
+    if _reader is not None:
+        _reader.invalidate(session_id, actor_id)
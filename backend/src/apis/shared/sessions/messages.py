@@ -6,6 +6,7 @@ Retrieves conversation history from AgentCore Memory.
 import base64
 import logging
 import os
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 # Relative imports from shared sessions module
@@ -16,14 +17,17 @@ logger = logging.getLogger(__name__)
 
 # Check if AgentCore Memory is available
 try:
-    from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
-    from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
+    from bedrock_agentcore.memory.integrations.strands.bedrock_converter import AgentCoreMemoryConverter
 
     AGENTCORE_MEMORY_AVAILABLE = True
 except ImportError:
     AGENTCORE_MEMORY_AVAILABLE = False
     logger.warning("AgentCore Memory not available - install bedrock_agentcore package")
 
+# Slack applied around a page's message timestamps when range-querying its
+# cost records, which are written when the turn finishes streaming
+METADATA_WINDOW_MARGIN = timedelta(minutes=5)
+
 
 def _ensure_image_base64(image_data: Dict[str, Any]) -> Dict[str, Any]:
     """Ensure image data has base64 encoding instead of raw bytes
@@ -315,6 +319,46 @@ def _convert_message(msg: Any, metadata: Any = None) -> Message:
     return Message(role=role, content=content_blocks, timestamp=str(timestamp) if timestamp else None, metadata=message_metadata)
 
 
+def _decode_start_index(next_token: Optional[str]) -> int:
+    """Decode a pagination token (base64-encoded sequence number) to a start index."""
+    if not next_token:
+        return 0
+    try:
+        decoded = base64.b64decode(next_token).decode("utf-8")
+        return int(decoded)
+    except Exception as e:
+        logger.warning(f"Invalid next_token: {e}, starting from beginning")
+        return 0
+
+
+def _encode_start_index(start_index: int) -> str:
+    return base64.b64encode(str(start_index).encode("utf-8")).decode("utf-8")
+
+
+def _page_bounds(total: int, limit: Optional[int] = None, next_token: Optional[str] = None) -> Tuple[int, int, Optional[str]]:
+    """
+    Compute the [start, end) slice of a page and the token for the next one
+
+    Args:
+        total: Number of messages in the session
+        limit: Maximum number of messages to return
+        next_token: Pagination token (sequence number to start from)
+
+    Returns:
+        Tuple of (start index, end index, next_token if more messages exist)
+    """
+    start_index = _decode_start_index(next_token)
+
+    if limit and limit > 0:
+        end_index = min(start_index + limit, total)
+        next_page_token = _encode_start_index(start_index + limit) if start_index + limit < total else None
+    else:
+        end_index = total
+        next_page_token = None
+
+    return start_index, max(start_index, end_index), next_page_token
+
+
 def _apply_pagination(messages: List[Message], limit: Optional[int] = None, next_token: Optional[str] = None) -> Tuple[List[Message], Optional[str]]:
     """
     Apply pagination to a list of messages
@@ -327,33 +371,56 @@ def _apply_pagination(messages: List[Message], limit: Optional[int] = None, next
     Returns:
         Tuple of (paginated messages, next_token if more messages exist)
     """
-    start_index = 0
+    start_index, end_index, next_page_token = _page_bounds(len(messages), limit, next_token)
+    return messages[start_index:end_index], next_page_token
 
-    # Decode next_token if provided (it's a base64-encoded sequence number)
-    if next_token:
-        try:
-            decoded = base64.b64decode(next_token).decode("utf-8")
-            start_index = int(decoded)
-        except Exception as e:
-            logger.warning(f"Invalid next_token: {e}, starting from beginning")
-            start_index = 0
 
-    # Apply start index
-    paginated_messages = messages[start_index:]
+def _message_created_at(msg: Any) -> Optional[datetime]:
+    """Parse a SessionMessage's created_at as an aware UTC datetime."""
+    raw = msg.get("timestamp") if isinstance(msg, dict) else getattr(msg, "created_at", None)
+    if not isinstance(raw, str) or not raw:
+        return None
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _starts_turn(msg: Any) -> bool:
+    """True for a user message that opens a turn (not a toolResult carrier)."""
+    if _get_message_role(msg) != "user":
+        return False
+    inner = msg if isinstance(msg, dict) else getattr(msg, "message", None) or msg
+    content = inner.get("content", []) if isinstance(inner, dict) else getattr(inner, "content", [])
+    if not isinstance(content, list):
+        return True
+    return not any(isinstance(block, dict) and "toolResult" in block for block in content)
 
-    # Apply limit
-    if limit and limit > 0:
-        paginated_messages = paginated_messages[:limit]
-        # Check if there are more messages
-        if start_index + limit < len(messages):
-            next_seq = start_index + limit
-            next_token = base64.b64encode(str(next_seq).encode("utf-8")).decode("utf-8")
-        else:
-            next_token = None
-    else:
-        next_token = None
 
-    return paginated_messages, next_token
+def _metadata_time_range(messages_raw: List[Any], start: int, end: int) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Bracket the cost records for messages[start:end] by write time
+
+    Cost records are written once the turn that produced them finishes, so
+    they fall between the first message of the page and the next message
+    that opens a new turn after it (open-ended when the page reaches the
+    latest turn). Returns None when the needed timestamps are missing.
+    """
+    first = _message_created_at(messages_raw[start])
+    if first is None:
+        return None
+    since = (first - METADATA_WINDOW_MARGIN).isoformat()
+
+    for msg in messages_raw[end:]:
+        if _starts_turn(msg):
+            next_turn = _message_created_at(msg)
+            if next_turn is None:
+                return None
+            return since, (next_turn + METADATA_WINDOW_MARGIN).isoformat()
+    return since, None
 
 
 async def get_messages_from_cloud(
@@ -377,39 +444,34 @@ async def get_messages_from_cloud(
     if not memory_id:
         raise ValueError("AGENTCORE_MEMORY_ID environment variable not set")
 
-    # Create AgentCore Memory config
-    config = AgentCoreMemoryConfig(
-        memory_id=memory_id,
-        session_id=session_id,
-        actor_id=user_id,
-        enable_prompt_caching=False,  # Not needed for reading
-    )
-
-    # Create session manager
-    session_manager = AgentCoreMemorySessionManager(agentcore_memory_config=config, region_name=aws_region)
-
     logger.info(f"Retrieving messages from AgentCore Memory - Session: {session_id}, User: {user_id}")
 
     try:
-        # Fetch messages and metadata in parallel for better performance
         import asyncio
 
-        async def fetch_messages():
-            """Fetch messages from AgentCore Memory.
+        from .history_reader import get_history_reader, get_memory_data_client
+
+        def read_history() -> List[Any]:
+            """Read the decoded session history through the process-wide cache.
 
             Note: AgentCore Memory's list_events API does not filter by
             agent_id — it returns ALL messages for the session regardless
-            of which agent stored them.  A single fetch with any agent_id
-            is sufficient; fetching twice (e.g. "default" + "voice") would
-            return identical results and cause duplication.
+            of which agent stored them, so one read covers text and voice.
             """
-            return await asyncio.to_thread(session_manager.list_messages, session_id, "default")
-
-        async def fetch_metadata():
-            """Fetch metadata from DynamoDB"""
-            from .metadata import get_all_message_metadata
-
-            return await get_all_message_metadata(session_id, user_id)
+            try:
+                return get_history_reader().read(
+                    get_memory_data_client(aws_region),
+                    AgentCoreMemoryConverter,
+                    memory_id,
+                    user_id,
+                    session_id,
+                )
+            except Exception as e:
+                # JUSTIFICATION: Matches AgentCoreMemorySessionManager.list_messages,
+                # which this replaced: a failed history read renders as an empty
+                # conversation rather than an error page.
+                logger.error(f"Failed to list messages from AgentCore Memory: {e}")
+                return []
 
         async def fetch_pending_interrupts():
             """Fetch pending OAuth consent interrupts from session metadata.
@@ -437,24 +499,43 @@ async def get_messages_from_cloud(
             )
 
         # Run fetches in parallel
-        messages_raw, metadata_index, pending_interrupts, ui_resource_rows = (
-            await asyncio.gather(
-                fetch_messages(),
-                fetch_metadata(),
-                fetch_pending_interrupts(),
-                fetch_ui_resources(),
-            )
+        messages_raw, pending_interrupts, ui_resource_rows = await asyncio.gather(
+            asyncio.to_thread(read_history),
+            fetch_pending_interrupts(),
+            fetch_ui_resources(),
         )
 
-        messages_raw = list(messages_raw or [])
-
         logger.info(f"AgentCore Memory returned {len(messages_raw)} raw messages")
+
+        start_seq, end_seq, next_page_token = _page_bounds(len(messages_raw), limit, next_token)
+        window = messages_raw[start_seq:end_seq]
+
+        # Only the page's metadata rows are fetched: display text by exact
+        # key, cost records by the time range the page's turns were written in.
+        metadata_index: Dict[str, Any] = {}
+        if window:
+            from . import metadata as metadata_store
+
+            time_range = _metadata_time_range(messages_raw, start_seq, end_seq)
+            if time_range is None:
+                logger.info("Page messages lack timestamps, falling back to full metadata index")
+                metadata_index = await metadata_store.get_all_message_metadata(session_id, user_id)
+            else:
+                since, until = time_range
+                metadata_index = await metadata_store.get_message_metadata_window(
+                    session_id,
+                    user_id,
+                    message_ids=range(start_seq, end_seq),
+                    display_message_ids=[start_seq + i for i, msg in enumerate(window) if _starts_turn(msg)],
+                    since=since,
+                    until=until,
+                )
+
         logger.info(f"Metadata index contains {len(metadata_index)} entries")
-        logger.info(f"🔑 Metadata index keys: {sorted(metadata_index.keys())}")
 
-        # Convert to our Message model
-        messages = []
-        for idx, msg in enumerate(messages_raw):
+        # Convert only the requested page to our Message model
+        message_responses = []
+        for idx, msg in enumerate(window, start=start_seq):
             try:
                 # Look up metadata: try plain index first (text chat),
                 # then "voice:<idx>" prefix (voice chat metadata).
@@ -471,26 +552,12 @@ async def get_messages_from_cloud(
                 else:
                     logger.warning(f"⚠️ No metadata found for assistant message {idx}")
 
-                messages.append(_convert_message(msg, metadata=metadata))
+                message_responses.append(_convert_message_to_response(_convert_message(msg, metadata=metadata), session_id, idx))
             except Exception as e:
                 logger.error(f"Error converting message {idx}: {e}", exc_info=True)
                 continue
 
-        logger.info(f"Retrieved {len(messages)} messages from AgentCore Memory with metadata")
-
-        # Apply pagination
-        paginated_messages, next_page_token = _apply_pagination(messages, limit, next_token)
-
-        # Convert to MessageResponse format
-        start_seq = 0
-        if next_token:
-            try:
-                decoded = base64.b64decode(next_token).decode("utf-8")
-                start_seq = int(decoded)
-            except Exception:
-                start_seq = 0
-
-        message_responses = [_convert_message_to_response(msg, session_id, start_seq + idx) for idx, msg in enumerate(paginated_messages)]
+        logger.info(f"Retrieved {len(message_responses)} messages ({start_seq}-{end_seq} of {len(messages_raw)}) with metadata")
 
         # MCP Apps (SEP-1865): replay persisted UI resources so the
         # `mcp-app-frame` survives a reload. The inline `ui_resource` event
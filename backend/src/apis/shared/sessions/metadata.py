@@ -5,8 +5,14 @@ streaming completes. It uses DynamoDB for storage.
 
 Architecture:
 - Cloud: Stores metadata in DynamoDB table specified by DYNAMODB_SESSIONS_METADATA_TABLE_NAME
+- All table calls go through ``table_access.table_op``, which runs them on a
+  bounded, pooled executor so they never block the event loop
+- Session rows live at a stable key (``SK: SESSION#{session_id}``) with
+  recency served by ``SessionRecencyIndex``; see ``session_rows`` for the
+  layout and the migration from the legacy ``S#ACTIVE#`` rows
 """
 
+import asyncio
 import logging
 import json
 import math
@@ -17,6 +23,20 @@ from decimal import Decimal
 
 # Relative imports from shared sessions module
 from .models import ExportReceipt, MessageMetadata, PausedTurnSnapshot, PendingInterrupt, SessionMetadata, SessionPreferences
+from .session_rows import (
+    LEGACY_ACTIVE_PREFIX,
+    RECENCY_PK,
+    RECENCY_SK,
+    ROW_KEY_ATTRIBUTES,
+    SESSION_RECENCY_INDEX,
+    is_legacy_row,
+    legacy_reads_enabled,
+    migrate_legacy_row,
+    recency_attributes,
+    recency_sort_key,
+    session_row_key,
+)
+from .table_access import run_table_call, table_op
 
 # Import preview session helper
 from agents.main_agent.session.preview_session_manager import is_preview_session
@@ -56,6 +76,14 @@ def _convert_decimal_to_float(obj: Any) -> Any:
         return obj
 
 
+def _is_conditional_check_failure(error: Exception) -> bool:
+    """True when a DynamoDB write was rejected by its ConditionExpression."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
 def _coerce_cost_total(raw: Any) -> float:
     """Normalize a ``MessageMetadata.cost`` value to a finite float total.
 
@@ -144,12 +172,8 @@ async def store_user_display_text(
         return
 
     try:
-        import boto3
         from datetime import datetime, timezone, timedelta
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(sessions_metadata_table)
-
         timestamp = datetime.now(timezone.utc).isoformat()
         ttl = int((datetime.now(timezone.utc) + timedelta(days=365)).timestamp())
 
@@ -166,7 +190,7 @@ async def store_user_display_text(
             "ttl": ttl,
         }
 
-        table.put_item(Item=item)
+        await table_op(sessions_metadata_table, "put_item", Item=item)
         logger.info(f"💾 Stored displayText for user message {message_id} in session {session_id}")
 
     except Exception as e:
@@ -217,13 +241,9 @@ async def _store_message_metadata_cloud(
         - TTL only affects cost records (sessions don't have ttl)
     """
     try:
-        import boto3
         import uuid as uuid_lib
         from datetime import datetime, timezone, timedelta
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-
         # Prepare item for DynamoDB
         metadata_dict = message_metadata.model_dump(by_alias=True, exclude_none=True)
 
@@ -270,7 +290,7 @@ async def _store_message_metadata_cloud(
         }
 
         # Store in DynamoDB
-        table.put_item(Item=item)
+        await table_op(table_name, "put_item", Item=item)
 
         logger.info(f"💾 Stored cost record in DynamoDB table {table_name}")
         logger.info(f"   Session: {session_id}, Message: {message_id}, SK: C#{timestamp}#{unique_id[:8]}...")
@@ -282,7 +302,7 @@ async def _store_message_metadata_cloud(
             session_id=session_id,
             user_id=user_id,
             message_metadata=message_metadata,
-            table=table,
+            table_name=table_name,
         )
 
         # Update pre-aggregated cost summary for fast quota checks
@@ -321,7 +341,8 @@ async def _update_cost_summary_async(
     Uses atomic ADD operations for concurrent safety.
     Also updates per-model breakdown and calculates cache savings.
 
-    Additionally triggers system-wide rollup updates (async, fire-and-forget) for:
+    Additionally queues system-wide rollup deltas on the write-behind
+    rollup buffer (``apis.shared.costs.rollup_buffer``) for:
     - Daily rollups (ROLLUP#DAILY)
     - Monthly rollups (ROLLUP#MONTHLY)
     - Per-model rollups (ROLLUP#MODEL)
@@ -332,7 +353,6 @@ async def _update_cost_summary_async(
         message_metadata: MessageMetadata containing cost, usage, and model info
     """
     try:
-        import asyncio
         from datetime import datetime
 
         # Extract cost and usage from metadata. cost may be a breakdown dict
@@ -431,20 +451,19 @@ async def _update_cost_summary_async(
         savings_str = f", savings=${cache_savings:.6f}" if cache_savings > 0 else ""
         logger.info(f"📊 Updated cost summary: user={user_id}, period={period}, cost=${cost:.6f}{model_info_str}{savings_str}")
 
-        # Fire-and-forget: Update system-wide rollups asynchronously
-        # These updates don't block the main request flow
-        asyncio.create_task(
-            _update_system_rollups_async(
-                user_id=user_id,
-                period=period,
-                date=date,
-                cost=cost,
-                usage_delta=usage_delta,
-                cache_savings=cache_savings,
-                model_id=model_id,
-                model_name=model_name,
-                provider=provider
-            )
+        # Buffer system-wide rollup deltas. The write-behind buffer coalesces
+        # them per (date, period, model) and flushes one ADD per key in the
+        # background, so this adds no DynamoDB writes to the request path.
+        _record_system_rollups(
+            user_id=user_id,
+            period=period,
+            date=date,
+            cost=cost,
+            usage_delta=usage_delta,
+            cache_savings=cache_savings,
+            model_id=model_id,
+            model_name=model_name,
+            provider=provider
         )
 
     except Exception as e:
@@ -457,7 +476,7 @@ async def _update_cost_summary_async(
 
 
 
-async def _update_system_rollups_async(
+def _record_system_rollups(
     user_id: str,
     period: str,
     date: str,
@@ -469,15 +488,14 @@ async def _update_system_rollups_async(
     provider: str | None
 ) -> None:
     """
-    Update system-wide rollups for admin dashboard (async, fire-and-forget)
+    Queue system-wide rollup deltas for the admin dashboard
 
-    This updates:
+    Feeds the process-wide ``SystemRollupBuffer``, which coalesces deltas
+    and periodically flushes:
     - Daily rollup (ROLLUP#DAILY, SK: YYYY-MM-DD)
     - Monthly rollup (ROLLUP#MONTHLY, SK: YYYY-MM)
     - Per-model rollup (ROLLUP#MODEL, SK: YYYY-MM#model_id)
-
-    These updates are non-blocking and failures don't affect the main request flow.
-    The rollups support the admin cost dashboard with pre-aggregated system-wide metrics.
+    plus the matching active-user tracking rows.
 
     Args:
         user_id: User identifier (for tracking unique active users)
@@ -490,70 +508,24 @@ async def _update_system_rollups_async(
         model_name: Human-readable model name
         provider: LLM provider
     """
-    try:
-        # Check if we're using DynamoDB storage (rollups only make sense in cloud mode)
-        system_rollup_table = os.environ.get("DYNAMODB_SYSTEM_ROLLUP_TABLE_NAME")
-        if not system_rollup_table:
-            logger.debug("System rollup table not configured, skipping rollup updates")
-            return
-
-        from apis.shared.storage.dynamodb_storage import DynamoDBStorage
-        storage = DynamoDBStorage()
-
-        # Track active users using conditional writes
-        # Returns (is_new_today, is_new_this_month) - True if first request for that period
-        is_new_today, is_new_this_month = await storage.track_active_user(
-            user_id=user_id,
-            period=period,
-            date=date
-        )
-
-        # Update daily rollup
-        await storage.update_daily_rollup(
-            date=date,
-            cost_delta=cost,
-            usage_delta=usage_delta,
-            is_new_user=is_new_today,
-            model_id=model_id
-        )
-
-        # Update monthly rollup
-        await storage.update_monthly_rollup(
-            period=period,
-            cost_delta=cost,
-            usage_delta=usage_delta,
-            cache_savings_delta=cache_savings,
-            is_new_user=is_new_this_month,
-            model_id=model_id
-        )
-
-        # Update per-model rollup if model info is available
-        if model_id and model_name and provider:
-            # Track active users per model separately (user may use multiple models)
-            is_new_user_for_model = await storage.track_active_user_for_model(
-                user_id=user_id,
-                period=period,
-                model_id=model_id
-            )
-
-            await storage.update_model_rollup(
-                period=period,
-                model_id=model_id,
-                model_name=model_name,
-                provider=provider,
-                cost_delta=cost,
-                usage_delta=usage_delta,
-                is_new_user_for_model=is_new_user_for_model
-            )
+    # Rollups only make sense when the system rollup table is configured
+    if not os.environ.get("DYNAMODB_SYSTEM_ROLLUP_TABLE_NAME"):
+        logger.debug("System rollup table not configured, skipping rollup updates")
+        return
 
-        logger.debug(f"📈 Updated system rollups: date={date}, period={period}, new_today={is_new_today}, new_month={is_new_this_month}")
+    from apis.shared.costs.rollup_buffer import get_rollup_buffer
 
-    except Exception as e:
-        # JUSTIFICATION: System rollup updates are supplementary analytics for admin dashboard.
-        # They are fire-and-forget background operations that should not block user requests.
-        # The primary cost data is already stored in individual cost records (C# prefix).
-        # Rollup failures only affect admin dashboard aggregates, not user functionality.
-        logger.error(f"Failed to update system rollups (non-critical): {e}", exc_info=True)
+    get_rollup_buffer().record(
+        user_id=user_id,
+        period=period,
+        date=date,
+        cost=cost,
+        usage_delta=usage_delta,
+        cache_savings=cache_savings,
+        model_id=model_id,
+        model_name=model_name,
+        provider=provider
+    )
 
 
 
@@ -594,11 +566,14 @@ async def _store_session_metadata_cloud(
     table_name: str
 ) -> None:
     """
-    Store session metadata in DynamoDB with new SK pattern
+    Store session metadata in DynamoDB
 
-    This creates or updates the session record in DynamoDB.
-    For updates where last_message_at changes, the record is moved (delete old, put new)
-    because the SK contains the timestamp.
+    This creates or updates the session record in DynamoDB. The row key is
+    stable, so an update is a single in-place ``update_item`` whatever
+    changed; recency lives in the SessionRecencyIndex keys, which are set
+    from ``lastMessageAt`` for active sessions and removed on soft delete.
+    A legacy row found through the lookup fallback is migrated to the
+    stable key first.
 
     Args:
         session_id: Session identifier
@@ -608,28 +583,28 @@ async def _store_session_metadata_cloud(
 
     Schema:
         PK: USER#{user_id}
-        SK: S#ACTIVE#{last_message_at}#{session_id} (active sessions)
-            S#DELETED#{deleted_at}#{session_id} (deleted sessions)
+        SK: SESSION#{session_id}
+
+        GSI: SessionRecencyIndex (active sessions only)
+            GSI3PK: USER#{user_id}
+            GSI3SK: {last_message_at}#{session_id}
 
         GSI: SessionLookupIndex
             GSI_PK: SESSION#{session_id}
             GSI_SK: META
 
     This allows:
-    - Querying all active sessions: begins_with(SK, 'S#ACTIVE#')
-    - Sessions sorted by timestamp in SK (no in-memory sorting needed)
-    - Direct session lookup via GSI
+    - Direct session lookup by key (get_item)
+    - Active sessions sorted by recency from the sparse GSI
+    - Per-turn activity updates without moving the row
     """
     try:
-        import boto3
-        from botocore.exceptions import ClientError
         from datetime import datetime, timezone
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-
-        # First, check if session exists via GSI to get current SK
-        existing_session = await _get_session_by_gsi(session_id, user_id, table)
+        existing_session = await _get_session_row(session_id, user_id, table_name)
+        if existing_session and is_legacy_row(existing_session):
+            await migrate_legacy_row(table_name, _convert_floats_to_decimal(existing_session))
+            existing_session = await _get_session_row(session_id, user_id, table_name)
 
         # Prepare item for DynamoDB
         item = session_metadata.model_dump(by_alias=True, exclude_none=True)
@@ -637,86 +612,55 @@ async def _store_session_metadata_cloud(
         # Convert floats to Decimal for DynamoDB compatibility
         item = _convert_floats_to_decimal(item)
 
-        # Determine SK based on session status
         last_message_at = session_metadata.last_message_at or datetime.now(timezone.utc).isoformat()
-
-        if session_metadata.deleted:
-            deleted_at = session_metadata.deleted_at or datetime.now(timezone.utc).isoformat()
-            new_sk = f"S#DELETED#{deleted_at}#{session_id}"
-        else:
-            new_sk = f"S#ACTIVE#{last_message_at}#{session_id}"
-
-        # Build primary key
-        pk = f'USER#{user_id}'
+        item['lastMessageAt'] = last_message_at
 
         # Add GSI keys for direct lookup
         item['GSI_PK'] = f'SESSION#{session_id}'
         item['GSI_SK'] = 'META'
 
+        key = session_row_key(user_id, session_id)
         if existing_session:
-            # Session exists - check if SK needs to change
-            old_sk = existing_session.get('SK')
-
-            if old_sk and old_sk != new_sk:
-                # SK changed (timestamp updated) - need transactional move
-                # Deep merge existing with new data
-                merged_item = _deep_merge(
-                    {k: v for k, v in existing_session.items() if k not in ['PK', 'SK']},
-                    item
-                )
-                merged_item['PK'] = pk
-                merged_item['SK'] = new_sk
-
-                # Move session: put new SK first, then delete old SK
-                # Using high-level Table API (put_item + delete_item) instead of
-                # transact_write_items to avoid low-level serialization issues
-                logger.debug(f"🔄 Moving session: old_sk={old_sk[:50]}..., new_sk={new_sk[:50]}...")
-                try:
-                    # Convert floats to Decimal for DynamoDB compatibility
-                    decimal_item = _convert_floats_to_decimal(merged_item)
-
-                    # Put new item first — if this fails, original is untouched
-                    table.put_item(Item=decimal_item)
-                    # Delete old item
-                    table.delete_item(Key={'PK': pk, 'SK': old_sk})
-                    logger.info(f"💾 Moved session metadata in DynamoDB (SK changed)")
-                except Exception as move_error:
-                    logger.error(f"Session move failed - PK={pk}, old_SK={old_sk}, new_SK={new_sk}")
-                    logger.error(f"Move error: {move_error}")
-                    raise
-            else:
-                # SK unchanged - simple update with deep merge
-                # Build update expression for partial update
-                update_expression_parts = []
-                expression_attribute_names = {}
-                expression_attribute_values = {}
-
-                for key_name, value in item.items():
-                    # Skip keys that are part of the primary key or GSI
-                    if key_name in ['sessionId', 'userId', 'PK', 'SK']:
-                        continue
-
-                    placeholder_name = f"#{key_name}"
-                    placeholder_value = f":{key_name}"
-
-                    update_expression_parts.append(f"{placeholder_name} = {placeholder_value}")
-                    expression_attribute_names[placeholder_name] = key_name
-                    expression_attribute_values[placeholder_value] = value
-
-                if update_expression_parts:
-                    update_expression = "SET " + ", ".join(update_expression_parts)
-                    table.update_item(
-                        Key={'PK': pk, 'SK': old_sk},
-                        UpdateExpression=update_expression,
-                        ExpressionAttributeNames=expression_attribute_names,
-                        ExpressionAttributeValues=expression_attribute_values
-                    )
-                logger.info(f"💾 Updated session metadata in DynamoDB table {table_name}")
+            # Partial update: fields not in the model dump are preserved
+            update_expression_parts = []
+            expression_attribute_names = {}
+            expression_attribute_values = {}
+
+            if not session_metadata.deleted:
+                item.update(recency_attributes(user_id, session_id, last_message_at))
+
+            for key_name, value in item.items():
+                # Skip keys that are part of the primary key
+                if key_name in ['sessionId', 'userId', 'PK', 'SK']:
+                    continue
+
+                placeholder_name = f"#{key_name}"
+                placeholder_value = f":{key_name}"
+
+                update_expression_parts.append(f"{placeholder_name} = {placeholder_value}")
+                expression_attribute_names[placeholder_name] = key_name
+                expression_attribute_values[placeholder_value] = value
+
+            update_expression = "SET " + ", ".join(update_expression_parts)
+            if session_metadata.deleted:
+                # Dropping the recency keys takes the row out of the listing index
+                update_expression += f" REMOVE {RECENCY_PK}, {RECENCY_SK}"
+
+            await table_op(
+                table_name, "update_item",
+                Key={'PK': existing_session['PK'], 'SK': existing_session['SK']},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=expression_attribute_values
+            )
+            logger.info(f"💾 Updated session metadata in DynamoDB table {table_name}")
         else:
             # New session - create with put_item
-            item['PK'] = pk
-            item['SK'] = new_sk
-            table.put_item(Item=item)
+            item.update(key)
+            item.setdefault('preferences', {})
+            if not session_metadata.deleted:
+                item.update(recency_attributes(user_id, session_id, last_message_at))
+            await table_op(table_name, "put_item", Item=item)
             logger.info(f"💾 Created session metadata in DynamoDB table {table_name}")
 
         logger.info(f"   Session: {session_id}, User: {user_id}")
@@ -742,20 +686,11 @@ async def ensure_session_metadata_exists(session_id: str, user_id: str) -> bool:
     Returns ``True`` when a new row was created (caller can use this as the
     "first turn" signal, e.g. to fire title generation).
 
-    Existence is gated on a ``SessionLookupIndex`` GSI lookup rather than a
-    conditional ``put_item``: the main-table SK encodes ``lastMessageAt``
-    (rotated each turn by ``update_session_activity`` to keep recency
-    listing correct), so each call generates a different SK and an
-    ``attribute_not_exists(PK)`` ConditionExpression would be evaluated
-    against an item that never existed at that exact key — the put would
-    always succeed and the same session would gain a new duplicate row
-    every turn.
-
-    The GSI is eventually consistent, so a residual race remains for
-    genuinely concurrent first-turn requests for the same brand-new
-    session_id. That window is bounded to the GSI replication lag (sub-
-    100ms typical) and is the same one tracked alongside the schema
-    change in issue #175.
+    The row key is stable (``SK: SESSION#{session_id}``), so creation is a
+    conditional ``put_item`` with ``attribute_not_exists(PK)``: concurrent
+    first-turn requests for the same brand-new session cannot both create
+    it. While legacy reads are on, a legacy row for the session also
+    counts as existing.
 
     No-op for preview sessions, which intentionally skip persistence.
     """
@@ -767,20 +702,17 @@ async def ensure_session_metadata_exists(session_id: str, user_id: str) -> bool:
         raise RuntimeError("DYNAMODB_SESSIONS_METADATA_TABLE_NAME environment variable is required")
 
     try:
-        import boto3
         from datetime import datetime, timezone
 
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
-        if existing is not None:
-            return False
+        if legacy_reads_enabled():
+            existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
+            if existing is not None:
+                return False
 
         now = datetime.now(timezone.utc).isoformat()
         item = {
-            "PK": f"USER#{user_id}",
-            "SK": f"S#ACTIVE#{now}#{session_id}",
+            **session_row_key(user_id, session_id),
+            **recency_attributes(user_id, session_id, now),
             "GSI_PK": f"SESSION#{session_id}",
             "GSI_SK": "META",
             "sessionId": session_id,
@@ -792,9 +724,19 @@ async def ensure_session_metadata_exists(session_id: str, user_id: str) -> bool:
             "messageCount": 0,
             "starred": False,
             "tags": [],
+            "preferences": {},
         }
 
-        table.put_item(Item=item)
+        try:
+            await table_op(
+                sessions_metadata_table, "put_item",
+                Item=item,
+                ConditionExpression="attribute_not_exists(PK)",
+            )
+        except Exception as e:
+            if _is_conditional_check_failure(e):
+                return False
+            raise
         logger.info(f"💾 Pre-created session metadata for {session_id}")
         return True
     except Exception as e:
@@ -809,8 +751,8 @@ async def update_session_title(session_id: str, user_id: str, title: str) -> Non
 
     Uses a targeted ``UpdateExpression`` so it can run concurrently with
     ``store_session_metadata`` (which does a full-row merge) without racing
-    on other fields like ``messageCount`` or ``lastMessageAt``. Looks up the
-    current SK via the GSI because the SK contains a timestamp.
+    on other fields like ``messageCount`` or ``lastMessageAt``. Writes to
+    the row found by ``_get_session_row`` (stable, or legacy during rollout).
 
     No-op when the session row doesn't exist (preview sessions, sessions
     deleted mid-turn).
@@ -823,12 +765,7 @@ async def update_session_title(session_id: str, user_id: str, title: str) -> Non
         raise RuntimeError("DYNAMODB_SESSIONS_METADATA_TABLE_NAME environment variable is required")
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             logger.info(f"update_session_title: session {session_id} not found, skipping")
             return
@@ -837,7 +774,8 @@ async def update_session_title(session_id: str, user_id: str, title: str) -> Non
             logger.warning(f"update_session_title: session {session_id} has no SK")
             return
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET title = :t",
             ExpressionAttributeValues={":t": title},
@@ -855,23 +793,23 @@ async def update_session_activity(
     enabled_tools: Optional[List[str]] = None,
     system_prompt_hash: Optional[str] = None,
 ) -> bool:
-    """Per-turn session activity update with targeted writes.
-
-    Increments ``messageCount``, advances ``lastMessageAt`` to now, and
-    merges agent-derived preferences. No other attributes are written, so
-    concurrent writers (``update_session_title``, ``add_pending_interrupt``)
-    cannot be clobbered by this path.
-
-    Phase A is a targeted ``UpdateExpression`` on the current SK. Phase B
-    rotates the SK because ``lastMessageAt`` is encoded in it for recency
-    listing — fresh-read after Phase A, put at the new SK, delete the old.
-    The Phase B carry picks up any concurrent write that landed between
-    Phase A and the fresh read; the residual race window is bounded to
-    that small interval (full elimination requires the schema change in
-    issue #175).
-
-    Self-heals when the row is missing by calling
-    ``ensure_session_metadata_exists`` and retrying the lookup once.
+    """Per-turn session activity update with a single targeted write.
+
+    Increments ``messageCount``, advances ``lastMessageAt`` (and the
+    SessionRecencyIndex sort key with it) to now, and sets the passed
+    agent-derived preferences as nested attributes. No other attributes
+    are written, so concurrent writers (``update_session_title``,
+    ``add_pending_interrupt``, ``set_selected_prompt_id``) cannot be
+    clobbered by this path. The row key is stable, so there is no read
+    and no row move: one ``update_item`` per turn.
+
+    The write is conditioned on the row existing with a ``preferences``
+    map and not being soft-deleted. When the condition fails the slow
+    path works out why: a missing row is created through
+    ``ensure_session_metadata_exists``, a legacy row is migrated to the
+    stable key, and a row without ``preferences`` gets the map; then the
+    update is retried once. Deleted sessions are left alone.
+
     No-op for preview sessions. Returns ``True`` when the update applied.
     """
     if is_preview_session(session_id):
@@ -882,91 +820,117 @@ async def update_session_activity(
         raise RuntimeError("DYNAMODB_SESSIONS_METADATA_TABLE_NAME environment variable is required")
 
     try:
-        import boto3
         from datetime import datetime, timezone
 
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
-        if not existing:
-            # Pre-create may have failed at /invocations entry — try once
-            # more so we don't lose the session record entirely.
-            await ensure_session_metadata_exists(session_id, user_id)
-            existing = await _get_session_by_gsi(session_id, user_id, table)
-            if not existing:
-                logger.warning(
-                    "update_session_activity: session %s missing and could not be created",
-                    session_id,
-                )
-                return False
-
-        old_sk = existing.get("SK")
-        if not old_sk:
-            logger.warning("update_session_activity: session %s has no SK", session_id)
-            return False
-
-        # Merge preferences: existing values take effect for keys the
-        # caller didn't pass (e.g. assistantId set by the assistant-attach
-        # flow). We replace the whole `preferences` map in one SET so the
-        # update works whether the attribute exists yet or not — DynamoDB
-        # disallows updating both a parent path and its children in the
-        # same expression.
-        existing_prefs_raw = existing.get("preferences") or {}
-        try:
-            existing_prefs = SessionPreferences.model_validate(existing_prefs_raw)
-        except Exception:
-            existing_prefs = SessionPreferences()
-        prefs_dict = existing_prefs.model_dump(by_alias=False, exclude_none=True)
+        # Only the preference fields the caller passed are written, so
+        # values set elsewhere (e.g. assistantId from the assistant-attach
+        # flow) are preserved without reading the row first.
+        prefs: Dict[str, Any] = {}
         if last_model is not None:
-            prefs_dict["last_model"] = last_model
+            prefs["last_model"] = last_model
         if enabled_tools is not None:
-            prefs_dict["enabled_tools"] = enabled_tools
+            prefs["enabled_tools"] = enabled_tools
         if system_prompt_hash is not None:
-            prefs_dict["system_prompt_hash"] = system_prompt_hash
-        merged_prefs = SessionPreferences(**prefs_dict).model_dump(by_alias=True, exclude_none=True)
+            prefs["system_prompt_hash"] = system_prompt_hash
+        prefs_update = _convert_floats_to_decimal(
+            SessionPreferences(**prefs).model_dump(by_alias=True, exclude_none=True)
+        )
 
         now = datetime.now(timezone.utc).isoformat()
-        pk = f"USER#{user_id}"
-
-        # Phase A: targeted update of owned attributes on the current SK.
-        # Disjoint from title, starred, tags, pendingInterrupts.
-        table.update_item(
-            Key={"PK": pk, "SK": old_sk},
-            UpdateExpression="ADD messageCount :one SET lastMessageAt = :t, preferences = :p",
-            ExpressionAttributeValues={
-                ":one": 1,
-                ":t": now,
-                ":p": _convert_floats_to_decimal(merged_prefs),
-            },
-        )
+        if await _apply_session_activity(sessions_metadata_table, session_id, user_id, now, prefs_update):
+            logger.info("Updated session activity for %s", session_id)
+            return True
 
-        # Phase B: SK rotation. lastMessageAt is encoded in the SK for
-        # recency listing, so a per-turn change forces a row move. Fresh
-        # read carries any concurrent write (e.g. title-gen) that landed
-        # between Phase A and now.
-        new_sk = f"S#ACTIVE#{now}#{session_id}"
-        if new_sk != old_sk:
-            fresh_resp = table.get_item(Key={"PK": pk, "SK": old_sk})
-            fresh = fresh_resp.get("Item")
-            if not fresh:
-                logger.warning(
-                    "update_session_activity: row vanished between Phase A and Phase B for %s",
-                    session_id,
-                )
-                return True
-            carried = {k: v for k, v in fresh.items() if k not in ("PK", "SK")}
-            new_item = {"PK": pk, "SK": new_sk, **carried}
-            table.put_item(Item=new_item)
-            table.delete_item(Key={"PK": pk, "SK": old_sk})
+        if not await _prepare_session_row_for_activity(sessions_metadata_table, session_id, user_id):
+            return False
+        if await _apply_session_activity(sessions_metadata_table, session_id, user_id, now, prefs_update):
+            logger.info("Updated session activity for %s (after repairing the row)", session_id)
+            return True
 
-        logger.info("Updated session activity for %s (sk_rotated=%s)", session_id, new_sk != old_sk)
-        return True
+        logger.warning("update_session_activity: session %s could not be updated", session_id)
+        return False
     except Exception as e:
         logger.error("update_session_activity failed for %s: %s", session_id, e, exc_info=True)
         return False
 
 
+async def _apply_session_activity(
+    table_name: str,
+    session_id: str,
+    user_id: str,
+    now: str,
+    prefs_update: Dict[str, Any],
+) -> bool:
+    """The single-write activity update. False when the row's condition failed."""
+    names: Dict[str, str] = {"#prefs": "preferences"}
+    values: Dict[str, Any] = {
+        ":one": 1,
+        ":t": now,
+        ":rpk": f"USER#{user_id}",
+        ":rsk": recency_sort_key(now, session_id),
+        ":no": False,
+    }
+    set_parts = ["lastMessageAt = :t", f"{RECENCY_PK} = :rpk", f"{RECENCY_SK} = :rsk"]
+    for i, (field_name, value) in enumerate(prefs_update.items()):
+        names[f"#p{i}"] = field_name
+        values[f":p{i}"] = value
+        set_parts.append(f"#prefs.#p{i} = :p{i}")
+
+    try:
+        await table_op(
+            table_name, "update_item",
+            Key=session_row_key(user_id, session_id),
+            UpdateExpression="ADD messageCount :one SET " + ", ".join(set_parts),
+            ConditionExpression="attribute_exists(#prefs) AND (attribute_not_exists(deleted) OR deleted = :no)",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+        return True
+    except Exception as e:
+        if _is_conditional_check_failure(e):
+            return False
+        raise
+
+
+async def _prepare_session_row_for_activity(table_name: str, session_id: str, user_id: str) -> bool:
+    """Bring the session row into a state the activity update's condition accepts.
+
+    Returns False when the session should not be updated (deleted, or
+    missing and could not be created).
+    """
+    existing = await _get_session_row(session_id, user_id, table_name)
+    if not existing:
+        # Pre-create may have failed at /invocations entry — try once
+        # more so we don't lose the session record entirely.
+        await ensure_session_metadata_exists(session_id, user_id)
+        existing = await _get_session_row(session_id, user_id, table_name)
+        if not existing:
+            logger.warning(
+                "update_session_activity: session %s missing and could not be created",
+                session_id,
+            )
+            return False
+
+    if existing.get("deleted"):
+        logger.info("update_session_activity: session %s is deleted, skipping", session_id)
+        return False
+
+    if is_legacy_row(existing):
+        await migrate_legacy_row(table_name, _convert_floats_to_decimal(existing))
+        return True
+
+    if not isinstance(existing.get("preferences"), dict):
+        # Rows written before every writer created the map; nested SETs
+        # need the parent to exist.
+        await table_op(
+            table_name, "update_item",
+            Key=session_row_key(user_id, session_id),
+            UpdateExpression="SET preferences = if_not_exists(preferences, :empty)",
+            ExpressionAttributeValues={":empty": {}},
+        )
+    return True
+
+
 async def set_selected_prompt_id(
     session_id: str,
     user_id: str,
@@ -974,8 +938,8 @@ async def set_selected_prompt_id(
 ) -> bool:
     """Set ``preferences.selected_prompt_id`` on the session row, in place.
 
-    Targeted SET on the existing row — does NOT rotate the SK, does NOT
-    bump ``messageCount``. Safe to call alongside ``update_session_activity``
+    Targeted SET on the existing row — does NOT touch ``lastMessageAt``,
+    does NOT bump ``messageCount``. Safe to call alongside ``update_session_activity``
     in the same turn without double-counting.
 
     Self-heals via ``ensure_session_metadata_exists`` if the row is
@@ -990,12 +954,10 @@ async def set_selected_prompt_id(
     map. If another writer (``update_session_activity`` finishing a
     parallel turn, the BFF metadata PUT, etc.) lands between the GetItem
     and UpdateItem here, last-write-wins on the full map. The window is
-    short and the same race already exists for every preference field
-    written through ``update_session_activity``. The proper fix is a
-    nested-attribute SET (``SET preferences.selectedPromptId = :p``),
-    which DynamoDB supports but rejects when the parent map is missing —
-    so we'd need to pre-create ``preferences`` everywhere first. Tracked
-    separately from this feature.
+    short. ``update_session_activity`` already uses nested-attribute SETs
+    (rows now get a ``preferences`` map at creation or migration); moving
+    this path to ``SET preferences.selectedPromptId = :p`` as well closes
+    the race and is tracked separately from this feature.
     """
     if is_preview_session(session_id):
         return False
@@ -1006,15 +968,10 @@ async def set_selected_prompt_id(
         return False
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             await ensure_session_metadata_exists(session_id, user_id)
-            existing = await _get_session_by_gsi(session_id, user_id, table)
+            existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
             if not existing:
                 logger.warning("set_selected_prompt_id: session %s could not be located", session_id)
                 return False
@@ -1045,7 +1002,8 @@ async def set_selected_prompt_id(
             by_alias=True, exclude_none=True
         )
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET preferences = :p",
             ExpressionAttributeValues={":p": _convert_floats_to_decimal(merged_prefs)},
@@ -1056,7 +1014,7 @@ async def set_selected_prompt_id(
         return False
 
 
-async def _get_session_by_gsi(session_id: str, user_id: str, table) -> Optional[dict]:
+async def _get_session_by_gsi(session_id: str, user_id: str, table_name: str) -> Optional[dict]:
     """
     Get session record using GSI (SessionLookupIndex)
 
@@ -1065,7 +1023,7 @@ async def _get_session_by_gsi(session_id: str, user_id: str, table) -> Optional[
     Args:
         session_id: Session identifier
         user_id: User identifier (for ownership verification)
-        table: DynamoDB table resource
+        table_name: Sessions metadata table name
 
     Returns:
         Raw DynamoDB item dict if found, None otherwise
@@ -1073,7 +1031,8 @@ async def _get_session_by_gsi(session_id: str, user_id: str, table) -> Optional[
     try:
         from boto3.dynamodb.conditions import Key
 
-        response = table.query(
+        response = await table_op(
+            table_name, "query",
             IndexName='SessionLookupIndex',
             KeyConditionExpression=Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').eq('META')
         )
@@ -1100,13 +1059,39 @@ async def _get_session_by_gsi(session_id: str, user_id: str, table) -> Optional[
         return None
 
 
+async def _get_session_row(session_id: str, user_id: str, table_name: str) -> Optional[dict]:
+    """
+    Get a session row by its stable key, falling back to a legacy row
+
+    The stable row is read with a strongly consistent ``get_item``. While
+    ``SESSIONS_LEGACY_READS`` is on, a miss falls back to the
+    ``SessionLookupIndex`` GSI so rows not yet migrated off the legacy
+    ``S#ACTIVE#``/``S#DELETED#`` layout are still found. Callers write back
+    through ``existing["SK"]``, which is correct for either layout.
+
+    Returns:
+        Row dict (Decimals converted to floats) if found, None otherwise
+    """
+    response = await table_op(
+        table_name, "get_item",
+        Key=session_row_key(user_id, session_id),
+        ConsistentRead=True,
+    )
+    item = response.get("Item")
+    if item:
+        return _convert_decimal_to_float(item)
+    if legacy_reads_enabled():
+        return await _get_session_by_gsi(session_id, user_id, table_name)
+    return None
+
+
 
 
 async def _bump_session_aggregates(
     session_id: str,
     user_id: str,
     message_metadata: MessageMetadata,
-    table,
+    table_name: str,
 ) -> None:
     """Atomically update the session row's denormalized cost + context fields.
 
@@ -1117,10 +1102,10 @@ async def _bump_session_aggregates(
       - ``SET lastContextTokens :t, contextWindow :w`` — last-write-wins,
         which is the right behavior for "most recent turn."
 
-    The session row's SK encodes ``lastMessageAt`` so we don't know it
-    directly; query the ``SessionLookupIndex`` GSI once to find it. Any
-    failure is swallowed — drift is repaired on the next metadata read by
-    ``_backfill_session_aggregates``.
+    The update targets the stable row key directly, conditioned on the row
+    existing; only a legacy row (during rollout) costs an extra lookup.
+    Any failure is swallowed — drift is repaired on the next metadata read
+    by ``_backfill_session_aggregates``.
     """
     try:
         cost_value = _coerce_cost_total(message_metadata.cost)
@@ -1144,15 +1129,6 @@ async def _bump_session_aggregates(
             context_window = message_metadata.model_extra.get("contextWindow") \
                 or message_metadata.model_extra.get("context_window")
 
-        existing = await _get_session_by_gsi(session_id, user_id, table)
-        if not existing:
-            logger.debug("bump_session_aggregates: session %s not found, skipping", session_id)
-            return
-
-        sk = existing.get("SK")
-        if not sk:
-            return
-
         update_parts_set = ["lastContextTokens = :t"]
         values: Dict[str, Any] = {":c": Decimal(str(cost_value)), ":t": int(input_tokens)}
 
@@ -1162,11 +1138,27 @@ async def _bump_session_aggregates(
 
         update_expression = "ADD totalCost :c SET " + ", ".join(update_parts_set)
 
-        table.update_item(
-            Key={"PK": f"USER#{user_id}", "SK": sk},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=values,
-        )
+        try:
+            await table_op(
+                table_name, "update_item",
+                Key=session_row_key(user_id, session_id),
+                UpdateExpression=update_expression,
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeValues=values,
+            )
+        except Exception as e:
+            if not _is_conditional_check_failure(e):
+                raise
+            existing = await _get_session_row(session_id, user_id, table_name) if legacy_reads_enabled() else None
+            if not existing:
+                logger.debug("bump_session_aggregates: session %s not found, skipping", session_id)
+                return
+            await table_op(
+                table_name, "update_item",
+                Key={"PK": existing["PK"], "SK": existing["SK"]},
+                UpdateExpression=update_expression,
+                ExpressionAttributeValues=values,
+            )
         logger.debug(
             "bumped session aggregates for %s: +$%.6f, lastContextTokens=%d",
             session_id, cost_value, input_tokens,
@@ -1180,7 +1172,7 @@ async def _backfill_session_aggregates(
     session_id: str,
     user_id: str,
     session_item: Dict[str, Any],
-    table,
+    table_name: str,
 ) -> None:
     """One-shot backfill for legacy sessions missing denormalized aggregates.
 
@@ -1216,7 +1208,7 @@ async def _backfill_session_aggregates(
             if last_evaluated_key:
                 query_kwargs["ExclusiveStartKey"] = last_evaluated_key
 
-            response = table.query(**query_kwargs)
+            response = await table_op(table_name, "query", **query_kwargs)
             for rec in response.get("Items", []):
                 rec_float = _convert_decimal_to_float(rec)
                 if rec_float.get("userId") != user_id:
@@ -1252,7 +1244,8 @@ async def _backfill_session_aggregates(
             update_parts.append("lastContextTokens = :t")
             values[":t"] = int(last_context_tokens)
 
-        table.update_item(
+        await table_op(
+            table_name, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET " + ", ".join(update_parts),
             ExpressionAttributeValues=values,
@@ -1314,13 +1307,10 @@ async def session_exists_for_other_user(session_id: str, current_user_id: str) -
         raise RuntimeError("DYNAMODB_SESSIONS_METADATA_TABLE_NAME environment variable is required")
 
     try:
-        import boto3
         from boto3.dynamodb.conditions import Key
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(sessions_metadata_table)
-
-        response = table.query(
+        response = await table_op(
+            sessions_metadata_table, "query",
             IndexName='SessionLookupIndex',
             KeyConditionExpression=Key('GSI_PK').eq(f'SESSION#{session_id}')
             & Key('GSI_SK').eq('META'),
@@ -1381,88 +1371,186 @@ async def _get_all_message_metadata_cloud(session_id: str, user_id: str, table_n
         Dictionary mapping message_id (str) to metadata dict
     """
     try:
-        import boto3
         from boto3.dynamodb.conditions import Key
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-
         logger.info(f"🔍 Querying cost records via GSI for session {session_id}")
 
         # Query cost records (C#) and display text records (D#) in parallel
-        cost_response = table.query(
-            IndexName='SessionLookupIndex',
-            KeyConditionExpression=Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').begins_with('C#')
-        )
-        display_response = table.query(
-            IndexName='SessionLookupIndex',
-            KeyConditionExpression=Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').begins_with('D#')
+        items, display_items = await asyncio.gather(
+            _query_session_index(table_name, Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').begins_with('C#')),
+            _query_session_index(table_name, Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').begins_with('D#')),
         )
 
-        items = cost_response.get("Items", [])
-        display_items = display_response.get("Items", [])
-        metadata_index = {}
-
         logger.info(f"📦 DynamoDB returned {len(items)} cost record items, {len(display_items)} display text items")
 
-        for item in items:
-            # Verify user ownership
-            if item.get('userId') != user_id:
-                logger.warning(f"Cost record belongs to different user, skipping")
-                continue
+        metadata_index = _build_metadata_index(items, display_items, user_id)
+        logger.info(f"📋 Metadata keys: {sorted(metadata_index.keys())}")
+        return metadata_index
+
+    except Exception as e:
+        logger.error(f"Failed to query message metadata from DynamoDB: {e}", exc_info=True)
+        return {}
+
 
-            # Convert Decimal to float
-            item_float = _convert_decimal_to_float(item)
+async def get_message_metadata_window(
+    session_id: str,
+    user_id: str,
+    message_ids: Iterable[int],
+    display_message_ids: Iterable[int] = (),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Retrieve metadata for a window of messages instead of the whole session.
 
-            # Extract message_id as integer (DynamoDB returns Decimal, convert to int then str)
-            # Must convert to int first to avoid "0.0" -> "0" mismatch
-            message_id_raw = item_float.get("messageId")
-            message_id = str(int(message_id_raw)) if isinstance(message_id_raw, (int, float)) else str(message_id_raw)
+    Cost records are keyed by write time (GSI_SK: C#{timestamp}), not by
+    message index, so the caller bounds the query with ISO timestamps that
+    bracket the window: ``since`` no later than the first message in it and
+    ``until`` no earlier than the end of its last turn (``None`` leaves the
+    range open at the newest record). Rows for other messages that fall in
+    the range are dropped. Display text records have exact keys and are
+    fetched with one BatchGetItem for ``display_message_ids``.
 
-            logger.debug(f"Processing cost record for message_id={message_id}, SK={item_float.get('SK')}")
+    Returns:
+        Dictionary mapping message_id (str) to metadata dict, the same shape
+        as ``get_all_message_metadata`` restricted to ``message_ids``
+    """
+    sessions_metadata_table = os.environ.get('DYNAMODB_SESSIONS_METADATA_TABLE_NAME')
+    if not sessions_metadata_table:
+        raise RuntimeError("DYNAMODB_SESSIONS_METADATA_TABLE_NAME environment variable is required")
 
-            # Remove DynamoDB-specific keys and top-level fields not needed in metadata dict
-            for key in ["PK", "SK", "GSI_PK", "GSI_SK", "ttl", "userId", "sessionId", "messageId", "timestamp"]:
-                item_float.pop(key, None)
+    wanted = set()
+    for message_id in message_ids:
+        wanted.add(str(message_id))
+        wanted.add(f"voice:{message_id}")
+    if not wanted:
+        return {}
 
-            metadata_index[message_id] = item_float
+    try:
+        from boto3.dynamodb.conditions import Key
 
-        logger.info(f"📂 Retrieved {len(metadata_index)} cost records from DynamoDB")
+        # '$' sorts right after '#', so "C$" bounds every C# key from above
+        cost_range = Key('GSI_SK').between(f"C#{since or ''}", f"C#{until}" if until else "C$")
+        display_keys = [
+            {"PK": f"USER#{user_id}", "SK": f"D#{session_id}#{message_id}"}
+            for message_id in sorted(set(display_message_ids))
+        ]
 
-        # Merge displayText from D# records into metadata index
-        for item in display_items:
-            if item.get('userId') != user_id:
-                continue
-            item_float = _convert_decimal_to_float(item)
-            message_id_raw = item_float.get("messageId")
-            message_id = str(int(message_id_raw)) if isinstance(message_id_raw, (int, float)) else str(message_id_raw)
-            display_text = item_float.get("displayText")
-            if display_text:
-                if message_id in metadata_index:
-                    metadata_index[message_id]["displayText"] = display_text
-                else:
-                    metadata_index[message_id] = {"displayText": display_text}
-                logger.debug(f"🔗 Merged displayText for user message {message_id}")
+        items, display_items = await asyncio.gather(
+            _query_session_index(sessions_metadata_table, Key('GSI_PK').eq(f'SESSION#{session_id}') & cost_range),
+            _batch_get_items(sessions_metadata_table, display_keys),
+        )
 
-        logger.info(f"📋 Metadata keys: {sorted(metadata_index.keys())}")
-        return metadata_index
+        metadata_index = _build_metadata_index(items, display_items, user_id)
+        window_index = {message_id: metadata for message_id, metadata in metadata_index.items() if message_id in wanted}
+        logger.info(
+            f"📦 Window metadata for session {session_id}: {len(items)} cost rows in range, "
+            f"{len(display_items)} display rows, {len(window_index)} matched"
+        )
+        return window_index
 
     except Exception as e:
-        logger.error(f"Failed to query message metadata from DynamoDB: {e}", exc_info=True)
+        logger.error(f"Failed to query windowed message metadata from DynamoDB: {e}", exc_info=True)
         return {}
 
 
+async def _query_session_index(table_name: str, key_condition: Any) -> List[Dict[str, Any]]:
+    """Run a SessionLookupIndex query and follow LastEvaluatedKey to the end."""
+    items: List[Dict[str, Any]] = []
+    kwargs: Dict[str, Any] = {"IndexName": 'SessionLookupIndex', "KeyConditionExpression": key_condition}
+    while True:
+        response = await table_op(table_name, "query", **kwargs)
+        items.extend(response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+async def _batch_get_items(table_name: str, keys: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """BatchGetItem ``keys`` from one table, retrying unprocessed keys."""
+    if not keys:
+        return []
+
+    def _fetch(table: Any) -> List[Dict[str, Any]]:
+        client = table.meta.client
+        found: List[Dict[str, Any]] = []
+        # DynamoDB batch_get_item limit is 100
+        for i in range(0, len(keys), 100):
+            request = {table_name: {"Keys": keys[i : i + 100]}}
+            for _ in range(5):
+                response = client.batch_get_item(RequestItems=request)
+                found.extend(response.get("Responses", {}).get(table_name, []))
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+        return found
+
+    return await run_table_call(table_name, "batch_get_item", _fetch)
+
+
+def _metadata_message_id(item: Dict[str, Any]) -> str:
+    # Must convert to int first to avoid "0.0" -> "0" mismatch
+    message_id_raw = item.get("messageId")
+    return str(int(message_id_raw)) if isinstance(message_id_raw, (int, float)) else str(message_id_raw)
+
+
+def _build_metadata_index(
+    cost_items: List[Dict[str, Any]],
+    display_items: List[Dict[str, Any]],
+    user_id: str,
+) -> Dict[str, Any]:
+    """Join cost (C#) and display text (D#) rows into a message_id -> metadata map."""
+    metadata_index: Dict[str, Any] = {}
+
+    for item in cost_items:
+        # Verify user ownership
+        if item.get('userId') != user_id:
+            logger.warning(f"Cost record belongs to different user, skipping")
+            continue
+
+        # Convert Decimal to float
+        item_float = _convert_decimal_to_float(item)
+        message_id = _metadata_message_id(item_float)
+
+        logger.debug(f"Processing cost record for message_id={message_id}, SK={item_float.get('SK')}")
+
+        # Remove DynamoDB-specific keys and top-level fields not needed in metadata dict
+        for key in ["PK", "SK", "GSI_PK", "GSI_SK", "ttl", "userId", "sessionId", "messageId", "timestamp"]:
+            item_float.pop(key, None)
+
+        metadata_index[message_id] = item_float
+
+    logger.info(f"📂 Retrieved {len(metadata_index)} cost records from DynamoDB")
+
+    # Merge displayText from D# records into metadata index
+    for item in display_items:
+        if item.get('userId') != user_id:
+            continue
+        item_float = _convert_decimal_to_float(item)
+        message_id = _metadata_message_id(item_float)
+        display_text = item_float.get("displayText")
+        if display_text:
+            if message_id in metadata_index:
+                metadata_index[message_id]["displayText"] = display_text
+            else:
+                metadata_index[message_id] = {"displayText": display_text}
+            logger.debug(f"🔗 Merged displayText for user message {message_id}")
+
+    return metadata_index
+
+
 async def _get_session_metadata_cloud(
     session_id: str,
     user_id: str,
     table_name: str
 ) -> Optional[SessionMetadata]:
     """
-    Retrieve session metadata from DynamoDB using GSI
+    Retrieve session metadata from DynamoDB
 
-    With the new SK pattern (S#ACTIVE#{last_message_at}#{session_id}), we can't
-    use get_item directly because we don't know the last_message_at timestamp.
-    Instead, we use the SessionLookupIndex GSI for direct session lookup by ID.
+    Reads the row at its stable key (``SK: SESSION#{session_id}``); while
+    legacy reads are on, falls back to the SessionLookupIndex GSI for rows
+    not yet migrated.
 
     Args:
         session_id: Session identifier
@@ -1471,42 +1559,13 @@ async def _get_session_metadata_cloud(
 
     Returns:
         SessionMetadata object if found, None otherwise
-
-    Schema:
-        GSI: SessionLookupIndex
-            GSI_PK: SESSION#{session_id}
-            GSI_SK: META
-
-    This allows looking up sessions by ID without knowing the timestamp.
     """
     try:
-        import boto3
-        from boto3.dynamodb.conditions import Key
-
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-
-        # Use GSI for session lookup by ID
-        response = table.query(
-            IndexName='SessionLookupIndex',
-            KeyConditionExpression=Key('GSI_PK').eq(f'SESSION#{session_id}') & Key('GSI_SK').eq('META')
-        )
-
-        items = response.get('Items', [])
-        if not items:
+        item = await _get_session_row(session_id, user_id, table_name)
+        if not item:
             logger.info(f"Session metadata not found in DynamoDB: {session_id}")
             return None
 
-        item = items[0]
-
-        # Verify user ownership
-        if item.get('userId') != user_id:
-            logger.warning(f"Session {session_id} belongs to different user")
-            return None
-
-        # Convert Decimal to float for JSON serialization
-        item = _convert_decimal_to_float(item)
-
         # Lazy backfill of session-cost-badge aggregates for legacy
         # sessions that pre-date write-time aggregation. One-shot per
         # session — subsequent reads see the denormalized values directly.
@@ -1515,11 +1574,11 @@ async def _get_session_metadata_cloud(
                 session_id=session_id,
                 user_id=user_id,
                 session_item=item,
-                table=table,
+                table_name=table_name,
             )
 
         # Remove DynamoDB keys before validation
-        for key in ['PK', 'SK', 'GSI_PK', 'GSI_SK']:
+        for key in ROW_KEY_ATTRIBUTES:
             item.pop(key, None)
 
         # Dedupe pending interrupts at the storage boundary so list_append
@@ -1651,103 +1710,81 @@ async def _list_user_sessions_cloud(
         Sessions are sorted by last_message_at descending (most recent first)
 
     Schema:
-        PK: USER#{user_id}
-        SK: S#ACTIVE#{last_message_at}#{session_id}
-
-    Performance improvements over old schema:
-        - Query only returns session records (no cost records with C# prefix)
-        - No in-memory filtering needed
-        - Sessions sorted by timestamp in SK (no in-memory sorting)
-        - True server-side pagination via DynamoDB's native mechanism
-        - O(page_size) instead of O(sessions + messages)
+        GSI: SessionRecencyIndex (sparse: active sessions only)
+            GSI3PK: USER#{user_id}
+            GSI3SK: {last_message_at}#{session_id}
+
+    Sessions come from a descending query on the recency index. While
+    legacy reads are on, unmigrated ``S#ACTIVE#`` rows are queried from the
+    main table too and merged in by the same ``{last_message_at}#{session_id}``
+    ordering. The page token is that ordering key of the last session
+    returned, so it is valid against both sources; tokens issued before
+    the switch (a raw ``S#ACTIVE#`` LastEvaluatedKey) are still accepted.
     """
     try:
-        import boto3
         from boto3.dynamodb.conditions import Key
 
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(table_name)
-
-        # Decode next_token to get ExclusiveStartKey if provided
-        exclusive_start_key = None
-        if next_token:
-            try:
-                decoded = base64.b64decode(next_token).decode('utf-8')
-                exclusive_start_key = json.loads(decoded)
-            except Exception as e:
-                # JUSTIFICATION: Invalid pagination tokens should not break the request.
-                # We fall back to no pagination, which is a reasonable default.
-                # This handles cases where tokens are corrupted, expired, or malformed.
-                logger.warning(f"Invalid next_token: {e}")
-
-        # Build query parameters with new S#ACTIVE# prefix
-        # This cleanly separates from:
-        # - S#DELETED# (soft-deleted sessions)
-        # - C# (cost records)
-        query_params = {
-            'KeyConditionExpression': Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('S#ACTIVE#'),
-            'ScanIndexForward': False  # Descending order (most recent first) - timestamp is in SK!
-        }
-
-        if exclusive_start_key:
-            query_params['ExclusiveStartKey'] = exclusive_start_key
-
+        cursor = _decode_session_cursor(next_token) if next_token else None
+
+        recency_condition = Key(RECENCY_PK).eq(f'USER#{user_id}')
+        if cursor:
+            recency_condition = recency_condition & Key(RECENCY_SK).lt(cursor)
+        sources = [
+            _query_session_source(
+                table_name,
+                {
+                    'IndexName': SESSION_RECENCY_INDEX,
+                    'KeyConditionExpression': recency_condition,
+                    'ScanIndexForward': False,
+                },
+                lambda item: item.get(RECENCY_SK, ''),
+                limit,
+            )
+        ]
+        if legacy_reads_enabled():
+            legacy_condition = Key('PK').eq(f'USER#{user_id}')
+            if cursor:
+                legacy_condition = legacy_condition & Key('SK').between(
+                    LEGACY_ACTIVE_PREFIX, f'{LEGACY_ACTIVE_PREFIX}{cursor}'
+                )
+            else:
+                legacy_condition = legacy_condition & Key('SK').begins_with(LEGACY_ACTIVE_PREFIX)
+            sources.append(
+                _query_session_source(
+                    table_name,
+                    {'KeyConditionExpression': legacy_condition, 'ScanIndexForward': False},
+                    lambda item: item.get('SK', '')[len(LEGACY_ACTIVE_PREFIX):],
+                    limit,
+                    exclude_key=cursor,
+                )
+            )
+        results = await asyncio.gather(*sources)
+
+        # A source that still has rows only vouches for ordering down to its
+        # last fetched key; nothing older than that may end this page.
+        cutoff = max((entries[-1][0] for entries, has_more in results if has_more and entries), default='')
+
+        merged: Dict[str, Tuple[str, SessionMetadata]] = {}
+        for entries, _ in results:
+            for sort_key, session in entries:
+                # Stable rows come first, so a session caught mid-migration
+                # keeps its stable version
+                merged.setdefault(session.session_id, (sort_key, session))
+        ordered = sorted(merged.values(), key=lambda entry: entry[0], reverse=True)
+
+        page = [entry for entry in ordered if entry[0] >= cutoff]
+        has_more = any(has_more for _, has_more in results) or len(page) < len(ordered)
         if limit:
-            query_params['Limit'] = limit
-
-        # Pagination loop: DynamoDB's Limit caps items *evaluated*, not items
-        # *returned* after application-level filtering (preview sessions, parse
-        # failures). A single query may return fewer valid sessions than the
-        # requested limit while still having more data in the partition. We keep
-        # querying until we fill the page or exhaust the partition.
-        sessions: list[SessionMetadata] = []
-        last_evaluated_key = None
-
-        while True:
-            response = table.query(**query_params)
-
-            for item in response['Items']:
-                try:
-                    item = _convert_decimal_to_float(item)
-
-                    for key in ['PK', 'SK', 'GSI_PK', 'GSI_SK']:
-                        item.pop(key, None)
-
-                    # Skip preview sessions - they should not appear in user's session list
-                    session_id = item.get('sessionId', '')
-                    if is_preview_session(session_id):
-                        continue
-
-                    if "pendingInterrupts" in item:
-                        item["pendingInterrupts"] = _dedupe_interrupt_dicts(item["pendingInterrupts"])
-
-                    metadata = SessionMetadata.model_validate(item)
-                    sessions.append(metadata)
-
-                    # Stop collecting once we have enough
-                    if limit and len(sessions) >= limit:
-                        break
-                except Exception as e:
-                    # JUSTIFICATION: When listing sessions from DynamoDB, individual session parsing
-                    # failures should not break the entire list operation. We skip corrupted sessions
-                    # and continue processing others. This provides better UX than failing completely.
-                    logger.warning(f"Failed to parse session item: {e}")
-                    continue
-
-            last_evaluated_key = response.get('LastEvaluatedKey')
-
-            # Stop if we've filled the page or there's no more data
-            if (limit and len(sessions) >= limit) or not last_evaluated_key:
-                break
-
-            # Continue querying from where DynamoDB left off
-            query_params['ExclusiveStartKey'] = last_evaluated_key
+            has_more = has_more or len(page) > limit
+            page = page[:limit]
+        else:
+            has_more = False
 
-        # Generate next_token only when there is genuinely more data to fetch
+        sessions = [session for _, session in page]
         next_page_token = None
-        if last_evaluated_key and limit and len(sessions) >= limit:
+        if has_more and page:
             next_page_token = base64.b64encode(
-                json.dumps(last_evaluated_key).encode('utf-8')
+                json.dumps({'before': page[-1][0]}).encode('utf-8')
             ).decode('utf-8')
 
         logger.info(f"Listed {len(sessions)} sessions for user {user_id} from DynamoDB")
@@ -1769,6 +1806,86 @@ async def _list_user_sessions_cloud(
         )
 
 
+def _decode_session_cursor(next_token: str) -> Optional[str]:
+    """Recency key a listing page token points below, or None if unusable."""
+    try:
+        decoded = json.loads(base64.b64decode(next_token).decode('utf-8'))
+        if 'before' in decoded:
+            return str(decoded['before'])
+        sk = decoded.get('SK', '')
+        if sk.startswith(LEGACY_ACTIVE_PREFIX):
+            return sk[len(LEGACY_ACTIVE_PREFIX):]
+        raise ValueError("unrecognised token")
+    except Exception as e:
+        # JUSTIFICATION: Invalid pagination tokens should not break the request.
+        # We fall back to no pagination, which is a reasonable default.
+        # This handles cases where tokens are corrupted, expired, or malformed.
+        logger.warning(f"Invalid next_token: {e}")
+        return None
+
+
+async def _query_session_source(
+    table_name: str,
+    query_params: Dict[str, Any],
+    sort_key_of: Any,
+    limit: Optional[int],
+    exclude_key: Optional[str] = None,
+) -> Tuple[List[Tuple[str, SessionMetadata]], bool]:
+    """Collect up to ``limit`` listable sessions from one descending query.
+
+    Returns ``(sort_key, session)`` pairs in query order and whether the
+    query has rows left.
+    """
+    params = dict(query_params)
+    if limit:
+        params['Limit'] = limit
+
+    # Pagination loop: DynamoDB's Limit caps items *evaluated*, not items
+    # *returned* after application-level filtering (preview sessions, parse
+    # failures). A single query may return fewer valid sessions than the
+    # requested limit while still having more data in the partition. We keep
+    # querying until we fill the page or exhaust the partition.
+    entries: List[Tuple[str, SessionMetadata]] = []
+    while True:
+        response = await table_op(table_name, "query", **params)
+        items = response.get('Items', [])
+        for item in items:
+            if limit and len(entries) >= limit:
+                return entries, True
+            sort_key = sort_key_of(item)
+            if exclude_key is not None and sort_key == exclude_key:
+                continue
+            try:
+                item = _convert_decimal_to_float(item)
+
+                for key in ROW_KEY_ATTRIBUTES:
+                    item.pop(key, None)
+
+                # Skip preview sessions - they should not appear in user's session list
+                if is_preview_session(item.get('sessionId', '')):
+                    continue
+
+                if "pendingInterrupts" in item:
+                    item["pendingInterrupts"] = _dedupe_interrupt_dicts(item["pendingInterrupts"])
+
+                entries.append((sort_key, SessionMetadata.model_validate(item)))
+            except Exception as e:
+                # JUSTIFICATION: When listing sessions from DynamoDB, individual session parsing
+                # failures should not break the entire list operation. We skip corrupted sessions
+                # and continue processing others. This provides better UX than failing completely.
+                logger.warning(f"Failed to parse session item: {e}")
+                continue
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return entries, False
+        if limit and len(entries) >= limit:
+            return entries, True
+
+        # Continue querying from where DynamoDB left off
+        params['ExclusiveStartKey'] = last_evaluated_key
+
+
 def _deep_merge(base: dict, updates: dict) -> dict:
     """
     Deep merge two dictionaries
@@ -1872,12 +1989,7 @@ async def add_pending_interrupt(
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             logger.info("Skipping pending_interrupts add — session %s not found", session_id)
             return
@@ -1889,7 +2001,8 @@ async def add_pending_interrupt(
 
         new_entry = interrupt.model_dump(by_alias=True, exclude_none=True)
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET #pi = list_append(if_not_exists(#pi, :empty), :new)",
             ExpressionAttributeNames={"#pi": "pendingInterrupts"},
@@ -1930,12 +2043,7 @@ async def add_export_receipt(
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             logger.info("Skipping export receipt add — session %s not found", session_id)
             return
@@ -1947,7 +2055,8 @@ async def add_export_receipt(
 
         new_entry = receipt.model_dump(by_alias=True, exclude_none=True)
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET #er = list_append(if_not_exists(#er, :empty), :new)",
             ExpressionAttributeNames={"#er": "exportReceipts"},
@@ -1981,12 +2090,7 @@ async def remove_pending_interrupts(
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             return
 
@@ -2000,7 +2104,8 @@ async def remove_pending_interrupts(
         if len(kept) == len(current):
             return  # Nothing matched
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET #pi = :pi",
             ExpressionAttributeNames={"#pi": "pendingInterrupts"},
@@ -2046,12 +2151,7 @@ async def set_paused_turn(
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             logger.info("Skipping paused_turn write — session %s not found", session_id)
             return
@@ -2065,7 +2165,8 @@ async def set_paused_turn(
             snapshot.model_dump(by_alias=True, exclude_none=True)
         )
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET #pt = :pt",
             ExpressionAttributeNames={"#pt": "pausedTurn"},
@@ -2098,12 +2199,7 @@ async def clear_paused_turn(session_id: str, user_id: str) -> None:
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             return
 
@@ -2114,7 +2210,8 @@ async def clear_paused_turn(session_id: str, user_id: str) -> None:
         if "pausedTurn" not in existing:
             return  # Already clear
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="REMOVE #pt",
             ExpressionAttributeNames={"#pt": "pausedTurn"},
@@ -2139,12 +2236,7 @@ async def set_truncated_turn(session_id: str, user_id: str) -> None:
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             logger.info("Skipping truncated_turn write — session %s not found", session_id)
             return
@@ -2154,7 +2246,8 @@ async def set_truncated_turn(session_id: str, user_id: str) -> None:
             logger.warning("Session %s has no SK; cannot update truncated_turn", session_id)
             return
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="SET #ltc = :ltc",
             ExpressionAttributeNames={"#ltc": "lastTurnContinuable"},
@@ -2178,12 +2271,7 @@ async def clear_truncated_turn(session_id: str, user_id: str) -> None:
         return
 
     try:
-        import boto3
-
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(sessions_metadata_table)
-
-        existing = await _get_session_by_gsi(session_id, user_id, table)
+        existing = await _get_session_row(session_id, user_id, sessions_metadata_table)
         if not existing:
             return
 
@@ -2194,7 +2282,8 @@ async def clear_truncated_turn(session_id: str, user_id: str) -> None:
         if "lastTurnContinuable" not in existing:
             return  # Already clear
 
-        table.update_item(
+        await table_op(
+            sessions_metadata_table, "update_item",
             Key={"PK": f"USER#{user_id}", "SK": sk},
             UpdateExpression="REMOVE #ltc",
             ExpressionAttributeNames={"#ltc": "lastTurnContinuable"},
@@ -189,8 +189,11 @@ class SessionMetadata(BaseModel):
 
     DynamoDB Schema:
         PK: USER#{user_id}
-        SK: S#ACTIVE#{last_message_at}#{session_id} (active sessions)
-            S#DELETED#{deleted_at}#{session_id} (deleted sessions)
+        SK: SESSION#{session_id}
+
+        GSI: SessionRecencyIndex (active sessions only)
+            GSI3PK: USER#{user_id}
+            GSI3SK: {last_message_at}#{session_id}
 
         GSI: SessionLookupIndex
             GSI_PK: SESSION#{session_id}
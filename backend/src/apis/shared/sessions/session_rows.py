@@ -0,0 +1,192 @@
+"""Session row layout in the sessions metadata table, and the migration to it.
+
+Session rows used to be keyed ``SK = S#ACTIVE#{lastMessageAt}#{session_id}``
+so that a partition query returned sessions newest-first. The price was
+that every turn moved the row: ``update_session_activity`` found it through
+``SessionLookupIndex``, updated it, re-read it, put it under the new SK and
+deleted the old one. That was five calls per turn, with a race window
+between them (issue #175).
+
+Session rows now have a stable key, and recency ordering comes from a
+sparse GSI that only active sessions carry keys for:
+
+    PK: USER#{user_id}
+    SK: SESSION#{session_id}
+    GSI3PK: USER#{user_id}                  (SessionRecencyIndex, active only)
+    GSI3SK: {lastMessageAt}#{session_id}
+    GSI_PK: SESSION#{session_id}            (SessionLookupIndex, unchanged)
+    GSI_SK: META
+
+A turn's activity bump is then a single ``update_item``. A soft delete is
+also a single ``update_item``: it drops the recency keys and the row falls
+out of the index.
+
+Rollout: while ``SESSIONS_LEGACY_READS`` is on (the default), lookups fall
+back to ``SessionLookupIndex`` and listings merge in legacy ``S#ACTIVE#``
+rows. A legacy row is migrated the first time the activity path writes to
+it, and ``backfill_session_rows`` (``scripts/migrate_session_rows.py``)
+migrates the rest. Turn legacy reads off once the backfill reports nothing
+left to migrate.
+
+Configuration:
+    SESSIONS_LEGACY_READS: read legacy rows during rollout (default true)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .table_access import table_op
+
+logger = logging.getLogger(__name__)
+
+SESSION_SK_PREFIX = "SESSION#"
+LEGACY_ACTIVE_PREFIX = "S#ACTIVE#"
+LEGACY_DELETED_PREFIX = "S#DELETED#"
+
+SESSION_RECENCY_INDEX = "SessionRecencyIndex"
+RECENCY_PK = "GSI3PK"
+RECENCY_SK = "GSI3SK"
+
+# Key attributes stripped from session rows before model validation
+ROW_KEY_ATTRIBUTES = ("PK", "SK", "GSI_PK", "GSI_SK", RECENCY_PK, RECENCY_SK)
+
+
+def legacy_reads_enabled() -> bool:
+    """Whether lookups and listings still consult legacy ``S#ACTIVE#`` rows."""
+    return os.environ.get("SESSIONS_LEGACY_READS", "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+def session_row_key(user_id: str, session_id: str) -> Dict[str, str]:
+    """Primary key of a session row in the stable layout."""
+    return {"PK": f"USER#{user_id}", "SK": f"{SESSION_SK_PREFIX}{session_id}"}
+
+
+def recency_sort_key(last_message_at: str, session_id: str) -> str:
+    return f"{last_message_at}#{session_id}"
+
+
+def recency_attributes(user_id: str, session_id: str, last_message_at: str) -> Dict[str, str]:
+    """SessionRecencyIndex keys for an active session row."""
+    return {
+        RECENCY_PK: f"USER#{user_id}",
+        RECENCY_SK: recency_sort_key(last_message_at, session_id),
+    }
+
+
+def is_legacy_row(item: Dict[str, Any]) -> bool:
+    sk = item.get("SK") or ""
+    return sk.startswith(LEGACY_ACTIVE_PREFIX) or sk.startswith(LEGACY_DELETED_PREFIX)
+
+
+def to_stable_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite a legacy session row into the stable layout (pure)."""
+    sk = item.get("SK") or ""
+    session_id = item.get("sessionId") or sk.rsplit("#", 1)[-1]
+    user_id = item.get("userId") or (item.get("PK") or "").split("#", 1)[-1]
+
+    row = {k: v for k, v in item.items() if k not in ("PK", "SK", RECENCY_PK, RECENCY_SK)}
+    row.update(session_row_key(user_id, session_id))
+    row["sessionId"] = session_id
+    row["userId"] = user_id
+    row["GSI_PK"] = f"SESSION#{session_id}"
+    row["GSI_SK"] = "META"
+    # The activity path writes preference fields as nested paths, which
+    # DynamoDB rejects when the parent map is missing.
+    if not isinstance(row.get("preferences"), dict):
+        row["preferences"] = {}
+
+    deleted = sk.startswith(LEGACY_DELETED_PREFIX) or bool(item.get("deleted"))
+    if not deleted:
+        last_message_at = item.get("lastMessageAt") or sk[len(LEGACY_ACTIVE_PREFIX):].rsplit("#", 1)[0]
+        row["lastMessageAt"] = last_message_at
+        row.update(recency_attributes(user_id, session_id, last_message_at))
+    return row
+
+
+async def migrate_legacy_row(table_name: str, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Move one legacy session row to the stable layout.
+
+    ``item`` is the raw legacy row (numbers as ``Decimal``). The stable row
+    is written only if none exists yet or the existing one is older, so
+    duplicate legacy rows for one session (left by the old
+    per-turn move) collapse into the most recent. The legacy row is
+    deleted either way. Returns the stable row written, or None when a
+    newer one was already there.
+    """
+    from botocore.exceptions import ClientError
+
+    row = to_stable_row(item)
+    written: Optional[Dict[str, Any]] = row
+    try:
+        await table_op(
+            table_name, "put_item",
+            Item=row,
+            ConditionExpression="attribute_not_exists(PK) OR lastMessageAt < :t",
+            ExpressionAttributeValues={":t": row.get("lastMessageAt", "")},
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        written = None
+    await table_op(table_name, "delete_item", Key={"PK": item["PK"], "SK": item["SK"]})
+    logger.info(f"🔀 Migrated session row {row['sessionId']} to the stable layout")
+    return written
+
+
+@dataclass
+class SessionRowBackfillStats:
+    """Outcome of a ``backfill_session_rows`` run."""
+
+    scanned: int = 0
+    migrated: int = 0
+    superseded: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "scanned": self.scanned,
+            "migrated": self.migrated,
+            "superseded": self.superseded,
+            "failed": self.failed,
+        }
+
+
+async def backfill_session_rows(table_name: str, *, dry_run: bool = False) -> SessionRowBackfillStats:
+    """Migrate every legacy session row in the table. Idempotent.
+
+    With ``dry_run`` the table is only scanned and ``scanned`` reports how
+    many legacy rows remain.
+    """
+    from boto3.dynamodb.conditions import Attr
+
+    stats = SessionRowBackfillStats()
+    scan_kwargs: Dict[str, Any] = {
+        "FilterExpression": Attr("SK").begins_with(LEGACY_ACTIVE_PREFIX) | Attr("SK").begins_with(LEGACY_DELETED_PREFIX),
+    }
+    while True:
+        response = await table_op(table_name, "scan", **scan_kwargs)
+        for item in response.get("Items", []):
+            stats.scanned += 1
+            if dry_run:
+                continue
+            try:
+                if await migrate_legacy_row(table_name, item) is None:
+                    stats.superseded += 1
+                else:
+                    stats.migrated += 1
+            except Exception as e:
+                # JUSTIFICATION: one bad row must not abort a table-wide
+                # backfill; it is counted and the run can be repeated.
+                stats.failed += 1
+                logger.warning(f"Failed to migrate session row {item.get('SK')}: {e}")
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+    logger.info(f"Session row backfill ({'dry run' if dry_run else 'applied'}): {stats.to_dict()}")
+    return stats
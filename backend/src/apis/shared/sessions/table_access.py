@@ -0,0 +1,199 @@
+"""Pooled, async-shaped DynamoDB access for the sessions metadata table.
+
+Every function in ``metadata.py`` used to build a fresh
+``boto3.resource('dynamodb')`` per call and then issue the blocking
+``put_item``/``query``/``update_item`` directly inside ``async def``. On
+the inference API that froze the uvicorn event loop for the full
+DynamoDB round-trip, so one slow write delayed token delivery for every
+other SSE stream on the worker.
+
+This module routes those calls through a bounded thread-pool executor.
+Each worker thread lazily builds (and then reuses) one ``boto3`` resource
+and one ``Table`` per table name, so the connection pool behind it stays
+warm across calls. boto3 resources are not safe to share between threads,
+which is why they are thread-local rather than process-global; the
+executor bound caps how many exist.
+
+Per-operation latency counters are kept in-process and exposed through
+``get_table_latency_stats`` for logging and debugging.
+
+Configuration:
+    SESSIONS_METADATA_DDB_MAX_WORKERS: executor size (default 16)
+    SESSIONS_METADATA_DDB_SLOW_CALL_MS: log a warning for calls slower
+        than this many milliseconds (default 1000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DEFAULT_MAX_WORKERS = 16
+_DEFAULT_SLOW_CALL_MS = 1000.0
+
+
+@dataclass
+class OperationLatency:
+    """Running latency counters for one DynamoDB operation name."""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "totalMs": round(self.total_ms, 3),
+            "avgMs": round(self.avg_ms, 3),
+            "maxMs": round(self.max_ms, 3),
+        }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_thread_state = threading.local()
+# Bumped by reset_table_pool() so worker threads that survive a reset
+# (they don't — the executor is replaced — but belt and braces) drop
+# their cached resources on next use.
+_generation = 0
+
+_stats: Dict[str, OperationLatency] = {}
+_stats_lock = threading.Lock()
+
+
+def _max_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("SESSIONS_METADATA_DDB_MAX_WORKERS", _DEFAULT_MAX_WORKERS)))
+    except ValueError:
+        return _DEFAULT_MAX_WORKERS
+
+
+def _slow_call_ms() -> float:
+    try:
+        return float(os.environ.get("SESSIONS_METADATA_DDB_SLOW_CALL_MS", _DEFAULT_SLOW_CALL_MS))
+    except ValueError:
+        return _DEFAULT_SLOW_CALL_MS
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_workers(),
+                    thread_name_prefix="sessions-ddb",
+                )
+    return _executor
+
+
+def get_table(table_name: str):
+    """Return this thread's cached ``Table`` for ``table_name``.
+
+    Intended to be called from inside the executor (``run_table_call`` does
+    this for you). Calling it on the event loop thread is harmless but
+    builds a resource for that thread too.
+    """
+    if getattr(_thread_state, "generation", None) != _generation:
+        _thread_state.generation = _generation
+        _thread_state.resource = None
+        _thread_state.tables = {}
+
+    tables: Dict[str, Any] = _thread_state.tables
+    table = tables.get(table_name)
+    if table is None:
+        if _thread_state.resource is None:
+            import boto3
+
+            _thread_state.resource = boto3.resource("dynamodb")
+        table = _thread_state.resource.Table(table_name)
+        tables[table_name] = table
+    return table
+
+
+def _record(operation: str, elapsed_ms: float, failed: bool) -> None:
+    with _stats_lock:
+        stat = _stats.get(operation)
+        if stat is None:
+            stat = _stats[operation] = OperationLatency()
+        stat.count += 1
+        stat.total_ms += elapsed_ms
+        if elapsed_ms > stat.max_ms:
+            stat.max_ms = elapsed_ms
+        if failed:
+            stat.errors += 1
+
+
+async def run_table_call(table_name: str, operation: str, fn: Callable[[Any], T]) -> T:
+    """Run ``fn(table)`` on the pooled executor and record its latency.
+
+    ``operation`` is the counter bucket (e.g. ``"put_item"`` or
+    ``"update_session_activity"``). Exceptions from ``fn`` propagate to the
+    awaiting coroutine unchanged, so callers keep their existing
+    ``ClientError`` / best-effort handling.
+    """
+
+    def _invoke() -> T:
+        started = time.perf_counter()
+        failed = False
+        try:
+            return fn(get_table(table_name))
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _record(operation, elapsed_ms, failed)
+            if elapsed_ms >= _slow_call_ms():
+                logger.warning("Slow DynamoDB %s on %s: %.0fms", operation, table_name, elapsed_ms)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _invoke)
+
+
+async def table_op(table_name: str, operation: str, **kwargs: Any) -> Any:
+    """Await a single ``Table.<operation>(**kwargs)`` call on the pool.
+
+    Convenience wrapper over ``run_table_call`` for the common case of one
+    boto3 call: ``await table_op(name, "put_item", Item=item)``.
+    """
+    return await run_table_call(table_name, operation, lambda table: getattr(table, operation)(**kwargs))
+
+
+def get_table_latency_stats() -> Dict[str, Dict[str, float]]:
+    """Snapshot of per-operation latency counters, keyed by operation name."""
+    with _stats_lock:
+        return {name: stat.to_dict() for name, stat in _stats.items()}
+
+
+def reset_table_pool() -> None:
+    """Tear down the executor, cached resources and counters.
+
+    Used by tests (moto swaps the backing service per test) and safe to
+    call at shutdown. In-flight calls on the old executor are allowed to
+    finish.
+    """
+    global _executor, _generation
+    with _executor_lock:
+        executor, _executor = _executor, None
+        _generation += 1
+    if executor is not None:
+        executor.shutdown(wait=False)
+    with _stats_lock:
+        _stats.clear()
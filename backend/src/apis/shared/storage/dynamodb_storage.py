@@ -7,8 +7,9 @@ Schema:
     SessionsMetadata Table:
         Session Records:
             PK: USER#<user_id>
-            SK: S#ACTIVE#<last_message_at>#<session_id> (active sessions)
-                S#DELETED#<deleted_at>#<session_id> (deleted sessions)
+            SK: SESSION#<session_id>
+            GSI3PK/GSI3SK: USER#<user_id> / <last_message_at>#<session_id>
+                (SessionRecencyIndex; active sessions only)
             Attributes: sessionId, title, status, createdAt, lastMessageAt, messageCount, etc.
 
         Cost Records:
@@ -26,6 +27,7 @@ Schema:
         Attributes: totalCost, totalRequests, totalTokens, modelBreakdown, etc.
 """
 
+import asyncio
 import os
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
@@ -412,7 +414,10 @@ class DynamoDBStorage(MetadataStorage):
         """
         Update per-model breakdown in cost summary
 
-        Uses a multi-step approach to handle nested map structure in DynamoDB:
+        The common case — the model already has an entry this period — is a
+        single atomic ADD on the nested counters. Only when that path does
+        not exist yet (first request for the model this period) do we fall
+        back to the multi-step approach for the nested map structure:
         1. First ensure modelBreakdown map exists (separate update to avoid path overlap)
         2. Then ensure the specific model entry exists
         3. Finally, atomically increment the model's counters
@@ -430,6 +435,48 @@ class DynamoDBStorage(MetadataStorage):
                 "SK": f"PERIOD#{period}"
             }
 
+            def _increment_counters() -> None:
+                self.cost_summary_table.update_item(
+                    Key=key,
+                    UpdateExpression="""
+                        ADD #mb.#model.#cost :cost,
+                            #mb.#model.#requests :one,
+                            #mb.#model.#inputTokens :input,
+                            #mb.#model.#outputTokens :output,
+                            #mb.#model.#cacheReadTokens :cacheRead,
+                            #mb.#model.#cacheWriteTokens :cacheWrite
+                    """,
+                    ExpressionAttributeNames={
+                        "#mb": "modelBreakdown",
+                        "#model": safe_model_id,
+                        "#cost": "cost",
+                        "#requests": "requests",
+                        "#inputTokens": "inputTokens",
+                        "#outputTokens": "outputTokens",
+                        "#cacheReadTokens": "cacheReadTokens",
+                        "#cacheWriteTokens": "cacheWriteTokens"
+                    },
+                    ExpressionAttributeValues={
+                        ":cost": _safe_decimal(cost_delta),
+                        ":one": 1,
+                        ":input": usage_delta.get("inputTokens", 0),
+                        ":output": usage_delta.get("outputTokens", 0),
+                        ":cacheRead": usage_delta.get("cacheReadInputTokens", 0),
+                        ":cacheWrite": usage_delta.get("cacheWriteInputTokens", 0)
+                    }
+                )
+
+            # Fast path: the model entry already exists, one write.
+            try:
+                _increment_counters()
+                logger.debug(f"Updated model breakdown for {model_id} (key: {safe_model_id})")
+                return
+            except ClientError as e:
+                # ValidationException = the nested document path is missing;
+                # anything else is a real failure.
+                if e.response['Error']['Code'] != 'ValidationException':
+                    raise
+
             # Step 1: Ensure modelBreakdown map exists (if not, create it)
             # This is a separate update to avoid path overlap issues
             try:
@@ -470,35 +517,7 @@ class DynamoDBStorage(MetadataStorage):
                 logger.warning(f"Error initializing model entry: {e}")
 
             # Step 3: Atomically increment the model's counters
-            self.cost_summary_table.update_item(
-                Key=key,
-                UpdateExpression="""
-                    ADD #mb.#model.#cost :cost,
-                        #mb.#model.#requests :one,
-                        #mb.#model.#inputTokens :input,
-                        #mb.#model.#outputTokens :output,
-                        #mb.#model.#cacheReadTokens :cacheRead,
-                        #mb.#model.#cacheWriteTokens :cacheWrite
-                """,
-                ExpressionAttributeNames={
-                    "#mb": "modelBreakdown",
-                    "#model": safe_model_id,
-                    "#cost": "cost",
-                    "#requests": "requests",
-                    "#inputTokens": "inputTokens",
-                    "#outputTokens": "outputTokens",
-                    "#cacheReadTokens": "cacheReadTokens",
-                    "#cacheWriteTokens": "cacheWriteTokens"
-                },
-                ExpressionAttributeValues={
-                    ":cost": _safe_decimal(cost_delta),
-                    ":one": 1,
-                    ":input": usage_delta.get("inputTokens", 0),
-                    ":output": usage_delta.get("outputTokens", 0),
-                    ":cacheRead": usage_delta.get("cacheReadInputTokens", 0),
-                    ":cacheWrite": usage_delta.get("cacheWriteInputTokens", 0)
-                }
-            )
+            _increment_counters()
 
             logger.debug(f"Updated model breakdown for {model_id} (key: {safe_model_id})")
 
@@ -731,7 +750,8 @@ class DynamoDBStorage(MetadataStorage):
         # Try to mark user as active today
         try:
             daily_ttl = int((now + timedelta(days=90)).timestamp())
-            self.system_rollup_table.put_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.put_item,
                 Item={
                     "PK": f"ACTIVE#DAILY#{date}",
                     "SK": user_id,
@@ -752,7 +772,8 @@ class DynamoDBStorage(MetadataStorage):
         # Try to mark user as active this month
         try:
             monthly_ttl = int((now + timedelta(days=400)).timestamp())
-            self.system_rollup_table.put_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.put_item,
                 Item={
                     "PK": f"ACTIVE#MONTHLY#{period}",
                     "SK": user_id,
@@ -807,7 +828,8 @@ class DynamoDBStorage(MetadataStorage):
 
         try:
             monthly_ttl = int((now + timedelta(days=400)).timestamp())
-            self.system_rollup_table.put_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.put_item,
                 Item={
                     "PK": f"ACTIVE#MODEL#{period}#{safe_model_id}",
                     "SK": user_id,
@@ -833,7 +855,9 @@ class DynamoDBStorage(MetadataStorage):
         cost_delta: float,
         usage_delta: Dict[str, int],
         is_new_user: bool = False,
-        model_id: Optional[str] = None
+        model_id: Optional[str] = None,
+        request_count: int = 1,
+        new_user_count: int = 0
     ) -> None:
         """
         Update daily system-wide cost rollup (atomic increment)
@@ -848,6 +872,10 @@ class DynamoDBStorage(MetadataStorage):
             usage_delta: Token counts to add
             is_new_user: Whether this is the user's first request today
             model_id: Model identifier for tracking active users per model
+            request_count: Requests represented by this delta (>1 when the
+                rollup write-behind buffer coalesces several messages)
+            new_user_count: Newly active users in this delta; overrides
+                ``is_new_user`` when non-zero
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -856,7 +884,7 @@ class DynamoDBStorage(MetadataStorage):
             # Atomic increment of daily totals
             update_expression = """
                 ADD totalCost :cost,
-                    totalRequests :one,
+                    totalRequests :requests,
                     totalInputTokens :input,
                     totalOutputTokens :output,
                     totalCacheReadTokens :cacheRead,
@@ -867,7 +895,7 @@ class DynamoDBStorage(MetadataStorage):
 
             expression_values = {
                 ":cost": _safe_decimal(cost_delta),
-                ":one": 1,
+                ":requests": request_count,
                 ":input": usage_delta.get("inputTokens", 0),
                 ":output": usage_delta.get("outputTokens", 0),
                 ":cacheRead": usage_delta.get("cacheReadInputTokens", 0),
@@ -877,13 +905,16 @@ class DynamoDBStorage(MetadataStorage):
             }
 
             # Track active users (increment only if new user today)
-            if is_new_user:
+            new_users = new_user_count or (1 if is_new_user else 0)
+            if new_users:
                 update_expression = update_expression.replace(
                     "ADD totalCost :cost",
-                    "ADD totalCost :cost, activeUsers :one"
+                    "ADD totalCost :cost, activeUsers :newUsers"
                 )
+                expression_values[":newUsers"] = new_users
 
-            self.system_rollup_table.update_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.update_item,
                 Key={
                     "PK": "ROLLUP#DAILY",
                     "SK": date
@@ -906,7 +937,9 @@ class DynamoDBStorage(MetadataStorage):
         usage_delta: Dict[str, int],
         cache_savings_delta: float = 0.0,
         is_new_user: bool = False,
-        model_id: Optional[str] = None
+        model_id: Optional[str] = None,
+        request_count: int = 1,
+        new_user_count: int = 0
     ) -> None:
         """
         Update monthly system-wide cost rollup (atomic increment)
@@ -922,6 +955,9 @@ class DynamoDBStorage(MetadataStorage):
             cache_savings_delta: Cache savings to add
             is_new_user: Whether this is the user's first request this month
             model_id: Model identifier for model breakdown
+            request_count: Requests represented by this delta
+            new_user_count: Newly active users in this delta; overrides
+                ``is_new_user`` when non-zero
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -929,7 +965,7 @@ class DynamoDBStorage(MetadataStorage):
         try:
             update_expression = """
                 ADD totalCost :cost,
-                    totalRequests :one,
+                    totalRequests :requests,
                     totalInputTokens :input,
                     totalOutputTokens :output,
                     totalCacheReadTokens :cacheRead,
@@ -941,7 +977,7 @@ class DynamoDBStorage(MetadataStorage):
 
             expression_values = {
                 ":cost": _safe_decimal(cost_delta),
-                ":one": 1,
+                ":requests": request_count,
                 ":input": usage_delta.get("inputTokens", 0),
                 ":output": usage_delta.get("outputTokens", 0),
                 ":cacheRead": usage_delta.get("cacheReadInputTokens", 0),
@@ -952,13 +988,16 @@ class DynamoDBStorage(MetadataStorage):
             }
 
             # Track active users (increment only if new user this month)
-            if is_new_user:
+            new_users = new_user_count or (1 if is_new_user else 0)
+            if new_users:
                 update_expression = update_expression.replace(
                     "ADD totalCost :cost",
-                    "ADD totalCost :cost, activeUsers :one"
+                    "ADD totalCost :cost, activeUsers :newUsers"
                 )
+                expression_values[":newUsers"] = new_users
 
-            self.system_rollup_table.update_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.update_item,
                 Key={
                     "PK": "ROLLUP#MONTHLY",
                     "SK": period
@@ -981,7 +1020,9 @@ class DynamoDBStorage(MetadataStorage):
         provider: str,
         cost_delta: float,
         usage_delta: Dict[str, int],
-        is_new_user_for_model: bool = False
+        is_new_user_for_model: bool = False,
+        request_count: int = 1,
+        new_user_count: int = 0
     ) -> None:
         """
         Update per-model cost rollup (atomic increment)
@@ -998,6 +1039,9 @@ class DynamoDBStorage(MetadataStorage):
             cost_delta: Cost to add
             usage_delta: Token counts to add
             is_new_user_for_model: Whether this is the user's first request for this model
+            request_count: Requests represented by this delta
+            new_user_count: Newly active users for this model in this delta;
+                overrides ``is_new_user_for_model`` when non-zero
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -1008,7 +1052,7 @@ class DynamoDBStorage(MetadataStorage):
 
             update_expression = """
                 ADD totalCost :cost,
-                    totalRequests :one,
+                    totalRequests :requests,
                     totalInputTokens :input,
                     totalOutputTokens :output
                 SET lastUpdated = :now,
@@ -1020,7 +1064,7 @@ class DynamoDBStorage(MetadataStorage):
 
             expression_values = {
                 ":cost": _safe_decimal(cost_delta),
-                ":one": 1,
+                ":requests": request_count,
                 ":input": usage_delta.get("inputTokens", 0),
                 ":output": usage_delta.get("outputTokens", 0),
                 ":now": datetime.now(timezone.utc).isoformat(),
@@ -1030,13 +1074,16 @@ class DynamoDBStorage(MetadataStorage):
                 ":type": "model"
             }
 
-            if is_new_user_for_model:
+            new_users = new_user_count or (1 if is_new_user_for_model else 0)
+            if new_users:
                 update_expression = update_expression.replace(
                     "ADD totalCost :cost",
-                    "ADD totalCost :cost, uniqueUsers :one"
+                    "ADD totalCost :cost, uniqueUsers :newUsers"
                 )
+                expression_values[":newUsers"] = new_users
 
-            self.system_rollup_table.update_item(
+            await asyncio.to_thread(
+                self.system_rollup_table.update_item,
                 Key={
                     "PK": "ROLLUP#MODEL",
                     "SK": f"{period}#{safe_model_id}"
@@ -11,11 +11,27 @@ Fronts the `artifacts.{domain}` CloudFront origin. Request flow:
        SK = ARTIFACT#{aid}#V#{ver:05d}
   4. Fetch the content blob from S3 (ARTIFACTS_BUCKET) using the
      `content_key` stored on the record (the writer owns key
-     construction; the verifier never reconstructs it).
+     construction; the verifier never reconstructs it). `storage` is
+     "s3" (per-version key, legacy) or "s3-blob" (content-addressed,
+     shared by identical versions); a record with
+     `content_encoding="gzip"` points at a gzip-compressed object,
+     which is inflated here.
   5. Return those exact bytes with strict security headers. The CDN's
      response-headers-policy also stamps the CSP, so the policy holds
      even if this handler is buggy (defense in depth).
 
+Warm path: a pinned (sub, aid, ver) is immutable, so the version record
+fields and decoded body are kept in a per-container LRU bounded by
+RENDER_CACHE_MAX_BYTES (default 32 MiB; 0 disables it). An iframe reload
+of a version this container has served costs no DynamoDB or S3 read.
+Render responses carry a strong ETag derived from the pinned version and
+`Cache-Control: private, max-age=<token lifetime left>, immutable`, and a
+matching If-None-Match gets a 304 without any reads. The token is always
+verified first. `private` keeps the bytes out of CloudFront and other
+shared caches: the distribution's cache key cannot carry the token's
+authorization, so only the browser that presented the token may reuse
+the response. Downloads and errors stay `no-store`.
+
 This Lambda is a thin authenticated gate + header stamper, not a
 templating layer: S3 holds the complete document to serve, and the
 artifact writer owns all rendering. `#HEAD` is never read — the token
@@ -46,8 +62,12 @@ import json
 import logging
 import os
 import re
+import sys
+import threading
 import time
-from typing import Any
+import zlib
+from collections import OrderedDict
+from typing import Any, NamedTuple
 from urllib.parse import parse_qs, quote
 
 import boto3
@@ -68,6 +88,16 @@ _ARTIFACTS_BUCKET = os.environ.get("ARTIFACTS_BUCKET", "")
 _ARTIFACTS_TABLE = os.environ.get("ARTIFACTS_TABLE", "")
 _RENDER_TOKEN_SECRET_ARN = os.environ.get("RENDER_TOKEN_SECRET_ARN", "")
 
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+_RENDER_CACHE_MAX_BYTES = _env_int("RENDER_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
 _EXPECTED_ISS = "app-api"
 _EXPECTED_AUD = "artifact-render"
 # Tolerance for clock skew between the app-api minter and this Lambda.
@@ -80,6 +110,8 @@ _MAX_TOKEN_LIFETIME_SECONDS = 600
 # Cap content size to stay within the Lambda's 5s / 512MB envelope and
 # to keep a single response bounded. Oversized blobs are a writer bug.
 _MAX_CONTENT_BYTES = 5 * 1024 * 1024
+_STORAGE_CLASSES = frozenset({"s3", "s3-blob"})
+_GZIP_ENCODING = "gzip"
 
 # Module-scoped for container reuse across invocations.
 _secrets_client = None
@@ -88,6 +120,19 @@ _ddb_table = None
 _cached_signing_key: str | None = None
 
 
+class _CachedVersion(NamedTuple):
+    stored_content_type: str
+    title: str
+    body: str
+    size: int
+
+
+# (sub, aid, ver) -> _CachedVersion, least recently used first.
+_version_cache: "OrderedDict[tuple[str, str, int], _CachedVersion]" = OrderedDict()
+_version_cache_bytes = 0
+_version_cache_lock = threading.Lock()
+
+
 class _TokenError(Exception):
     """Render token is missing, malformed, or fails verification."""
 
@@ -142,13 +187,15 @@ def _serve_content_type(stored: str) -> str:
     return stored
 
 
-def _security_headers(content_type: str) -> dict[str, str]:
+def _security_headers(
+    content_type: str, cache_control: str = "no-store"
+) -> dict[str, str]:
     return {
         "content-type": content_type,
         "content-security-policy": _csp_header(),
         "x-content-type-options": "nosniff",
         "referrer-policy": "no-referrer",
-        "cache-control": "no-store",
+        "cache-control": cache_control,
     }
 
 
@@ -243,6 +290,65 @@ def _response(status: int, body: str, content_type: str) -> dict[str, Any]:
     }
 
 
+def _etag(user_id: str, artifact_id: str, version: int) -> str:
+    """Strong validator for a pinned version. Versions are immutable, so
+    the identity alone determines the bytes; hashed so the header never
+    carries the raw ids."""
+    digest = hashlib.sha256(f"{user_id}\0{artifact_id}\0{version}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _etag_matches(event: dict[str, Any], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    headers = event.get("headers") or {}
+    value = headers.get("if-none-match") or headers.get("If-None-Match")
+    if not value:
+        return False
+    for candidate in value.split(","):
+        candidate = candidate.strip()
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _render_cache_headers(
+    content_type: str, etag: str, claims: dict[str, Any]
+) -> dict[str, str]:
+    # Browser reuse never outlives the token that authorized it.
+    max_age = max(0, int(claims["exp"]) - int(time.time()))
+    headers = _security_headers(
+        content_type, f"private, max-age={max_age}, immutable"
+    )
+    headers["etag"] = etag
+    return headers
+
+
+def _cached_version(key: tuple[str, str, int]) -> _CachedVersion | None:
+    with _version_cache_lock:
+        entry = _version_cache.get(key)
+        if entry is not None:
+            _version_cache.move_to_end(key)
+        return entry
+
+
+def _cache_version(key: tuple[str, str, int], entry: _CachedVersion) -> None:
+    """Admit an entry, evicting least-recently-used ones to stay within
+    the byte budget. Bodies over a quarter of the budget are not cached so
+    one large artifact can't flush everything else."""
+    global _version_cache_bytes
+    if entry.size > _RENDER_CACHE_MAX_BYTES // 4:
+        return
+    with _version_cache_lock:
+        previous = _version_cache.pop(key, None)
+        if previous is not None:
+            _version_cache_bytes -= previous.size
+        _version_cache[key] = entry
+        _version_cache_bytes += entry.size
+        while _version_cache_bytes > _RENDER_CACHE_MAX_BYTES:
+            _, evicted = _version_cache.popitem(last=False)
+            _version_cache_bytes -= evicted.size
+
+
 def _error_response(status: int, message: str) -> dict[str, Any]:
     return _response(status, _error_html(message), "text/html; charset=utf-8")
 
@@ -373,7 +479,7 @@ def _get_version_record(user_id: str, artifact_id: str, version: int) -> dict[st
     return item
 
 
-def _fetch_content(content_key: str) -> str:
+def _fetch_content(content_key: str, content_encoding: str | None = None) -> str:
     global _s3_client
     if not _ARTIFACTS_BUCKET:
         raise _RenderConfigError("ARTIFACTS_BUCKET is not set")
@@ -392,6 +498,17 @@ def _fetch_content(content_key: str) -> str:
     raw = obj["Body"].read(_MAX_CONTENT_BYTES + 1)
     if len(raw) > _MAX_CONTENT_BYTES:
         raise _UnsupportedStorage("content exceeds size limit")
+    if content_encoding == _GZIP_ENCODING:
+        # Bounded inflate: a small object must not expand past the cap.
+        inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        try:
+            raw = inflater.decompress(raw, _MAX_CONTENT_BYTES + 1)
+        except zlib.error as exc:
+            raise _UnsupportedStorage("content is not valid gzip") from exc
+        if len(raw) > _MAX_CONTENT_BYTES:
+            raise _UnsupportedStorage("content exceeds size limit")
+    elif content_encoding is not None:
+        raise _UnsupportedStorage(f"content encoding {content_encoding!r} not supported")
     try:
         return raw.decode("utf-8")
     except UnicodeDecodeError as exc:
@@ -450,45 +567,52 @@ def handler(event: dict[str, Any], _context: Any) -> dict[str, Any]:
         claims.get("sid"),
     )
 
-    try:
-        record = _get_version_record(user_id, artifact_id, version)
-        storage = record.get("storage")
-        if storage != "s3":
-            raise _UnsupportedStorage(f"storage class {storage!r} not supported")
-        content_key = record.get("content_key")
-        if not isinstance(content_key, str) or not content_key:
-            raise _ArtifactNotFound("version record has no content pointer")
-        stored_content_type = record.get("content_type") or _HTML_CONTENT_TYPE
-        content_type = _serve_content_type(stored_content_type)
-        raw_title = record.get("title")
-        title = raw_title if isinstance(raw_title, str) else ""
-        body = _fetch_content(content_key)
-    except _ArtifactNotFound as exc:
-        logger.warning(
-            "artifact not found user=%s artifact=%s v=%s: %s",
-            user_id,
-            artifact_id,
-            version,
-            exc,
-        )
-        return _error_response(404, "This artifact could not be found.")
-    except _UnsupportedStorage as exc:
-        logger.error(
-            "unsupported artifact content user=%s artifact=%s v=%s: %s",
-            user_id,
-            artifact_id,
-            version,
-            exc,
-        )
-        return _error_response(500, "This artifact could not be rendered.")
-    except _RenderConfigError as exc:
-        logger.error("render config error during fetch: %s", exc)
-        return _error_response(500, "The artifact service is misconfigured.")
-
-    if _wants_download(event):
+    download = _wants_download(event)
+    etag = _etag(user_id, artifact_id, version)
+    if not download and _etag_matches(event, etag):
+        # The validator identifies the pinned immutable version, so a
+        # match needs neither the record nor the body. No content-type:
+        # the browser keeps the one stored with its cached 200.
+        headers = _render_cache_headers("", etag, claims)
+        del headers["content-type"]
+        return {"statusCode": 304, "headers": headers, "body": ""}
+
+    cache_key = (user_id, artifact_id, version)
+    cached = _cached_version(cache_key)
+    if cached is None:
+        try:
+            cached = _load_version(user_id, artifact_id, version)
+        except _ArtifactNotFound as exc:
+            logger.warning(
+                "artifact not found user=%s artifact=%s v=%s: %s",
+                user_id,
+                artifact_id,
+                version,
+                exc,
+            )
+            return _error_response(404, "This artifact could not be found.")
+        except _UnsupportedStorage as exc:
+            logger.error(
+                "unsupported artifact content user=%s artifact=%s v=%s: %s",
+                user_id,
+                artifact_id,
+                version,
+                exc,
+            )
+            return _error_response(500, "This artifact could not be rendered.")
+        except _RenderConfigError as exc:
+            logger.error("render config error during fetch: %s", exc)
+            return _error_response(500, "The artifact service is misconfigured.")
+        _cache_version(cache_key, cached)
+
+    stored_content_type = cached.stored_content_type
+    content_type = _serve_content_type(stored_content_type)
+    body = cached.body
+
+    if download:
         ext = _download_extension(stored_content_type)
         headers = _download_headers(
-            content_type, _content_disposition(title, ext)
+            content_type, _content_disposition(cached.title, ext)
         )
         return {
             "statusCode": 200,
@@ -496,9 +620,28 @@ def handler(event: dict[str, Any], _context: Any) -> dict[str, Any]:
             "body": "" if method == "HEAD" else body,
         }
 
-    if method == "HEAD":
-        return _response(200, "", content_type)
-    return _response(200, body, content_type)
+    return {
+        "statusCode": 200,
+        "headers": _render_cache_headers(content_type, etag, claims),
+        "body": "" if method == "HEAD" else body,
+    }
+
+
+def _load_version(user_id: str, artifact_id: str, version: int) -> _CachedVersion:
+    """Read the version record and its body. Raises _ArtifactNotFound,
+    _UnsupportedStorage or _RenderConfigError."""
+    record = _get_version_record(user_id, artifact_id, version)
+    storage = record.get("storage")
+    if storage not in _STORAGE_CLASSES:
+        raise _UnsupportedStorage(f"storage class {storage!r} not supported")
+    content_key = record.get("content_key")
+    if not isinstance(content_key, str) or not content_key:
+        raise _ArtifactNotFound("version record has no content pointer")
+    stored_content_type = record.get("content_type") or _HTML_CONTENT_TYPE
+    raw_title = record.get("title")
+    title = raw_title if isinstance(raw_title, str) else ""
+    body = _fetch_content(content_key, record.get("content_encoding"))
+    return _CachedVersion(stored_content_type, title, body, sys.getsizeof(body))
 
 
 # Local smoke test: `python handler.py` exercises the missing-token path
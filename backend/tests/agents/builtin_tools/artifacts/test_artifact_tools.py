@@ -9,6 +9,8 @@ Lambda would serve.
 from __future__ import annotations
 
 import base64
+import gzip
+import hashlib
 import re
 
 import boto3
@@ -83,17 +85,28 @@ def _item(ddb, artifact_id: str, sk_suffix: str) -> dict:
     ).get("Item")
 
 
+def _body(ddb, s3, artifact_id: str, version: int) -> str:
+    """The document a reader resolves from the version row's content_key."""
+    vrow = _item(ddb, artifact_id, f"V#{version:05d}")
+    raw = s3.get_object(Bucket=BUCKET, Key=vrow["content_key"])["Body"].read()
+    if vrow.get("content_encoding") == "gzip":
+        raw = gzip.decompress(raw)
+    return raw.decode()
+
+
 def test_create_writes_s3_and_rows(aws) -> None:
     ddb, s3 = aws
     aid, ver = service.create_artifact_record(USER, SESSION, "My Art", DOC, "")
     assert ver == 1
 
-    key = f"{USER}/{aid}/v1/index.html"
+    digest = hashlib.sha256(DOC.encode()).hexdigest()
+    key = f"blobs/{digest[:2]}/{digest}"
     assert s3.get_object(Bucket=BUCKET, Key=key)["Body"].read().decode() == DOC
 
     vrow = _item(ddb, aid, "V#00001")
-    assert vrow["storage"] == "s3"
+    assert vrow["storage"] == "s3-blob"
     assert vrow["content_key"] == key
+    assert "content_encoding" not in vrow  # below the compression floor
     assert vrow["content_type"] == "text/html; charset=utf-8"
 
     head = _item(ddb, aid, "HEAD")
@@ -110,14 +123,12 @@ def test_update_increments_and_preserves_old(aws) -> None:
     assert ver == 2
 
     # Old version object is immutable / still present.
-    assert s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v1/index.html"
-    )["Body"].read().decode() == DOC
-    assert s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v2/index.html"
-    )["Body"].read().decode() == new_doc
-
-    assert _item(ddb, aid, "V#00002")["content_key"] == f"{USER}/{aid}/v2/index.html"
+    assert _body(ddb, s3, aid, 1) == DOC
+    assert _body(ddb, s3, aid, 2) == new_doc
+    assert (
+        _item(ddb, aid, "V#00001")["content_key"]
+        != _item(ddb, aid, "V#00002")["content_key"]
+    )
     head = _item(ddb, aid, "HEAD")
     assert head["version"] == 2
     assert head["title"] == "T"  # carried forward
@@ -151,9 +162,7 @@ def test_markdown_create_wraps_and_preserves_type(aws) -> None:
     # and list; the render Lambda maps it to text/html when serving.
     assert _item(ddb, aid, "V#00001")["content_type"] == "text/markdown"
 
-    body = s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v1/index.html"
-    )["Body"].read().decode()
+    body = _body(ddb, s3, aid, 1)
     assert body.lstrip().startswith("<!doctype html>")
     assert "https://esm.sh/marked@14.1.4" in body
     # Source is base64-embedded, never inlined raw (escaping/XSS-safe).
@@ -162,18 +171,16 @@ def test_markdown_create_wraps_and_preserves_type(aws) -> None:
 
 
 def test_markdown_charset_suffix_still_markdown(aws) -> None:
-    _, s3 = aws
+    ddb, s3 = aws
     aid, _ = service.create_artifact_record(
         USER, SESSION, "Doc", MD, "text/markdown; charset=utf-8"
     )
-    body = s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v1/index.html"
-    )["Body"].read().decode()
+    body = _body(ddb, s3, aid, 1)
     assert _embedded_markdown(body) == MD
 
 
 def test_markdown_update_rewraps_inherited_type(aws) -> None:
-    _, s3 = aws
+    ddb, s3 = aws
     aid, _ = service.create_artifact_record(
         USER, SESSION, "Doc", MD, "text/markdown"
     )
@@ -181,19 +188,15 @@ def test_markdown_update_rewraps_inherited_type(aws) -> None:
     # content_type omitted → inherits Markdown from HEAD, must re-wrap.
     ver = service.update_artifact_record(USER, aid, new_md, None, None)
     assert ver == 2
-    body = s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v2/index.html"
-    )["Body"].read().decode()
+    body = _body(ddb, s3, aid, 2)
     assert body.lstrip().startswith("<!doctype html>")
     assert _embedded_markdown(body) == new_md
 
 
 def test_html_artifact_not_wrapped(aws) -> None:
-    _, s3 = aws
+    ddb, s3 = aws
     aid, _ = service.create_artifact_record(USER, SESSION, "Page", DOC, "text/html")
-    assert s3.get_object(
-        Bucket=BUCKET, Key=f"{USER}/{aid}/v1/index.html"
-    )["Body"].read().decode() == DOC
+    assert _body(ddb, s3, aid, 1) == DOC
 
 
 def test_ssm_fallback(aws, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -223,10 +226,8 @@ def test_record_satisfies_minter(aws) -> None:
     minter._assert_version_exists(USER, aid, ver)  # must not raise
 
     # And the content_key the readers trust actually points at content.
-    vrow = _item(boto3.resource("dynamodb", region_name=REGION), aid, "V#00001")
-    assert s3.get_object(
-        Bucket=BUCKET, Key=vrow["content_key"]
-    )["Body"].read().decode() == DOC
+    ddb = boto3.resource("dynamodb", region_name=REGION)
+    assert _body(ddb, s3, aid, ver) == DOC
 
 
 @pytest.mark.parametrize(
@@ -292,3 +293,106 @@ def test_set_produced_by_message_index_requires_existing_rows(aws) -> None:
     # No version/HEAD rows for "nope": the conditional update fails closed.
     with pytest.raises(ClientError):
         service.set_produced_by_message_index(USER, "nope", 1, 1)
+
+
+def test_head_carries_version_index(aws) -> None:
+    ddb, _ = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "T", DOC, "")
+    service.update_artifact_record(USER, aid, DOC, "T2", "text/markdown")
+
+    index = _item(ddb, aid, "HEAD")["version_index"]
+    assert sorted(index) == ["00001", "00002"]
+    assert index["00001"]["title"] == "T"
+    assert index["00002"]["title"] == "T2"
+    assert index["00002"]["content_type"] == "text/markdown"
+    assert index["00002"]["updated_at"] == _item(ddb, aid, "V#00002")["updated_at"]
+
+
+def test_update_rebuilds_index_for_legacy_head(aws) -> None:
+    """A HEAD written before the index existed picks it up, rebuilt from
+    the version rows, on its next update."""
+    ddb, _ = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "T", DOC, "")
+    service.set_produced_by_message_index(USER, aid, 1, 3)
+    ddb.Table(TABLE).update_item(
+        Key={"PK": f"USER#{USER}", "SK": f"ARTIFACT#{aid}#HEAD"},
+        UpdateExpression="REMOVE version_index",
+    )
+
+    service.update_artifact_record(USER, aid, DOC, None, None)
+
+    index = _item(ddb, aid, "HEAD")["version_index"]
+    assert sorted(index) == ["00001", "00002"]
+    assert index["00001"]["produced_by_message_index"] == 3
+
+
+def test_set_produced_by_message_index_stamps_index_entry(aws) -> None:
+    ddb, _ = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "T", DOC, "")
+    service.update_artifact_record(USER, aid, DOC, None, None)
+
+    service.set_produced_by_message_index(USER, aid, 2, 9)
+
+    head = _item(ddb, aid, "HEAD")
+    assert head["produced_by_message_index"] == 9
+    assert head["version_index"]["00002"]["produced_by_message_index"] == 9
+    assert "produced_by_message_index" not in head["version_index"]["00001"]
+
+
+def test_set_produced_by_message_index_without_index_entry(aws) -> None:
+    ddb, _ = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "T", DOC, "")
+    ddb.Table(TABLE).update_item(
+        Key={"PK": f"USER#{USER}", "SK": f"ARTIFACT#{aid}#HEAD"},
+        UpdateExpression="REMOVE version_index",
+    )
+
+    service.set_produced_by_message_index(USER, aid, 1, 4)
+
+    assert _item(ddb, aid, "HEAD")["produced_by_message_index"] == 4
+
+
+BIG_DOC = "<!doctype html><html><body>" + "<p>row</p>" * 500 + "</body></html>"
+
+
+def test_large_body_is_stored_compressed(aws) -> None:
+    ddb, s3 = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "Big", BIG_DOC, "")
+
+    vrow = _item(ddb, aid, "V#00001")
+    assert vrow["content_encoding"] == "gzip"
+    assert vrow["content_key"].endswith(".gz")
+    obj = s3.get_object(Bucket=BUCKET, Key=vrow["content_key"])
+    assert obj["ContentEncoding"] == "gzip"
+    assert obj["ContentLength"] < len(BIG_DOC) // 10
+    assert _body(ddb, s3, aid, 1) == BIG_DOC
+
+
+def test_compression_can_be_disabled(aws, monkeypatch: pytest.MonkeyPatch) -> None:
+    ddb, s3 = aws
+    monkeypatch.setenv("ARTIFACTS_COMPRESS_CONTENT", "false")
+    aid, _ = service.create_artifact_record(USER, SESSION, "Big", BIG_DOC, "")
+
+    assert "content_encoding" not in _item(ddb, aid, "V#00001")
+    assert _body(ddb, s3, aid, 1) == BIG_DOC
+
+
+def test_identical_bodies_share_one_blob(aws) -> None:
+    """A revert, an unchanged re-save and the same document from another
+    user all resolve to one object."""
+    ddb, s3 = aws
+    aid, _ = service.create_artifact_record(USER, SESSION, "T", BIG_DOC, "")
+    service.update_artifact_record(USER, aid, DOC, None, None)
+    service.update_artifact_record(USER, aid, BIG_DOC, None, None)
+    other, _ = service.create_artifact_record("user-456", SESSION, "T", BIG_DOC, "")
+
+    keys = {_item(ddb, aid, f"V#{v:05d}")["content_key"] for v in (1, 3)}
+    assert len(keys) == 1
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 2
+
+    # Another process (empty memo) finds the blob present via the
+    # conditional put instead of overwriting it.
+    service._reset_caches_for_tests()
+    service.update_artifact_record(USER, aid, BIG_DOC, None, None)
+    assert _item(ddb, aid, "V#00004")["content_key"] in keys
+    assert _body(ddb, s3, aid, 4) == BIG_DOC
@@ -283,7 +283,7 @@ class FakeCodeInterpreter:
         self.started = False
         self.stopped = False
 
-    def start(self, identifier: str) -> None:  # noqa: D401 — mock signature
+    def start(self, identifier: str, **_kwargs) -> None:  # noqa: D401 — mock signature
         self.started = True
 
     def stop(self) -> None:
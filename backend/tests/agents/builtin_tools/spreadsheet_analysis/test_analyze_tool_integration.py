@@ -14,7 +14,8 @@ logic worth pinning down":
 - Skipped-sheet warning when workbook exceeds MAX_SHEETS_TO_CONVERT
 - Missing Code Interpreter → friendly error, no interpreter calls
 - File not found → friendly error with list_spreadsheets hint
-- S3 download failure → friendly error, interpreter still stopped
+- S3 download failure → friendly error, interpreter never started
+- Warm sandbox reuse: repeat analyses skip download/upload/conversion
 
 S3 and DynamoDB go through moto so tests exercise the real boto3 call
 paths. Only the CodeInterpreter is hand-mocked (no moto equivalent for
@@ -26,6 +27,11 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
+import pytest
+
+from agents.builtin_tools.spreadsheet_analysis import analyze_tool
+from tests.agents.builtin_tools.spreadsheet_analysis.conftest import _stream_response
+
 
 # ---------------------------------------------------------------------------
 # Happy path: CSV end-to-end
@@ -70,8 +76,9 @@ class TestCsvHappyPath:
         assert "Dataset" in text
         assert "data.csv" in text
         # No XLSX bootstrap: one writeFiles (raw CSV) + two executeCode
-        # calls (schema probe, user code).
-        assert fake.started and fake.stopped
+        # calls (schema probe, user code). The sandbox stays warm for
+        # follow-ups in the same chat session.
+        assert fake.started and not fake.stopped
         write_calls = [r for r in fake.invocations if r.name == "writeFiles"]
         exec_calls = [r for r in fake.invocations if r.name == "executeCode"]
         assert len(write_calls) == 1
@@ -708,7 +715,7 @@ class TestUserCodeError:
 
 
 class TestInterpreterLifecycle:
-    def test_interpreter_stopped_on_success(
+    def test_interpreter_kept_warm_on_success(
         self,
         call_analyze,
         file_sources,
@@ -720,6 +727,8 @@ class TestInterpreterLifecycle:
         schema_stdout,
         reply_factory,
     ):
+        from agents.builtin_tools.spreadsheet_analysis.interpreter_pool import get_interpreter_pool
+
         set_kb, set_session = file_sources
         set_session([file_factories["session_csv"]("data.csv")])
         seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
@@ -739,9 +748,11 @@ class TestInterpreterLifecycle:
             )
 
         assert fake.started
+        assert not fake.stopped
+        get_interpreter_pool().clear()
         assert fake.stopped
 
-    def test_interpreter_stopped_on_user_error(
+    def test_interpreter_kept_warm_on_user_error(
         self,
         call_analyze,
         file_sources,
@@ -753,9 +764,11 @@ class TestInterpreterLifecycle:
         schema_stdout,
         reply_factory,
     ):
-        """The finally: stop() must run even when user code fails.
-        Otherwise we'd leak interpreter sessions on every bad query.
+        """A failing user query is a normal result, not a broken sandbox:
+        the retry that usually follows should land on the warm session.
         """
+        from agents.builtin_tools.spreadsheet_analysis.interpreter_pool import get_interpreter_pool
+
         set_kb, set_session = file_sources
         set_session([file_factories["session_csv"]("data.csv")])
         seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
@@ -776,4 +789,329 @@ class TestInterpreterLifecycle:
                 user_id="u1",
             )
 
+        assert not fake.stopped
+        assert len(get_interpreter_pool()) == 1
+
+    def test_interpreter_stopped_when_invoke_raises(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+    ):
+        """Transport failures may leave the sandbox gone or half-staged,
+        so it is stopped instead of pooled. Otherwise we'd leak interpreter
+        sessions, or hand a dead one to the next call.
+        """
+        from agents.builtin_tools.spreadsheet_analysis.interpreter_pool import get_interpreter_pool
+
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+
+        def _reply(name, _payload):
+            if name == "executeCode" and len(fake.executed_codes()) == 2:
+                raise RuntimeError("session expired")
+            return {"stream": []}
+
+        fake.reply_for = _reply
+
+        with ci_patch, pytest.raises(RuntimeError):
+            call_analyze(
+                filename="data.csv",
+                python_code="pass",
+                session_id="s1",
+                user_id="u1",
+            )
+
         assert fake.stopped
+        assert len(get_interpreter_pool()) == 0
+
+    def test_pooling_disabled_stops_after_each_call(
+        self,
+        monkeypatch,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+        reply_factory,
+    ):
+        monkeypatch.setenv("ANALYZE_INTERPRETER_IDLE_SECONDS", "0")
+
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = reply_factory(
+            schema_out=schema_stdout(file="data.csv"),
+            user_out="done\n",
+        )
+
+        with ci_patch:
+            call_analyze(
+                filename="data.csv",
+                python_code="pass",
+                session_id="s1",
+                user_id="u1",
+            )
+
+        assert fake.started
+        assert fake.stopped
+
+
+def _state_out(digests, output=None):
+    marker = analyze_tool._STATE_MARKER
+    lines = [marker] + [f"digest|{path}|{digest}" for path, digest in digests.items()]
+    if output:
+        lines.append(f"output|{output}")
+    return "\n".join(lines + [marker]) + "\n"
+
+
+class TestWarmSandboxReuse:
+    def _reply(self, bootstrap_out, schema_out, staged_state="", warm_state=""):
+        """Answer bootstrap / schema probe / warm-sandbox reset / user code
+        by code content, so the reply doesn't depend on how many calls the
+        fake has seen."""
+        def _r(name, payload):
+            if name != "executeCode":
+                return _stream_response()
+            code = payload["code"]
+            if "load_workbook" in code:
+                return _stream_response(bootstrap_out)
+            if "[__SCHEMA__]" in code:
+                return _stream_response(staged_state + schema_out)
+            if analyze_tool._STATE_MARKER in code:
+                return _stream_response(warm_state)
+            return _stream_response(f"ran: {code}\n")
+        return _r
+
+    def test_follow_up_skips_download_upload_and_conversion(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        bootstrap_stdout,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_xlsx"]("Ledger.xlsx")])
+        seed_s3_object(key="sessions/Ledger.xlsx", body=XLSX_BYTES)
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply(
+            bootstrap_stdout(
+                total=2,
+                sheets=[
+                    ("Summary", "Ledger.summary.csv", 10, False, "Ledger.csv"),
+                    ("Detail", "Ledger.detail.csv", 900, False, ""),
+                ],
+            ),
+            schema_stdout(file="Ledger.csv"),
+        )
+
+        with ci_patch, patch(
+            "agents.builtin_tools.spreadsheet_analysis.analyze_tool._download_file",
+            wraps=analyze_tool._download_file,
+        ) as download:
+            first = call_analyze(filename="Ledger.xlsx", python_code="q1", session_id="s1", user_id="u1")
+            setup_calls = len(fake.invocations)
+            second = call_analyze(filename="Ledger.xlsx", python_code="q2", session_id="s1", user_id="u1")
+
+        assert download.call_count == 1
+        # The follow-up resets the kernel and checks the staged CSVs, then
+        # runs the user code; nothing is uploaded or converted again.
+        follow_up = fake.invocations[setup_calls:]
+        assert [r.name for r in follow_up] == ["executeCode", "executeCode"]
+        assert follow_up[0].payload["clearContext"] is True
+        assert "'Ledger.detail.csv'" in follow_up[0].payload["code"]
+        assert follow_up[1].payload["code"] == "q2"
+        # Staged schema footer and sheet inventory are still reported.
+        for result in (first, second):
+            text = result["content"][0]["text"]
+            assert "Dataset: file: Ledger.csv" in text
+            assert "Ledger.detail.csv" in text
+        assert "ran: q2" in second["content"][0]["text"]
+
+    def test_changed_object_is_restaged(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply("", schema_stdout(file="data.csv"))
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="q1", session_id="s1", user_id="u1")
+            seed_s3_object(key="sessions/data.csv", body=b"a,b\n3,4\n")
+            call_analyze(filename="data.csv", python_code="q2", session_id="s1", user_id="u1")
+
+        writes = [r.payload["content"][0]["text"] for r in fake.invocations if r.name == "writeFiles"]
+        assert writes == ["a,b\n1,2\n", "a,b\n3,4\n"]
+
+    def test_other_chat_session_gets_its_own_sandbox(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        from agents.builtin_tools.spreadsheet_analysis.interpreter_pool import get_interpreter_pool
+
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply("", schema_stdout(file="data.csv"))
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="q1", session_id="s1", user_id="u1")
+            call_analyze(filename="data.csv", python_code="q2", session_id="s2", user_id="u1")
+
+        assert get_interpreter_pool().stats.starts == 2
+        assert len([r for r in fake.invocations if r.name == "writeFiles"]) == 2
+
+    def test_staged_file_modified_by_earlier_code_is_restaged(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply(
+            "",
+            schema_stdout(file="data.csv"),
+            staged_state=_state_out({"data.csv": "d1"}),
+            warm_state=_state_out({"data.csv": "overwritten"}),
+        )
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="q1", session_id="s1", user_id="u1")
+            call_analyze(filename="data.csv", python_code="q2", session_id="s1", user_id="u1")
+
+        writes = [r.payload["content"][0]["text"] for r in fake.invocations if r.name == "writeFiles"]
+        assert writes == ["a,b\n1,2\n", "a,b\n1,2\n"]
+
+    def test_unchanged_staged_file_is_not_restaged(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply(
+            "",
+            schema_stdout(file="data.csv"),
+            staged_state=_state_out({"data.csv": "d1"}),
+            warm_state=_state_out({"data.csv": "d1"}),
+        )
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="q1", session_id="s1", user_id="u1")
+            call_analyze(filename="data.csv", python_code="q2", session_id="s1", user_id="u1")
+
+        assert len([r for r in fake.invocations if r.name == "writeFiles"]) == 1
+
+    def test_chart_left_by_earlier_call_is_not_returned(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        # The old chart could not be deleted, so whatever sits at that path
+        # was not written by this call.
+        fake.reply_for = self._reply("", schema_stdout(file="data.csv"), warm_state=_state_out({}, output="kept"))
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="plot", output_filename="chart.png",
+                         session_id="s1", user_id="u1")
+            setup_calls = len(fake.invocations)
+            result = call_analyze(filename="data.csv", python_code="print(1)", output_filename="chart.png",
+                                  session_id="s1", user_id="u1")
+
+        follow_up = fake.invocations[setup_calls:]
+        assert "'chart.png'" in follow_up[0].payload["code"]
+        assert "readFiles" not in [r.name for r in follow_up]
+        assert [block for block in result["content"] if "image" in block] == []
+
+    def test_chart_is_read_once_the_old_one_is_cleared(
+        self,
+        call_analyze,
+        file_sources,
+        file_factories,
+        fake_code_interpreter,
+        sessions_bucket,
+        seed_s3_object,
+        code_interpreter_id,
+        schema_stdout,
+    ):
+        set_kb, set_session = file_sources
+        set_session([file_factories["session_csv"]("data.csv")])
+        seed_s3_object(key="sessions/data.csv", body=b"a,b\n1,2\n")
+
+        fake, ci_patch = fake_code_interpreter
+        fake.reply_for = self._reply("", schema_stdout(file="data.csv"), warm_state=_state_out({}, output="cleared"))
+
+        with ci_patch:
+            call_analyze(filename="data.csv", python_code="plot", session_id="s1", user_id="u1")
+            setup_calls = len(fake.invocations)
+            call_analyze(filename="data.csv", python_code="plot", output_filename="chart.png",
+                         session_id="s1", user_id="u1")
+
+        assert [r.name for r in fake.invocations[setup_calls:]][-1] == "readFiles"
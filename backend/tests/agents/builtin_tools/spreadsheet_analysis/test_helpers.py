@@ -6,9 +6,15 @@ simple so the tests are small — their job is to lock in the current
 behavior so the async refactor doesn't regress the happy paths (#261).
 """
 
+import contextlib
+import hashlib
+import io
+
 from agents.builtin_tools.spreadsheet_analysis.analyze_tool import (
     MAX_OUTPUT_CHARS,
+    _build_state_code,
     _extract_schema_preview,
+    _parse_state,
     _safe_int,
     _sanitize_sheet_name,
     _truncate_output,
@@ -147,3 +153,37 @@ class TestSanitizeSheetName:
         # Same input always yields same output — callers rely on this
         # to predict filenames.
         assert _sanitize_sheet_name("Q1 2026") == _sanitize_sheet_name("Q1 2026")
+
+
+class TestStateCode:
+    """The state probe runs as-is in the sandbox, so exercise it for real."""
+
+    def _run(self, *args):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            exec(_build_state_code(*args), {})
+        return _parse_state(out.getvalue())
+
+    def test_reports_digests_and_missing_files(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a|b.csv").write_bytes(b"x,y\n1,2\n")
+        digests, cleared = self._run(("a|b.csv", "gone.csv"))
+        assert digests == {"a|b.csv": hashlib.sha256(b"x,y\n1,2\n").hexdigest(), "gone.csv": "-"}
+        assert cleared is False
+
+    def test_deletes_previous_chart(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "chart.png").write_bytes(b"old")
+        _, cleared = self._run((), "chart.png")
+        assert cleared is True
+        assert not (tmp_path / "chart.png").exists()
+
+    def test_undeletable_chart_is_reported(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "chart.png").mkdir()
+        (tmp_path / "chart.png" / "f").write_bytes(b"")
+        assert self._run((), "chart.png") == ({}, False)
+
+    def test_unmarked_output_parses_empty(self):
+        assert _parse_state("Total: 42\n") == ({}, False)
+
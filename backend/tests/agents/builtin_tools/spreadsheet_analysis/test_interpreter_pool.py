@@ -0,0 +1,119 @@
+"""Unit tests for the per-chat-session Code Interpreter pool."""
+
+from __future__ import annotations
+
+import time
+
+from agents.builtin_tools.spreadsheet_analysis import interpreter_pool
+from agents.builtin_tools.spreadsheet_analysis.interpreter_pool import InterpreterPool, StagedFile
+
+
+class _Client:
+    def __init__(self):
+        self.started_with = None
+        self.stopped = False
+
+    def start(self, identifier, session_timeout_seconds=None):
+        self.started_with = (identifier, session_timeout_seconds)
+
+    def stop(self):
+        self.stopped = True
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(monkeypatch, **kwargs):
+    clock = _Clock()
+    monkeypatch.setattr(interpreter_pool.time, "monotonic", clock)
+    kwargs.setdefault("idle_seconds", 300)
+    kwargs.setdefault("session_timeout_seconds", 3600)
+    return InterpreterPool(**kwargs), clock
+
+
+class TestInterpreterPool:
+    def test_released_sandbox_is_reused_with_its_staged_files(self, monkeypatch):
+        pool, _ = _pool(monkeypatch)
+        lease = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        lease.staged[("b", "k")] = StagedFile(etag='"e1"', csv_filename="k.csv")
+        pool.release(lease)
+
+        assert pool.staged_file(("u1", "s1"), ("b", "k")).etag == '"e1"'
+        again = pool.acquire(("u1", "s1"), _Client, "ci-1")
+
+        assert again.client is lease.client
+        assert again.reused
+        assert lease.client.started_with == ("ci-1", 3600)
+        assert pool.stats.to_dict() == {"starts": 1, "reuses": 1, "stops": 0, "stagedHits": 0}
+
+    def test_leases_are_exclusive(self, monkeypatch):
+        pool, _ = _pool(monkeypatch)
+        first = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        second = pool.acquire(("u1", "s1"), _Client, "ci-1")
+
+        assert first.client is not second.client
+        pool.release(first)
+        pool.release(second)
+
+        # Only the most recently returned sandbox stays warm
+        assert first.client.stopped
+        assert not second.client.stopped
+        assert len(pool) == 1
+
+    def test_idle_sandbox_expires(self, monkeypatch):
+        pool, clock = _pool(monkeypatch, idle_seconds=60)
+        lease = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        pool.release(lease)
+        clock.now += 61
+
+        assert pool.staged_file(("u1", "s1"), ("b", "k")) is None
+        fresh = pool.acquire(("u1", "s1"), _Client, "ci-1")
+
+        assert lease.client.stopped
+        assert fresh.client is not lease.client
+
+    def test_sandbox_near_session_timeout_is_not_pooled(self, monkeypatch):
+        pool, clock = _pool(monkeypatch, session_timeout_seconds=600)
+        lease = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        clock.now += 590
+
+        pool.release(lease)
+
+        assert lease.client.stopped
+        assert len(pool) == 0
+
+    def test_pool_size_is_bounded(self, monkeypatch):
+        pool, _ = _pool(monkeypatch, max_sessions=2)
+        leases = [pool.acquire(("u1", s), _Client, "ci-1") for s in ("a", "b", "c")]
+        for lease in leases:
+            pool.release(lease)
+
+        assert len(pool) == 2
+        assert leases[0].client.stopped
+
+    def test_zero_idle_window_disables_pooling(self, monkeypatch):
+        pool, _ = _pool(monkeypatch, idle_seconds=0)
+        lease = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        pool.release(lease)
+
+        assert lease.client.stopped
+        assert len(pool) == 0
+
+    def test_sweeper_stops_idle_sandbox_without_further_access(self):
+        pool = InterpreterPool(idle_seconds=0.05, session_timeout_seconds=3600)
+        lease = pool.acquire(("u1", "s1"), _Client, "ci-1")
+        pool.release(lease)
+
+        deadline = time.monotonic() + 2
+        while not lease.client.stopped and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert lease.client.stopped
+        assert len(pool) == 0
+        assert pool.stats.stops == 1
+        assert pool._sweeper is None
@@ -94,6 +94,18 @@ class TestBuildPromptWithDocuments:
         assert "." not in sanitized_name
 
 
+    def test_resolved_upload_bytes_used_without_decoding(self):
+        """ResolvedFileContent carries raw bytes; they land in the block unchanged."""
+        from apis.shared.files.file_resolver import ResolvedFileContent
+
+        builder = _make_builder()
+        file = ResolvedFileContent(filename="notes.pdf", content_type="application/pdf", data=b"%PDF raw")
+        result = builder.build_prompt("Read this", files=[file])
+
+        doc_blocks = [b for b in result if "document" in b]
+        assert doc_blocks[0]["document"]["source"]["bytes"] == b"%PDF raw"
+
+
 class TestBuildPromptUnsupportedFiles:
     """Req 11.5: Unsupported file types are skipped."""
 
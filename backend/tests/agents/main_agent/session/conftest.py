@@ -135,7 +135,7 @@ def compaction_config_disabled() -> CompactionConfig:
 
 
 # ---------------------------------------------------------------------------
-# Moto DynamoDB table with SessionLookupIndex GSI
+# Moto DynamoDB table with SessionLookupIndex and SessionRecencyIndex GSIs
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
@@ -153,6 +153,8 @@ def dynamodb_sessions_table():
                 {"AttributeName": "SK", "AttributeType": "S"},
                 {"AttributeName": "GSI_PK", "AttributeType": "S"},
                 {"AttributeName": "GSI_SK", "AttributeType": "S"},
+                {"AttributeName": "GSI3PK", "AttributeType": "S"},
+                {"AttributeName": "GSI3SK", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -163,6 +165,14 @@ def dynamodb_sessions_table():
                     ],
                     "Projection": {"ProjectionType": "ALL"},
                 },
+                {
+                    "IndexName": "SessionRecencyIndex",
+                    "KeySchema": [
+                        {"AttributeName": "GSI3PK", "KeyType": "HASH"},
+                        {"AttributeName": "GSI3SK", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
             ],
             BillingMode="PAY_PER_REQUEST",
         )
@@ -174,7 +184,7 @@ def seed_session_record(table, session_id: str, user_id: str, compaction=None) -
     """Insert a session metadata record into the moto table."""
     item = {
         "PK": f"USER#{user_id}",
-        "SK": f"S#ACTIVE#2026-03-08T00:00:00Z#{session_id}",
+        "SK": f"SESSION#{session_id}",
         "GSI_PK": f"SESSION#{session_id}",
         "GSI_SK": "META",
         "userId": user_id,
@@ -0,0 +1,178 @@
+"""Token-delta coalescing and SSE frame encoding.
+
+``coalesce_deltas`` is driven with hand-built processed events (and a
+controllable async source for the timer); the last test runs the real
+``StreamCoordinator`` pipeline with coalescing switched on via env.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from agents.main_agent.streaming.delta_coalescer import coalesce_deltas
+from agents.main_agent.streaming.sse_frames import encode_json, sse_frame
+from agents.main_agent.streaming.stream_coordinator import StreamCoordinator
+
+
+def _text(text: str, index: int = 0) -> Dict[str, Any]:
+    return {"type": "content_block_delta", "data": {"contentBlockIndex": index, "type": "text", "text": text}}
+
+
+def _reasoning(text: str) -> Dict[str, Any]:
+    return {"type": "reasoning", "data": {"reasoningText": text}}
+
+
+async def _source(events: List[Any]) -> AsyncIterator[Dict[str, Any]]:
+    for event in events:
+        if isinstance(event, float):
+            await asyncio.sleep(event)
+        else:
+            yield event
+
+
+async def _collect(events: List[Any], **kwargs) -> List[Dict[str, Any]]:
+    return [event async for event in coalesce_deltas(_source(events), **kwargs)]
+
+
+class TestCoalesceDeltas:
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        events = [_text("a"), _text("b"), _text("c")]
+
+        assert await _collect(events) == events
+
+    @pytest.mark.asyncio
+    async def test_first_delta_passes_through_and_rest_merge(self):
+        out = await _collect([_text("Hel"), _text("lo"), _text(", "), _text("world")], window_ms=1000)
+
+        assert out == [_text("Hel"), _text("lo, world")]
+
+    @pytest.mark.asyncio
+    async def test_other_events_flush_without_reordering(self):
+        tool_delta = {"type": "content_block_delta", "data": {"contentBlockIndex": 1, "type": "tool_use", "input": "{\"q\""}}
+        stop = {"type": "content_block_stop", "data": {"contentBlockIndex": 0}}
+        events = [
+            _reasoning("think"), _reasoning("ing"), _reasoning("..."),
+            {"type": "reasoning", "data": {"reasoning_signature": "sig"}},
+            _text("a"), _text("b"), _text("c"), stop,
+            tool_delta, tool_delta,
+            _text("x", index=2), _text("y", index=3),
+        ]
+
+        out = await _collect(events, window_ms=1000)
+
+        assert out == [
+            _reasoning("think"), _reasoning("ing..."),
+            {"type": "reasoning", "data": {"reasoning_signature": "sig"}},
+            _text("a"), _text("bc"), stop,
+            tool_delta, tool_delta,
+            _text("x", index=2), _text("y", index=3),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_raw_mirrors_of_text_deltas_are_dropped(self):
+        def _mirror(delta):
+            return {"type": "event", "data": {"event": {"contentBlockDelta": {"contentBlockIndex": 0, "delta": delta}}}}
+
+        start = {"type": "event", "data": {"event": {"messageStart": {"role": "assistant"}}}}
+        tool_mirror = _mirror({"toolUse": {"input": "{}"}})
+        events = [start, _mirror({"text": "a"}), _text("a"), _mirror({"text": "b"}), _text("b"), tool_mirror]
+
+        assert await _collect(events, window_ms=1000) == [start, _text("a"), _text("b"), tool_mirror]
+
+    @pytest.mark.asyncio
+    async def test_byte_limit_flushes_early(self):
+        out = await _collect([_text("é")] + [_text("éé")] * 4, window_ms=1000, max_bytes=8)
+
+        # "é" is two bytes in UTF-8: two held deltas reach the limit
+        assert [e["data"]["text"] for e in out] == ["é", "éééé", "éééé"]
+
+    @pytest.mark.asyncio
+    async def test_window_flushes_while_upstream_is_quiet(self):
+        out = []
+        gen = coalesce_deltas(_source([_text("a"), _text("b"), _text("c"), 0.5, _text("d")]), window_ms=20)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async for event in gen:
+            out.append((event["data"]["text"], loop.time() - started))
+
+        assert [text for text, _ in out] == ["a", "bc", "d"]
+        # "bc" went out on the timer, long before "d" arrived
+        assert out[1][1] < 0.3
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_propagates_after_held_text(self):
+        async def _failing():
+            yield _text("a")
+            yield _text("b")
+            raise RuntimeError("boom")
+
+        out = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for event in coalesce_deltas(_failing(), window_ms=1000):
+                out.append(event)
+
+        assert out == [_text("a"), _text("b")]
+
+
+class TestSseFrames:
+    @pytest.mark.parametrize("data", [
+        {"contentBlockIndex": 0, "type": "text", "text": "héllo \"quoted\"\n☃"},
+        {"stopReason": "end_turn", "n": 1.5, "ok": True, "none": None, "big": 10**20},
+        {"nested": {"a": [1, 2]}},
+        {"nan": float("nan")},
+        {1: "int key"},
+        {},
+        [1, "two"],
+    ])
+    def test_matches_json_dumps(self, data):
+        assert encode_json(data) == json.dumps(data)
+
+    def test_frame_layout(self):
+        assert sse_frame("message_stop", {"stopReason": "end_turn"}) == (
+            'event: message_stop\ndata: {"stopReason": "end_turn"}\n\n'
+        )
+
+    def test_unserializable_payload_raises_like_json(self):
+        with pytest.raises(TypeError):
+            sse_frame("x", {"obj": object()})
+
+
+class _FakeAgent:
+    messages: List[Dict[str, Any]] = []
+
+    def __init__(self, raw_events: List[Dict[str, Any]]) -> None:
+        self._raw_events = raw_events
+
+    def stream_async(self, prompt: Any) -> AsyncIterator[Dict[str, Any]]:
+        async def _gen() -> AsyncIterator[Dict[str, Any]]:
+            for ev in self._raw_events:
+                yield ev
+
+        return _gen()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_emits_fewer_delta_frames_when_enabled(monkeypatch):
+    monkeypatch.setenv("STREAM_COALESCE_WINDOW_MS", "1000")
+    tokens = ["The", " answer", " is", " 42", "."]
+    raw = [{"event": {"messageStart": {"role": "assistant"}}}]
+    raw += [{"event": {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": t}}}} for t in tokens]
+    raw += [
+        {"event": {"contentBlockStop": {"contentBlockIndex": 0}}},
+        {"event": {"messageStop": {"stopReason": "end_turn"}}},
+    ]
+
+    frames = [
+        sse async for sse in StreamCoordinator().stream_response(
+            agent=_FakeAgent(raw), prompt="q", session_manager=object(), session_id="sess-1", user_id="user-1",
+        )
+    ]
+
+    deltas = [json.loads(f.split("data: ", 1)[1]) for f in frames if f.startswith("event: content_block_delta\n")]
+    assert [d["text"] for d in deltas] == ["The", " answer is 42."]
+    names = [f.split("\n", 1)[0] for f in frames]
+    assert names.count("event: event") == 3  # messageStart, contentBlockStop, messageStop mirrors
+    assert names.index("event: content_block_stop") > names.index("event: content_block_delta")
@@ -1,7 +1,7 @@
 """Tests for VoiceAgent — module-level and class-level behavior."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from agents.main_agent.config.constants import Defaults, EnvVars
 from agents.main_agent.base_agent import BaseAgent
@@ -123,6 +123,24 @@ class TestVoiceAgentTextHistory:
         assert messages == []
 
 
+class TestVoiceAgentSendAudio:
+    """Audio from binary WebSocket frames arrives as raw PCM bytes."""
+
+    @pytest.mark.asyncio
+    async def test_raw_pcm_is_base64_encoded_for_the_model(self):
+        from agents.main_agent.voice_agent import VoiceAgent
+
+        agent = VoiceAgent.__new__(VoiceAgent)
+        agent._bidi_agent = AsyncMock()
+
+        await agent.send_audio(b"\x01\x00\xff\x7f", sample_rate=24000)
+        await agent.send_audio("AQD/fw==")
+
+        first, second = [c.args[0] for c in agent._bidi_agent.send.call_args_list]
+        assert first["audio"] == "AQD/fw==" and first["sample_rate"] == 24000
+        assert second["audio"] == "AQD/fw==" and second["sample_rate"] == 16000
+
+
 class TestVoiceSystemPrompt:
     """Req VA-5: Voice-optimized system prompt."""
 
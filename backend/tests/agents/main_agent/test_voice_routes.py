@@ -115,3 +115,104 @@ class TestDebugEndpoints:
         assert result["status"] == "stopped"
         mock_agent.stop.assert_called_once()
         assert "sess-stop" not in _active_sessions
+
+
+class _FakeWebSocket:
+    """Scripted ASGI receive() messages plus recorded sends."""
+
+    def __init__(self, messages=()):
+        self._messages = list(messages)
+        self.sent_json = []
+        self.sent_bytes = []
+
+    async def receive(self):
+        if not self._messages:
+            return {"type": "websocket.disconnect", "code": 1000}
+        return self._messages.pop(0)
+
+    async def send_json(self, data):
+        self.sent_json.append(data)
+
+    async def send_bytes(self, data):
+        self.sent_bytes.append(data)
+
+
+class TestBinaryAudioFraming:
+    """Raw PCM audio frames, negotiated via the config message."""
+
+    def test_frame_round_trip(self):
+        from apis.inference_api.chat.voice_frames import decode_audio_frame, encode_audio_frame
+
+        frame = encode_audio_frame(b"\x01\x00\xff\x7f", 24000)
+        assert len(frame) == 10
+        assert decode_audio_frame(frame) == (b"\x01\x00\xff\x7f", 24000, 1)
+
+    @pytest.mark.parametrize("frame", [b"\x01\x00", b"\x02\x00\x00\x3e\x80\x01pcm"])
+    def test_malformed_frames_are_rejected(self, frame):
+        from apis.inference_api.chat.voice_frames import decode_audio_frame
+
+        with pytest.raises(ValueError):
+            decode_audio_frame(frame)
+
+    @pytest.mark.asyncio
+    async def test_receive_accepts_binary_and_json_audio(self):
+        from apis.inference_api.chat.voice_frames import encode_audio_frame
+        from apis.inference_api.chat.voice_routes import _receive_from_client
+
+        ws = _FakeWebSocket([
+            {"type": "websocket.receive", "bytes": encode_audio_frame(b"\x01\x02", 24000)},
+            {"type": "websocket.receive", "bytes": b"\x07junk"},
+            {"type": "websocket.receive", "text": json.dumps({"type": "bidi_audio_input", "audio": "AQI="})},
+            {"type": "websocket.receive", "text": "not json"},
+            {"type": "websocket.receive", "text": json.dumps({"type": "ping"})},
+            {"type": "websocket.receive", "text": json.dumps({"type": "stop"})},
+        ])
+        agent = AsyncMock()
+
+        await _receive_from_client(ws, agent, "sess-1")
+
+        assert [c.args for c in agent.send_audio.call_args_list] == [(b"\x01\x02", 24000), ("AQI=", 16000)]
+        assert ws.sent_json == [{"type": "pong"}]
+
+    @pytest.mark.asyncio
+    async def test_receive_returns_on_disconnect(self):
+        from apis.inference_api.chat.voice_routes import _receive_from_client
+
+        await _receive_from_client(_FakeWebSocket(), AsyncMock(), "sess-1")
+
+    @staticmethod
+    def _agent(events):
+        agent = MagicMock()
+
+        async def _events():
+            for event in events:
+                yield event
+
+        agent.receive_events = _events
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_send_uses_binary_frames_for_audio_when_negotiated(self):
+        from apis.inference_api.chat.voice_frames import decode_audio_frame
+        from apis.inference_api.chat.voice_routes import _send_to_client
+
+        audio = {"type": "bidi_audio_stream", "audio": "AQI=", "format": "pcm", "sample_rate": 24000, "channels": 1}
+        transcript = {"type": "bidi_transcript_stream", "role": "assistant", "delta": {"text": "hi"}}
+        ws = _FakeWebSocket()
+
+        await _send_to_client(ws, self._agent([audio, transcript]), "sess-1", binary_audio=True)
+
+        assert [decode_audio_frame(f) for f in ws.sent_bytes] == [(b"\x01\x02", 24000, 1)]
+        assert ws.sent_json == [transcript]
+
+    @pytest.mark.asyncio
+    async def test_send_keeps_json_audio_by_default(self):
+        from apis.inference_api.chat.voice_routes import _send_to_client
+
+        audio = {"type": "bidi_audio_stream", "audio": "AQI=", "format": "pcm", "sample_rate": 24000}
+        ws = _FakeWebSocket()
+
+        await _send_to_client(ws, self._agent([audio]), "sess-1")
+
+        assert ws.sent_bytes == []
+        assert ws.sent_json == [audio]
@@ -7,6 +7,7 @@ inline size cap, and the fail-closed config behavior.
 from __future__ import annotations
 
 import base64
+import gzip
 
 import boto3
 import pytest
@@ -78,19 +79,25 @@ def _put(
     body: bytes = b"<h1>hi</h1>",
     write_object: bool = True,
     content_key: str | None = None,
+    compressed: bool = False,
 ) -> None:
+    """One version row plus its object. `compressed` models the writer's
+    gzip-compressed content-addressed blob."""
     key = content_key
     if key is None:
         key = f"{user_id}/{artifact}/v{version}/index.html"
-    ddb.Table(TABLE).put_item(
-        Item={
-            "PK": f"USER#{user_id}",
-            "SK": f"ARTIFACT#{artifact}#V#{version:05d}",
-            "storage": "s3",
-            "content_key": key,
-            "content_type": content_type,
-        }
-    )
+    item = {
+        "PK": f"USER#{user_id}",
+        "SK": f"ARTIFACT#{artifact}#V#{version:05d}",
+        "storage": "s3",
+        "content_key": key,
+        "content_type": content_type,
+    }
+    if compressed:
+        item["storage"] = "s3-blob"
+        item["content_encoding"] = "gzip"
+        body = gzip.compress(body)
+    ddb.Table(TABLE).put_item(Item=item)
     if write_object:
         s3.put_object(Bucket=BUCKET, Key=key, Body=body)
 
@@ -178,6 +185,29 @@ def test_oversized_artifact_is_413(client, monkeypatch) -> None:
     assert resp.status_code == 413
 
 
+def test_compressed_markdown_blob_is_inflated_and_unwrapped(client) -> None:
+    tc, ddb, s3 = client
+    _put(
+        ddb,
+        s3,
+        content_type="text/markdown",
+        body=_markdown_wrapper("# Notes\n"),
+        content_key="blobs/ab/abcdef.gz",
+        compressed=True,
+    )
+    resp = tc.get("/artifacts/art-1/content", params={"version": 1})
+    assert resp.status_code == 200
+    assert resp.json()["content"] == "# Notes\n"
+
+
+def test_compressed_artifact_past_cap_is_413(client, monkeypatch) -> None:
+    tc, ddb, s3 = client
+    monkeypatch.setattr(artifact_service, "_MAX_CONTENT_BYTES", 256)
+    _put(ddb, s3, body=b"x" * 4096, compressed=True)
+    resp = tc.get("/artifacts/art-1/content", params={"version": 1})
+    assert resp.status_code == 413
+
+
 def test_missing_bucket_is_500(client, monkeypatch) -> None:
     tc, ddb, s3 = client
     _put(ddb, s3)
@@ -1,9 +1,10 @@
 """Tests for the app-api session artifacts list endpoint.
 
-The endpoint returns *every version* of every artifact in a session via
-a two-step query: SessionIndex (HEAD rows only) to discover the
-artifacts, then a per-artifact main-table `SK begins_with #V#` query for
-all immutable version rows. The SPA renders one card per version,
+The endpoint returns *every version* of every artifact in a session.
+SessionIndex (HEAD rows only) discovers the artifacts, and the HEAD's
+`version_index` lists their versions. HEADs without one fall back to a
+per-artifact main-table `SK begins_with #V#` query for the immutable
+version rows. The SPA renders one card per version,
 anchored to the turn that produced it via the per-version
 `produced_by_message_index` the writer stamps.
 """
@@ -121,27 +122,30 @@ def _put_head(
     session_id: str = SESSION,
     updated_at: str = "2026-05-15T10:00:00+00:00",
     title: str = "Doc",
+    version_index: dict | None = None,
 ) -> None:
     """The HEAD pointer row — carries the SessionIndex GSI keys used for
-    step-1 artifact discovery."""
-    ddb.Table(TABLE).put_item(
-        Item={
-            "PK": f"USER#{user_id}",
-            "SK": f"ARTIFACT#{artifact}#HEAD",
-            "GSI1PK": f"SESSION#{session_id}",
-            "GSI1SK": f"ARTIFACT#{updated_at}#{artifact}",
-            "storage": "s3",
-            "content_key": f"{user_id}/{artifact}/v{head_version}/index.html",
-            "content_type": "text/html; charset=utf-8",
-            "version": head_version,
-            "artifact_id": artifact,
-            "user_id": user_id,
-            "session_id": session_id,
-            "title": title,
-            "created_at": "2026-05-15T10:00:00+00:00",
-            "updated_at": updated_at,
-        }
-    )
+    artifact discovery. `version_index` left None models a HEAD written
+    before the writer denormalized the version list onto it."""
+    item = {
+        "PK": f"USER#{user_id}",
+        "SK": f"ARTIFACT#{artifact}#HEAD",
+        "GSI1PK": f"SESSION#{session_id}",
+        "GSI1SK": f"ARTIFACT#{updated_at}#{artifact}",
+        "storage": "s3",
+        "content_key": f"{user_id}/{artifact}/v{head_version}/index.html",
+        "content_type": "text/html; charset=utf-8",
+        "version": head_version,
+        "artifact_id": artifact,
+        "user_id": user_id,
+        "session_id": session_id,
+        "title": title,
+        "created_at": "2026-05-15T10:00:00+00:00",
+        "updated_at": updated_at,
+    }
+    if version_index is not None:
+        item["version_index"] = version_index
+    ddb.Table(TABLE).put_item(Item=item)
 
 
 def _put_artifact(
@@ -299,6 +303,132 @@ def test_other_users_artifact_is_filtered(client) -> None:
     assert {a["artifact_id"] for a in arts} == {"mine"}
 
 
+def _index(*versions: int, **extra) -> dict:
+    return {
+        f"{v:05d}": {
+            "title": "Doc",
+            "content_type": "text/html; charset=utf-8",
+            "updated_at": f"2026-05-15T1{v}:00:00+00:00",
+            **extra,
+        }
+        for v in versions
+    }
+
+
+def test_version_index_lists_without_version_queries(client, monkeypatch) -> None:
+    """A HEAD carrying a complete version_index needs no version-row
+    queries — the single SessionIndex query covers the session."""
+    tc, ddb = client
+    _put_head(
+        ddb,
+        artifact="art-1",
+        head_version=3,
+        version_index=_index(1, 2, 3, produced_by_message_index=5),
+    )
+
+    def _no_version_queries(*_args, **_kwargs):
+        raise AssertionError("version rows should not be queried")
+
+    monkeypatch.setattr(
+        ArtifactListService, "_versions_for_artifact", staticmethod(_no_version_queries)
+    )
+    arts = tc.get("/artifacts", params={"session_id": SESSION}).json()[
+        "artifacts"
+    ]
+    assert [a["version"] for a in arts] == [1, 2, 3]
+    assert arts[1]["updated_at"] == "2026-05-15T12:00:00+00:00"
+    assert all(a["produced_by_message_index"] == 5 for a in arts)
+    assert all(a["created_at"] == "2026-05-15T10:00:00+00:00" for a in arts)
+
+
+def test_incomplete_index_falls_back_to_version_rows(client) -> None:
+    """Indexed and legacy HEADs mix in one session; an index with a gap
+    is not trusted and the artifact's version rows are read instead."""
+    tc, ddb = client
+    _put_head(
+        ddb,
+        artifact="indexed",
+        head_version=1,
+        updated_at="2026-05-15T12:00:00+00:00",
+        version_index=_index(1),
+    )
+    _put_artifact(
+        ddb,
+        artifact="gappy",
+        versions=[
+            {"version": 1, "updated_at": "2026-05-15T10:00:00+00:00"},
+            {"version": 2, "updated_at": "2026-05-15T11:00:00+00:00"},
+        ],
+    )
+    _put_head(
+        ddb,
+        artifact="gappy",
+        head_version=2,
+        updated_at="2026-05-15T11:00:00+00:00",
+        version_index=_index(2),
+    )
+    for name in ("legacy-a", "legacy-b"):
+        _put_artifact(ddb, artifact=name, versions=[{"version": 1}])
+
+    arts = tc.get("/artifacts", params={"session_id": SESSION}).json()[
+        "artifacts"
+    ]
+    assert [(a["artifact_id"], a["version"]) for a in arts][:3] == [
+        ("indexed", 1),
+        ("gappy", 1),
+        ("gappy", 2),
+    ]
+    assert {a["artifact_id"] for a in arts[3:]} == {"legacy-a", "legacy-b"}
+
+
+def test_listing_is_cached_until_a_head_changes(client, monkeypatch) -> None:
+    tc, ddb = client
+    _put_artifact(ddb, artifact="art-1", versions=[{"version": 1}])
+    calls = []
+    original = ArtifactListService._versions_for_artifact
+
+    def _counting(user_id, artifact_id):
+        calls.append(artifact_id)
+        return original(user_id, artifact_id)
+
+    monkeypatch.setattr(
+        ArtifactListService, "_versions_for_artifact", staticmethod(_counting)
+    )
+    service = ArtifactListService()
+    first = service.list_for_session(user_id=USER_ID, session_id=SESSION)
+    first[0]["title"] = "mutated by caller"
+    assert service.list_for_session(user_id=USER_ID, session_id=SESSION)[0][
+        "title"
+    ] == "Doc"
+    assert calls == ["art-1"]
+
+    # An update re-puts HEAD with a new version + updated_at.
+    _put_version(ddb, artifact="art-1", version=2, updated_at="2026-05-15T11:00:00+00:00")
+    _put_head(ddb, artifact="art-1", head_version=2, updated_at="2026-05-15T11:00:00+00:00")
+    rows = service.list_for_session(user_id=USER_ID, session_id=SESSION)
+    assert [r["version"] for r in rows] == [1, 2]
+    assert calls == ["art-1", "art-1"]
+
+
+def test_cached_listing_sees_per_version_linkage_stamps(client) -> None:
+    """Stamping an older version's produced_by_message_index rewrites only
+    its version_index entry; the cached listing must still be dropped."""
+    _, ddb = client
+    _put_head(ddb, artifact="art-1", head_version=2, version_index=_index(1, 2))
+    service = ArtifactListService()
+    assert [
+        r.get("produced_by_message_index")
+        for r in service.list_for_session(user_id=USER_ID, session_id=SESSION)
+    ] == [None, None]
+
+    stamped = _index(1, 2)
+    stamped["00001"]["produced_by_message_index"] = 3
+    _put_head(ddb, artifact="art-1", head_version=2, version_index=stamped)
+    rows = service.list_for_session(user_id=USER_ID, session_id=SESSION)
+
+    assert [r.get("produced_by_message_index") for r in rows] == [3, None]
+
+
 def test_session_id_required(client) -> None:
     tc, _ = client
     resp = tc.get("/artifacts")
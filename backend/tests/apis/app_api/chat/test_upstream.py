@@ -0,0 +1,145 @@
+"""Tests for the shared upstream client behind the chat proxies."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apis.app_api.chat import proxy_routes, upstream
+from apis.app_api.chat.proxy_routes import router as proxy_router
+from apis.shared.auth.dependencies import get_current_user_from_session
+from apis.shared.auth.models import User
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_client():
+    upstream._client = None
+    upstream._client_loop = None
+    yield
+    upstream._client = None
+    upstream._client_loop = None
+
+
+def _user() -> User:
+    user = User(email="alice@example.com", user_id="user-sub", name="Alice", roles=["user"])
+    user.raw_token = "access.token.value"
+    return user
+
+
+def test_limits_and_timeouts_come_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("UPSTREAM_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("UPSTREAM_HTTP_MAX_KEEPALIVE", "3")
+    monkeypatch.setenv("UPSTREAM_HTTP_KEEPALIVE_EXPIRY_SECONDS", "12.5")
+    monkeypatch.setenv("UPSTREAM_HTTP_POOL_TIMEOUT_SECONDS", "2.5")
+
+    client = upstream.build_upstream_client()
+
+    pool = client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (7, 3, 12.5)
+    assert client.timeout.read == upstream.PROXY_TIMEOUT_SECONDS
+    assert client.timeout.pool == 2.5
+    asyncio.run(client.aclose())
+
+
+def test_streams_never_wait_on_a_capped_pool_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each relayed stream pins a connection for a whole turn, so the default
+    pool is unbounded and never times out acquiring a connection."""
+    monkeypatch.delenv("UPSTREAM_HTTP_MAX_CONNECTIONS", raising=False)
+    monkeypatch.setenv("UPSTREAM_HTTP_POOL_TIMEOUT_SECONDS", "not-a-number")
+
+    client = upstream.build_upstream_client()
+
+    assert client._transport._pool._max_connections == sys.maxsize
+    assert client.timeout.pool is None
+    assert client.timeout.connect == upstream._CONNECT_TIMEOUT_SECONDS
+    asyncio.run(client.aclose())
+
+
+@pytest.mark.asyncio
+async def test_cookies_from_one_response_are_not_sent_on_the_next() -> None:
+    """The client is shared across users, so a Set-Cookie (e.g. a sticky
+    session) must not be replayed on anyone else's request."""
+    sent: list[str | None] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "AWSALB=node-1; Path=/"})
+
+    client = upstream.build_upstream_client()
+    client._transport = httpx.MockTransport(_handler)
+
+    await client.get("http://inference-api.local/chat/stream")
+    await client.get("http://inference-api.local/chat/stream")
+
+    assert sent == [None, None]
+    assert len(client.cookies.jar) == 0
+    await client.aclose()
+
+
+def test_http2_falls_back_without_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("UPSTREAM_HTTP2", "true")
+    monkeypatch.setitem(sys.modules, "h2", None)
+
+    assert upstream._http2_enabled() is False
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_loop_until_closed() -> None:
+    first = upstream.get_upstream_client()
+    assert upstream.get_upstream_client() is first
+
+    await upstream.close_upstream_client()
+
+    assert first.is_closed
+    second = upstream.get_upstream_client()
+    assert second is not first
+    await upstream.close_upstream_client()
+
+
+def test_new_loop_gets_a_fresh_client() -> None:
+    async def _get() -> httpx.AsyncClient:
+        return upstream.get_upstream_client()
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+
+    assert second is not first
+
+
+def test_proxy_requests_share_the_client_and_leave_it_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    closed_responses = []
+
+    class _Stream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"event: done\ndata: {}\n\n"
+
+        async def aclose(self) -> None:
+            closed_responses.append(True)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=_Stream(), headers={"content-type": "text/event-stream"})
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    seen = []
+
+    def _shared_client() -> httpx.AsyncClient:
+        seen.append(shared)
+        return shared
+
+    monkeypatch.setattr(proxy_routes, "_build_upstream_client", _shared_client)
+    app = FastAPI()
+    app.include_router(proxy_router)
+    app.dependency_overrides[get_current_user_from_session] = _user
+
+    with TestClient(app) as client:
+        assert client.post("/chat/stream", json={}).status_code == 200
+        assert client.post("/chat/stream", json={}).status_code == 200
+
+    assert len(seen) == 2
+    assert closed_responses == [True, True]
+    assert not shared.is_closed
@@ -49,3 +49,17 @@ def test_non_json_frame_is_passthrough() -> None:
 
 def test_non_object_json_is_passthrough() -> None:
     assert _inject_config_auth("[1,2,3]", access_token="t", user_id="u") == "[1,2,3]"
+
+
+def test_audio_frame_is_returned_without_parsing() -> None:
+    raw = json.dumps({"type": "bidi_audio_input", "audio": "AAAA" * 1000, "sample_rate": 16000})
+    assert _inject_config_auth(raw, access_token="t", user_id="u") is raw
+
+
+def test_escaped_config_type_is_still_injected() -> None:
+    # "config" decodes to "config"; the fast path must not let it
+    # through with the SPA's own identity fields.
+    raw = '{"type": "\\u0063onfig", "user_id": "spa-set", "auth_token": "x"}'
+    parsed = json.loads(_inject_config_auth(raw, access_token="t", user_id="proxy-set"))
+    assert parsed["user_id"] == "proxy-set"
+    assert parsed["auth_token"] == "t"
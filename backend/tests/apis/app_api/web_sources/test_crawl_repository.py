@@ -169,6 +169,23 @@ async def test_increment_counters_bumps_atomically(ddb) -> None:
     assert refetched.failed_count == 1
 
 
+@pytest.mark.asyncio
+async def test_increment_counters_tracks_unchanged_pages(ddb) -> None:
+    job = await crawl_repository.create_crawl_job(
+        assistant_id=ASSISTANT_ID,
+        root_url="https://example.com/",
+        settings=CrawlSettings(incremental=True),
+        started_by_user_id=USER_ID,
+    )
+    await crawl_repository.increment_counters(
+        assistant_id=ASSISTANT_ID, crawl_id=job.crawl_id, unchanged_delta=2
+    )
+    refetched = await crawl_repository.get_crawl_job(ASSISTANT_ID, job.crawl_id)
+    assert refetched is not None
+    assert refetched.unchanged_count == 2
+    assert refetched.settings.incremental is True
+
+
 @pytest.mark.asyncio
 async def test_finalize_writes_status_and_error(ddb) -> None:
     job = await crawl_repository.create_crawl_job(
@@ -362,3 +379,46 @@ async def test_cascade_leaves_running_crawl_alone(ddb) -> None:
     await _cascade_delete_orphaned_crawl_jobs(ASSISTANT_ID)
 
     assert await crawl_repository.get_crawl_job(ASSISTANT_ID, crawl.crawl_id) is not None
+
+
+# =========================================================================
+# Incremental re-crawl: prior page state
+# =========================================================================
+
+
+@pytest.mark.asyncio
+async def test_list_crawled_pages_returns_validators_and_depth(ddb) -> None:
+    _put_web_doc(ddb, document_id="DOC-old", source_file_id="https://example.com/")
+    _put_web_doc(ddb, document_id="DOC-gone", source_file_id="https://example.com/x", status="deleting")
+    ddb.put_item(
+        Item={
+            "PK": f"AST#{ASSISTANT_ID}",
+            "SK": "DOC#DOC-new",
+            "documentId": "DOC-new",
+            "sourceConnectorId": "web",
+            "sourceFileId": "https://example.com/",
+            "sourceEtag": '"v2"',
+            "sourceLastModified": "Wed, 01 Jan 2025 00:00:00 GMT",
+            "crawlDepth": 0,
+            "s3Key": "assistants/a/documents/DOC-new/Home.md",
+            "crawlRoot": "https://example.com/",
+            "createdAt": "2026-06-01T00:00:00Z",
+            "status": "complete",
+        }
+    )
+
+    pages = await crawl_repository.list_crawled_pages(ASSISTANT_ID)
+
+    # The deleting row is ignored; the newer of two imports of a URL wins.
+    assert pages == {
+        "https://example.com/": crawl_repository.CrawledPage(
+            document_id="DOC-new",
+            status="complete",
+            created_at="2026-06-01T00:00:00Z",
+            etag='"v2"',
+            last_modified="Wed, 01 Jan 2025 00:00:00 GMT",
+            depth=0,
+            s3_key="assistants/a/documents/DOC-new/Home.md",
+            root="https://example.com/",
+        )
+    }
@@ -18,13 +18,19 @@ finalized.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Dict, List, Tuple
 
 import httpx
 import pytest
 
 from apis.app_api.web_sources import crawl_repository, crawler
+from apis.app_api.web_sources.crawl_repository import CrawledPage
 from apis.app_api.web_sources.crawler import run_crawl
+from apis.app_api.web_sources.html_extract import parse_page
 from apis.app_api.web_sources.models import CrawlSettings
 
 
@@ -38,10 +44,20 @@ class _Recorder:
         self.created_docs: List[Tuple[str, str]] = []  # (document_id, source_url)
         self.status_updates: List[Tuple[str, str]] = []  # (document_id, status)
         self.metadata_updates: List[str] = []  # document_id list
+        self.metadata: Dict[str, dict] = {}  # document_id -> validators + depth
         self.s3_puts: List[Tuple[str, bytes]] = []  # (s3_key, body)
+        self.s3_holders: set[int] = set()  # distinct per-crawl S3 holders seen
+        self.s3_deletes: List[str] = []  # s3_key list
+        # Fake vector store: document_id -> chunk indices. Each S3 put is
+        # "ingested" as one chunk per non-blank markdown line, overwriting
+        # indices the way the ingestion Lambda does.
+        self.vectors: Dict[str, set[int]] = {}
+        self.events: List[Tuple[str, str]] = []  # (action, document_id or key)
+        self.increment_calls = 0
         self.discovered_delta = 0
         self.fetched_delta = 0
         self.failed_delta = 0
+        self.unchanged_delta = 0
         self.finalized_status: str | None = None
         self.finalized_error: str | None = None
         self._doc_counter = 0
@@ -101,8 +117,17 @@ def recorder(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
         size_bytes: int,
         s3_key: str,
         source_etag: str | None = None,
+        source_last_modified: str | None = None,
+        crawl_depth: int | None = None,
+        crawl_root: str | None = None,
     ):
         rec.metadata_updates.append(document_id)
+        rec.metadata[document_id] = {
+            "etag": source_etag,
+            "last_modified": source_last_modified,
+            "depth": crawl_depth,
+            "root": crawl_root,
+        }
         return None
 
     counter = {"n": 0}
@@ -112,12 +137,24 @@ def recorder(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
         return f"DOC-gen{counter['n']:09d}"
 
     async def fake_put_markdown(
-        *, assistant_id: str, document_id: str, markdown: str, filename: str
+        *, assistant_id: str, document_id: str, markdown: str, filename: str, s3
     ) -> str:
+        rec.s3_holders.add(id(s3))
         key = f"assistants/{assistant_id}/documents/{document_id}/{filename}"
         rec.s3_puts.append((key, markdown.encode("utf-8")))
+        rec.events.append(("put", document_id))
+        chunks = [line for line in markdown.splitlines() if line.strip()]
+        rec.vectors.setdefault(document_id, set()).update(range(len(chunks)))
         return key
 
+    async def fake_delete_markdown(*, s3_key: str, s3) -> None:
+        rec.s3_deletes.append(s3_key)
+        rec.events.append(("delete_object", s3_key))
+
+    async def fake_delete_vectors(document_id: str) -> int:
+        rec.events.append(("delete_vectors", document_id))
+        return len(rec.vectors.pop(document_id, set()))
+
     async def fake_increment(
         *,
         assistant_id: str,
@@ -125,10 +162,13 @@ def recorder(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
         discovered_delta: int = 0,
         fetched_delta: int = 0,
         failed_delta: int = 0,
+        unchanged_delta: int = 0,
     ):
+        rec.increment_calls += 1
         rec.discovered_delta += discovered_delta
         rec.fetched_delta += fetched_delta
         rec.failed_delta += failed_delta
+        rec.unchanged_delta += unchanged_delta
 
     async def fake_finalize(
         *, assistant_id: str, crawl_id: str, status: str, error: str | None = None
@@ -142,6 +182,8 @@ def recorder(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
     monkeypatch.setattr(crawler, "update_document_status", fake_update_status)
     monkeypatch.setattr(crawler, "update_document_import_metadata", fake_update_metadata)
     monkeypatch.setattr(crawler, "_put_markdown", fake_put_markdown)
+    monkeypatch.setattr(crawler, "_delete_markdown", fake_delete_markdown)
+    monkeypatch.setattr(crawler, "delete_vectors_for_document", fake_delete_vectors)
     monkeypatch.setattr(crawler, "increment_counters", fake_increment)
     monkeypatch.setattr(crawler, "finalize_crawl", fake_finalize)
     # _create_pending_document calls _generate_document_id, which lives in
@@ -462,3 +504,562 @@ async def test_visited_dedupes_repeated_links(recorder: _Recorder):
     )
     # Only one extra doc despite three duplicate <a>'s.
     assert len(recorder.created_docs) == 1
+
+
+# ── Parse offload ──────────────────────────────────────────────────────────
+
+
+def test_parse_page_skips_links_at_depth_limit():
+    html = '<html><head><title>T</title></head><body><a href="/x">x</a></body></html>'
+
+    markdown, title, links = parse_page(html, "https://example.com/", want_links=True)
+    assert title == "T" and markdown.startswith("# T")
+    assert links == [("https://example.com/x", "https://example.com/x")]
+    assert parse_page(html, "https://example.com/", want_links=False)[2] == []
+
+
+@pytest.mark.asyncio
+async def test_parsing_does_not_block_the_event_loop():
+    html = "<html><body>" + '<p><a href="/p">para</a> text</p>' * 4000 + "</body></html>"
+    ticks = 0
+    done = asyncio.Event()
+
+    async def _ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(_ticker())
+    started = time.perf_counter()
+    markdown, _title, links = await crawler._parse_in_pool(html, "https://example.com/", True)
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker
+
+    assert "para" in markdown and len(links) == 1
+    # The loop kept ticking at ~10ms intervals for most of the parse
+    assert ticks >= elapsed / 0.01 / 2
+
+
+@pytest.mark.asyncio
+async def test_parse_falls_back_to_a_thread_when_pool_disabled(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("WEB_CRAWL_PARSE_WORKERS", "0")
+    markdown, title, _links = await crawler._parse_in_pool(
+        "<title>Solo</title><p>x</p>", "https://example.com/", False
+    )
+    assert title == "Solo" and "x" in markdown
+
+
+# ── Incremental re-crawl ───────────────────────────────────────────────────
+
+
+def _conditional_handler(pages: Dict[str, str], etags: Dict[str, str], seen: List[dict]):
+    """Serve `pages` with ETags, answering 304 when If-None-Match matches."""
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url.endswith("/robots.txt"):
+            return httpx.Response(404, text="")
+        seen.append({"url": url, "if_none_match": request.headers.get("if-none-match")})
+        if url not in pages:
+            return httpx.Response(404, text="not found")
+        if request.headers.get("if-none-match") == etags[url]:
+            return httpx.Response(304, headers={"etag": etags[url]})
+        return httpx.Response(
+            200,
+            text=pages[url],
+            headers={"content-type": "text/html", "etag": etags[url]},
+        )
+
+    return _handler
+
+
+@pytest.mark.asyncio
+async def test_incremental_recrawl_skips_unchanged_pages(recorder: _Recorder):
+    pages = {
+        "https://example.com/": '<html><body><a href="/a">A</a></body></html>',
+        "https://example.com/a": "<html><body>a</body></html>",
+    }
+    etags = {"https://example.com/": '"root-v1"', "https://example.com/a": '"a-v1"'}
+    prior = {
+        "https://example.com/": CrawledPage("DOC-root00000001", "complete", etag='"root-v1"', depth=0),
+        "https://example.com/a": CrawledPage("DOC-a", "complete", etag='"a-v1"', depth=1),
+    }
+    seen: List[dict] = []
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url="https://example.com/",
+        settings=CrawlSettings(max_depth=1, max_pages=10, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, etags, seen)),
+    )
+
+    assert recorder.finalized_status == "complete"
+    assert sorted(r["if_none_match"] for r in seen) == ['"a-v1"', '"root-v1"']
+    assert recorder.unchanged_delta == 2
+    assert recorder.created_docs == []
+    assert recorder.s3_puts == []
+    assert recorder.metadata_updates == []
+    assert recorder.fetched_delta == 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_recrawl_reimports_changed_pages_in_place(recorder: _Recorder):
+    pages = {
+        "https://example.com/": (
+            '<html><body><a href="/a">A</a><a href="/new">N</a></body></html>'
+        ),
+        "https://example.com/a": "<html><body>a</body></html>",
+        "https://example.com/new": "<html><body>new</body></html>",
+    }
+    etags = {
+        "https://example.com/": '"root-v2"',
+        "https://example.com/a": '"a-v1"',
+        "https://example.com/new": '"new-v1"',
+    }
+    prior = {
+        "https://example.com/": CrawledPage("DOC-root00000001", "complete", etag='"root-v1"', depth=0),
+        "https://example.com/a": CrawledPage("DOC-a", "complete", etag='"a-v1"', depth=1),
+    }
+    seen: List[dict] = []
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url="https://example.com/",
+        settings=CrawlSettings(max_depth=1, max_pages=10, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, etags, seen)),
+    )
+
+    # The changed root is re-imported into its existing document; the new
+    # link gets a fresh one; the unchanged child is left alone.
+    assert recorder.unchanged_delta == 1
+    assert recorder.created_docs == [("DOC-gen000000001", "https://example.com/new")]
+    assert sorted(recorder.metadata_updates) == ["DOC-gen000000001", recorder.preassigned_root_id]
+    assert recorder.metadata[recorder.preassigned_root_id] == {
+        "etag": '"root-v2"',
+        "last_modified": None,
+        "depth": 0,
+        "root": "https://example.com/",
+    }
+    assert "DOC-a" not in recorder.metadata
+    # Only the re-imported document is cleared, and before it is re-staged.
+    assert [e for e in recorder.events if e[0] == "delete_vectors"] == [
+        ("delete_vectors", recorder.preassigned_root_id)
+    ]
+    assert recorder.events.index(("delete_vectors", recorder.preassigned_root_id)) < (
+        recorder.events.index(("put", recorder.preassigned_root_id))
+    )
+
+
+@pytest.mark.asyncio
+async def test_recrawl_seeds_by_recorded_crawl_root(recorder: _Recorder):
+    """Pages are re-checked because this root imported them, not because
+    their URL starts with it: a page outside the root path whose parent is
+    unchanged is still fetched, and `/docs-old` is not mistaken for a page
+    under `/docs`."""
+    root = "https://example.com/docs"
+    pages = {
+        root: '<html><body><a href="/blog/post">post</a></body></html>',
+        "https://example.com/blog/post": "<html><body>post v2</body></html>",
+        "https://example.com/docs/legacy": "<html><body>legacy</body></html>",
+        "https://example.com/docs-old": "<html><body>old docs</body></html>",
+        "https://example.com/docs/other-crawl": "<html><body>other</body></html>",
+    }
+    etags = {url: '"v2"' for url in pages}
+    etags[root] = '"root-v1"'
+    prior = {
+        root: CrawledPage("DOC-root00000001", "complete", etag='"root-v1"', depth=0, root=root),
+        "https://example.com/blog/post": CrawledPage(
+            "DOC-post", "complete", etag='"v1"', depth=1, root=root
+        ),
+        # Imported before crawl roots were recorded: matched by path.
+        "https://example.com/docs/legacy": CrawledPage("DOC-legacy", "complete", etag='"v1"', depth=1),
+        "https://example.com/docs-old": CrawledPage("DOC-docs-old", "complete", etag='"v1"', depth=1),
+        # Under this path, but another root's crawl imported it.
+        "https://example.com/docs/other-crawl": CrawledPage(
+            "DOC-other", "complete", etag='"v1"', depth=1, root="https://example.com/"
+        ),
+    }
+    seen: List[dict] = []
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=root,
+        settings=CrawlSettings(max_depth=1, max_pages=10, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, etags, seen)),
+    )
+
+    assert sorted(r["url"] for r in seen) == [
+        "https://example.com/blog/post",
+        root,
+        "https://example.com/docs/legacy",
+    ]
+    assert recorder.unchanged_delta == 1
+    assert sorted(recorder.metadata_updates) == ["DOC-legacy", "DOC-post"]
+    assert recorder.metadata["DOC-post"]["root"] == root
+
+
+@pytest.mark.asyncio
+async def test_changed_page_with_fewer_chunks_leaves_no_stale_vectors(recorder: _Recorder):
+    root = "https://example.com/"
+    old_key = f"assistants/ast-1/documents/{recorder.preassigned_root_id}/Old title.md"
+    pages = {root: "<html><head><title>New title</title></head><body><p>short now</p></body></html>"}
+    etags = {root: '"v2"'}
+    prior = {
+        root: CrawledPage(
+            recorder.preassigned_root_id, "complete", etag='"v1"', depth=0, s3_key=old_key
+        )
+    }
+    # The previous version was long: five chunks in the vector store.
+    recorder.vectors[recorder.preassigned_root_id] = set(range(5))
+
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=root,
+        settings=CrawlSettings(max_depth=0, max_pages=1, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, etags, [])),
+    )
+
+    new_key, body = recorder.s3_puts[0]
+    new_chunks = len([line for line in body.decode().splitlines() if line.strip()])
+    assert new_chunks < 5
+    assert recorder.vectors[recorder.preassigned_root_id] == set(range(new_chunks))
+    # The title changed, so the markdown moved; the old object is removed.
+    assert new_key != old_key
+    assert recorder.s3_deletes == [old_key]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_key_is_not_deleted(recorder: _Recorder):
+    root = "https://example.com/"
+    key = f"assistants/ast-1/documents/{recorder.preassigned_root_id}/Same.md"
+    pages = {root: "<html><head><title>Same</title></head><body>v2</body></html>"}
+    prior = {
+        root: CrawledPage(recorder.preassigned_root_id, "complete", etag='"v1"', depth=0, s3_key=key)
+    }
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=root,
+        settings=CrawlSettings(max_depth=0, max_pages=1, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, {root: '"v2"'}, [])),
+    )
+
+    assert recorder.s3_puts[0][0] == key
+    assert recorder.s3_deletes == []
+
+
+@pytest.mark.asyncio
+async def test_failed_prior_page_is_fetched_unconditionally(recorder: _Recorder):
+    pages = {"https://example.com/": "<html><body>back</body></html>"}
+    etags = {"https://example.com/": '"v1"'}
+    prior = {"https://example.com/": CrawledPage("DOC-root00000001", "failed", etag='"v1"', depth=0)}
+    seen: List[dict] = []
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url="https://example.com/",
+        settings=CrawlSettings(max_depth=0, max_pages=1, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_conditional_handler(pages, etags, seen)),
+    )
+
+    assert seen == [{"url": "https://example.com/", "if_none_match": None}]
+    assert recorder.metadata_updates == [recorder.preassigned_root_id]
+
+
+def _flaky_handler(error: Exception | int):
+    """Every page request raises `error`, or answers with that status."""
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url).endswith("/robots.txt"):
+            return httpx.Response(404, text="")
+        if isinstance(error, int):
+            return httpx.Response(error, text="unavailable")
+        raise error
+
+    return _handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [503, 429, httpx.ReadTimeout("timed out")])
+async def test_transient_error_keeps_complete_prior_document(recorder: _Recorder, error):
+    root = "https://example.com/"
+    prior = {root: CrawledPage(recorder.preassigned_root_id, "complete", etag='"v1"', depth=0)}
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=root,
+        settings=CrawlSettings(max_depth=0, max_pages=1, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_flaky_handler(error)),
+    )
+
+    assert recorder.status_updates == []
+    assert recorder.events == []
+    assert recorder.failed_delta == 1
+    assert recorder.finalized_status == "complete"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "prior_status, error",
+    [(None, 503), ("failed", 503), ("complete", 404)],
+)
+async def test_other_fetch_errors_still_fail_the_document(
+    recorder: _Recorder, prior_status, error
+):
+    root = "https://example.com/"
+    prior = (
+        {root: CrawledPage(recorder.preassigned_root_id, prior_status, etag='"v1"', depth=0)}
+        if prior_status
+        else {}
+    )
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=root,
+        settings=CrawlSettings(max_depth=0, max_pages=1, incremental=True),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=_client_factory(_flaky_handler(error)),
+    )
+
+    assert recorder.status_updates == [(recorder.preassigned_root_id, "failed")]
+    assert recorder.failed_delta == 1
+
+
+class _FixtureSite(BaseHTTPRequestHandler):
+    """Static site that honours If-None-Match / If-Modified-Since."""
+
+    pages: Dict[str, str] = {}
+    log: List[Tuple[str, int, bool]] = []  # (path, status, conditional)
+    last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        body = self.pages.get(self.path)
+        conditional = bool(
+            self.headers.get("If-None-Match") or self.headers.get("If-Modified-Since")
+        )
+        if body is None:
+            self._reply(404, conditional)
+            return
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()[:12]}"'
+        if (
+            self.headers.get("If-None-Match") == etag
+            or self.headers.get("If-Modified-Since") == self.last_modified
+        ):
+            self._reply(304, conditional, etag=etag)
+            return
+        self._reply(200, conditional, body=body, etag=etag)
+
+    def _reply(self, status: int, conditional: bool, body: str = "", etag: str = "") -> None:
+        self.log.append((self.path, status, conditional))
+        payload = body.encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", self.last_modified)
+        if status == 200:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        if status != 304:
+            self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(payload)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture
+def fixture_site(monkeypatch: pytest.MonkeyPatch):
+    _FixtureSite.pages = {
+        "/": '<html><head><title>Home</title></head><body><a href="/a">A</a><a href="/b">B</a></body></html>',
+        "/a": '<html><head><title>A</title></head><body>a <a href="/a/deep">deep</a></body></html>',
+        "/b": "<html><head><title>B</title></head><body>b</body></html>",
+        "/a/deep": "<html><head><title>Deep</title></head><body>deep</body></html>",
+    }
+    _FixtureSite.log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureSite)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # The SSRF guard rejects loopback links; this server is the point.
+    monkeypatch.setattr(crawler, "assert_url_is_public", lambda url, resolve=True: url)
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_recrawl_of_unchanged_site_only_sends_conditional_requests(
+    recorder: _Recorder, fixture_site: str
+):
+    settings = CrawlSettings(max_depth=2, max_pages=10, min_delay_seconds=0, max_delay_seconds=0)
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url=fixture_site,
+        settings=settings,
+        root_document_id=recorder.preassigned_root_id,
+        http_client_factory=httpx.AsyncClient,
+    )
+    assert recorder.fetched_delta == 4
+    urls = {doc_id: url for doc_id, url in recorder.created_docs}
+    urls[recorder.preassigned_root_id] = fixture_site
+    prior = {
+        urls[doc_id]: CrawledPage(doc_id, "complete", **meta)
+        for doc_id, meta in recorder.metadata.items()
+    }
+    assert prior[fixture_site + "a/deep"].depth == 2
+
+    first_run_puts = len(recorder.s3_puts)
+    first_run_docs = len(recorder.created_docs)
+    recorder.metadata_updates.clear()
+    _FixtureSite.log = []
+
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-2",
+        user_id="user-1",
+        root_url=fixture_site,
+        settings=settings.model_copy(update={"incremental": True}),
+        root_document_id=recorder.preassigned_root_id,
+        prior_pages=prior,
+        http_client_factory=httpx.AsyncClient,
+    )
+
+    pages = [entry for entry in _FixtureSite.log if entry[0] != "/robots.txt"]
+    assert sorted(pages) == [
+        ("/", 304, True),
+        ("/a", 304, True),
+        ("/a/deep", 304, True),
+        ("/b", 304, True),
+    ]
+    assert recorder.unchanged_delta == 4
+    assert len(recorder.s3_puts) == first_run_puts
+    assert len(recorder.created_docs) == first_run_docs
+    assert recorder.metadata_updates == []
+    assert recorder.finalized_status == "complete"
+
+
+# ── Progress batching and scheduling ───────────────────────────────────────
+
+
+def _wide_site(pages: int) -> Dict[str, str]:
+    links = "".join(f'<a href="/p{i}">p{i}</a>' for i in range(1, pages))
+    site = {"https://example.com/": f"<html><body>{links}</body></html>"}
+    for i in range(1, pages):
+        site[f"https://example.com/p{i}"] = f"<html><body>page {i}</body></html>"
+    return site
+
+
+@pytest.mark.asyncio
+async def test_counter_writes_are_batched_with_exact_totals(recorder: _Recorder):
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url="https://example.com/",
+        settings=CrawlSettings(max_depth=1, max_pages=100, concurrency=5),
+        root_document_id=recorder.preassigned_root_id,
+        http_client_factory=_client_factory(_build_handler(_wide_site(100))),
+    )
+
+    assert recorder.finalized_status == "complete"
+    assert (recorder.discovered_delta, recorder.fetched_delta, recorder.failed_delta) == (100, 100, 0)
+    # One write per discovered link and per page would be 200
+    assert recorder.increment_calls <= 25
+    # Every PUT of the crawl shared one S3 client holder
+    assert len(recorder.s3_puts) == 100 and len(recorder.s3_holders) == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_does_not_poll(recorder: _Recorder, monkeypatch: pytest.MonkeyPatch):
+    sleeps: List[float] = []
+    patched_sleep = asyncio.sleep
+
+    async def counting_sleep(seconds: float = 0):
+        sleeps.append(seconds)
+        await patched_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", counting_sleep)
+    await run_crawl(
+        assistant_id="ast-1",
+        crawl_id="CRAWL-1",
+        user_id="user-1",
+        root_url="https://example.com/",
+        settings=CrawlSettings(
+            max_depth=1, max_pages=20, min_delay_seconds=0, max_delay_seconds=0
+        ),
+        root_document_id=recorder.preassigned_root_id,
+        http_client_factory=_client_factory(_build_handler(_wide_site(20))),
+    )
+
+    assert recorder.fetched_delta == 20
+    # With no politeness delay nothing should sleep: workers wake on the queue
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_progress_flushes_on_interval_and_on_close(monkeypatch: pytest.MonkeyPatch):
+    writes: List[dict] = []
+
+    async def fake_increment(**kwargs):
+        writes.append(kwargs)
+
+    monkeypatch.setattr(crawler, "increment_counters", fake_increment)
+    monkeypatch.setenv("WEB_CRAWL_PROGRESS_FLUSH_SECONDS", "0.02")
+    progress = crawler._CrawlProgress("ast-1", "CRAWL-1")
+    progress.start()
+
+    await progress.add(discovered=3)
+    for _ in range(50):
+        if writes:
+            break
+        await asyncio.sleep(0.01)
+    assert [w["discovered_delta"] for w in writes] == [3]
+
+    await progress.add(fetched=1, unchanged=2)
+    await progress.close()
+    assert writes[-1]["fetched_delta"] == 1 and writes[-1]["unchanged_delta"] == 2
+    assert len(writes) == 2
+
+
+@pytest.mark.asyncio
+async def test_crawl_s3_client_is_built_once(monkeypatch: pytest.MonkeyPatch):
+    import boto3
+
+    built: List[str] = []
+    monkeypatch.setattr(boto3, "client", lambda service: built.append(service) or object())
+    s3 = crawler._CrawlS3()
+
+    clients = await asyncio.gather(*(s3.client() for _ in range(5)))
+
+    assert built == ["s3"]
+    assert all(c is clients[0] for c in clients)
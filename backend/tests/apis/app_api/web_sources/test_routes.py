@@ -16,6 +16,7 @@ from fastapi.testclient import TestClient
 
 from apis.app_api.documents.models import Document
 from apis.app_api.web_sources import routes as web_routes
+from apis.app_api.web_sources.crawl_repository import CrawledPage
 from apis.app_api.web_sources.models import CrawlJob, CrawlSettings
 from apis.shared.auth.models import User
 from apis.shared.auth.dependencies import get_current_user_from_session
@@ -113,6 +114,52 @@ class TestStartCrawl:
         # exercising the real crawler.
         run_crawl_mock.assert_called_once()
 
+    def test_incremental_crawl_reuses_prior_root_document(self, app: FastAPI):
+        mock_auth_user(app, _user())
+        prior_root = _stub_document("DOC-prior0000001")
+        prior = {
+            "https://example.com/": CrawledPage(
+                "DOC-prior0000001", "complete", etag='"v1"', depth=0
+            )
+        }
+        create_document_mock = AsyncMock()
+        run_crawl_mock = AsyncMock(return_value=None)
+        with patch(
+            "apis.app_api.web_sources.routes.get_assistant",
+            new_callable=AsyncMock,
+            return_value={"assistantId": ASSISTANT_ID},
+        ), patch(
+            "apis.app_api.web_sources.routes.list_crawled_pages",
+            new_callable=AsyncMock,
+            return_value=prior,
+        ), patch(
+            "apis.app_api.web_sources.routes.get_document",
+            new_callable=AsyncMock,
+            return_value=prior_root,
+        ), patch(
+            "apis.app_api.web_sources.routes.create_document", create_document_mock,
+        ), patch(
+            "apis.app_api.web_sources.routes.create_crawl_job",
+            new_callable=AsyncMock,
+            return_value=_stub_crawl(),
+        ), patch(
+            "apis.app_api.web_sources.routes.run_crawl", run_crawl_mock,
+        ), patch(
+            "apis.app_api.web_sources.routes.assert_url_is_public",
+            return_value="https://example.com/",
+        ):
+            client = TestClient(app)
+            resp = client.post(
+                f"/assistants/{ASSISTANT_ID}/web-sources/crawl",
+                json={"url": "https://example.com/", "settings": {"incremental": True}},
+            )
+        assert resp.status_code == 202
+        assert resp.json()["documents"][0]["documentId"] == "DOC-prior0000001"
+        create_document_mock.assert_not_called()
+        kwargs = run_crawl_mock.call_args.kwargs
+        assert kwargs["root_document_id"] == "DOC-prior0000001"
+        assert kwargs["prior_pages"] is prior
+
     def test_returns_404_when_assistant_not_owned(self, app: FastAPI):
         mock_auth_user(app, _user())
         with patch(
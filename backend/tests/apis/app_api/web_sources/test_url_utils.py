@@ -15,6 +15,7 @@ from apis.app_api.web_sources.url_utils import (
     absolute_url,
     assert_url_is_public,
     host_of,
+    is_under_path,
     normalize_url,
     same_registrable_domain,
     url_extension_hint,
@@ -54,6 +55,24 @@ class TestNormalizeUrl:
             normalize_url("https:///path")
 
 
+class TestIsUnderPath:
+    def test_root_and_descendants(self):
+        assert is_under_path("https://x.com/docs", "https://x.com/docs")
+        assert is_under_path("https://x.com/docs/intro", "https://x.com/docs")
+        assert is_under_path("https://x.com/docs/a/b", "https://x.com/docs/")
+
+    def test_sibling_with_shared_prefix_is_outside(self):
+        assert not is_under_path("https://x.com/docs-old", "https://x.com/docs")
+        assert not is_under_path("https://x.com/docs-old/a", "https://x.com/docs/")
+
+    def test_other_host_or_scheme_is_outside(self):
+        assert not is_under_path("https://y.com/docs/a", "https://x.com/docs")
+        assert not is_under_path("http://x.com/docs/a", "https://x.com/docs")
+
+    def test_site_root_covers_everything_on_the_host(self):
+        assert is_under_path("https://x.com/anything", "https://x.com/")
+
+
 class TestSameRegistrableDomain:
     def test_identical_hosts(self):
         assert same_registrable_domain(
@@ -0,0 +1,226 @@
+"""Tests for ``apis.inference_api.chat.agent_cache.AgentCache``.
+
+Covers LRU ordering, the byte budget, per-session eviction, the idle
+sweeper, turn leases and MCP cleanup of evicted agents.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from apis.inference_api.chat.agent_cache import AgentCache, estimate_agent_bytes
+
+
+def _agent(messages=None, tools=()):
+    inner = SimpleNamespace(
+        messages=list(messages or []),
+        tool_names=list(tools),
+        cleanup=MagicMock(),
+    )
+    return SimpleNamespace(agent=inner)
+
+
+def _put(cache: AgentCache, key, agent) -> None:
+    """Insert and end the turn, as ``get_agent`` + ``release_agent`` would."""
+    cache.put(key, agent)
+    cache.release(agent)
+
+
+def _text_message(n_chars: int) -> dict:
+    return {"role": "user", "content": [{"text": "x" * n_chars}]}
+
+
+class TestLRU:
+
+    def test_hit_refreshes_recency(self):
+        cache = AgentCache(max_entries=2, max_bytes=0, idle_ttl_seconds=0)
+        a, b, c = _agent(), _agent(), _agent()
+        _put(cache, ("s1",), a)
+        _put(cache, ("s2",), b)
+        assert cache.get(("s1",)) is a
+        cache.release(a)
+        _put(cache, ("s3",), c)
+
+        assert ("s1",) in cache
+        assert ("s2",) not in cache
+        b.agent.cleanup.assert_called_once()
+
+    def test_stats_track_hits_misses_evictions(self):
+        cache = AgentCache(max_entries=1, max_bytes=0, idle_ttl_seconds=0)
+        cache.get(("s1",))
+        cache.put(("s1",), _agent())
+        cache.get(("s1",))
+        cache.put(("s2",), _agent())
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hitRate"] == 0.5
+        assert stats["evictions"] == {"lru": 1}
+        assert stats["entries"] == 1
+
+
+class TestByteBudget:
+
+    def test_estimate_counts_history_and_tools(self):
+        small = estimate_agent_bytes(_agent())
+        large = estimate_agent_bytes(_agent([_text_message(10_000)], tools=["a", "b"]))
+        assert large - small >= 10_000
+
+    def test_uncooperative_agent_gets_base_cost(self):
+        assert estimate_agent_bytes(object()) == estimate_agent_bytes(_agent())
+
+    def test_evicts_lru_until_under_budget(self):
+        base = estimate_agent_bytes(_agent())
+        cache = AgentCache(max_entries=10, max_bytes=base * 4, idle_ttl_seconds=0)
+        cache.put(("s1",), _agent())
+        cache.put(("s2",), _agent())
+        cache.put(("s3",), _agent([_text_message(base * 2)]))
+
+        assert ("s3",) in cache
+        assert ("s1",) not in cache and ("s2",) not in cache
+        assert cache.total_bytes <= base * 4
+        assert cache.stats()["evictions"] == {"bytes": 2}
+
+    def test_release_resizes_grown_history(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        agent = _agent()
+        _put(cache, ("s1",), agent)
+        before = cache.total_bytes
+
+        cache.get(("s1",))
+        assert cache.total_bytes == before  # a hit does not re-walk the history
+        agent.agent.messages.append(_text_message(5_000))
+        cache.release(agent)
+
+        assert cache.total_bytes >= before + 5_000
+
+    def test_growth_past_budget_evicts_on_release(self):
+        base = estimate_agent_bytes(_agent())
+        cache = AgentCache(max_entries=10, max_bytes=base * 3, idle_ttl_seconds=0)
+        old, grown = _agent(), _agent()
+        _put(cache, ("s1",), old)
+        cache.put(("s2",), grown)
+        grown.agent.messages.append(_text_message(base * 2))
+        cache.release(grown)
+
+        assert ("s1",) not in cache and ("s2",) in cache
+        old.agent.cleanup.assert_called_once()
+
+
+class TestSessionEviction:
+
+    def test_evict_session_keeps_other_sessions(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        cache.put(("s1", "model-a"), _agent())
+        cache.put(("s1", "model-b"), _agent())
+        cache.put(("s2", "model-a"), _agent())
+
+        assert cache.evict_session("s1", keep=("s1", "model-b")) == 1
+        assert cache.session_keys("s1") == {("s1", "model-b")}
+        assert ("s2", "model-a") in cache
+
+    def test_replacing_with_same_agent_does_not_release(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        agent = _agent()
+        cache.put(("s1",), agent)
+        cache.put(("s1",), agent)
+        agent.agent.cleanup.assert_not_called()
+        assert len(cache) == 1
+
+
+class TestLeases:
+
+    def test_evicting_leased_entry_defers_cleanup(self):
+        cache = AgentCache(max_entries=1, max_bytes=0, idle_ttl_seconds=0)
+        streaming = _agent()
+        cache.put(("s1",), streaming)
+        _put(cache, ("s2",), _agent())
+
+        assert ("s1",) not in cache
+        streaming.agent.cleanup.assert_not_called()
+        assert cache.stats()["leased"] == 1
+
+        cache.release(streaming)
+        streaming.agent.cleanup.assert_called_once()
+        assert cache.stats()["leased"] == 0
+
+    def test_cleanup_waits_for_last_lease(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        agent = _agent()
+        cache.put(("s1",), agent)
+        cache.get(("s1",))
+        cache.discard(("s1",))
+
+        cache.release(agent)
+        agent.agent.cleanup.assert_not_called()
+        cache.release(agent)
+        agent.agent.cleanup.assert_called_once()
+
+    def test_release_of_uncached_agent_is_ignored(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        agent = _agent()
+        cache.release(agent)
+        _put(cache, ("s1",), agent)
+        cache.release(agent)  # lease already returned
+        assert ("s1",) in cache
+        agent.agent.cleanup.assert_not_called()
+
+    def test_stale_lease_is_reclaimed(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0, lease_timeout_seconds=0.05)
+        abandoned = _agent()
+        cache.put(("s1",), abandoned)
+        cache.discard(("s1",))
+        time.sleep(0.1)
+
+        assert cache._reclaim_stale_leases() == 1
+        abandoned.agent.cleanup.assert_called_once()
+        assert cache.stats()["leased"] == 0
+
+
+class TestIdleSweeper:
+
+    @pytest.mark.asyncio
+    async def test_sweep_releases_idle_agents(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0.05)
+        idle, hot, streaming = _agent(), _agent(), _agent()
+        _put(cache, ("idle",), idle)
+        _put(cache, ("hot",), hot)
+        cache.put(("streaming",), streaming)
+        await asyncio.sleep(0.1)
+        cache.get(("hot",))
+        cache.release(hot)
+
+        assert cache.sweep() == 1
+        assert ("hot",) in cache
+        assert ("streaming",) in cache  # mid-turn, not idle
+        await cache.close()
+        idle.agent.cleanup.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_sweeper_and_releases_everything(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=60)
+        agent = _agent()
+        cache.put(("s1",), agent)
+        assert cache._sweeper is not None
+
+        await cache.close()
+
+        assert len(cache) == 0
+        assert cache._sweeper is None
+        agent.agent.cleanup.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_failure_is_swallowed(self):
+        cache = AgentCache(max_entries=10, max_bytes=0, idle_ttl_seconds=0)
+        agent = _agent()
+        agent.agent.cleanup.side_effect = RuntimeError("mcp already closed")
+        _put(cache, ("s1",), agent)
+        cache.discard(("s1",))
+        await cache.close()
+        agent.agent.cleanup.assert_called_once()
@@ -20,12 +20,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from apis.inference_api.chat import service
+from apis.inference_api.chat.agent_cache import AgentCache
 
 
 @pytest.fixture(autouse=True)
-def _clear_cache():
-    """Each test starts with an empty agent cache."""
-    service.clear_agent_cache()
+def _clear_cache(monkeypatch):
+    """Each test starts with an empty agent cache and no outstanding leases."""
+    monkeypatch.setattr(service, "_agent_cache", AgentCache())
     yield
     service.clear_agent_cache()
 
@@ -135,6 +136,23 @@ async def test_non_resume_evicts_paused_cached_agent(
 
     assert rebuilt is not paused, "non-resume must not be served the paused agent"
     assert mock_create_agent.call_count == 2
+    # The lease taken by the discarded hit is returned inside get_agent;
+    # only the first turn's (never released here) and the rebuild's remain.
+    assert service.get_agent_cache_stats()["leased"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_agent_returns_the_turn_lease(mock_create_agent, mock_freshness_hash):
+    """Every agent handed out by get_agent holds a lease until release_agent."""
+    agent = await service.get_agent(session_id="s1", user_id="u1")
+    again = await service.get_agent(session_id="s1", user_id="u1")
+    assert again is agent
+    assert service.get_agent_cache_stats()["leased"] == 1
+
+    service.release_agent(agent)
+    assert service.get_agent_cache_stats()["leased"] == 1
+    service.release_agent(again)
+    assert service.get_agent_cache_stats()["leased"] == 0
 
 
 @pytest.mark.asyncio
@@ -249,3 +267,18 @@ async def test_chat_path_unaffected_by_skills_hash(mock_create_agent, mock_fresh
     assert a is a_again
     assert mock_create_agent.call_count == 1
     assert "accessible_skill_ids" not in mock_create_agent.call_args.kwargs
+
+
+@pytest.mark.asyncio
+async def test_new_config_evicts_same_session_siblings(mock_create_agent, mock_freshness_hash):
+    """A session that switches model keeps only its latest agent cached, but
+    other sessions' agents are untouched.
+    """
+    evicted_before = service.get_agent_cache_stats()["evictions"].get("session", 0)
+    other = await service.get_agent(session_id="s2", user_id="u")
+    await service.get_agent(session_id="s1", user_id="u", model_id="model-a")
+    await service.get_agent(session_id="s1", user_id="u", model_id="model-b")
+
+    assert len(service._agent_cache.session_keys("s1")) == 1
+    assert await service.get_agent(session_id="s2", user_id="u") is other
+    assert service.get_agent_cache_stats()["evictions"]["session"] == evicted_before + 1
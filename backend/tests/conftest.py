@@ -1,5 +1,6 @@
 """Pytest configuration for test suite."""
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -118,3 +119,59 @@ def _clear_env_config_bleed():
         for k, v in saved.items():
             os.environ[k] = v
 
+
+
+# The sessions metadata module keeps a process-wide executor with cached
+# thread-local boto3 resources, the cost rollup write-behind buffer is a
+# process-wide singleton holding a storage handle, the managed model
+# registry holds a snapshot of the models table, the session history
+# reader caches decoded conversations and data-plane clients, the
+# spreadsheet tool keeps warm Code Interpreter sandboxes, and RAG search
+# caches complete-document sets, query embeddings and mapped lexical
+# index segments, and the assistants service caches shared-with lists. moto swaps
+# the backing service per test, so drop all of them between tests rather
+# than let state built under one test's mock leak into the next. Modules a
+# test never imported hold no state, so they are looked up rather than
+# imported (tests/apis shadows the `apis` package when its files run alone).
+@pytest.fixture(autouse=True)
+def _reset_process_wide_aws_state():
+    yield
+    table_access = sys.modules.get("apis.shared.sessions.table_access")
+    if table_access is not None:
+        table_access.reset_table_pool()
+    rollup_buffer = sys.modules.get("apis.shared.costs.rollup_buffer")
+    if rollup_buffer is not None and rollup_buffer._buffer is not None:
+        # Stop the flush task on the loop it runs on. Deltas a test left
+        # behind are dropped: its mocks are gone, so a flush would hit AWS.
+        rollup_buffer._buffer.discard_pending()
+        loop = rollup_buffer._buffer._loop
+        if loop is not None and not loop.is_closed():
+            loop.run_until_complete(rollup_buffer.close_rollup_buffer())
+        else:
+            asyncio.run(rollup_buffer.close_rollup_buffer())
+    registry = sys.modules.get("apis.shared.models.registry")
+    if registry is not None:
+        registry._registry = None
+    history_reader = sys.modules.get("apis.shared.sessions.history_reader")
+    if history_reader is not None:
+        history_reader._reader = None
+        history_reader._clients.clear()
+    interpreter_pool = sys.modules.get("agents.builtin_tools.spreadsheet_analysis.interpreter_pool")
+    if interpreter_pool is not None:
+        interpreter_pool._pool = None
+    document_status = sys.modules.get("apis.shared.assistants.document_status")
+    if document_status is not None:
+        document_status._cache = None
+    bedrock_embeddings = sys.modules.get("apis.shared.embeddings.bedrock_embeddings")
+    if bedrock_embeddings is not None:
+        bedrock_embeddings._query_cache.clear()
+    assistants_service = sys.modules.get("apis.shared.assistants.service")
+    if assistants_service is not None:
+        assistants_service._invalidate_shared_with()
+        assistants_service._dynamodb_client = None
+    lexical_index = sys.modules.get("apis.shared.embeddings.lexical_index")
+    if lexical_index is not None:
+        if lexical_index._index is not None:
+            lexical_index._index.close()
+        lexical_index._index = None
+        lexical_index._s3_client = None
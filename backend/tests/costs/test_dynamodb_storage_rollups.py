@@ -7,6 +7,9 @@ Covers:
     - get_system_summary / get_daily_trends / get_model_usage
 """
 
+import threading
+from unittest.mock import patch
+
 import pytest
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
@@ -143,6 +146,17 @@ class TestUpdateDailyRollup:
         assert summary["totalOutputTokens"] == 500
         assert summary["type"] == "daily"
 
+    @pytest.mark.asyncio
+    async def test_write_runs_off_the_event_loop(self, storage, sample_usage_delta):
+        threads = []
+        with patch.object(
+            storage.system_rollup_table, "update_item",
+            side_effect=lambda **_: threads.append(threading.current_thread()),
+        ):
+            await storage.update_daily_rollup(DATE, 0.05, sample_usage_delta)
+
+        assert threads and threads[0] is not threading.current_thread()
+
     @pytest.mark.asyncio
     async def test_atomic_increment(self, storage, sample_usage_delta):
         await storage.update_daily_rollup(DATE, 0.05, sample_usage_delta)
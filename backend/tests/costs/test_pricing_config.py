@@ -18,7 +18,7 @@ GEMINI_MODEL_ID = "gemini-2.0-flash"
 @pytest.fixture
 def mock_list_models(sample_managed_models):
     with patch(
-        "apis.shared.costs.pricing_config.list_managed_models",
+        "apis.shared.models.managed_models.list_all_managed_models",
         new_callable=AsyncMock,
     ) as mock:
         mock.return_value = sample_managed_models
@@ -42,9 +42,11 @@ async def test_get_model_by_model_id_not_found(mock_list_models):
 
 
 @pytest.mark.asyncio
-async def test_get_model_by_model_id_calls_list_with_no_roles(mock_list_models):
+async def test_get_model_by_model_id_loads_table_once(mock_list_models):
     await get_model_by_model_id(BEDROCK_MODEL_ID)
-    mock_list_models.assert_awaited_once_with(user_roles=None)
+    await get_model_by_model_id(OPENAI_MODEL_ID)
+    await create_pricing_snapshot(GEMINI_MODEL_ID)
+    mock_list_models.assert_awaited_once_with()
 
 
 # ── get_model_pricing ────────────────────────────────────────────────────────
@@ -0,0 +1,160 @@
+"""Tests for the write-behind system rollup buffer.
+
+Covers:
+    - coalescing of many messages into one ADD per rollup key
+    - active-user de-duplication across messages and flushes
+    - flush-on-close and interval-driven background flushes
+    - bounded write concurrency during a flush
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from apis.shared.costs.rollup_buffer import SystemRollupBuffer
+
+from .conftest import SYSTEM_ROLLUP_TABLE
+
+PERIOD = "2025-01"
+DATE = "2025-01-15"
+MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+SAFE_MODEL_ID = "us_anthropic_claude_sonnet_4_5_20250929_v1_0"
+
+
+def _record(buffer, user_id="user-alpha", cost=0.01, model_id=MODEL_ID):
+    buffer.record(
+        user_id=user_id,
+        period=PERIOD,
+        date=DATE,
+        cost=cost,
+        usage_delta={"inputTokens": 100, "outputTokens": 50, "cacheReadInputTokens": 10, "cacheWriteInputTokens": 0},
+        cache_savings=0.001,
+        model_id=model_id,
+        model_name="Claude Sonnet 4.5",
+        provider="bedrock",
+    )
+
+
+def _rollup(moto_dynamodb, pk, sk):
+    table = moto_dynamodb.Table(SYSTEM_ROLLUP_TABLE)
+    return table.get_item(Key={"PK": pk, "SK": sk}).get("Item")
+
+
+class TestCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_many_messages_flush_as_one_write_per_key(self, mock_storage):
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=mock_storage)
+        for _ in range(10):
+            _record(buffer)
+        await buffer.close()
+
+        mock_storage.update_daily_rollup.assert_awaited_once()
+        mock_storage.update_monthly_rollup.assert_awaited_once()
+        mock_storage.update_model_rollup.assert_awaited_once()
+        mock_storage.track_active_user.assert_awaited_once()
+        mock_storage.track_active_user_for_model.assert_awaited_once()
+
+        daily = mock_storage.update_daily_rollup.await_args.kwargs
+        assert daily["request_count"] == 10
+        assert daily["cost_delta"] == pytest.approx(0.1)
+        assert daily["usage_delta"]["inputTokens"] == 1000
+        assert daily["new_user_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_already_tracked_users_skip_conditional_put(self, mock_storage):
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=mock_storage)
+        _record(buffer)
+        await buffer.flush()
+        _record(buffer)
+        await buffer.flush()
+
+        assert mock_storage.track_active_user.await_count == 1
+        assert mock_storage.track_active_user_for_model.await_count == 1
+        assert mock_storage.update_daily_rollup.await_count == 2
+        assert mock_storage.update_daily_rollup.await_args.kwargs["new_user_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_model_rollup_skipped_without_model_info(self, mock_storage):
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=mock_storage)
+        _record(buffer, model_id=None)
+        await buffer.close()
+
+        mock_storage.update_model_rollup.assert_not_awaited()
+        mock_storage.update_daily_rollup.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_is_swallowed(self, mock_storage):
+        mock_storage.update_daily_rollup.side_effect = RuntimeError("boom")
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=mock_storage)
+        _record(buffer)
+        await buffer.close()
+        assert buffer.pending_keys == 0
+
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_run_concurrently_up_to_the_bound(self, mock_storage):
+        active = peak = 0
+
+        async def _write(**_kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        mock_storage.update_daily_rollup.side_effect = _write
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=mock_storage, flush_concurrency=3)
+        for day in range(10):
+            buffer.record(
+                user_id="user-alpha", period=PERIOD, date=f"2025-01-{day + 1:02d}", cost=0.01,
+                usage_delta={}, cache_savings=0.0, model_id=None, model_name=None, provider=None,
+            )
+        await buffer.close()
+
+        assert mock_storage.update_daily_rollup.await_count == 10
+        assert peak == 3
+
+
+class TestBackgroundFlush:
+
+    @pytest.mark.asyncio
+    async def test_interval_flush(self, mock_storage):
+        buffer = SystemRollupBuffer(flush_interval_seconds=0.05, storage=mock_storage)
+        _record(buffer)
+        await asyncio.sleep(0.2)
+        mock_storage.update_daily_rollup.assert_awaited_once()
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_size_triggered_flush(self, mock_storage):
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, max_pending_keys=3, storage=mock_storage)
+        _record(buffer)
+        await asyncio.sleep(0.05)
+        mock_storage.update_daily_rollup.assert_awaited_once()
+        await buffer.close()
+
+
+class TestAgainstDynamoDB:
+
+    @pytest.mark.asyncio
+    async def test_coalesced_totals_match_per_message_writes(self, storage, moto_dynamodb):
+        buffer = SystemRollupBuffer(flush_interval_seconds=60, storage=storage)
+        for user in ("user-alpha", "user-beta", "user-alpha"):
+            _record(buffer, user_id=user)
+        await buffer.close()
+
+        daily = _rollup(moto_dynamodb, "ROLLUP#DAILY", DATE)
+        assert daily["totalRequests"] == 3
+        assert daily["activeUsers"] == 2
+        assert daily["totalInputTokens"] == 300
+        assert daily["totalCost"] == Decimal("0.03")
+
+        monthly = _rollup(moto_dynamodb, "ROLLUP#MONTHLY", PERIOD)
+        assert monthly["totalRequests"] == 3
+        assert monthly["activeUsers"] == 2
+
+        model = _rollup(moto_dynamodb, "ROLLUP#MODEL", f"{PERIOD}#{SAFE_MODEL_ID}")
+        assert model["totalRequests"] == 3
+        assert model["uniqueUsers"] == 2
@@ -3,9 +3,15 @@
 import csv
 import io
 
+import pytest
 import tiktoken
 
-from apis.app_api.documents.ingestion.processors.csv_chunker import chunk_csv
+from apis.app_api.documents.ingestion.processors.csv_chunker import (
+    _rows_to_csv_text,
+    _truncate_to_tokens,
+    chunk_csv,
+    iter_csv_chunks,
+)
 
 
 def _count_tokens(text: str) -> int:
@@ -157,3 +163,85 @@ class TestChunkCSVTokenBudget:
         assert len(chunks) > 1
         for chunk in chunks:
             assert _count_tokens(chunk) <= 900
+
+
+def _reference_chunk_csv(file_bytes: bytes, max_tokens: int) -> list[str]:
+    """The original quadratic chunker: re-tokenizes every candidate chunk."""
+    reader = csv.reader(io.StringIO(file_bytes.decode("utf-8", errors="replace")))
+    try:
+        header_row = next(reader)
+    except StopIteration:
+        return []
+    header_text = _rows_to_csv_text(header_row, [])
+    if _count_tokens(header_text) >= max_tokens:
+        return [_truncate_to_tokens(header_text, max_tokens)]
+
+    chunks, current_rows = [], []
+    for row in reader:
+        if _count_tokens(_rows_to_csv_text(header_row, current_rows + [row])) <= max_tokens:
+            current_rows.append(row)
+            continue
+        if current_rows:
+            chunks.append(_rows_to_csv_text(header_row, current_rows))
+            current_rows = []
+        single_text = _rows_to_csv_text(header_row, [row])
+        if _count_tokens(single_text) <= max_tokens:
+            current_rows = [row]
+        else:
+            chunks.append(_truncate_to_tokens(single_text, max_tokens))
+    if current_rows:
+        chunks.append(_rows_to_csv_text(header_row, current_rows))
+    return chunks
+
+
+_CORPUS = {
+    "plain": _make_csv_bytes(
+        ["id", "name", "description"],
+        [[str(i), f"item_{i}", f"Description text for item {i} with more words"] for i in range(300)],
+    ),
+    "punctuation_at_row_ends": _make_csv_bytes(
+        ["q", "answer"],
+        [[f"Question {i}?", f"Yes. Really!{'.' * (i % 4)}"] for i in range(200)] + [["trailing", ""]] * 20,
+    ),
+    "quoted_and_multiline": _make_csv_bytes(
+        ["name", "bio"],
+        [[f"Person {i}", f'Said "hi", then\nleft, {i}'] for i in range(150)],
+    ),
+    "leading_and_trailing_whitespace": _make_csv_bytes(
+        ["  padded header", "x  "],
+        [[f"  {i}", f"value {i}   "] for i in range(150)],
+    ),
+    "blank_and_whitespace_rows": (
+        b"a,b\n" + b"".join(b"%d,x\n\n \n\t,\n" % i for i in range(120)) + b"\n\n"
+    ),
+    "unicode": _make_csv_bytes(
+        ["city", "note"],
+        [[f"Z\u00fcrich {i}", "\u65e5\u672c\u8a9e\u306e\u30c6\u30ad\u30b9\u30c8 \U0001f600"] for i in range(150)],
+    ),
+    "numbers": _make_csv_bytes(
+        ["a", "b", "c"],
+        [[str(i * 7919), f"{i / 3:.4f}", "-1234567890"] for i in range(300)],
+    ),
+    "wide_rows": _make_csv_bytes(["id", "data"], [[str(i), "word " * (i * 40)] for i in range(12)]),
+    "blank_header": b" \n1,2\n3,4\n\n5,6\n",
+}
+
+
+class TestChunkCSVMatchesReference:
+    """The streaming chunker must emit exactly what the old quadratic loop did."""
+
+    @pytest.mark.parametrize("name", sorted(_CORPUS))
+    @pytest.mark.parametrize("max_tokens", [10, 37, 100, 900])
+    def test_byte_identical_to_reference(self, name, max_tokens):
+        data = _CORPUS[name]
+        assert chunk_csv(data, max_tokens=max_tokens) == _reference_chunk_csv(data, max_tokens)
+
+    def test_iter_csv_chunks_is_lazy(self):
+        header = ["id", "text"]
+        rows = [[str(i), f"Row {i} content"] for i in range(500)]
+        chunks = iter_csv_chunks(_make_csv_bytes(header, rows), max_tokens=50)
+
+        first = next(chunks)
+
+        assert first.startswith("id,text")
+        assert list(chunks) == chunk_csv(_make_csv_bytes(header, rows), max_tokens=50)[1:]
@@ -0,0 +1,36 @@
+"""Tests for the ingestion pipeline's document status writes."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apis.app_api.documents.ingestion.status import update_document_status
+
+
+async def _update_expression(**kwargs) -> str:
+    table = MagicMock()
+    with patch("boto3.resource") as resource:
+        resource.return_value.Table.return_value = table
+        assert await update_document_status(assistant_id="a", document_id="d", table_name="t", **kwargs)
+    return table.update_item.call_args.kwargs["UpdateExpression"]
+
+
+@pytest.mark.asyncio
+async def test_complete_without_segment_removes_stale_lexical_key():
+    expression = await _update_expression(status="complete", vector_store_id="vs")
+    _, removed = expression.split("REMOVE ")
+    assert "lexicalIndexKey" in removed.split(", ")
+
+
+@pytest.mark.asyncio
+async def test_complete_with_segment_sets_lexical_key():
+    expression = await _update_expression(status="complete", vector_store_id="vs", lexical_index_key="idx/k")
+    set_clause, removed = expression.split("REMOVE ")
+    assert "lexicalIndexKey = :lexical_index_key" in set_clause
+    assert "lexicalIndexKey" not in removed.split(", ")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", ["chunking", "embedding"])
+async def test_progress_updates_leave_lexical_key_alone(status):
+    assert "lexicalIndexKey" not in await _update_expression(status=status)
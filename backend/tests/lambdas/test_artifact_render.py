@@ -9,10 +9,12 @@ Two layers:
 from __future__ import annotations
 
 import base64
+import gzip
 import hashlib
 import hmac
 import json
 import time
+from collections import OrderedDict
 from typing import Any
 
 import boto3
@@ -68,6 +70,8 @@ def _reset_module_state(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(handler, "_secrets_client", None)
     monkeypatch.setattr(handler, "_s3_client", None)
     monkeypatch.setattr(handler, "_ddb_table", None)
+    monkeypatch.setattr(handler, "_version_cache", OrderedDict())
+    monkeypatch.setattr(handler, "_version_cache_bytes", 0)
 
 
 # --------------------------------------------------------------------------
@@ -267,7 +271,11 @@ def _put_record(ddb, **overrides: Any) -> None:
 
 
 def _event(
-    token: str | None, method: str = "GET", *, download: bool = False
+    token: str | None,
+    method: str = "GET",
+    *,
+    download: bool = False,
+    headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     qsp: dict[str, str] = {}
     raw_parts: list[str] = []
@@ -281,6 +289,7 @@ def _event(
         "requestContext": {"http": {"method": method}},
         "queryStringParameters": qsp,
         "rawQueryString": "&".join(raw_parts),
+        "headers": headers or {},
     }
 
 
@@ -289,7 +298,10 @@ def test_happy_path_returns_content(aws_env) -> None:
     resp = handler.handler(_event(_mint(_valid_claims())), None)
     assert resp["statusCode"] == 200
     assert resp["body"] == DOC
-    assert resp["headers"]["cache-control"] == "no-store"
+    cache_control = resp["headers"]["cache-control"]
+    assert cache_control.startswith("private, max-age=")
+    assert cache_control.endswith(", immutable")
+    assert resp["headers"]["etag"].startswith('"')
     assert "frame-ancestors https://app.example.com" in (
         resp["headers"]["content-security-policy"]
     )
@@ -422,6 +434,136 @@ def test_oversized_content_is_500(aws_env, monkeypatch: pytest.MonkeyPatch) -> N
     assert resp["statusCode"] == 500
 
 
+BLOB_KEY = "blobs/ab/abcdef.gz"
+
+
+def test_compressed_blob_record_is_inflated(aws_env) -> None:
+    boto3.client("s3", region_name="us-east-1").put_object(
+        Bucket=BUCKET, Key=BLOB_KEY, Body=gzip.compress(DOC.encode()),
+        ContentEncoding="gzip",
+    )
+    _put_record(
+        aws_env["ddb"], storage="s3-blob", content_key=BLOB_KEY,
+        content_encoding="gzip",
+    )
+    resp = handler.handler(_event(_mint(_valid_claims())), None)
+    assert resp["statusCode"] == 200
+    assert resp["body"] == DOC
+
+
+def test_compressed_blob_past_cap_is_500(aws_env, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The cap applies to the inflated size, not just the stored bytes."""
+    monkeypatch.setattr(handler, "_MAX_CONTENT_BYTES", 256)
+    boto3.client("s3", region_name="us-east-1").put_object(
+        Bucket=BUCKET, Key=BLOB_KEY, Body=gzip.compress(b"x" * 4096)
+    )
+    _put_record(
+        aws_env["ddb"], storage="s3-blob", content_key=BLOB_KEY,
+        content_encoding="gzip",
+    )
+    resp = handler.handler(_event(_mint(_valid_claims())), None)
+    assert resp["statusCode"] == 500
+
+
+def test_unknown_content_encoding_is_500(aws_env) -> None:
+    _put_record(aws_env["ddb"], content_encoding="br")
+    resp = handler.handler(_event(_mint(_valid_claims())), None)
+    assert resp["statusCode"] == 500
+
+
+# --------------------------------------------------------------------------
+# Warm path: per-container version cache, ETag / 304.
+# --------------------------------------------------------------------------
+
+
+def _drop_backing_data(ddb) -> None:
+    ddb.Table(TABLE).delete_item(
+        Key={"PK": "USER#user-123", "SK": "ARTIFACT#artifact-abc#V#00001"}
+    )
+    boto3.client("s3", region_name="us-east-1").delete_object(
+        Bucket=BUCKET, Key=CONTENT_KEY
+    )
+
+
+def test_warm_reload_reads_neither_dynamodb_nor_s3(aws_env) -> None:
+    _put_record(aws_env["ddb"], title="Page")
+    first = handler.handler(_event(_mint(_valid_claims())), None)
+    _drop_backing_data(aws_env["ddb"])
+
+    # A freshly minted token for the same pinned version.
+    again = handler.handler(_event(_mint(_valid_claims())), None)
+    assert again["statusCode"] == 200
+    assert again["body"] == DOC
+    assert again["headers"]["etag"] == first["headers"]["etag"]
+    download = handler.handler(_event(_mint(_valid_claims()), download=True), None)
+    assert 'filename="Page.html"' in download["headers"]["content-disposition"]
+
+
+def test_cache_is_keyed_by_pinned_version(aws_env) -> None:
+    _put_record(aws_env["ddb"])
+    handler.handler(_event(_mint(_valid_claims())), None)
+    resp = handler.handler(_event(_mint(_valid_claims(ver=2))), None)
+    assert resp["statusCode"] == 404
+
+
+def test_matching_if_none_match_is_304_without_reads(aws_env) -> None:
+    _put_record(aws_env["ddb"])
+    etag = handler.handler(_event(_mint(_valid_claims())), None)["headers"]["etag"]
+    _drop_backing_data(aws_env["ddb"])
+    handler._version_cache.clear()
+
+    resp = handler.handler(
+        _event(_mint(_valid_claims()), headers={"if-none-match": f'"other", W/{etag}'}),
+        None,
+    )
+    assert resp["statusCode"] == 304
+    assert resp["body"] == ""
+    assert resp["headers"]["etag"] == etag
+    assert "content-type" not in resp["headers"]
+
+
+def test_if_none_match_still_requires_valid_token(aws_env) -> None:
+    _put_record(aws_env["ddb"])
+    etag = handler.handler(_event(_mint(_valid_claims())), None)["headers"]["etag"]
+    resp = handler.handler(
+        _event("a.b.c", headers={"if-none-match": etag}), None
+    )
+    assert resp["statusCode"] == 403
+
+
+def test_stale_if_none_match_gets_full_response(aws_env) -> None:
+    _put_record(aws_env["ddb"])
+    resp = handler.handler(
+        _event(_mint(_valid_claims()), headers={"if-none-match": '"stale"'}), None
+    )
+    assert resp["statusCode"] == 200
+    assert resp["body"] == DOC
+
+
+def test_render_cache_max_age_never_outlives_token(aws_env) -> None:
+    _put_record(aws_env["ddb"])
+    now = int(time.time())
+    resp = handler.handler(
+        _event(_mint(_valid_claims(iat=now, exp=now + 90))), None
+    )
+    max_age = int(resp["headers"]["cache-control"].split("max-age=")[1].split(",")[0])
+    assert 0 < max_age <= 90
+
+
+def test_cache_evicts_to_byte_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(handler, "_RENDER_CACHE_MAX_BYTES", 400)
+    entry = handler._CachedVersion("text/html", "", "x", 90)
+    for version in range(1, 6):
+        handler._cache_version(("u", "a", version), entry)
+    handler._cached_version(("u", "a", 2))  # refresh: now most recent
+    handler._cache_version(("u", "a", 6), entry)
+
+    assert list(handler._version_cache) == [("u", "a", 4), ("u", "a", 5), ("u", "a", 2), ("u", "a", 6)]
+    assert handler._version_cache_bytes == 360
+    handler._cache_version(("u", "a", 7), handler._CachedVersion("text/html", "", "x", 101))
+    assert ("u", "a", 7) not in handler._version_cache
+
+
 # --------------------------------------------------------------------------
 # Download mode (`?download=1`): attachment disposition, no CSP, gated by
 # the same token as render.
@@ -74,24 +74,25 @@ def test_search_results_only_contain_complete_documents(
     # Build a mock DynamoDB table that returns the appropriate status per doc
     status_map = {doc_id: status for doc_id, status in doc_status_pairs}
 
-    def mock_get_item(**kwargs):
-        key = kwargs["Key"]
-        doc_id = key["SK"].replace("DOC#", "")
-        status = status_map.get(doc_id)
-        if status is None:
-            # Missing document — no Item in response
-            return {}
-        return {"Item": {"status": status}}
-
-    mock_table = MagicMock()
-    mock_table.get_item = MagicMock(side_effect=mock_get_item)
+    def mock_batch_get_item(**kwargs):
+        (table_name, request), = kwargs["RequestItems"].items()
+        items = []
+        for key in request["Keys"]:
+            doc_id = key["SK"].replace("DOC#", "")
+            status = status_map.get(doc_id)
+            # Missing document — left out of Responses
+            if status is not None:
+                items.append({"SK": key["SK"], "status": status})
+        return {"Responses": {table_name: items}}
 
     mock_dynamodb = MagicMock()
-    mock_dynamodb.Table.return_value = mock_table
+    mock_dynamodb.meta.client.batch_get_item = MagicMock(side_effect=mock_batch_get_item)
 
     with (
         patch.dict("os.environ", {"DYNAMODB_ASSISTANTS_TABLE_NAME": "test-table"}),
         patch("boto3.resource", return_value=mock_dynamodb),
+        # Fresh status cache per example; assistant IDs can repeat across examples
+        patch("apis.shared.assistants.document_status._cache", None),
     ):
         from apis.shared.assistants.rag_service import (
             _filter_vectors_by_document_status,
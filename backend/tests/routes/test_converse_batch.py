@@ -0,0 +1,247 @@
+"""Tests for the /chat/api-converse/batch endpoint.
+
+Bedrock, key validation, RBAC and cost storage are stubbed; the tests cover
+per-item results and errors, streaming formats, the concurrency limits,
+per-item rate limiting, the quota cap and the single aggregate cost record.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apis.inference_api.chat import converse_routes
+from apis.inference_api.chat.converse_routes import router
+from apis.inference_api.chat.models import ConverseBatchRequest
+from apis.shared.auth.api_keys.models import ValidatedApiKey
+
+_KEY = ValidatedApiKey(key_id="test-key", user_id="test-user", name="Test Key")
+
+
+def _reply(text, input_tokens=10, output_tokens=5):
+    return {
+        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+        "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens},
+        "stopReason": "end_turn",
+    }
+
+
+def _echo_converse(**params):
+    prompt = params["messages"][0]["content"][0]["text"]
+    if prompt == "bad":
+        raise ClientError({"Error": {"Code": "ValidationException", "Message": "no"}}, "Converse")
+    return _reply(prompt.upper())
+
+
+@pytest.fixture
+def bedrock():
+    client = MagicMock()
+    client.converse.side_effect = _echo_converse
+    return client
+
+
+@pytest.fixture
+def record_cost():
+    return AsyncMock()
+
+
+@pytest.fixture
+def limiter():
+    limiter = MagicMock()
+    limiter.check_rate_limit = AsyncMock(return_value=True)
+    return limiter
+
+
+@pytest.fixture
+def client(bedrock, record_cost, limiter):
+    app = FastAPI()
+    app.include_router(router)
+    roles = MagicMock()
+    roles.can_access_model = AsyncMock(return_value=True)
+    with patch.object(converse_routes, "_validate_api_key", AsyncMock(return_value=_KEY)), \
+            patch.object(converse_routes, "get_app_role_service", return_value=roles), \
+            patch("apis.shared.rate_limit.get_rate_limiter", return_value=limiter), \
+            patch("apis.shared.quota.is_quota_enforcement_enabled", return_value=False), \
+            patch.object(converse_routes, "_get_bedrock_client", return_value=bedrock), \
+            patch.object(converse_routes, "_record_cost", record_cost):
+        yield TestClient(app)
+
+
+def _post(client, **body):
+    body.setdefault("model_id", "test-model")
+    return client.post("/chat/api-converse/batch", json=body, headers={"X-API-Key": "k"})
+
+
+def _items(*prompts):
+    return [{"id": f"p{i}", "messages": [{"role": "user", "content": p}]} for i, p in enumerate(prompts)]
+
+
+def test_streams_one_ndjson_line_per_item_then_done(client, record_cost):
+    resp = _post(client, items=_items("a", "bad", "c"))
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    by_id = {line["id"]: line for line in lines[:-1]}
+    assert by_id["p0"]["type"] == "result" and by_id["p0"]["content"] == "A"
+    assert by_id["p2"]["content"] == "C" and by_id["p2"]["index"] == 2
+    assert by_id["p1"] == {
+        "type": "error", "index": 1, "id": "p1", "status": 400,
+        "error": "Invalid request — check model ID, message format, and content policy.",
+    }
+    assert lines[-1] == {
+        "type": "done", "succeeded": 2, "failed": 1,
+        "usage": {"inputTokens": 20, "outputTokens": 10},
+    }
+    record_cost.assert_awaited_once_with(
+        user_id="test-user", model_id="test-model",
+        usage={"inputTokens": 20, "outputTokens": 10}, key_id="test-key",
+    )
+
+
+def test_sse_format(client):
+    resp = _post(client, items=_items("a"), format="sse")
+
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text.startswith("event: result\ndata: ")
+    assert resp.text.endswith('event: done\ndata: {"succeeded": 1, "failed": 0, '
+                              '"usage": {"inputTokens": 10, "outputTokens": 5}}\n\n')
+
+
+def test_item_settings_override_batch_defaults():
+    batch = ConverseBatchRequest(
+        model_id="m", system_prompt="be brief", temperature=0.2,
+        items=[{"messages": [{"role": "user", "content": "x"}], "temperature": 0.9, "max_tokens": 50}],
+    )
+
+    request = batch.item_request(batch.items[0])
+
+    assert (request.system_prompt, request.temperature, request.max_tokens) == ("be brief", 0.9, 50)
+
+
+@pytest.mark.parametrize("items", [[], _items("a", "b", "c")])
+def test_rejects_empty_or_oversized_batches(client, monkeypatch, bedrock, items):
+    monkeypatch.setenv("CONVERSE_BATCH_MAX_ITEMS", "2")
+
+    assert _post(client, items=items).status_code == 400
+    bedrock.converse.assert_not_called()
+
+
+def test_rejects_item_without_messages(client):
+    assert _post(client, items=[{"messages": []}]).status_code == 400
+
+
+def test_batch_concurrency_is_bounded(client, bedrock, monkeypatch):
+    monkeypatch.setenv("CONVERSE_BATCH_CONCURRENCY", "3")
+    lock = threading.Lock()
+    running = peak = 0
+
+    def _slow(**params):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.03)
+        with lock:
+            running -= 1
+        return _reply("ok")
+
+    bedrock.converse.side_effect = _slow
+    resp = _post(client, items=_items(*"abcdefghij"))
+
+    assert json.loads(resp.text.splitlines()[-1])["succeeded"] == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_key_slots_are_shared_across_batches():
+    active = peak = 0
+
+    async def _item():
+        nonlocal active, peak
+        async with converse_routes._key_slot("key-a", 2):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(_item() for _ in range(6)))
+
+    assert peak == 2
+    assert "key-a" not in converse_routes._batch_key_slots
+
+
+def test_each_item_is_charged_to_the_rate_limit(client, limiter, bedrock, monkeypatch):
+    monkeypatch.setenv("CONVERSE_BATCH_CONCURRENCY", "1")
+    # The batch request (which carries the first item) and one more item fit
+    limiter.check_rate_limit.side_effect = [True, True, False]
+
+    lines = [json.loads(line) for line in _post(client, items=_items("a", "b", "c", "d")).text.splitlines()]
+
+    assert [line["type"] for line in lines] == ["result", "result", "error", "error", "done"]
+    assert {line["status"] for line in lines if line["type"] == "error"} == {429}
+    # Once refused, the rest of the batch is not run or charged again
+    assert limiter.check_rate_limit.await_count == 3
+    assert bedrock.converse.call_count == 2
+
+
+def test_batch_stops_once_remaining_quota_is_spent(client, bedrock, monkeypatch):
+    monkeypatch.setenv("CONVERSE_BATCH_CONCURRENCY", "1")
+    quota = MagicMock()
+    quota.check_quota = AsyncMock(return_value=MagicMock(
+        allowed=True, remaining=0.0001, tier=MagicMock(action_on_limit="block"),
+    ))
+    pricing = {"inputPricePerMtok": 3.0, "outputPricePerMtok": 15.0}
+
+    with patch("apis.shared.quota.is_quota_enforcement_enabled", return_value=True), \
+            patch("apis.shared.quota.get_quota_checker", return_value=quota), \
+            patch.object(converse_routes, "create_pricing_snapshot", AsyncMock(return_value=pricing)):
+        lines = [json.loads(line) for line in _post(client, items=_items("a", "b", "c")).text.splitlines()]
+
+    # 10 input + 5 output tokens cost $0.000105, past the $0.0001 left
+    assert [line["type"] for line in lines] == ["result", "error", "error", "done"]
+    assert lines[1]["status"] == 429
+    assert bedrock.converse.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_in_flight_at_disconnect_are_still_billed(bedrock, record_cost, limiter):
+    release = threading.Event()
+
+    def _converse(**params):
+        if params["messages"][0]["content"][0]["text"] == "slow":
+            release.wait(5)
+        return _reply("ok")
+
+    bedrock.converse.side_effect = _converse
+    batch = ConverseBatchRequest(model_id="test-model", items=_items("fast", "slow"))
+    usage, in_flight = {}, set()
+
+    with patch.object(converse_routes, "_get_bedrock_client", return_value=bedrock), \
+            patch.object(converse_routes, "_record_cost", record_cost), \
+            patch("apis.shared.rate_limit.get_rate_limiter", return_value=limiter):
+        stream = converse_routes._stream_batch(batch, _KEY, usage, in_flight)
+        assert json.loads(await stream.__anext__())["id"] == "p0"
+        # The client goes away while the slow item is still running
+        await stream.aclose()
+        assert len(in_flight) == 1
+
+        recording = asyncio.create_task(
+            converse_routes._record_batch_cost("test-user", "test-model", usage, "test-key", in_flight)
+        )
+        await asyncio.sleep(0.05)
+        assert not recording.done()
+        release.set()
+        await recording
+
+    record_cost.assert_awaited_once_with(
+        user_id="test-user", model_id="test-model",
+        usage={"inputTokens": 20, "outputTokens": 10}, key_id="test-key",
+    )
+
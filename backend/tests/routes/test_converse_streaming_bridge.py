@@ -0,0 +1,146 @@
+"""The api-converse Bedrock bridge keeps blocking boto3 work off the event loop.
+
+A stubbed Bedrock stream sleeps between events the way a slow model does;
+other coroutines must keep running while it is read, concurrent streams
+must overlap, and a consumer that stops early must release the reader.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apis.inference_api.chat import converse_routes
+from apis.inference_api.chat.converse_routes import _iterate_in_thread, _stream_converse
+from apis.inference_api.chat.models import ConverseRequest
+
+_GAP_SECONDS = 0.1
+
+
+class _SlowStream:
+    """Blocking event stream that sleeps before each event."""
+
+    def __init__(self, events, gap=_GAP_SECONDS, error=None):
+        self._events = list(events)
+        self._gap = gap
+        self._error = error
+        self.closed = threading.Event()
+        self.read = 0
+
+    def __iter__(self):
+        for event in self._events:
+            if self.closed.wait(self._gap):
+                return
+            self.read += 1
+            yield event
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        self.closed.set()
+
+
+def _events(text_chunks):
+    events = [{"messageStart": {"role": "assistant"}}]
+    events += [
+        {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": t}}} for t in text_chunks
+    ]
+    events += [
+        {"messageStop": {"stopReason": "end_turn"}},
+        {"metadata": {"usage": {"inputTokens": 3, "outputTokens": len(text_chunks)}, "metrics": {}}},
+    ]
+    return events
+
+
+def _request() -> ConverseRequest:
+    return ConverseRequest(
+        model_id="us.anthropic.claude-haiku-4-5-20251001-v1:0",
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_does_not_block_the_loop():
+    fake_client = MagicMock()
+    fake_client.converse_stream.return_value = {"stream": _SlowStream(_events(["a", "b", "c"]))}
+    ticks = 0
+    done = asyncio.Event()
+
+    async def _ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(_ticker())
+    usage = {}
+    with patch.object(converse_routes, "_get_bedrock_client", return_value=fake_client):
+        frames = [f async for f in _stream_converse(_request(), usage_out=usage)]
+    done.set()
+    await ticker
+
+    assert frames[-1] == "event: done\ndata: {}\n\n"
+    assert usage == {"inputTokens": 3, "outputTokens": 3}
+    # Six events with a 100ms gap each: a blocked loop would barely tick
+    assert ticks >= 30
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_overlap():
+    async def _consume():
+        return [event async for event in _iterate_in_thread(_SlowStream(range(5)))]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_consume() for _ in range(4)))
+    elapsed = time.perf_counter() - started
+
+    assert results == [list(range(5))] * 4
+    # Serial reads would take 4 x 5 x 100ms
+    assert elapsed < 1.2
+
+
+@pytest.mark.asyncio
+async def test_early_close_stops_the_reader():
+    stream = _SlowStream(range(1000), gap=0.005)
+    events = _iterate_in_thread(stream)
+
+    assert await events.__anext__() == 0
+    await events.aclose()
+
+    assert stream.closed.is_set()
+    await asyncio.sleep(0.05)
+    read = stream.read
+    await asyncio.sleep(0.05)
+    assert stream.read == read < 1000
+
+
+@pytest.mark.asyncio
+async def test_reader_error_propagates_after_earlier_events():
+    stream = _SlowStream([1, 2], gap=0, error=RuntimeError("stream reset"))
+    seen = []
+
+    with pytest.raises(RuntimeError, match="stream reset"):
+        async for event in _iterate_in_thread(stream):
+            seen.append(event)
+
+    assert seen == [1, 2]
+
+
+def test_bedrock_client_is_shared(monkeypatch):
+    monkeypatch.setattr(converse_routes, "_bedrock_client", None)
+    created = []
+
+    def _client(*args, **kwargs):
+        created.append(kwargs["config"].max_pool_connections)
+        return MagicMock()
+
+    monkeypatch.setenv("CONVERSE_MAX_CONCURRENCY", "12")
+    with patch.object(converse_routes.boto3, "client", side_effect=_client):
+        first = converse_routes._get_bedrock_client()
+        assert converse_routes._get_bedrock_client() is first
+
+    assert created == [12]
+    monkeypatch.setattr(converse_routes, "_bedrock_client", None)
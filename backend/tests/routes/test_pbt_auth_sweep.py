@@ -32,7 +32,8 @@ from tests.routes.conftest import mock_no_auth
 
 # Known public routes that do NOT require the standard get_current_user
 # auth dependency.  These are excluded from the auth-enforcement sweep.
-# /chat/api-converse uses X-API-Key header auth instead of JWT.
+# /chat/api-converse (and its /batch variant) uses X-API-Key header auth
+# instead of JWT.
 PUBLIC_ROUTE_PATTERNS: set[str] = {
     "/health",
     "/auth/providers",
@@ -43,6 +44,7 @@ PUBLIC_ROUTE_PATTERNS: set[str] = {
     "/auth/callback",  # BFF Token Handler OAuth callback (Phase 3) — Cognito redirects here with the auth code; no Bearer involved.
     "/oauth/callback",
     "/chat/api-converse",
+    "/chat/api-converse/batch",
     "/system/status",
     "/system/first-boot",
     "/openapi.json",
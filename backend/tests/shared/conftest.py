@@ -233,10 +233,13 @@ def sessions_metadata_table(aws, monkeypatch):
             {"AttributeName": "GSI1SK", "AttributeType": "S"},
             {"AttributeName": "GSI_PK", "AttributeType": "S"},
             {"AttributeName": "GSI_SK", "AttributeType": "S"},
+            {"AttributeName": "GSI3PK", "AttributeType": "S"},
+            {"AttributeName": "GSI3SK", "AttributeType": "S"},
         ],
         gsis=[
             _gsi("UserTimestampIndex", "GSI1PK", "GSI1SK"),
             _gsi("SessionLookupIndex", "GSI_PK", "GSI_SK"),
+            _gsi("SessionRecencyIndex", "GSI3PK", "GSI3SK"),
         ],
     )
 
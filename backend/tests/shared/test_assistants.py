@@ -375,6 +375,118 @@ class TestSharePermissions:
         assert getattr(shared[0], "user_permission", None) == "editor"
 
 
+class TestSharedWithListing:
+    @pytest.fixture(autouse=True)
+    def _set_env(self, monkeypatch):
+        monkeypatch.setenv("S3_ASSISTANTS_VECTOR_STORE_INDEX_NAME", "test-index")
+
+    async def _share_many(self, count, email="bob@example.com"):
+        from apis.shared.assistants.service import create_assistant, share_assistant
+        ids = []
+        for i in range(count):
+            created = await create_assistant(
+                owner_id="u1", owner_name="Alice", name=f"Bot {i}",
+                description="d", instructions="hi",
+            )
+            await share_assistant(created.assistant_id, "u1", [email], permission="editor" if i % 2 else "viewer")
+            ids.append(created.assistant_id)
+        return ids
+
+    @pytest.mark.asyncio
+    async def test_lists_more_than_one_batch(self, assistants_table):
+        from apis.shared.assistants.service import list_shared_with_user
+        ids = await self._share_many(130)
+
+        shared = await list_shared_with_user("Bob@Example.com")
+
+        assert sorted(a.assistant_id for a in shared) == sorted(ids)
+        by_id = {a.assistant_id: a.user_permission for a in shared}
+        assert by_id[ids[0]] == "viewer" and by_id[ids[1]] == "editor"
+
+    @pytest.mark.asyncio
+    async def test_result_is_cached_until_shares_change(self, assistants_table):
+        from unittest.mock import patch
+
+        from apis.shared.assistants import service
+        first, second = await self._share_many(2)
+        assert len(await service.list_shared_with_user("bob@example.com")) == 2
+
+        with patch.object(service, "_batch_get_assistants", side_effect=AssertionError("not cached")):
+            cached = await service.list_shared_with_user("bob@example.com")
+        assert len(cached) == 2
+        cached[0].is_shared_with_me = True  # callers annotate; must not leak into the cache
+        assert all(getattr(a, "is_shared_with_me", None) is None for a in await service.list_shared_with_user("bob@example.com"))
+
+        await service.unshare_assistant(first, "u1", ["bob@example.com"])
+        assert [a.assistant_id for a in await service.list_shared_with_user("bob@example.com")] == [second]
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self, assistants_table, monkeypatch):
+        from apis.shared.assistants import service
+        monkeypatch.setenv("ASSISTANT_SHARED_LIST_CACHE_TTL_SECONDS", "0")
+        await self._share_many(1)
+        await service.list_shared_with_user("bob@example.com")
+
+        assert service._shared_with_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_pages_index_and_retries_unprocessed_keys(self, monkeypatch):
+        from unittest.mock import MagicMock, patch
+
+        from apis.shared.assistants import service
+        monkeypatch.setenv("DYNAMODB_ASSISTANTS_TABLE_NAME", "assistants")
+
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [{"assistantId": "ast-1"}], "LastEvaluatedKey": {"k": 1}},
+            {"Items": [{"assistantId": "ast-2", "permission": "editor"}]},
+        ]
+        resource = MagicMock()
+        resource.Table.return_value = table
+
+        def _item(assistant_id):
+            return {
+                "assistantId": {"S": assistant_id}, "ownerId": {"S": "u1"}, "ownerName": {"S": "Alice"},
+                "name": {"S": assistant_id}, "description": {"S": "d"}, "instructions": {"S": "hi"},
+                "vectorIndexId": {"S": "idx"}, "visibility": {"S": "SHARED"}, "tags": {"L": []},
+                "usageCount": {"N": "0"}, "createdAt": {"S": "2026-01-01"}, "updatedAt": {"S": "2026-01-01"},
+                "status": {"S": "COMPLETE"},
+            }
+
+        unprocessed = {"assistants": {"Keys": [{"PK": {"S": "AST#ast-2"}, "SK": {"S": "METADATA"}}]}}
+        client = MagicMock()
+        client.batch_get_item.side_effect = [
+            {"Responses": {"assistants": [_item("ast-1")]}, "UnprocessedKeys": unprocessed},
+            {"Responses": {"assistants": [_item("ast-2")]}},
+        ]
+
+        with (
+            patch("boto3.resource", return_value=resource),
+            patch("boto3.client", return_value=client),
+            patch.object(service, "_BATCH_GET_BACKOFF_SECONDS", 0),
+        ):
+            shared = await service.list_shared_with_user("bob@example.com")
+
+        assert [(a.assistant_id, a.user_permission) for a in shared] == [("ast-1", "viewer"), ("ast-2", "editor")]
+        assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"k": 1}
+        assert client.batch_get_item.call_args_list[1].kwargs["RequestItems"] == unprocessed
+
+    @pytest.mark.asyncio
+    async def test_batch_get_reuses_one_dynamodb_client(self):
+        from unittest.mock import MagicMock, patch
+
+        from apis.shared.assistants import service
+
+        client = MagicMock()
+        client.batch_get_item.return_value = {"Responses": {"assistants": []}}
+        with patch("boto3.client", return_value=client) as make_client:
+            await service._batch_get_assistants(["ast-1"], "assistants")
+            await service._batch_get_assistants(["ast-2"], "assistants")
+
+        assert make_client.call_count == 1
+        assert client.batch_get_item.call_count == 2
+
+
 class TestRAGService:
     def test_augment_prompt_with_context(self):
         from apis.shared.assistants.rag_service import augment_prompt_with_context
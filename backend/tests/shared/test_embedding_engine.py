@@ -0,0 +1,147 @@
+"""Tests for the bounded-concurrency Bedrock embedding engine."""
+
+import asyncio
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from apis.shared.embeddings.embedding_engine import EmbeddingEngine, embedding_cache_key, normalize_text
+
+
+class _FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+def _fake_client(delay=0.0, fail_codes=None):
+    """bedrock-runtime stand-in: embedding = [len(text), call number]."""
+    state = {"calls": 0, "in_flight": 0, "peak": 0, "inputs": []}
+    lock = threading.Lock()
+    fail_codes = list(fail_codes or [])
+
+    def invoke_model(**kwargs):
+        text = json.loads(kwargs["body"])["inputText"]
+        with lock:
+            state["calls"] += 1
+            state["inputs"].append(text)
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            code = fail_codes.pop(0) if fail_codes else None
+        try:
+            if delay:
+                time.sleep(delay)
+            if code:
+                raise _FakeClientError(code)
+            return {"body": io.BytesIO(json.dumps({"embedding": [float(len(text)), 1.0]}).encode())}
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    client = MagicMock()
+    client.invoke_model.side_effect = invoke_model
+    return client, state
+
+
+def _engine(client, **kw):
+    engine = EmbeddingEngine(model_id="amazon.titan-embed-text-v2:0", region_name="us-west-2", **kw)
+    engine._client = client
+    return engine
+
+
+class TestCacheKey:
+    def test_normalization_ignores_outer_whitespace_and_unicode_form(self):
+        assert normalize_text("  café\n") == normalize_text("café")
+
+    def test_key_depends_on_model(self):
+        assert embedding_cache_key("model-a", "text") != embedding_cache_key("model-b", "text")
+
+
+class TestEmbed:
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        client, _ = _fake_client()
+        engine = _engine(client)
+
+        result = await engine.embed(["a", "bbb", "cc"])
+
+        assert [v[0] for v in result] == [1.0, 3.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        client, state = _fake_client(delay=0.02)
+        engine = _engine(client, max_concurrency=3)
+
+        await engine.embed([f"chunk {i}" for i in range(30)])
+
+        assert state["calls"] == 30
+        assert state["peak"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_cache_and_in_batch_dedup_skip_bedrock(self):
+        client, state = _fake_client()
+        engine = _engine(client)
+
+        await engine.embed(["same", "same", " same ", "other"])
+        assert state["calls"] == 2
+
+        await engine.embed(["same", "other"])
+        assert state["calls"] == 2
+
+        stats = engine.stats.to_dict()
+        assert stats["cacheHits"] == 2
+        assert stats["batches"] == 2
+        assert stats["lastBatchMs"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_cache_is_lru_bounded(self):
+        client, state = _fake_client()
+        engine = _engine(client, cache_max_entries=2)
+
+        await engine.embed(["a", "b", "c"])
+        await engine.embed(["a"])
+
+        assert len(engine.cache) == 2
+        assert state["calls"] == 4
+
+
+class TestBackoff:
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        real_sleep = asyncio.sleep
+        monkeypatch.setattr("apis.shared.embeddings.embedding_engine.asyncio.sleep", lambda _d: real_sleep(0))
+
+    @pytest.mark.asyncio
+    async def test_throttling_is_retried_and_shrinks_limit(self):
+        client, state = _fake_client(fail_codes=["ThrottlingException", "ThrottlingException"])
+        engine = _engine(client, max_concurrency=8)
+
+        result = await engine.embed(["only"])
+
+        assert result == [[4.0, 1.0]]
+        assert state["calls"] == 3
+        assert engine.stats.throttles == 2
+        assert engine._limiter.limit < 8
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_propagates(self):
+        client, state = _fake_client(fail_codes=["ValidationException"])
+        engine = _engine(client)
+
+        with pytest.raises(_FakeClientError):
+            await engine.embed(["bad"])
+        assert state["calls"] == 1
+        assert engine.stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        client, state = _fake_client(fail_codes=["ThrottlingException"] * 10)
+        engine = _engine(client, max_retries=2)
+
+        with pytest.raises(_FakeClientError):
+            await engine.embed(["busy"])
+        assert state["calls"] == 3
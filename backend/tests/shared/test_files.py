@@ -1,6 +1,5 @@
 """Task 8: Files repository (moto DynamoDB) + file resolver (moto S3)."""
 
-import base64
 import pytest
 from datetime import datetime
 from apis.shared.files.models import FileMetadata, FileStatus, UserFileQuota
@@ -84,6 +83,33 @@ class TestFileUploadRepository:
         quota = await file_repository.decrement_quota("u1", 1024)
         assert quota.total_bytes == 1024
 
+    @pytest.mark.asyncio
+    async def test_batch_get_files(self, file_repository):
+        await file_repository.create_file(_make_file("f1"))
+        await file_repository.create_file(_make_file("f2"))
+        await file_repository.create_file(_make_file("f3", user_id="u2"))
+        files = await file_repository.batch_get_files("u1", ["f1", "f2", "f3", "f1"])
+        assert set(files) == {"f1", "f2"}
+        assert files["f2"].upload_id == "f2"
+
+    @pytest.mark.asyncio
+    async def test_batch_get_files_runs_off_the_event_loop(self, file_repository, monkeypatch):
+        import threading
+
+        await file_repository.create_file(_make_file("f1"))
+        client = file_repository._dynamodb.meta.client
+        real_batch_get = client.batch_get_item
+        threads = []
+
+        def _batch_get_item(**kwargs):
+            threads.append(threading.get_ident())
+            return real_batch_get(**kwargs)
+
+        monkeypatch.setattr(client, "batch_get_item", _batch_get_item)
+        files = await file_repository.batch_get_files("u1", ["f1"])
+        assert set(files) == {"f1"}
+        assert threads and threading.get_ident() not in threads
+
     @pytest.mark.asyncio
     async def test_delete_session_files(self, file_repository):
         await file_repository.create_file(_make_file("f1", session_id="s1"))
@@ -106,9 +132,9 @@ class TestFileResolver:
         files = await resolver.resolve_files("u1", ["f1"])
         assert len(files) == 1
         assert files[0].filename == "test.pdf"
-        # Verify base64 encoding
-        decoded = base64.b64decode(files[0].bytes)
-        assert decoded == b"PDF content here"
+        # Raw bytes, no base64 round trip
+        assert files[0].data == b"PDF content here"
+        assert files[0].upload_id == "f1"
 
     @pytest.mark.asyncio
     async def test_resolve_missing_file(self, file_repository, s3_bucket, aws):
@@ -132,3 +158,62 @@ class TestFileResolver:
         resolver._file_repository = file_repository
         files = await resolver.resolve_files("u1", [f"f{i}" for i in range(10)], max_files=3)
         assert len(files) == 3
+
+    @pytest.mark.asyncio
+    async def test_resolve_preserves_order_and_skips_not_ready(self, file_repository, s3_bucket, aws):
+        import boto3
+        from apis.shared.files.file_resolver import FileResolver
+        s3 = boto3.client("s3", region_name="us-east-1")
+        for i in range(3):
+            s3.put_object(Bucket=s3_bucket, Key=f"uploads/u1/f{i}", Body=f"body {i}".encode())
+            await file_repository.create_file(_make_file(f"f{i}", filename=f"doc{i}.pdf"))
+        await file_repository.update_file_status("u1", "f1", FileStatus.PENDING)
+        resolver = FileResolver(s3_client=s3)
+        resolver._file_repository = file_repository
+        files = await resolver.resolve_files("u1", ["f2", "f1", "f0"])
+        assert [f.filename for f in files] == ["doc2.pdf", "doc0.pdf"]
+        assert files[0].data == b"body 2"
+
+    @pytest.mark.asyncio
+    async def test_repeat_resolve_served_from_cache(self, file_repository, s3_bucket, aws):
+        import boto3
+        from unittest.mock import MagicMock
+        from apis.shared.files.file_resolver import FileResolver
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.put_object(Bucket=s3_bucket, Key="uploads/u1/f1", Body=b"cached")
+        await file_repository.create_file(_make_file())
+        counting = MagicMock(wraps=s3)
+        resolver = FileResolver(s3_client=counting)
+        resolver._file_repository = file_repository
+
+        await resolver.resolve_files("u1", ["f1"])
+        files = await resolver.resolve_files("u1", ["f1"])
+
+        assert files[0].data == b"cached"
+        assert counting.get_object.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_deleted_upload_not_served_from_cache(self, file_repository, s3_bucket, aws):
+        import boto3
+        from apis.shared.files.file_resolver import FileResolver
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.put_object(Bucket=s3_bucket, Key="uploads/u1/f1", Body=b"gone soon")
+        await file_repository.create_file(_make_file())
+        resolver = FileResolver(s3_client=s3)
+        resolver._file_repository = file_repository
+
+        assert len(await resolver.resolve_files("u1", ["f1"])) == 1
+        await file_repository.delete_file("u1", "f1")
+        assert await resolver.resolve_files("u1", ["f1"]) == []
+
+    def test_content_cache_respects_byte_budget(self):
+        from apis.shared.files.file_resolver import _ContentCache
+        cache = _ContentCache(max_bytes=10, ttl_seconds=60)
+        cache.put(("b", "k1"), b"12345")
+        cache.put(("b", "k2"), b"12345")
+        cache.put(("b", "k3"), b"12345")
+        cache.put(("b", "big"), b"x" * 11)
+        assert cache.get(("b", "k1")) is None
+        assert cache.get(("b", "k3")) == b"12345"
+        assert cache.get(("b", "big")) is None
+        assert len(cache) == 2
@@ -0,0 +1,174 @@
+"""Lexical index segments, BM25 search over S3-stored segments (moto) and hybrid fusion."""
+
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+ASSISTANT_ID = "ast-1"
+BUCKET = "test-rag-documents"
+
+
+@pytest.fixture()
+def documents_bucket(aws, monkeypatch):
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setenv("S3_ASSISTANTS_DOCUMENTS_BUCKET_NAME", BUCKET)
+    return BUCKET
+
+
+class TestSegments:
+    def test_identifiers_are_kept_whole_and_split(self):
+        from apis.shared.embeddings.lexical_index import tokenize
+
+        assert tokenize("See CS-101 and the POL.2024.03 policy.") == [
+            "see", "cs-101", "cs", "101", "pol.2024.03", "pol", "2024", "03", "policy",
+        ]
+
+    def test_segment_round_trip(self):
+        from apis.shared.embeddings.lexical_index import LexicalSegment, build_segment
+
+        segment = LexicalSegment(build_segment(["alpha beta beta", "beta gamma", "delta"]))
+
+        assert segment.chunk_count == 3
+        assert segment.total_length == 6
+        assert segment.postings("beta") == [(0, 2), (1, 1)]
+        assert segment.postings("delta") == [(2, 1)]
+        assert segment.postings("omega") == []
+        assert [segment.chunk_length(i) for i in range(3)] == [3, 2, 1]
+
+    def test_version_follows_content(self):
+        from apis.shared.embeddings.lexical_index import segment_version
+
+        assert segment_version(["a", "b"]) == segment_version(["a", "b"])
+        assert segment_version(["a", "b"]) != segment_version(["a", "b2"])
+        assert segment_version(["ab"]) != segment_version(["a", "b"])
+
+
+class TestLexicalIndex:
+    @pytest.mark.asyncio
+    async def test_exact_code_ranks_its_chunk_first(self, documents_bucket, tmp_path):
+        from apis.shared.embeddings.lexical_index import LexicalIndex, store_lexical_segment
+
+        key_a = await store_lexical_segment(ASSISTANT_ID, "doc-a", [
+            "Course overview for introductory programming.",
+            "Prerequisites for CS-101 include algebra.",
+        ])
+        key_b = await store_lexical_segment(ASSISTANT_ID, "doc-b", [
+            "Programming courses are listed in the catalog.",
+        ])
+        assert key_a.startswith(f"lexical-index/{ASSISTANT_ID}/doc-a/")
+
+        index = LexicalIndex(BUCKET, cache_dir=str(tmp_path))
+        try:
+            hits = index.search({"doc-a": key_a, "doc-b": key_b}, "what are the prerequisites of cs 101?", limit=5)
+        finally:
+            index.close()
+
+        assert hits[0].key == "doc-a#1"
+        assert len(list(tmp_path.glob("*.lxi"))) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_segment_is_skipped(self, documents_bucket, tmp_path):
+        from apis.shared.embeddings.lexical_index import LexicalIndex, store_lexical_segment
+
+        key = await store_lexical_segment(ASSISTANT_ID, "doc-a", ["invoice SKU-4471 shipped"])
+        index = LexicalIndex(BUCKET, cache_dir=str(tmp_path))
+        try:
+            hits = index.search({"doc-a": key, "doc-gone": "lexical-index/ast-1/doc-gone/x.lxi.gz"}, "sku-4471", limit=5)
+        finally:
+            index.close()
+
+        assert [h.key for h in hits] == ["doc-a#0"]
+
+    @pytest.mark.asyncio
+    async def test_evicted_segment_file_is_removed(self, documents_bucket, tmp_path):
+        from apis.shared.embeddings.lexical_index import LexicalIndex, store_lexical_segment
+
+        keys = {f"doc-{i}": await store_lexical_segment(ASSISTANT_ID, f"doc-{i}", [f"term{i}"]) for i in range(3)}
+        index = LexicalIndex(BUCKET, cache_dir=str(tmp_path), max_open_segments=2)
+        try:
+            for doc_id, key in keys.items():
+                index.search({doc_id: key}, "term0 term1 term2", limit=5)
+        finally:
+            index.close()
+
+        assert len(list(tmp_path.glob("*.lxi"))) == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_every_version(self, documents_bucket):
+        from apis.shared.embeddings.lexical_index import delete_lexical_segments, store_lexical_segment
+
+        await store_lexical_segment(ASSISTANT_ID, "doc-a", ["first version"])
+        await store_lexical_segment(ASSISTANT_ID, "doc-a", ["second version"])
+        await store_lexical_segment(ASSISTANT_ID, "doc-b", ["other document"])
+
+        assert await delete_lexical_segments(ASSISTANT_ID, "doc-a") == 2
+        remaining = boto3.client("s3", region_name="us-east-1").list_objects_v2(Bucket=BUCKET)["Contents"]
+        assert [obj["Key"].split("/")[2] for obj in remaining] == ["doc-b"]
+
+
+class TestHybridRetrieval:
+    def test_reciprocal_rank_fusion_rewards_agreement(self):
+        from apis.shared.assistants.rag_service import _reciprocal_rank_fusion
+
+        fused = _reciprocal_rank_fusion([["v1", "both", "v3"], ["lex", "both"]], k=60)
+
+        assert fused[0] == "both"
+        assert set(fused) == {"v1", "both", "v3", "lex"}
+
+    @pytest.mark.asyncio
+    async def test_lexical_only_hits_are_read_back_by_key(self, monkeypatch):
+        from apis.shared.assistants import rag_service
+        from apis.shared.embeddings.lexical_index import LexicalHit
+
+        monkeypatch.setenv("DYNAMODB_ASSISTANTS_TABLE_NAME", "assistants")
+
+        def _vector(key, distance=0.4):
+            doc_id = key.split("#")[0]
+            return {"key": key, "distance": distance, "metadata": {"document_id": doc_id, "text": key}}
+
+        async def _search(assistant_id, query, top_k=5):
+            assert top_k == 12  # over-fetched for fusion
+            return {"vectors": [_vector("doc-a#0"), _vector("doc-a#1")]}
+
+        get_vectors = MagicMock(return_value=[{"key": "doc-b#3", "metadata": {"document_id": "doc-b", "text": "SKU-4471"}}])
+
+        async def _get_vectors_by_key(keys):
+            return get_vectors(keys)
+
+        with (
+            patch.object(rag_service, "search_assistant_knowledgebase", side_effect=_search),
+            patch.object(rag_service, "get_vectors_by_key", side_effect=_get_vectors_by_key),
+            patch.object(rag_service, "_prefetch_and_search_lexical", return_value=[
+                LexicalHit("doc-b", 3, 9.0), LexicalHit("doc-a", 1, 2.0),
+            ]),
+            patch.object(rag_service, "_filter_vectors_by_document_status", side_effect=lambda v, _a: v),
+        ):
+            results = await rag_service.search_assistant_knowledgebase_with_formatting(ASSISTANT_ID, "sku-4471", top_k=3)
+
+        # doc-a#1 is in both lists; the two rank-1 singles tie and keep vector order
+        assert [r["key"] for r in results] == ["doc-a#1", "doc-a#0", "doc-b#3"]
+        assert results[2]["distance"] is None
+        get_vectors.assert_called_once_with(["doc-b#3"])
+
+    @pytest.mark.asyncio
+    async def test_vector_mode_skips_lexical_search(self, monkeypatch):
+        from apis.shared.assistants import rag_service
+
+        monkeypatch.setenv("DYNAMODB_ASSISTANTS_TABLE_NAME", "assistants")
+        monkeypatch.setenv("RAG_RETRIEVAL_MODE", "vector")
+        cache = MagicMock()
+
+        async def _search(assistant_id, query, top_k=5):
+            assert top_k == 3
+            return {"vectors": []}
+
+        with (
+            patch.object(rag_service, "search_assistant_knowledgebase", side_effect=_search),
+            patch.object(rag_service, "get_document_status_cache", return_value=cache),
+        ):
+            assert await rag_service.search_assistant_knowledgebase_with_formatting(ASSISTANT_ID, "q", top_k=3) == []
+
+        cache.prefetch.assert_called_once_with(ASSISTANT_ID)
+        cache.lexical_segments.assert_not_called()
@@ -0,0 +1,97 @@
+"""Tests for the in-process managed model registry."""
+
+import boto3
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from apis.shared.models import managed_models as mm
+from apis.shared.models.models import ManagedModelCreate
+from apis.shared.models.registry import ManagedModelRegistry, find_managed_model, get_model_registry
+
+
+def _make_model_data(model_id="claude-3", **kw):
+    defaults = dict(
+        model_id=model_id, model_name="Claude 3", provider="bedrock",
+        provider_name="Anthropic", input_modalities=["TEXT"], output_modalities=["TEXT"],
+        max_input_tokens=200000, max_output_tokens=4096,
+        input_price_per_million_tokens=3.0, output_price_per_million_tokens=15.0,
+    )
+    defaults.update(kw)
+    return ManagedModelCreate(**defaults)
+
+
+@pytest.fixture(autouse=True)
+def _patch_dynamodb(managed_models_table, monkeypatch):
+    """Re-create the module-level dynamodb resource inside the active mock_aws context."""
+    monkeypatch.setattr(mm, "dynamodb", boto3.resource("dynamodb", region_name="us-east-1"))
+
+
+class TestLookups:
+    @pytest.mark.asyncio
+    async def test_lookups_share_one_scan(self):
+        await mm.create_managed_model(_make_model_data("model-a"))
+        await mm.create_managed_model(_make_model_data("model-b"))
+
+        with patch.object(mm, "list_all_managed_models", wraps=mm.list_all_managed_models) as scan:
+            assert (await find_managed_model("model-a")).model_id == "model-a"
+            assert (await find_managed_model("model-b")).model_id == "model-b"
+            assert await find_managed_model("missing") is None
+        assert scan.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_load_failure_without_snapshot_raises(self):
+        registry = ManagedModelRegistry()
+        with patch.object(mm, "list_all_managed_models", AsyncMock(side_effect=RuntimeError("no table"))):
+            with pytest.raises(RuntimeError):
+                await registry.get("model-a")
+
+    @pytest.mark.asyncio
+    async def test_reload_failure_serves_stale_snapshot(self):
+        await mm.create_managed_model(_make_model_data("model-a"))
+        registry = ManagedModelRegistry(ttl_seconds=0)
+        assert await registry.get("model-a") is not None
+
+        with patch.object(mm, "list_all_managed_models", AsyncMock(side_effect=RuntimeError("throttled"))):
+            assert (await registry.get("model-a")).model_id == "model-a"
+
+
+class TestInvalidation:
+    @pytest.mark.asyncio
+    async def test_local_writes_invalidate(self):
+        await find_managed_model("model-a")
+        created = await mm.create_managed_model(_make_model_data("model-a"))
+        assert (await find_managed_model("model-a")).model_name == "Claude 3"
+
+        from apis.shared.models.models import ManagedModelUpdate
+        await mm.update_managed_model(created.id, ManagedModelUpdate(model_name="Renamed"))
+        assert (await find_managed_model("model-a")).model_name == "Renamed"
+
+        await mm.delete_managed_model(created.id)
+        assert await find_managed_model("model-a") is None
+
+    @pytest.mark.asyncio
+    async def test_remote_write_detected_via_version_watermark(self):
+        await mm.create_managed_model(_make_model_data("model-a"))
+        # A registry in another process: never sees the local invalidation.
+        remote = ManagedModelRegistry(ttl_seconds=3600, version_check_seconds=0)
+        assert await remote.get("model-b") is None
+
+        await mm.create_managed_model(_make_model_data("model-b"))
+        assert (await remote.get("model-b")).model_id == "model-b"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_version_skips_rescan(self):
+        await mm.create_managed_model(_make_model_data("model-a"))
+        registry = ManagedModelRegistry(ttl_seconds=3600, version_check_seconds=0)
+        await registry.get("model-a")
+
+        with patch.object(mm, "list_all_managed_models", wraps=mm.list_all_managed_models) as scan:
+            await registry.get("model-a")
+            await registry.get("model-a")
+        scan.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_watermark_row_not_listed_as_model(self):
+        await mm.create_managed_model(_make_model_data("model-a"))
+        assert mm.get_registry_version("test-managed-models") == 1
+        assert [m.model_id for m in await get_model_registry().list()] == ["model-a"]
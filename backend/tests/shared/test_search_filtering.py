@@ -3,7 +3,7 @@ Unit tests for search path document status filtering.
 
 Tests the `_filter_vectors_by_document_status` helper in rag_service.py
 which filters vector search results to only include chunks from documents
-with status='complete' in DynamoDB.
+with status='complete' in DynamoDB, and the document status cache behind it.
 
 Feature: reliable-document-deletion
 Requirements: 3.1, 3.2, 3.3, 3.4
@@ -11,6 +11,7 @@ Requirements: 3.1, 3.2, 3.3, 3.4
 
 from unittest.mock import MagicMock, patch
 
+import pytest
 
 
 def _make_vector(doc_id, chunk_idx=0):
@@ -27,31 +28,31 @@ TABLE_NAME = "test-table"
 ENV_PATCH = {"DYNAMODB_ASSISTANTS_TABLE_NAME": TABLE_NAME}
 
 
-def _build_mock_table(status_map):
-    """Return a mock DynamoDB table whose get_item returns statuses from *status_map*.
+def _build_mock_dynamo(status_map):
+    """Return a mock DynamoDB resource whose batch_get_item returns statuses from *status_map*.
 
-    Keys present in *status_map* return {"Item": {"status": value}}.
-    Keys absent simulate a missing record (no "Item" key).
+    Keys present in *status_map* come back as items with that status.
+    Keys absent simulate a missing record (not in "Responses").
     """
-    mock_table = MagicMock()
+    def _batch_get_item(**kwargs):
+        (table_name, request), = kwargs["RequestItems"].items()
+        items = []
+        for key in request["Keys"]:
+            doc_id = key["SK"].replace("DOC#", "")
+            if doc_id in status_map:
+                items.append({"SK": key["SK"], "status": status_map[doc_id]})
+        return {"Responses": {table_name: items}, "UnprocessedKeys": {}}
 
-    def _get_item(**kwargs):
-        doc_id = kwargs["Key"]["SK"].replace("DOC#", "")
-        if doc_id in status_map:
-            return {"Item": {"status": status_map[doc_id]}}
-        return {}  # no Item → record not found
-
-    mock_table.get_item = MagicMock(side_effect=_get_item)
-    return mock_table
+    mock_dynamo = MagicMock()
+    mock_dynamo.meta.client.batch_get_item = MagicMock(side_effect=_batch_get_item)
+    return mock_dynamo
 
 
 def _setup_dynamo_mock(mock_boto3_resource, status_map):
-    """Wire a mock boto3.resource('dynamodb') to return a table with *status_map*."""
-    mock_table = _build_mock_table(status_map)
-    mock_dynamo = MagicMock()
-    mock_dynamo.Table.return_value = mock_table
+    """Wire a mock boto3.resource('dynamodb') to answer batch gets from *status_map*."""
+    mock_dynamo = _build_mock_dynamo(status_map)
     mock_boto3_resource.return_value = mock_dynamo
-    return mock_table
+    return mock_dynamo.meta.client
 
 
 # -----------------------------------------------------------------------
@@ -173,7 +174,7 @@ def test_filter_excludes_missing_records(mock_boto3_resource):
 def test_filter_graceful_degradation_on_dynamo_error(mock_boto3_resource):
     """DynamoDB raises exception — return unfiltered results."""
     mock_dynamo = MagicMock()
-    mock_dynamo.Table.side_effect = Exception("DynamoDB unavailable")
+    mock_dynamo.meta.client.batch_get_item.side_effect = Exception("DynamoDB unavailable")
     mock_boto3_resource.return_value = mock_dynamo
 
     from apis.shared.assistants.rag_service import _filter_vectors_by_document_status
@@ -207,3 +208,151 @@ def test_filter_empty_vectors(mock_boto3_resource):
     assert result == []
     # boto3.resource should not be called for empty input
     mock_boto3_resource.assert_not_called()
+
+
+# -----------------------------------------------------------------------
+# Batched lookups and the per-assistant complete-document cache
+# -----------------------------------------------------------------------
+
+
+@patch("boto3.resource")
+@patch.dict("os.environ", ENV_PATCH)
+def test_filter_checks_all_documents_in_one_batch_get(mock_boto3_resource):
+    """Every distinct document is confirmed by a single BatchGetItem."""
+    client = _setup_dynamo_mock(mock_boto3_resource, {"doc-a": "complete", "doc-b": "complete"})
+
+    from apis.shared.assistants.rag_service import _filter_vectors_by_document_status
+
+    vectors = [_make_vector("doc-a", 0), _make_vector("doc-a", 1), _make_vector("doc-b", 0)]
+
+    _filter_vectors_by_document_status(vectors, ASSISTANT_ID)
+
+    assert client.batch_get_item.call_count == 1
+    keys = client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]["Keys"]
+    assert sorted(k["SK"] for k in keys) == ["DOC#doc-a", "DOC#doc-b"]
+
+
+@patch("boto3.resource")
+@patch.dict("os.environ", ENV_PATCH)
+def test_complete_documents_are_cached_but_others_are_rechecked(mock_boto3_resource):
+    """A complete document is not looked up again; an ingesting one is."""
+    status_map = {"doc-a": "complete", "doc-b": "embedding"}
+    client = _setup_dynamo_mock(mock_boto3_resource, status_map)
+
+    from apis.shared.assistants.rag_service import _filter_vectors_by_document_status
+
+    vectors = [_make_vector("doc-a"), _make_vector("doc-b")]
+
+    first = _filter_vectors_by_document_status(vectors, ASSISTANT_ID)
+    status_map["doc-b"] = "complete"
+    second = _filter_vectors_by_document_status(vectors, ASSISTANT_ID)
+
+    assert [v["metadata"]["document_id"] for v in first] == ["doc-a"]
+    assert [v["metadata"]["document_id"] for v in second] == ["doc-a", "doc-b"]
+    keys = client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]["Keys"]
+    assert [k["SK"] for k in keys] == ["DOC#doc-b"]
+
+
+@patch("boto3.resource")
+def test_unprocessed_keys_are_retried(mock_boto3_resource):
+    from apis.shared.assistants.document_status import DocumentStatusCache
+
+    key = {"PK": f"AST#{ASSISTANT_ID}", "SK": "DOC#doc-a"}
+    client = mock_boto3_resource.return_value.meta.client
+    client.batch_get_item.side_effect = [
+        {"Responses": {}, "UnprocessedKeys": {TABLE_NAME: {"Keys": [key]}}},
+        {"Responses": {TABLE_NAME: [{"SK": "DOC#doc-a", "status": "complete"}]}},
+    ]
+
+    cache = DocumentStatusCache(TABLE_NAME, ttl_seconds=60)
+
+    assert cache.complete_documents(ASSISTANT_ID, ["doc-a"]) == {"doc-a"}
+    assert client.batch_get_item.call_count == 2
+
+
+@patch("boto3.resource")
+def test_prefetch_answers_without_batch_get(mock_boto3_resource):
+    """After a prefetch, complete documents need no further lookups."""
+    from apis.shared.assistants.document_status import DocumentStatusCache
+
+    table = mock_boto3_resource.return_value.Table.return_value
+    table.query.side_effect = [
+        {
+            "Items": [{"SK": "DOC#doc-a", "status": "complete"}, {"SK": "DOC#doc-b", "status": "deleting"}],
+            "LastEvaluatedKey": {"PK": f"AST#{ASSISTANT_ID}", "SK": "DOC#doc-b"},
+        },
+        {"Items": [{"SK": "DOC#doc-c", "status": "complete"}]},
+    ]
+    client = mock_boto3_resource.return_value.meta.client
+
+    cache = DocumentStatusCache(TABLE_NAME, ttl_seconds=60)
+    cache.prefetch(ASSISTANT_ID)
+    cache.prefetch(ASSISTANT_ID)
+
+    assert table.query.call_count == 2
+    assert cache.complete_documents(ASSISTANT_ID, ["doc-a", "doc-c"]) == {"doc-a", "doc-c"}
+    client.batch_get_item.assert_not_called()
+
+
+@patch("boto3.resource")
+def test_prefetch_reads_a_bounded_number_of_documents(mock_boto3_resource):
+    """A large knowledge base is not read in full; the rest is confirmed on demand."""
+    from apis.shared.assistants.document_status import DocumentStatusCache
+
+    client = _setup_dynamo_mock(mock_boto3_resource, {"doc-z": "complete"})
+    table = mock_boto3_resource.return_value.Table.return_value
+    table.query.side_effect = [
+        {
+            "Items": [{"SK": "DOC#doc-a", "status": "complete"}, {"SK": "DOC#doc-b", "status": "complete"}],
+            "LastEvaluatedKey": {"PK": f"AST#{ASSISTANT_ID}", "SK": "DOC#doc-b"},
+        },
+        {
+            "Items": [{"SK": "DOC#doc-c", "status": "complete"}],
+            "LastEvaluatedKey": {"PK": f"AST#{ASSISTANT_ID}", "SK": "DOC#doc-c"},
+        },
+    ]
+
+    cache = DocumentStatusCache(TABLE_NAME, ttl_seconds=60, prefetch_max_items=3)
+    cache.prefetch(ASSISTANT_ID)
+
+    assert [c.kwargs["Limit"] for c in table.query.call_args_list] == [3, 1]
+    assert cache.complete_documents(ASSISTANT_ID, ["doc-a", "doc-z"]) == {"doc-a", "doc-z"}
+    (request,) = client.batch_get_item.call_args.kwargs["RequestItems"].values()
+    assert request["Keys"] == [{"PK": f"AST#{ASSISTANT_ID}", "SK": "DOC#doc-z"}]
+
+
+@patch("boto3.resource")
+def test_zero_ttl_disables_caching(mock_boto3_resource):
+    from apis.shared.assistants.document_status import DocumentStatusCache
+
+    client = _setup_dynamo_mock(mock_boto3_resource, {"doc-a": "complete"})
+
+    cache = DocumentStatusCache(TABLE_NAME, ttl_seconds=0)
+    cache.prefetch(ASSISTANT_ID)
+    cache.complete_documents(ASSISTANT_ID, ["doc-a"])
+    cache.complete_documents(ASSISTANT_ID, ["doc-a"])
+
+    mock_boto3_resource.return_value.Table.assert_not_called()
+    assert client.batch_get_item.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch.dict("os.environ", ENV_PATCH)
+async def test_search_prefetches_status_alongside_vector_search():
+    """The complete-document set is loaded while the query is embedded and searched."""
+    from apis.shared.assistants import rag_service
+
+    cache = MagicMock()
+    cache.complete_documents.return_value = {"doc-a"}
+
+    async def _search(assistant_id, query, top_k=5):
+        return {"vectors": [_make_vector("doc-a"), _make_vector("doc-b")]}
+
+    with (
+        patch.object(rag_service, "search_assistant_knowledgebase", side_effect=_search),
+        patch.object(rag_service, "get_document_status_cache", return_value=cache),
+    ):
+        results = await rag_service.search_assistant_knowledgebase_with_formatting(ASSISTANT_ID, "question", top_k=3)
+
+    cache.prefetch.assert_called_once_with(ASSISTANT_ID)
+    assert [r["key"] for r in results] == ["doc-a#0"]
@@ -0,0 +1,201 @@
+"""Tests for the cached, incremental AgentCore Memory history reader."""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bedrock_agentcore.memory.integrations.strands.bedrock_converter import AgentCoreMemoryConverter
+
+from apis.shared.sessions.history_reader import SessionHistoryReader
+
+_T0 = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _FakeMemory:
+    """bedrock-agentcore stand-in: stores events, serves ListEvents newest-first."""
+
+    def __init__(self):
+        self.events = []
+        self.calls = []
+
+    def append(self, role, text, minutes=None, tool_result=False):
+        index = len(self.events)
+        content = [{"toolResult": {"toolUseId": "t", "content": [{"text": text}]}}] if tool_result else [{"text": text}]
+        created = _T0 + timedelta(minutes=index if minutes is None else minutes)
+        message = {
+            "message": {"role": role, "content": content},
+            "message_id": index,
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+        }
+        self.events.append(
+            {
+                "eventId": f"{index:019d}#e",
+                "payload": [{"conversational": {"content": {"text": json.dumps(message)}, "role": role.upper()}}],
+            }
+        )
+
+    def list_events(self, memoryId, actorId, sessionId, maxResults, includePayloads, nextToken=None):
+        self.calls.append({"maxResults": maxResults, "includePayloads": includePayloads})
+        newest_first = list(reversed(self.events))
+        start = int(nextToken or 0)
+        page = newest_first[start : start + maxResults]
+        if not includePayloads:
+            page = [{k: v for k, v in e.items() if k != "payload"} for e in page]
+        response = {"events": page}
+        if start + maxResults < len(newest_first):
+            response["nextToken"] = str(start + maxResults)
+        return response
+
+
+def _texts(messages):
+    return [m.message["content"][0].get("text") or m.message["content"][0]["toolResult"]["content"][0]["text"] for m in messages]
+
+
+def _read(reader, memory):
+    return reader.read(memory, AgentCoreMemoryConverter, "mem", "u1", "s1")
+
+
+class TestSessionHistoryReader:
+    def test_cold_read_decodes_full_history(self):
+        memory = _FakeMemory()
+        for i in range(250):
+            memory.append("user" if i % 2 == 0 else "assistant", f"m{i}")
+        reader = SessionHistoryReader()
+
+        messages = _read(reader, memory)
+
+        assert _texts(messages) == [f"m{i}" for i in range(250)]
+        assert len(memory.calls) == 3
+        assert reader.stats.full_loads == 1
+
+    def test_unchanged_history_costs_one_head_probe(self):
+        memory = _FakeMemory()
+        for i in range(250):
+            memory.append("user", f"m{i}")
+        reader = SessionHistoryReader()
+        first = _read(reader, memory)
+        memory.calls.clear()
+
+        again = _read(reader, memory)
+
+        assert again is first
+        assert memory.calls == [{"maxResults": 1, "includePayloads": False}]
+        assert reader.stats.hits == 1
+
+    def test_new_events_are_appended_without_full_reload(self):
+        memory = _FakeMemory()
+        for i in range(250):
+            memory.append("user", f"m{i}")
+        reader = SessionHistoryReader()
+        _read(reader, memory)
+        memory.append("user", "m250")
+        memory.append("assistant", "m251")
+        memory.calls.clear()
+
+        messages = _read(reader, memory)
+
+        assert _texts(messages) == [f"m{i}" for i in range(252)]
+        # head probe + one payload page that reaches the cached watermark
+        assert len(memory.calls) == 2
+        assert reader.stats.incremental == 1
+        assert reader.stats.full_loads == 1
+
+    def test_deleted_watermark_forces_full_reload(self):
+        memory = _FakeMemory()
+        for i in range(5):
+            memory.append("user", f"m{i}")
+        reader = SessionHistoryReader()
+        _read(reader, memory)
+        del memory.events[-2:]
+        memory.append("user", "replacement")
+
+        messages = _read(reader, memory)
+
+        assert _texts(messages) == ["m0", "m1", "m2", "replacement"]
+        assert reader.stats.full_loads == 2
+
+    def test_empty_session_drops_cache_entry(self):
+        memory = _FakeMemory()
+        memory.append("user", "m0")
+        reader = SessionHistoryReader()
+        _read(reader, memory)
+        memory.events.clear()
+
+        assert _read(reader, memory) == []
+        assert len(reader) == 0
+
+    def test_cache_is_lru_bounded(self):
+        memory = _FakeMemory()
+        memory.append("user", "m0")
+        reader = SessionHistoryReader(max_sessions=2)
+
+        for session_id in ("a", "b", "c"):
+            reader.read(memory, AgentCoreMemoryConverter, "mem", "u1", session_id)
+
+        assert len(reader) == 2
+
+
+class TestGetMessagesWindow:
+    def _patches(self, memory, window_metadata):
+        return (
+            patch("apis.shared.sessions.history_reader.get_memory_data_client", return_value=memory),
+            patch("apis.shared.sessions.metadata.get_message_metadata_window", window_metadata),
+            patch("apis.shared.sessions.metadata.get_all_message_metadata", new_callable=AsyncMock, return_value={}),
+            patch("apis.shared.sessions.metadata.get_pending_interrupts", new_callable=AsyncMock, return_value=[]),
+            patch("apis.shared.mcp_apps.ui_resource_store.get_ui_resource_store", return_value=MagicMock(list_for_session=MagicMock(return_value=[]))),
+        )
+
+    @pytest.mark.asyncio
+    async def test_page_fetches_only_its_metadata_window(self, monkeypatch):
+        monkeypatch.setenv("AGENTCORE_MEMORY_ID", "mem")
+        memory = _FakeMemory()
+        # turn 0: user, assistant(tool), tool result, assistant; turn 1: user, assistant
+        memory.append("user", "q0", minutes=0)
+        memory.append("assistant", "a0", minutes=1)
+        memory.append("user", "r0", minutes=2, tool_result=True)
+        memory.append("assistant", "a1", minutes=3)
+        memory.append("user", "q1", minutes=30)
+        memory.append("assistant", "a2", minutes=31)
+        window_metadata = AsyncMock(return_value={"3": {"cost": 0.5}, "4": {"displayText": "clean q1"}})
+
+        p = self._patches(memory, window_metadata)
+        with p[0], p[1], p[2] as full_metadata, p[3], p[4]:
+            from apis.shared.sessions.messages import get_messages_from_cloud
+
+            page = await get_messages_from_cloud("s1", "u1", limit=2, next_token=base64.b64encode(b"2").decode())
+
+        assert [m.id for m in page.messages] == ["msg-s1-2", "msg-s1-3"]
+        assert page.messages[1].metadata["cost"] == 0.5
+        assert page.next_token == base64.b64encode(b"4").decode()
+        full_metadata.assert_not_awaited()
+
+        kwargs = window_metadata.await_args.kwargs
+        assert list(kwargs["message_ids"]) == [2, 3]
+        # the tool result at index 2 does not open a turn, so no display lookup
+        assert kwargs["display_message_ids"] == []
+        assert kwargs["since"] < (_T0 + timedelta(minutes=2)).isoformat()
+        # bounded by the next turn's user message (q1), not the page's end
+        assert (_T0 + timedelta(minutes=30)).isoformat() < kwargs["until"] < (_T0 + timedelta(minutes=60)).isoformat()
+
+    @pytest.mark.asyncio
+    async def test_last_page_range_is_open_ended(self, monkeypatch):
+        monkeypatch.setenv("AGENTCORE_MEMORY_ID", "mem")
+        memory = _FakeMemory()
+        for i in range(4):
+            memory.append("user" if i % 2 == 0 else "assistant", f"m{i}")
+        window_metadata = AsyncMock(return_value={"2": {"displayText": "clean"}})
+
+        p = self._patches(memory, window_metadata)
+        with p[0], p[1], p[2], p[3], p[4]:
+            from apis.shared.sessions.messages import get_messages_from_cloud
+
+            page = await get_messages_from_cloud("s1", "u1", limit=5, next_token=base64.b64encode(b"2").decode())
+
+        assert [m.id for m in page.messages] == ["msg-s1-2", "msg-s1-3"]
+        assert page.next_token is None
+        kwargs = window_metadata.await_args.kwargs
+        assert kwargs["until"] is None
+        assert kwargs["display_message_ids"] == [2]
@@ -0,0 +1,183 @@
+"""Stable session rows, SessionRecencyIndex listing and the legacy-row migration (moto DynamoDB)."""
+
+import pytest
+
+
+def _legacy_row(session_id, last_message_at, user_id="u1", **extra):
+    return {
+        "PK": f"USER#{user_id}",
+        "SK": f"S#ACTIVE#{last_message_at}#{session_id}",
+        "GSI_PK": f"SESSION#{session_id}",
+        "GSI_SK": "META",
+        "sessionId": session_id,
+        "userId": user_id,
+        "title": f"Legacy {session_id}",
+        "status": "active",
+        "createdAt": "2026-01-01T00:00:00Z",
+        "lastMessageAt": last_message_at,
+        "messageCount": 3,
+        **extra,
+    }
+
+
+async def _store(session_id, last_message_at):
+    from apis.shared.sessions.metadata import store_session_metadata
+    from apis.shared.sessions.models import SessionMetadata
+
+    await store_session_metadata(
+        session_id=session_id, user_id="u1",
+        session_metadata=SessionMetadata(
+            sessionId=session_id, userId="u1", title="Stable", status="active",
+            createdAt="2026-01-01T00:00:00Z", lastMessageAt=last_message_at, messageCount=1,
+        ),
+    )
+
+
+class TestToStableRow:
+    def test_active_row_gets_recency_keys_and_preferences(self):
+        from apis.shared.sessions.session_rows import to_stable_row
+
+        row = to_stable_row(_legacy_row("s1", "2026-02-01T00:00:00Z"))
+
+        assert row["PK"] == "USER#u1"
+        assert row["SK"] == "SESSION#s1"
+        assert row["GSI3PK"] == "USER#u1"
+        assert row["GSI3SK"] == "2026-02-01T00:00:00Z#s1"
+        assert row["preferences"] == {}
+        assert row["title"] == "Legacy s1"
+
+    def test_deleted_row_stays_out_of_recency_index(self):
+        from apis.shared.sessions.session_rows import to_stable_row
+
+        item = _legacy_row("s1", "2026-02-01T00:00:00Z", deleted=True)
+        item["SK"] = "S#DELETED#2026-02-02T00:00:00Z#s1"
+
+        row = to_stable_row(item)
+
+        assert row["SK"] == "SESSION#s1"
+        assert "GSI3PK" not in row and "GSI3SK" not in row
+
+
+class TestLegacyRollout:
+    @pytest.mark.asyncio
+    async def test_activity_migrates_legacy_row(self, sessions_metadata_table):
+        from apis.shared.sessions.metadata import get_session_metadata, update_session_activity
+
+        sessions_metadata_table.put_item(Item=_legacy_row("s1", "2026-02-01T00:00:00Z"))
+
+        applied = await update_session_activity(session_id="s1", user_id="u1", last_model="claude-3")
+
+        assert applied is True
+        items = sessions_metadata_table.scan()["Items"]
+        assert [i["SK"] for i in items] == ["SESSION#s1"]
+        result = await get_session_metadata("s1", "u1")
+        assert result.title == "Legacy s1"
+        assert result.message_count == 4
+        assert result.preferences.last_model == "claude-3"
+
+    @pytest.mark.asyncio
+    async def test_get_reads_legacy_row(self, sessions_metadata_table):
+        from apis.shared.sessions.metadata import get_session_metadata
+
+        sessions_metadata_table.put_item(Item=_legacy_row("s1", "2026-02-01T00:00:00Z"))
+
+        result = await get_session_metadata("s1", "u1")
+
+        assert result is not None
+        assert result.title == "Legacy s1"
+
+    @pytest.mark.asyncio
+    async def test_legacy_reads_can_be_turned_off(self, sessions_metadata_table, monkeypatch):
+        from apis.shared.sessions.metadata import get_session_metadata, list_user_sessions
+
+        monkeypatch.setenv("SESSIONS_LEGACY_READS", "false")
+        sessions_metadata_table.put_item(Item=_legacy_row("s1", "2026-02-01T00:00:00Z"))
+
+        assert await get_session_metadata("s1", "u1") is None
+        sessions, _ = await list_user_sessions("u1")
+        assert sessions == []
+
+    @pytest.mark.asyncio
+    async def test_listing_merges_legacy_and_stable_rows_by_recency(self, sessions_metadata_table):
+        from apis.shared.sessions.metadata import list_user_sessions
+
+        for day in (1, 3, 5):
+            await _store(f"stable{day}", f"2026-01-0{day}T00:00:00Z")
+        for day in (2, 4):
+            sessions_metadata_table.put_item(Item=_legacy_row(f"legacy{day}", f"2026-01-0{day}T00:00:00Z"))
+
+        seen = []
+        token = None
+        while True:
+            page, token = await list_user_sessions("u1", limit=2, next_token=token)
+            assert len(page) <= 2
+            seen.extend(s.session_id for s in page)
+            if token is None:
+                break
+
+        assert seen == ["stable5", "legacy4", "stable3", "legacy2", "stable1"]
+
+    @pytest.mark.asyncio
+    async def test_listing_accepts_pre_migration_page_token(self, sessions_metadata_table):
+        import base64
+        import json
+
+        from apis.shared.sessions.metadata import list_user_sessions
+
+        await _store("new", "2026-01-05T00:00:00Z")
+        await _store("old", "2026-01-01T00:00:00Z")
+        legacy_token = base64.b64encode(json.dumps(
+            {"PK": "USER#u1", "SK": "S#ACTIVE#2026-01-03T00:00:00Z#gone"}
+        ).encode()).decode()
+
+        page, token = await list_user_sessions("u1", limit=5, next_token=legacy_token)
+
+        assert [s.session_id for s in page] == ["old"]
+        assert token is None
+
+    @pytest.mark.asyncio
+    async def test_soft_delete_drops_session_from_listing(self, sessions_metadata_table):
+        from apis.app_api.sessions.services.session_service import SessionService
+        from apis.shared.sessions.metadata import get_session_metadata, list_user_sessions
+
+        await _store("s1", "2026-01-01T00:00:00Z")
+        await _store("s2", "2026-01-02T00:00:00Z")
+
+        assert await SessionService().delete_session("u1", "s1") is True
+
+        sessions, _ = await list_user_sessions("u1")
+        assert [s.session_id for s in sessions] == ["s2"]
+        item = sessions_metadata_table.get_item(Key={"PK": "USER#u1", "SK": "SESSION#s1"})["Item"]
+        assert item["deleted"] is True
+        assert "GSI3SK" not in item
+        assert (await get_session_metadata("s1", "u1")).status == "deleted"
+
+
+class TestBackfillSessionRows:
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_rows_and_is_idempotent(self, sessions_metadata_table):
+        from apis.shared.sessions.session_rows import backfill_session_rows
+
+        table_name = sessions_metadata_table.name
+        sessions_metadata_table.put_item(Item=_legacy_row("s1", "2026-01-01T00:00:00Z"))
+        sessions_metadata_table.put_item(Item=_legacy_row("s2", "2026-01-02T00:00:00Z"))
+        # A stale duplicate left behind by the old per-turn row move
+        sessions_metadata_table.put_item(Item=_legacy_row("s2", "2025-12-01T00:00:00Z"))
+        sessions_metadata_table.put_item(Item={"PK": "USER#u1", "SK": "C#2026-01-01T00:00:00Z#x", "cost": 1})
+
+        dry = await backfill_session_rows(table_name, dry_run=True)
+        assert dry.scanned == 3
+        assert len(sessions_metadata_table.scan()["Items"]) == 4
+
+        stats = await backfill_session_rows(table_name)
+        assert stats.scanned == 3 and stats.failed == 0
+        # Scan order decides whether the stale duplicate is superseded or overwritten
+        assert stats.migrated + stats.superseded == 3
+
+        keys = sorted(i["SK"] for i in sessions_metadata_table.scan()["Items"])
+        assert keys == ["C#2026-01-01T00:00:00Z#x", "SESSION#s1", "SESSION#s2"]
+        s2 = sessions_metadata_table.get_item(Key={"PK": "USER#u1", "SK": "SESSION#s2"})["Item"]
+        assert s2["lastMessageAt"] == "2026-01-02T00:00:00Z"
+
+        again = await backfill_session_rows(table_name)
+        assert again.scanned == 0
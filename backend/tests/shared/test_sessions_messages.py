@@ -14,11 +14,11 @@ class TestGetMessages:
             MagicMock(message={"role": "user", "content": [{"text": "hello"}]}),
             MagicMock(message={"role": "assistant", "content": [{"text": "hi"}]}),
         ]
-        mock_session_mgr = MagicMock()
-        mock_session_mgr.list_messages.return_value = mock_msgs
+        mock_reader = MagicMock()
+        mock_reader.read.return_value = mock_msgs
 
-        with patch("apis.shared.sessions.messages.AgentCoreMemorySessionManager", return_value=mock_session_mgr), \
-             patch("apis.shared.sessions.messages.AgentCoreMemoryConfig"), \
+        with patch("apis.shared.sessions.history_reader.get_history_reader", return_value=mock_reader), \
+             patch("apis.shared.sessions.history_reader.get_memory_data_client"), \
              patch("apis.shared.sessions.messages.AGENTCORE_MEMORY_AVAILABLE", True), \
              patch("apis.shared.sessions.metadata.get_all_message_metadata", new_callable=AsyncMock, return_value={}), \
              patch("apis.shared.sessions.metadata.get_pending_interrupts", new_callable=AsyncMock, return_value=[]):
@@ -33,11 +33,11 @@ class TestGetMessages:
         monkeypatch.setenv("AWS_REGION", "us-east-1")
 
         mock_msgs = [MagicMock(message={"role": "user", "content": [{"text": f"msg{i}"}]}) for i in range(10)]
-        mock_session_mgr = MagicMock()
-        mock_session_mgr.list_messages.return_value = mock_msgs
+        mock_reader = MagicMock()
+        mock_reader.read.return_value = mock_msgs
 
-        with patch("apis.shared.sessions.messages.AgentCoreMemorySessionManager", return_value=mock_session_mgr), \
-             patch("apis.shared.sessions.messages.AgentCoreMemoryConfig"), \
+        with patch("apis.shared.sessions.history_reader.get_history_reader", return_value=mock_reader), \
+             patch("apis.shared.sessions.history_reader.get_memory_data_client"), \
              patch("apis.shared.sessions.messages.AGENTCORE_MEMORY_AVAILABLE", True), \
              patch("apis.shared.sessions.metadata.get_all_message_metadata", new_callable=AsyncMock, return_value={}), \
              patch("apis.shared.sessions.metadata.get_pending_interrupts", new_callable=AsyncMock, return_value=[]):
@@ -62,8 +62,8 @@ class TestGetMessages:
         monkeypatch.setenv("AWS_REGION", "us-east-1")
         monkeypatch.setenv("AGENTCORE_MCP_APPS_SANDBOX_ORIGIN", "https://fresh.example")
 
-        mock_session_mgr = MagicMock()
-        mock_session_mgr.list_messages.return_value = [
+        mock_reader = MagicMock()
+        mock_reader.read.return_value = [
             MagicMock(message={"role": "assistant", "content": [{"text": "hi"}]}),
         ]
 
@@ -80,8 +80,8 @@ class TestGetMessages:
             }
         ]
 
-        with patch("apis.shared.sessions.messages.AgentCoreMemorySessionManager", return_value=mock_session_mgr), \
-             patch("apis.shared.sessions.messages.AgentCoreMemoryConfig"), \
+        with patch("apis.shared.sessions.history_reader.get_history_reader", return_value=mock_reader), \
+             patch("apis.shared.sessions.history_reader.get_memory_data_client"), \
              patch("apis.shared.sessions.messages.AGENTCORE_MEMORY_AVAILABLE", True), \
              patch("apis.shared.sessions.metadata.get_all_message_metadata", new_callable=AsyncMock, return_value={}), \
              patch("apis.shared.sessions.metadata.get_pending_interrupts", new_callable=AsyncMock, return_value=[]), \
@@ -105,8 +105,8 @@ class TestGetMessages:
         monkeypatch.setenv("AGENTCORE_MEMORY_ID", "test-memory")
         monkeypatch.setenv("AWS_REGION", "us-east-1")
 
-        mock_session_mgr = MagicMock()
-        mock_session_mgr.list_messages.return_value = [
+        mock_reader = MagicMock()
+        mock_reader.read.return_value = [
             MagicMock(message={"role": "user", "content": [{"text": f"m{i}"}]}) for i in range(5)
         ]
         fake_store = MagicMock()
@@ -115,8 +115,8 @@ class TestGetMessages:
         import base64
         page2 = base64.b64encode(b"2").decode()
 
-        with patch("apis.shared.sessions.messages.AgentCoreMemorySessionManager", return_value=mock_session_mgr), \
-             patch("apis.shared.sessions.messages.AgentCoreMemoryConfig"), \
+        with patch("apis.shared.sessions.history_reader.get_history_reader", return_value=mock_reader), \
+             patch("apis.shared.sessions.history_reader.get_memory_data_client"), \
              patch("apis.shared.sessions.messages.AGENTCORE_MEMORY_AVAILABLE", True), \
              patch("apis.shared.sessions.metadata.get_all_message_metadata", new_callable=AsyncMock, return_value={}), \
              patch("apis.shared.sessions.metadata.get_pending_interrupts", new_callable=AsyncMock, return_value=[]), \
@@ -0,0 +1,87 @@
+"""Pooled DynamoDB access layer for the sessions metadata table."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from apis.shared.sessions import table_access
+from apis.shared.sessions.table_access import (
+    get_table_latency_stats,
+    reset_table_pool,
+    run_table_call,
+    table_op,
+)
+
+
+class TestRunTableCall:
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_block_event_loop(self, sessions_metadata_table):
+        ticks = 0
+
+        async def _ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        def _slow(table):
+            time.sleep(0.2)
+            return table.table_name
+
+        name, _ = await asyncio.gather(
+            run_table_call("test-sessions-metadata", "slow", _slow),
+            _ticker(),
+        )
+        assert name == "test-sessions-metadata"
+        assert ticks == 10
+
+    @pytest.mark.asyncio
+    async def test_table_op_round_trip(self, sessions_metadata_table):
+        await table_op("test-sessions-metadata", "put_item", Item={"PK": "USER#u1", "SK": "X"})
+        resp = await table_op("test-sessions-metadata", "get_item", Key={"PK": "USER#u1", "SK": "X"})
+        assert resp["Item"]["SK"] == "X"
+
+    @pytest.mark.asyncio
+    async def test_reuses_table_per_worker_thread(self, sessions_metadata_table, monkeypatch):
+        monkeypatch.setenv("SESSIONS_METADATA_DDB_MAX_WORKERS", "1")
+        reset_table_pool()
+
+        seen = []
+        for _ in range(3):
+            seen.append(await run_table_call("test-sessions-metadata", "probe", lambda table: (threading.get_ident(), id(table))))
+        assert len(set(seen)) == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self, sessions_metadata_table):
+        def _boom(table):
+            raise ValueError("nope")
+
+        with pytest.raises(ValueError):
+            await run_table_call("test-sessions-metadata", "boom", _boom)
+
+
+class TestLatencyStats:
+    @pytest.mark.asyncio
+    async def test_counts_calls_and_errors(self, sessions_metadata_table):
+        reset_table_pool()
+        await run_table_call("test-sessions-metadata", "op", lambda table: None)
+
+        def _boom(table):
+            raise RuntimeError("x")
+
+        with pytest.raises(RuntimeError):
+            await run_table_call("test-sessions-metadata", "op", _boom)
+
+        stats = get_table_latency_stats()["op"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 1
+        assert stats["maxMs"] >= stats["avgMs"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_stats(self, sessions_metadata_table):
+        await run_table_call("test-sessions-metadata", "op", lambda table: None)
+        reset_table_pool()
+        assert get_table_latency_stats() == {}
+        assert table_access._executor is None
@@ -0,0 +1,137 @@
+"""Tests for the pipelined S3 Vectors writer."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from apis.shared.embeddings import vector_writer
+from apis.shared.embeddings.vector_writer import PUT_VECTORS_BATCH_SIZE, VectorWriter
+
+
+def _client(delay=0.0, failures=0):
+    """s3vectors stand-in that records stored keys and peak concurrency."""
+    state = {"keys": [], "calls": 0, "in_flight": 0, "peak": 0, "failures": failures}
+    lock = threading.Lock()
+
+    def put_vectors(**kwargs):
+        with lock:
+            state["calls"] += 1
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            fail = state["failures"] > 0
+            if fail:
+                state["failures"] -= 1
+        try:
+            if delay:
+                time.sleep(delay)
+            if fail:
+                raise RuntimeError("ServiceUnavailable")
+            with lock:
+                state["keys"].extend(v["key"] for v in kwargs["vectors"])
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    client = MagicMock()
+    client.put_vectors.side_effect = put_vectors
+    return client, state
+
+
+def _writer(client, total, **kw):
+    return VectorWriter(
+        client=client,
+        vector_bucket="bucket",
+        vector_index="index",
+        assistant_id="AST-1",
+        document_id="DOC-1",
+        metadata={"filename": "file.pdf"},
+        total=total,
+        **kw,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(vector_writer.asyncio, "sleep", lambda _d: real_sleep(0))
+
+
+class TestVectorWriter:
+    @pytest.mark.asyncio
+    async def test_stores_every_vector_in_batches(self):
+        client, state = _client()
+        chunks = [f"chunk {i}" for i in range(120)]
+
+        async with _writer(client, len(chunks)) as writer:
+            await writer.put(0, chunks[:70], [[0.1]] * 70)
+            await writer.put(70, chunks[70:], [[0.1]] * 50)
+
+        assert sorted(state["keys"], key=lambda k: int(k.split("#")[1])) == [f"DOC-1#{i}" for i in range(120)]
+        assert all(len(call.kwargs["vectors"]) <= PUT_VECTORS_BATCH_SIZE for call in client.put_vectors.call_args_list)
+        first = client.put_vectors.call_args_list[0].kwargs["vectors"][0]
+        assert first["metadata"] == {"text": "chunk 0", "document_id": "DOC-1", "assistant_id": "AST-1", "source": "file.pdf"}
+
+    @pytest.mark.asyncio
+    async def test_uploads_run_concurrently_up_to_worker_count(self):
+        client, state = _client(delay=0.03)
+        chunks = ["x"] * (PUT_VECTORS_BATCH_SIZE * 8)
+
+        async with _writer(client, len(chunks), workers=3) as writer:
+            await writer.put(0, chunks, [[0.0]] * len(chunks))
+
+        assert state["calls"] == 8
+        assert 1 < state["peak"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self):
+        client, state = _client(failures=2)
+
+        async with _writer(client, 10) as writer:
+            await writer.put(0, ["c"] * 10, [[0.0]] * 10)
+
+        assert state["calls"] == 3
+        assert len(state["keys"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_raise(self):
+        client, _ = _client(failures=10)
+
+        with pytest.raises(RuntimeError):
+            async with _writer(client, 10, max_retries=1) as writer:
+                await writer.put(0, ["c"] * 10, [[0.0]] * 10)
+
+    @pytest.mark.asyncio
+    async def test_progress_reports_stored_counts(self):
+        client, _ = _client()
+        seen = []
+
+        async def progress(embedded, stored, total):
+            seen.append((embedded, stored, total))
+
+        async with _writer(client, 100, progress_callback=progress, workers=1) as writer:
+            await writer.put(0, ["c"] * 100, [[0.0]] * 100)
+
+        assert seen[-1] == (100, 100, 100)
+        assert [s for _, s, _ in seen] == sorted(s for _, s, _ in seen)
+
+
+class TestEmbedAndStore:
+    @pytest.mark.asyncio
+    async def test_embeds_in_slices_and_stores_all(self, monkeypatch):
+        import apis.shared.embeddings.bedrock_embeddings as mod
+
+        client, state = _client()
+        monkeypatch.setattr(mod, "_get_vector_store_bucket", lambda: "bucket")
+        monkeypatch.setattr(mod, "_get_vector_store_index", lambda: "index")
+        monkeypatch.setattr(mod, "get_s3vectors_client", lambda _region: client)
+        monkeypatch.setenv("EMBED_STORE_SLICE_SIZE", "40")
+        embed = AsyncMock(side_effect=lambda chunks: [[float(len(c))] for c in chunks])
+
+        with patch.object(mod, "generate_embeddings", embed):
+            await mod.embed_and_store("AST-1", "DOC-1", [f"c{i}" for i in range(100)], {"filename": "f.txt"})
+
+        assert embed.await_count == 3
+        assert len(state["keys"]) == 100
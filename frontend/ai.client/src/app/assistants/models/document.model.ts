@@ -50,6 +50,7 @@ export interface Document {
   errorMessage?: string;
   errorDetails?: string;
   chunkCount?: number;
+  embeddedCount?: number;
   createdAt: string;
   updatedAt: string;
 }
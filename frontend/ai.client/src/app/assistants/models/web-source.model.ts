@@ -17,6 +17,8 @@ export interface CrawlSettings {
   minDelay: number;
   maxDelay: number;
   sameDomainOnly: boolean;
+  /** Re-crawl already-imported pages conditionally, skipping unchanged ones. */
+  incremental?: boolean;
 }
 
 /** The polite defaults the SPA seeds the modal with. Match backend `CrawlSettings()`. */
@@ -49,6 +51,8 @@ export interface CrawlJob {
   discoveredCount: number;
   fetchedCount: number;
   failedCount: number;
+  /** Pages an incremental re-crawl found not modified (HTTP 304). */
+  unchangedCount?: number;
   startedAt: string;
   completedAt?: string | null;
   startedByUserId: string;
@@ -29,7 +29,14 @@ export interface ArtifactsDataConstructProps {
  *   ...lets the SPA list artifacts for the current session newest-first.
  *
  * S3 layout:
- *   {user_id}/{artifact_id}/v{n}/index.html (+ sibling assets)
+ *   blobs/{sha256[:2]}/{sha256}[.gz]        (storage="s3-blob", written now)
+ *   {user_id}/{artifact_id}/v{n}/index.html (storage="s3", legacy rows)
+ *   Blobs are content-addressed and shared across users: identical
+ *   bodies, from any user, resolve to one object outside every user
+ *   prefix. Deleting a user's `{user_id}/` prefix therefore does not
+ *   reclaim their blobs. Another user's version rows may still point at
+ *   the same key, so blob storage can only be reclaimed by a sweep that
+ *   checks no content_key references it.
  *   Private, no CORS — the iframe loads HTML directly from CloudFront
  *   (which proxies to the render Lambda), never via XHR. Versioning is
  *   at the DDB layer (immutable per-version rows + content pointer),
@@ -13,7 +13,8 @@ export interface CostTrackingTablesConstructProps {
  * and the admin cost dashboard.
  *
  *   - SessionsMetadataTable  — message-level metadata for cost tracking
- *                              (UserTimestampIndex + SessionLookupIndex)
+ *                              (UserTimestampIndex + SessionLookupIndex
+ *                              + SessionRecencyIndex)
  *   - UserCostSummaryTable   — pre-aggregated user-level cost summaries
  *                              (PeriodCostIndex enables top-N queries)
  *   - SystemCostRollupTable  — pre-aggregated system-wide metrics
@@ -65,6 +66,15 @@ export class CostTrackingTablesConstruct extends Construct {
       projectionType: dynamodb.ProjectionType.ALL,
     });
 
+    // Sparse: only active session rows carry GSI3PK/GSI3SK, so a
+    // descending query lists a user's sessions by recency.
+    this.sessionsMetadataTable.addGlobalSecondaryIndex({
+      indexName: 'SessionRecencyIndex',
+      partitionKey: { name: 'GSI3PK', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'GSI3SK', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.ALL,
+    });
+
 
 
     // UserCostSummary Table
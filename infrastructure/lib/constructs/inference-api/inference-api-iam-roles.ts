@@ -257,6 +257,17 @@ export function createRuntimeExecutionRole(
     resources: [skillResourcesBucketArn, `${skillResourcesBucketArn}/*`],
   }));
 
+  // ── RAG lexical index segments (S3, read-only) ──
+  // Hybrid RAG retrieval memory-maps the per-document BM25 segments the
+  // ingestion Lambda writes under lexical-index/ in the documents bucket.
+  const ragDocumentsBucketArn = refs.ragDocumentsBucket.bucketArn;
+  role.addToPolicy(new iam.PolicyStatement({
+    sid: 'RagLexicalIndexRead',
+    effect: iam.Effect.ALLOW,
+    actions: ['s3:GetObject'],
+    resources: [`${ragDocumentsBucketArn}/lexical-index/*`],
+  }));
+
   // ── S3 Vectors (RAG query) ──
   const vectorBucketName = refs.ragVectorBucketName;
   const vectorIndexName = refs.ragVectorIndexName;
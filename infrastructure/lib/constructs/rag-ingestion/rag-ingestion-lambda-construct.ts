@@ -12,7 +12,7 @@ import { AppConfig } from '../../config';
 
 export interface RagIngestionLambdaConstructProps {
   config: AppConfig;
-  /** RAG documents bucket — granted read access + S3 event subscription. */
+  /** RAG documents bucket — granted read access, lexical-index/ writes + S3 event subscription. */
   documentsBucket: s3.IBucket;
   /** RAG assistants table — granted read/write data access. */
   assistantsTable: dynamodb.ITable;
@@ -125,6 +125,9 @@ export class RagIngestionLambdaConstruct extends Construct {
 
     // IAM grants
     documentsBucket.grantRead(this.lambda);
+    // Lexical (BM25) index segments for hybrid retrieval. Kept outside the
+    // assistants/ prefix so writing them never re-triggers ingestion.
+    documentsBucket.grantPut(this.lambda, 'lexical-index/*');
     assistantsTable.grantReadWriteData(this.lambda);
 
     // ECR pull on the project's rag-ingestion repo so
@@ -177,12 +177,13 @@ describe('CostTrackingTablesConstruct — detailed', () => {
     });
   });
 
-  it('SessionsMetadata has 2 GSIs', () => {
+  it('SessionsMetadata has 3 GSIs', () => {
     t.hasResourceProperties('AWS::DynamoDB::Table', {
       TableName: 'test-project-sessions-metadata',
       GlobalSecondaryIndexes: Match.arrayWith([
         Match.objectLike({ IndexName: 'UserTimestampIndex' }),
         Match.objectLike({ IndexName: 'SessionLookupIndex' }),
+        Match.objectLike({ IndexName: 'SessionRecencyIndex' }),
       ]),
     });
   });